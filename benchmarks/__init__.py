@@ -0,0 +1 @@
+"""Performance benchmarks. Run from the repository root: python -m benchmarks.<name>"""
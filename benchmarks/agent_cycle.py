@@ -0,0 +1,529 @@
+"""
+Benchmark: offline run_full_cycle of the guest and topic agents.
+
+Usage:
+    python -m benchmarks.agent_cycle [--agent all|guest|topic] [--queries 6] [--repeat 3]
+                                     [--llm-latency-ms 0] [--output perf.json]
+
+The model is a scripted fake client, web search goes through the agent's
+SmartSearchTool with a stub provider, and pages are served from a local HTML corpus built from
+benchmarks.corpus. Runs need no network or API keys and are repeatable, so the
+JSON output can be compared across commits.
+
+Each agent runs in its own process, and every run uses a fresh temporary
+working directory (data/ and output/ files). Per agent the output has:
+
+- wall time per phase and in total, for the first run and as best of --repeat
+  (the first run includes one-off costs such as loading the NER pipeline);
+- peak RSS of the agent's process;
+- tracemalloc peak and the largest live allocations, from one extra traced run;
+- call counts: LLM calls per kind, tool calls per tool, searches, page fetches.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import zlib
+from collections import Counter
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from anthropic.types import Message, TextBlock, ThinkingBlock, ToolUseBlock, Usage
+from rich.console import Console
+
+from benchmarks.corpus import FIRST_NAMES, LAST_NAMES, ORGANIZATIONS, sample_pages
+from src.guest_search.config import Config
+from src.utils.smart_search_tool import SearchProvider, SearXNGInstanceManager
+
+CORPUS_URL = "https://corpus.local/nieuws/"
+
+# Phase methods per agent, timed in the order run_full_cycle calls them
+PHASES = {
+    "guest": (
+        "run_planning_phase",
+        "run_search_phase",
+        "enrich_linkedin_profiles",
+        "generate_report",
+    ),
+    "topic": ("run_topic_search", "generate_report"),
+}
+
+PRIORITIES = ("high", "medium", "low")
+
+
+# ============================================
+# LOCAL WEB: CORPUS + STUB SEARCH
+# ============================================
+
+
+class LocalCorpus:
+    """HTML pages keyed by URL, served in place of requests.get."""
+
+    def __init__(self, pages: int = 40, seed: int = 42):
+        self.pages = {
+            f"{CORPUS_URL}{index}": _html(index, text)
+            for index, text in enumerate(sample_pages(pages, seed=seed))
+        }
+        self.urls = list(self.pages)
+        self.fetches = 0
+
+    def urls_for(self, query: str, count: int) -> list[str]:
+        """Deterministic result URLs for a query."""
+        start = zlib.crc32(query.encode("utf-8")) % len(self.urls)
+        return [self.urls[(start + i) % len(self.urls)] for i in range(count)]
+
+    def get(self, url, **kwargs):
+        if url not in self.pages:
+            return SimpleNamespace(status_code=404, text="")
+        self.fetches += 1
+        return SimpleNamespace(status_code=200, text=self.pages[url])
+
+
+class StubSearchProvider(SearchProvider):
+    """Search provider that returns corpus pages."""
+
+    def __init__(self, corpus: LocalCorpus):
+        self.corpus = corpus
+        self.searches = 0
+
+    def is_available(self) -> bool:
+        return True
+
+    def search(self, query: str, **kwargs) -> list[dict]:
+        self.searches += 1
+        return [
+            {
+                "title": f"AI nieuws {url.rsplit('/', 1)[-1]}: {query[:40]}",
+                "link": url,
+                "snippet": self.corpus.pages[url][200:360],
+            }
+            for url in self.corpus.urls_for(query, kwargs.get("num_results", 10))
+        ]
+
+
+def _html(index: int, text: str) -> str:
+    paragraphs = "".join(f"<p>{line}</p>" for line in text.splitlines())
+    return (
+        f"<html><head><title>AI nieuws {index}</title>"
+        "<style>body { font-family: sans-serif; }</style><script>var x = 1;</script></head>"
+        "<body><nav>Home | Nieuws | Contact</nav>"
+        f"<article><h1>AI nieuws {index}</h1>{paragraphs}</article>"
+        "<footer>© AI Nieuws Nederland</footer></body></html>"
+    )
+
+
+# ============================================
+# SCRIPTED MODEL
+# ============================================
+
+
+class ScriptedLLM:
+    """
+    Fake messages client that plays a fixed agent script.
+
+    Search turns follow the tool results: search, fetch the top pages, save
+    the people or topics found there, finish. Usage is estimated from the
+    serialized request, like the real client serializes it.
+
+    Args:
+        queries: search queries in the guest strategy
+        fetches_per_turn: pages fetched after each search
+        topic_rounds: search rounds of the topic agent
+        latency: seconds of simulated model latency per call
+    """
+
+    def __init__(self, queries=6, fetches_per_turn=2, topic_rounds=3, latency=0.0):
+        self.queries = queries
+        self.fetches_per_turn = fetches_per_turn
+        self.topic_rounds = topic_rounds
+        self.latency = latency
+        self.messages = self
+        self.calls: Counter = Counter()
+        self.tool_uses: Counter = Counter()
+        self._ids = 0
+
+    def create(self, **request):
+        tools = {tool["name"] for tool in request.get("tools", [])}
+        if "save_candidate" in tools:
+            kind, content = "guest_search", self._guest_search_turn(request["messages"])
+        elif "enrich_candidate" in tools:
+            kind, content = "guest_report", self._guest_report_turn(request["messages"])
+        elif "save_topic" in tools:
+            kind, content = "topic_search", self._topic_search_turn(request["messages"])
+        elif "thinking" in request:
+            kind, content = "guest_planning", self._planning()
+        else:
+            kind, content = "topic_report", [_text("# AI-topics deze week\n\nOverzicht.")]
+
+        self.calls[kind] += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return self._message(request, content)
+
+    def _message(self, request, content):
+        tool_use = any(block.type == "tool_use" for block in content)
+        prompt_chars = len(json.dumps(request.get("messages"), default=str))
+        output_chars = len(json.dumps([block.model_dump() for block in content]))
+        return Message(
+            id=f"msg_{self._ids}",
+            type="message",
+            role="assistant",
+            model=request.get("model", "scripted"),
+            content=content,
+            stop_reason="tool_use" if tool_use else "end_turn",
+            usage=Usage(input_tokens=prompt_chars // 4, output_tokens=output_chars // 4),
+        )
+
+    def _tool(self, name, tool_input):
+        self._ids += 1
+        self.tool_uses[name] += 1
+        return ToolUseBlock(type="tool_use", id=f"toolu_{self._ids}", name=name, input=tool_input)
+
+    def _planning(self):
+        strategy = {
+            "week_focus": "AI in zorg, overheid en onderwijs",
+            "search_queries": [
+                {
+                    "query": f"AI expert {ORGANIZATIONS[i % len(ORGANIZATIONS)]} {i}",
+                    "rationale": "Benchmark query",
+                    "priority": PRIORITIES[i % len(PRIORITIES)],
+                }
+                for i in range(self.queries)
+            ],
+            "sectors_to_prioritize": ["zorg", "overheid"],
+            "topics_to_cover": ["AI Act", "generatieve AI"],
+        }
+        return [
+            ThinkingBlock(type="thinking", thinking="Strategie bepalen.", signature="sig"),
+            self._tool("submit_search_strategy", strategy),
+        ]
+
+    def _guest_search_turn(self, messages):
+        # Turns since the latest query prompt (a user message without tool results)
+        start = max(
+            i for i, m in enumerate(messages) if m["role"] == "user" and not _tool_results(m)
+        )
+        step = sum(1 for m in messages[start:] if m["role"] == "assistant")
+
+        if step == 0:
+            match = re.search(r"\*\*Query\*\*: (.+)", _text_of(messages[start]))
+            query = match.group(1).strip() if match else "AI expert Nederland"
+            return [self._tool("web_search", {"query": query})]
+        if step == 1:
+            return self._fetch_results(messages[-1])
+        if step == 2:
+            saves = []
+            for result in _tool_results(messages[-1]):
+                for person in result.get("potential_persons", [])[:1]:
+                    saves.append(self._tool("save_candidate", _candidate(person, result)))
+            if saves:
+                return saves
+        return [_text("Klaar met deze zoekopdracht.")]
+
+    def _guest_report_turn(self, messages):
+        if len(messages) == 1:
+            names = re.findall(r'"name": "([^"]+)"', _text_of(messages[0]))
+            enrich = [
+                self._tool(
+                    "enrich_candidate",
+                    {
+                        "name": name,
+                        "enriched_topics": ["AI in de zorg", "Uitlegbare AI", "AI Act"],
+                        "enriched_relevance": f"{name} werkt aan toegepaste AI.",
+                    },
+                )
+                for name in dict.fromkeys(names)
+            ]
+            if enrich:
+                return enrich
+        return [_text("# Potentiële gasten\n\nOverzicht van de kandidaten van deze week.")]
+
+    def _topic_search_turn(self, messages):
+        last_tool = None
+        rounds = 0
+        for message in messages:
+            if message["role"] == "assistant":
+                for block in message["content"]:
+                    if getattr(block, "type", None) == "tool_use":
+                        last_tool = block.name
+                        rounds += block.name == "web_search"
+
+        if last_tool == "web_search":
+            return self._fetch_results(messages[-1])
+        if last_tool == "fetch_page_content":
+            title = f"AI-topic {rounds}"
+            return [
+                self._tool(
+                    "save_topic",
+                    {
+                        "title": title,
+                        "category": "Praktijkvoorbeeld",
+                        "why_relevant_for_anne": "Concreet voorbeeld uit Nederland.",
+                        "description": "Een organisatie zet AI in voor betere dienstverlening.",
+                        "search_keywords": ["AI", "praktijk"],
+                        "discussion_angles": ["Kansen", "Risico's"],
+                        "sources": [{"url": CORPUS_URL, "title": title}],
+                    },
+                )
+            ]
+        if rounds < self.topic_rounds:
+            return [self._tool("web_search", {"query": f"AI nieuws Nederland {rounds}"})]
+        return [_text("Klaar met zoeken.")]
+
+    def _fetch_results(self, message):
+        urls = [
+            result["url"]
+            for search in _tool_results(message)
+            for result in search.get("results", [])
+        ]
+        fetches = [
+            self._tool("fetch_page_content", {"url": url}) for url in urls[: self.fetches_per_turn]
+        ]
+        return fetches or [_text("Geen resultaten.")]
+
+
+def _text(text):
+    return TextBlock(type="text", text=text)
+
+
+def _text_of(message) -> str:
+    content = message["content"]
+    if isinstance(content, str):
+        return content
+    return " ".join(block.get("text", "") for block in content if isinstance(block, dict))
+
+
+def _tool_results(message) -> list[dict]:
+    """Parsed tool results of a user message (empty for other messages)."""
+    if message["role"] != "user" or isinstance(message["content"], str):
+        return []
+    results = []
+    for block in message["content"]:
+        if isinstance(block, dict) and block.get("type") == "tool_result":
+            try:
+                results.append(json.loads(block["content"]))
+            except (TypeError, json.JSONDecodeError):
+                results.append({})
+    return results
+
+
+def _candidate(person, page_result):
+    return {
+        "name": person.get("name", f"{FIRST_NAMES[0]} {LAST_NAMES[0]}"),
+        "role": "onderzoeker",
+        "organization": ORGANIZATIONS[zlib.crc32(person.get("name", "").encode()) % 6],
+        "topics": ["AI in de zorg", "Uitlegbare AI"],
+        "relevance_description": "Werkt aan toegepaste AI in Nederland.",
+        "sources": [page_result.get("url", "")],
+    }
+
+
+# ============================================
+# RUNNER
+# ============================================
+
+
+def _fallback_instances(manager):
+    # SmartSearchTool builds a SearXNG provider that fetches the instance list
+    # from searx.space; the benchmark only searches through the stub provider.
+    manager.instances = manager.FALLBACK_INSTANCES.copy()
+
+
+def _new_agent(name, llm, corpus, provider):
+    console = Console(file=io.StringIO(), width=120)
+    offline = patch.object(SearXNGInstanceManager, "_load_instances", _fallback_instances)
+    if name == "guest":
+        from src.guest_search.agent import GuestFinderAgent
+
+        with patch("src.guest_search.agent.get_anthropic_client", return_value=llm), offline:
+            agent = GuestFinderAgent()
+    else:
+        from src.topic_search.agent import TopicFinderAgent
+
+        with patch("src.topic_search.agent.get_anthropic_client", return_value=llm), offline:
+            agent = TopicFinderAgent()
+
+    agent.console = console
+    agent.smart_search.providers = [provider]
+    return agent
+
+
+def run_once(name: str, options: dict, traced: bool = False) -> dict:
+    """One run_full_cycle in a fresh working directory; phase times and call counts."""
+    llm = ScriptedLLM(
+        queries=options["queries"],
+        fetches_per_turn=options["fetches_per_turn"],
+        topic_rounds=options["topic_rounds"],
+        latency=options["llm_latency_ms"] / 1000,
+    )
+    corpus = LocalCorpus(options["pages"])
+    provider = StubSearchProvider(corpus)
+    phases: Counter = Counter()
+    result: dict = {}
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            # Directories the guest_search.py / topic_search.py entry points create
+            os.makedirs("data", exist_ok=True)
+            os.makedirs("output/reports", exist_ok=True)
+            os.makedirs("output/topic_reports", exist_ok=True)
+            with open("data/previous_guests.json", "w", encoding="utf-8") as f:
+                f.write("[]")
+
+            with patch("requests.get", corpus.get), contextlib.redirect_stdout(io.StringIO()):
+                agent = _new_agent(name, llm, corpus, provider)
+                _time_phases(agent, PHASES[name], phases)
+
+                if traced:
+                    tracemalloc.start()
+                start = time.perf_counter()
+                agent.run_full_cycle()
+                total = time.perf_counter() - start
+
+            if traced:
+                _current, peak = tracemalloc.get_traced_memory()
+                snapshot = tracemalloc.take_snapshot()
+                tracemalloc.stop()
+                result["tracemalloc"] = _allocations(snapshot, peak)
+        finally:
+            os.chdir(cwd)
+
+    result.update(
+        {
+            "phases": {phase: round(phases[phase], 4) for phase in PHASES[name]},
+            "total_seconds": round(total, 4),
+            "calls": {
+                "llm": dict(llm.calls),
+                "tools": dict(llm.tool_uses),
+                "searches": provider.searches,
+                "page_fetches": corpus.fetches,
+            },
+            "results": len(getattr(agent, "candidates", getattr(agent, "topics", []))),
+        }
+    )
+    return result
+
+
+def benchmark_agent(name: str, options: dict) -> dict:
+    """Timed runs, one traced run and the peak RSS of this process."""
+    Config.EXTRACTION_WORKERS = options["extraction_workers"]
+    Config.PARALLEL_QUERY_WORKERS = options["parallel_queries"]
+    Config.ASYNC_RUNTIME = False
+
+    runs = [run_once(name, options) for _ in range(options["repeat"])]
+    traced = run_once(name, options, traced=True)
+    best = min(runs, key=lambda run: run["total_seconds"])
+
+    return {
+        "first_run": {"phases": runs[0]["phases"], "total_seconds": runs[0]["total_seconds"]},
+        "best": {"phases": best["phases"], "total_seconds": best["total_seconds"]},
+        "runs_seconds": [run["total_seconds"] for run in runs],
+        "peak_rss_bytes": _peak_rss(),
+        "tracemalloc": traced["tracemalloc"],
+        "calls": best["calls"],
+        "results": best["results"],
+    }
+
+
+def _time_phases(agent, names, phases):
+    """Replace the phase methods on this instance by timed wrappers."""
+    for name in names:
+        method = getattr(agent, name)
+
+        def timed(*args, _method=method, _name=name, **kwargs):
+            start = time.perf_counter()
+            try:
+                return _method(*args, **kwargs)
+            finally:
+                phases[_name] += time.perf_counter() - start
+
+        setattr(agent, name, timed)
+
+
+def _allocations(snapshot, peak, top=10):
+    stats = snapshot.statistics("lineno")
+    return {
+        "peak_bytes": peak,
+        "live_bytes_at_end": sum(stat.size for stat in stats),
+        "live_blocks_at_end": sum(stat.count for stat in stats),
+        "top_live_allocations": [
+            {"where": str(stat.traceback[0]), "bytes": stat.size, "blocks": stat.count}
+            for stat in stats[:top]
+        ],
+    }
+
+
+def _peak_rss() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--agent", choices=["all", "guest", "topic"], default="all")
+    parser.add_argument("--queries", type=int, default=6, help="queries in the guest strategy")
+    parser.add_argument("--fetches-per-turn", type=int, default=2)
+    parser.add_argument("--topic-rounds", type=int, default=3)
+    parser.add_argument("--pages", type=int, default=40, help="pages in the local corpus")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0)
+    parser.add_argument("--extraction-workers", type=int, default=0)
+    parser.add_argument("--parallel-queries", type=int, default=0)
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    options = {key: value for key, value in vars(args).items() if key not in ("agent", "output")}
+    agents = ["guest", "topic"] if args.agent == "all" else [args.agent]
+
+    # One process per agent: separate peak RSS, and no state shared between agents
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    for name in agents:
+        with context.Pool(1) as pool:
+            results[name] = pool.apply(benchmark_agent, (name, options))
+
+    report = {
+        "benchmark": "agent_cycle",
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "options": options,
+        "agents": results,
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+        print(f"Wrote {args.output}")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
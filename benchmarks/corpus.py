@@ -0,0 +1,47 @@
+"""Deterministic synthetic Dutch news pages for benchmarks."""
+
+import random
+
+FIRST_NAMES = ["Jan", "Maria", "Pieter", "Lisa", "Kees", "Anna", "Mark", "Sanne", "Joost", "Eva"]
+LAST_NAMES = ["de Vries", "Jansen", "Bakker", "van Dam", "de Jong", "Smit", "de Wit", "Visser"]
+ROLES = ["hoogleraar", "CEO", "directeur", "onderzoeker", "CTO", "wethouder"]
+ORGANIZATIONS = ["TU Delft", "TNO", "Radboud UMC", "Philips", "gemeente Utrecht", "UvA"]
+
+SENTENCES = [
+    "Prof. {name} is {role} bij {org} en werkt aan uitlegbare AI.",
+    "Volgens {name} verandert AI de manier waarop {org} werkt.",
+    '"Dit is pas het begin", zegt {name}, {role} bij {org}.',
+    "Het onderzoek wordt geleid door {name}, {role} van {org}.",
+    "{role} {name} presenteerde de resultaten op het congres.",
+    "Dr. {name} van {org} vertelt over het nieuwe AI-lab.",
+]
+
+FILLER = [
+    "Het project loopt drie jaar en wordt gefinancierd door NWO.",
+    "De resultaten worden later dit jaar gepubliceerd.",
+    "Ziekenhuizen experimenteren steeds vaker met machine learning.",
+    "De AI Act stelt nieuwe eisen aan transparantie van algoritmes.",
+    "Volgens het rapport groeit het gebruik van generatieve AI snel.",
+]
+
+
+def sample_pages(count: int = 50, sentences_per_page: int = 60, seed: int = 42) -> list[str]:
+    """Generate ``count`` pages of roughly news-article length."""
+    rng = random.Random(seed)
+    pages = []
+
+    for _ in range(count):
+        lines = []
+        for _ in range(sentences_per_page):
+            if rng.random() < 0.3:
+                name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+                lines.append(
+                    rng.choice(SENTENCES).format(
+                        name=name, role=rng.choice(ROLES), org=rng.choice(ORGANIZATIONS)
+                    )
+                )
+            else:
+                lines.append(rng.choice(FILLER))
+        pages.append("\n".join(lines))
+
+    return pages
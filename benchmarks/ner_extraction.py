@@ -0,0 +1,96 @@
+"""
+Benchmark: per-page person extraction time, spacy.load per page vs. warm NER service.
+
+Usage:
+    python -m benchmarks.ner_extraction [--pages 20] [--model nl_core_news_md]
+
+Requires the Dutch model (python -m spacy download nl_core_news_md). Without it,
+--blank runs the same comparison on a blank pipeline with an entity ruler, which
+only shows the framework overhead.
+"""
+
+import argparse
+import statistics
+import time
+
+from benchmarks.corpus import FIRST_NAMES, LAST_NAMES, sample_pages
+from src.guest_search.extraction import persons_from_doc
+from src.guest_search.ner import NerService
+
+
+def _blank_model(model_name: str):
+    import spacy
+
+    nlp = spacy.blank("nl")
+    nlp.add_pipe("sentencizer")  # The real model gets sentences from its parser
+    ruler = nlp.add_pipe("entity_ruler", name="ner")
+    ruler.add_patterns(
+        [
+            {"label": "PERSON", "pattern": f"{first} {last}"}
+            for first in FIRST_NAMES
+            for last in LAST_NAMES
+        ]
+    )
+    return nlp
+
+
+def _report(label: str, timings: list[float]):
+    per_page_ms = [t * 1000 for t in timings]
+    print(
+        f"{label:<28} mean {statistics.mean(per_page_ms):8.1f} ms/page   "
+        f"median {statistics.median(per_page_ms):8.1f} ms   total {sum(timings):7.2f} s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--model", default="nl_core_news_md")
+    parser.add_argument("--blank", action="store_true", help="use a blank stand-in pipeline")
+    args = parser.parse_args()
+
+    pages = sample_pages(args.pages)
+    loader = _blank_model if args.blank else None
+
+    import spacy
+
+    if not args.blank and not spacy.util.is_package(args.model):
+        print(f"Model '{args.model}' is not installed.")
+        print(f"Install it with: python -m spacy download {args.model} (or use --blank)")
+        return
+
+    load = loader or spacy.load
+
+    # Before: load the model for every page (old _extract_persons_with_spacy)
+    before = []
+    for text in pages:
+        start = time.perf_counter()
+        nlp = load(args.model)
+        persons_from_doc(nlp(text), text)
+        before.append(time.perf_counter() - start)
+
+    # After: warm service (first call includes the one-time load)
+    service = NerService(args.model, loader=loader)
+    start = time.perf_counter()
+    service.load()
+    load_time = time.perf_counter() - start
+
+    after = []
+    for text in pages:
+        start = time.perf_counter()
+        service.extract_persons(text)
+        after.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    service.extract_persons_batch(pages)
+    batch_time = time.perf_counter() - start
+
+    print(f"{len(pages)} pages, avg {statistics.mean(len(p) for p in pages):.0f} chars")
+    print(f"pipeline after warm-up: {service.load().pipe_names} (one-time load {load_time:.2f} s)")
+    _report("before: spacy.load per page", before)
+    _report("after: warm service", after)
+    _report("after: extract_persons_batch", [batch_time / len(pages)] * len(pages))
+
+
+if __name__ == "__main__":
+    main()
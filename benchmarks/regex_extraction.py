@@ -0,0 +1,130 @@
+"""
+Benchmark: regex person extraction, original per-pattern passes vs. compiled combined passes.
+
+Usage:
+    python -m benchmarks.regex_extraction [--pages 20] [--repeat 5]
+
+The original implementation is kept here verbatim as the baseline.
+"""
+
+import argparse
+import re
+import statistics
+import time
+
+from benchmarks.corpus import sample_pages
+from src.guest_search.extraction import extract_persons_regex
+
+
+def legacy_extract_persons_regex(text: str) -> list[dict]:
+    """Original extractor: 11 uncompiled re.finditer passes."""
+    potential_persons = []
+
+    title_patterns = [
+        r"(Prof\.?\s+(?:dr\.?\s+)?([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+))",
+        r"(Dr\.?\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+))",
+        r"(Drs\.?\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+))",
+        r"(Ir\.?\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+))",
+    ]
+
+    for pattern in title_patterns:
+        for match in re.finditer(pattern, text):
+            start = max(0, match.start() - 50)
+            end = min(len(text), match.end() + 100)
+            potential_persons.append(
+                {
+                    "name": match.group(2),
+                    "title_match": match.group(1),
+                    "context": text[start:end].replace("\n", " "),
+                    "position": match.start(2),
+                }
+            )
+
+    role_patterns = [
+        r"([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+),?\s+(hoogleraar|professor|docent|onderzoeker|CEO|CTO|directeur|hoofd|lead|manager|wethouder|burgemeester)",
+        r"(hoogleraar|professor|docent|onderzoeker|CEO|CTO|directeur|hoofd|lead|manager|wethouder|burgemeester)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)",
+        r"volgens\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)",
+        r"door\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+),",
+        r"zegt\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)",
+        r"vertelt\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)",
+        r"aldus\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)",
+    ]
+
+    for pattern in role_patterns:
+        for match in re.finditer(pattern, text, re.IGNORECASE):
+            name = None
+            position = match.start()
+            for group_index, group in enumerate(match.groups(), 1):
+                if (
+                    group
+                    and len(group.split()) >= 2
+                    and group[0].isupper()
+                    and group.lower()
+                    not in [
+                        "hoogleraar",
+                        "professor",
+                        "docent",
+                        "onderzoeker",
+                        "ceo",
+                        "cto",
+                        "directeur",
+                        "hoofd",
+                        "lead",
+                        "manager",
+                        "wethouder",
+                        "burgemeester",
+                    ]
+                ):
+                    name = group
+                    position = match.start(group_index)
+                    break
+
+            if name:
+                start = max(0, match.start() - 50)
+                end = min(len(text), match.end() + 100)
+                context = text[start:end].replace("\n", " ")
+                potential_persons.append({"name": name, "context": context, "position": position})
+
+    seen_names = set()
+    unique_persons = []
+    for person in potential_persons:
+        if person["name"].lower() not in seen_names:
+            seen_names.add(person["name"].lower())
+            unique_persons.append(person)
+
+    return unique_persons
+
+
+def _time(extractor, pages: list[str], repeat: int) -> float:
+    """Best-of-``repeat`` total time over all pages, in seconds."""
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in pages:
+            extractor(text)
+        runs.append(time.perf_counter() - start)
+    return min(runs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for sentences in (60, 600):
+        pages = sample_pages(args.pages, sentences_per_page=sentences)
+        assert all(legacy_extract_persons_regex(p) == extract_persons_regex(p) for p in pages)
+
+        legacy = _time(legacy_extract_persons_regex, pages, args.repeat)
+        compiled = _time(extract_persons_regex, pages, args.repeat)
+        avg_chars = statistics.mean(len(p) for p in pages)
+
+        print(f"{len(pages)} pages of ~{avg_chars:.0f} chars (identical output)")
+        print(f"  legacy 11 passes : {legacy / len(pages) * 1000:7.2f} ms/page")
+        print(f"  compiled passes  : {compiled / len(pages) * 1000:7.2f} ms/page")
+        print(f"  speedup          : {legacy / compiled:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,13 +12,13 @@ import json
 from pathlib import Path
 from datetime import datetime
 
+from src.guest_search.history_store import open_history_store
+from src.guest_search.identity import PersonIndex
 
-def find_candidate_by_name(name: str, candidates: list) -> dict | None:
-    """Find a candidate by exact name match."""
-    for candidate in candidates:
-        if candidate.get("name") == name:
-            return candidate
-    return None
+
+def find_candidate_by_name(name: str, candidates: PersonIndex) -> dict | None:
+    """Find a candidate by identity (titles, initials and spelling variants match)."""
+    return candidates.find_first(name)
 
 
 def enrich_guest(guest: dict, candidate: dict | None) -> dict:
@@ -94,7 +94,10 @@ def main():
     previous_guests_file = Path("data/previous_guests.json")
     candidates_file = Path("data/candidates_latest.json")
 
-    if not previous_guests_file.exists():
+    # HISTORY_STORE=sqlite: the guests live in the history database
+    store = open_history_store()
+
+    if store is None and not previous_guests_file.exists():
         print(f"❌ File not found: {previous_guests_file}")
         return
 
@@ -103,13 +106,18 @@ def main():
         return
 
     # Load data
-    with open(previous_guests_file, encoding="utf-8") as f:
-        guests = json.load(f)
+    if store is not None:
+        guests = store.all_guests()
+        source = store.path
+    else:
+        with open(previous_guests_file, encoding="utf-8") as f:
+            guests = json.load(f)
+        source = previous_guests_file
 
     with open(candidates_file, encoding="utf-8") as f:
-        candidates = json.load(f)
+        candidates = PersonIndex(json.load(f))
 
-    print(f"📋 Loaded {len(guests)} guests from previous_guests.json")
+    print(f"📋 Loaded {len(guests)} guests from {source}")
     print(f"📋 Loaded {len(candidates)} candidates from candidates_latest.json")
     print()
 
@@ -134,10 +142,13 @@ def main():
     print(f"✨ Enriched {enriched_count} guests with detailed candidate data")
 
     # Save enriched data
-    with open(previous_guests_file, "w", encoding="utf-8") as f:
-        json.dump(guests, f, indent=2, ensure_ascii=False)
+    if store is not None:
+        store.replace_guests(guests)
+    else:
+        with open(previous_guests_file, "w", encoding="utf-8") as f:
+            json.dump(guests, f, indent=2, ensure_ascii=False)
 
-    print(f"✅ Saved enriched data to {previous_guests_file}")
+    print(f"✅ Saved enriched data to {source}")
 
     # Show example of enriched guest
     for guest in guests:
@@ -1,3 +1,4 @@
+import argparse
 import os
 
 from rich.console import Console
@@ -9,7 +10,20 @@ from src.guest_search.config import Config
 from src.guest_search.interactive_selector import InteractiveGuestSelector
 
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AIToday Live Guest Finder")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="ga verder met de laatste onvoltooide run (checkpoint in data/runs/)",
+    )
+    parser.add_argument(
+        "--replan",
+        action="store_true",
+        help="maak een nieuwe zoekstrategie, ook als er deze week al een is",
+    )
+    args = parser.parse_args(argv)
+
     console = Console()
 
     # Check API key
@@ -39,7 +53,7 @@ def main():
     )
 
     agent = GuestFinderAgent()
-    report = agent.run_full_cycle()
+    report = agent.run_full_cycle(resume=args.resume, replan=args.replan)
 
     # Show brief summary
     if report and agent.candidates:
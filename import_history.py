@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Import previous_guests.json and search_history.json into the SQLite history store.
+
+The agent fills a new database automatically (HISTORY_STORE=sqlite); run this
+to import the JSON files into an existing one. Guests with the same name and
+date and sessions with the same date are skipped, so importing twice is safe.
+"""
+
+import argparse
+
+from src.guest_search.config import Config
+from src.guest_search.history_store import (
+    PREVIOUS_GUESTS_FILE,
+    SEARCH_HISTORY_FILE,
+    HistoryStore,
+)
+
+
+def main(argv=None):
+    """Import the JSON history files into the history database."""
+    parser = argparse.ArgumentParser(description="Import JSON history into SQLite")
+    parser.add_argument("--db", default=Config.HISTORY_DB, help="history database")
+    parser.add_argument("--guests", default=PREVIOUS_GUESTS_FILE, help="previous guests JSON")
+    parser.add_argument("--history", default=SEARCH_HISTORY_FILE, help="search history JSON")
+    args = parser.parse_args(argv)
+
+    store = HistoryStore(args.db)
+    guests, sessions = store.import_json(args.guests, args.history)
+
+    print(f"✅ Imported {guests} guests and {sessions} sessions into {store.path}")
+    print(f"📋 Database: {store.count_guests()} guests, {store.count_sessions()} sessions")
+    if Config.HISTORY_STORE != "sqlite":
+        print("💡 Set HISTORY_STORE=sqlite in .env to use the database")
+
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
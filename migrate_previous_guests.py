@@ -21,6 +21,8 @@ New structure:
 import json
 from pathlib import Path
 
+from src.guest_search.history_store import open_history_store
+
 
 def migrate_guest(guest: dict) -> dict:
     """Migrate a single guest to new structure."""
@@ -72,15 +74,22 @@ def main():
 
     previous_guests_file = Path("data/previous_guests.json")
 
-    if not previous_guests_file.exists():
-        print(f"❌ File not found: {previous_guests_file}")
-        return
+    # HISTORY_STORE=sqlite: the guests live in the history database
+    store = open_history_store()
+    if store is not None:
+        guests = store.all_guests()
+        source = store.path
+    else:
+        if not previous_guests_file.exists():
+            print(f"❌ File not found: {previous_guests_file}")
+            return
 
-    # Load existing data
-    with open(previous_guests_file, encoding="utf-8") as f:
-        guests = json.load(f)
+        # Load existing data
+        with open(previous_guests_file, encoding="utf-8") as f:
+            guests = json.load(f)
+        source = previous_guests_file
 
-    print(f"📋 Loaded {len(guests)} guests from {previous_guests_file}")
+    print(f"📋 Loaded {len(guests)} guests from {source}")
 
     # Migrate each guest
     migrated_count = 0
@@ -93,11 +102,15 @@ def main():
     print(f"✨ Migrated {migrated_count} guests to new structure")
 
     # Save migrated data
-    with open(previous_guests_file, "w", encoding="utf-8") as f:
-        json.dump(guests, f, indent=2, ensure_ascii=False)
-
-    print(f"✅ Saved migrated data to {previous_guests_file}")
-    print(f"💾 Backup available at: {previous_guests_file}.backup")
+    if store is not None:
+        store.replace_guests(guests)
+        print(f"✅ Saved migrated data to {source}")
+    else:
+        with open(previous_guests_file, "w", encoding="utf-8") as f:
+            json.dump(guests, f, indent=2, ensure_ascii=False)
+
+        print(f"✅ Saved migrated data to {previous_guests_file}")
+        print(f"💾 Backup available at: {previous_guests_file}.backup")
 
     # Show example
     if guests:
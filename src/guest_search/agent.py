@@ -1,8 +1,15 @@
+import asyncio
+import contextvars
 import json
 import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from typing import cast
 
+from anthropic import APIError
 from anthropic.types import ToolParam
 from rich.console import Console
 from rich.live import Live
@@ -14,14 +21,59 @@ from rich.table import Table
 from src.utils.portkey_client import get_anthropic_client
 from src.utils.smart_search_tool import SmartSearchTool
 
+from .async_runtime import AsyncGuestRuntime
+from .budget import SearchBudget, priority_order
+from .checkpoint import RunCheckpoint
+from .compaction import ConversationCompactor
 from .config import Config
+from .enrichment import (
+    enrichment_requests,
+    run_batch,
+    run_concurrent,
+    supports_batches,
+    tool_call_input,
+)
+from .extraction import ExtractionPool, extract_persons_regex, html_to_text
+from .history_store import open_history_store
+from .identity import PersonIndex
+from .learning import (
+    LearningAggregates,
+    consistency_errors,
+    scan_learning_insights,
+    scan_recent_sources,
+)
+from .ner import get_ner_service
+from .passages import PASSAGE_SEPARATOR, query_terms, select_passages
+from .planning import strategy_tool_choice, strategy_tool_input, stream_strategy
+from .prompt_cache import cache_report, system_prompt, with_message_breakpoint
 from .prompts import (
+    ENRICH_CANDIDATE_PROMPT,
     PLANNING_PROMPT,
+    PLANNING_TOOL_INSTRUCTION,
+    REPORT_ASSEMBLY_PROMPT,
     REPORT_GENERATION_PROMPT,
+    REPORT_INTRO_PROMPT,
     SEARCH_EXECUTION_PROMPT_CACHEABLE,
     SEARCH_EXECUTION_PROMPT_DYNAMIC,
 )
-from .tools import get_tools
+from .report_rendering import intro_summary, render_report
+from .routing import ToolResultMemo, defer_escalation_tools, needs_escalation
+from .run_metrics import RunMetrics
+from .strategy_cache import (
+    StrategyCache,
+    deprioritize_completed,
+    insights_fingerprint,
+    iso_week,
+    prompt_version,
+    week_start,
+)
+from .streaming import run_model_turn, supports_streaming
+from .tool_results import encode_tool_result, result_sizes
+from .tools import get_enrich_tool, get_strategy_tool, get_tools
+
+# SQLite history: sessies die de planning gebruikt (4 weken leergeschiedenis, gerekend
+# vanaf het begin van de ISO week voor de strategie cache)
+LEARNING_WINDOW_WEEKS = 5
 
 
 class GuestFinderAgent:
@@ -29,6 +81,8 @@ class GuestFinderAgent:
         self.client = get_anthropic_client(Config.ANTHROPIC_API_KEY)
         self.tools = get_tools()
         self.candidates = []
+        # previous_guests en search_history in SQLite (None = de JSON bestanden)
+        self.history_store = open_history_store()
         self.previous_guests = self._load_previous_guests()
         # Initialize smart search tool (will auto-detect API keys from env)
         self.smart_search = SmartSearchTool(enable_cache=True)
@@ -38,9 +92,52 @@ class GuestFinderAgent:
         self.search_history = self._load_search_history()
         self.current_session_queries = []
         self.current_session_strategy = None
+        # Query die nu wordt uitgevoerd (voor passage-selectie in fetch_page_content);
+        # per thread/context zodat parallelle query workers elkaar niet overschrijven
+        self._current_query = contextvars.ContextVar("current_query", default="")
+        # HTML parsing + NER in worker processes (0 = inline)
+        self.extraction_pool = ExtractionPool(Config.EXTRACTION_WORKERS)
+        # Token usage per zoek-turn (voor prompt cache rapportage)
+        self.search_turns = []
+        # Tokens, cache en latency per LLM call en tool call (per fase en per query)
+        self.metrics = RunMetrics()
+        # Stopt/dunt de zoekfase uit bij budget overschrijding of lage opbrengst
+        self.search_budget = self._new_budget()
+        # Checkpoint van de huidige run (zie run_full_cycle), None = geen checkpoints
+        self.checkpoint = None
+        # Strategieën van deze week voor hergebruik (None = altijd plannen)
+        self.strategy_cache = (
+            StrategyCache(Config.STRATEGY_CACHE_DIR) if Config.STRATEGY_CACHE_ENABLED else None
+        )
+        # Identiteitsindexen per lijst (zie _person_index)
+        self._person_indexes = {}
+        # (sessielijst, LearningAggregates) voor de planning (zie _learning_aggregates)
+        self._learning = None
+        # Beschermt candidates en de indexen bij parallelle query workers
+        self._state_lock = threading.RLock()
+
+    @property
+    def current_query(self):
+        return self._current_query.get()
+
+    @current_query.setter
+    def current_query(self, query):
+        self._current_query.set(query)
 
     def _load_previous_guests(self):
-        """Laad lijst van eerder aanbevolen gasten"""
+        """
+        Laad lijst van eerder aanbevolen gasten
+
+        Met de SQLite store alleen de gasten binnen EXCLUDE_WEEKS (check_previous_guests)
+        en de recente gasten van het rapport; oudere gasten spelen in een run geen rol.
+        """
+        if self.history_store is not None:
+            weeks = max(Config.EXCLUDE_WEEKS, 2)
+            guests = self.history_store.guests_since(datetime.now() - timedelta(weeks=weeks))
+            # Gasten vanaf deze index zijn nieuw in deze run (zie _save_previous_guests)
+            self._stored_guests = len(guests)
+            return guests
+
         try:
             with open("data/previous_guests.json", encoding="utf-8") as f:
                 return json.load(f)
@@ -48,13 +145,37 @@ class GuestFinderAgent:
             return []
 
     def _save_previous_guests(self):
-        """Bewaar bijgewerkte gastenlijst"""
+        """Bewaar bijgewerkte gastenlijst (SQLite: alleen de nieuwe gasten toevoegen)"""
+        if self.history_store is not None:
+            self.history_store.add_guests(self.previous_guests[self._stored_guests :])
+            self._stored_guests = len(self.previous_guests)
+            return
+
         import os
 
         os.makedirs("data", exist_ok=True)
         with open("data/previous_guests.json", "w", encoding="utf-8") as f:
             json.dump(self.previous_guests, f, indent=2, ensure_ascii=False)
 
+    def _person_index(self, attribute: str) -> PersonIndex:
+        """
+        Identiteitsindex over self.<attribute> (candidates of previous_guests).
+
+        De index groeit mee met append() op de lijst; wordt de lijst vervangen
+        of ingekort, dan wordt hij opnieuw opgebouwd.
+        """
+        with self._state_lock:
+            records = getattr(self, attribute)
+            cached = self._person_indexes.get(attribute)
+            if cached is None or cached[0] is not records or len(cached[1]) > len(records):
+                cached = (records, PersonIndex())
+                self._person_indexes[attribute] = cached
+
+            index = cached[1]
+            for record in records[len(index) :]:
+                index.add(record)
+            return index
+
     def _get_recent_guests(self, weeks: int = 2):
         """Haal gasten op die recent zijn aanbevolen (laatste N weken)"""
         cutoff_date = datetime.now() - timedelta(weeks=weeks)
@@ -70,24 +191,240 @@ class GuestFinderAgent:
 
         return recent_guests
 
+    def _enrich_and_write_report(self, prompt, enrich_tool):
+        """
+        Verrijk de kandidaten en schrijf het rapport in één multi-turn tool loop.
+
+        Returns:
+            Rapport (markdown), of None als het model geen rapport schreef
+        """
+        # Use multi-turn conversation to handle tool calls and report generation
+        conversation: list = [{"role": "user", "content": prompt}]
+        report = None
+
+        # ENRICHMENT_MODEL tot alle kandidaten verrijkt zijn, daarna REPORT_MODEL; verrijkt
+        # per identiteit, zodat een anders geschreven naam ook telt ("J. de Vries")
+        index = self._person_index("candidates")
+        enriched = set()
+
+        status_msg = "[cyan]Agent verrijkt kandidaten en schrijft rapport...[/cyan]"
+        with self.console.status(status_msg):
+            # Max 10 turns (enough for enriching all candidates + report)
+            for turn_num in range(10):
+                pending = {index.lookup(c["name"]) for c in self.candidates} - enriched - {None}
+                model = Config.ENRICHMENT_MODEL if pending else Config.REPORT_MODEL
+                start = time.perf_counter()
+                response = self.client.messages.create(
+                    model=model,
+                    max_tokens=Config.SEARCH_MAX_TOKENS,
+                    messages=conversation,  # type: ignore
+                    tools=[enrich_tool],  # type: ignore
+                )
+                self.metrics.record_llm_call(
+                    "report",
+                    getattr(response, "usage", None),
+                    time.perf_counter() - start,
+                    model=model,
+                )
+
+                # Debug: show what the agent is doing
+                if os.getenv("DEBUG_TOOLS"):
+                    self.console.print(f"[dim]Turn {turn_num + 1}: {response.stop_reason}[/dim]")
+                    for block in response.content:
+                        if block.type == "text":
+                            self.console.print(f"[dim]  Text: {block.text[:100]}...[/dim]")
+                        elif block.type == "tool_use":
+                            self.console.print(f"[dim]  Tool: {block.name}[/dim]")
+
+                # Check if there are tool calls in the response (regardless of stop reason)
+                has_tool_calls = any(block.type == "tool_use" for block in response.content)
+
+                if has_tool_calls:
+                    # Process tool calls
+                    tool_results = []
+                    for block in response.content:
+                        if block.type == "tool_use":
+                            if block.name == "enrich_candidate":
+                                # Convert tool input to dict
+                                tool_input = dict(block.input) if block.input else {}
+                                result = self._handle_enrich_candidate(tool_input)
+                                enriched.add(index.lookup(tool_input.get("name", "")))
+
+                                tool_results.append(
+                                    {
+                                        "type": "tool_result",
+                                        "tool_use_id": block.id,
+                                        "content": result,
+                                    }
+                                )
+
+                    # Add assistant message and tool results to conversation
+                    conversation.append({"role": "assistant", "content": response.content})
+                    conversation.append({"role": "user", "content": tool_results})
+
+                elif response.stop_reason == "end_turn":
+                    # Extract text from response
+                    for block in response.content:
+                        if block.type == "text":
+                            report = block.text
+                            break
+                    break
+                else:
+                    # Unexpected stop reason
+                    break
+
+        return report
+
+    def _enrich_candidates(self, enrich_tool, batch=False):
+        """
+        Verrijk elke kandidaat met een eigen, klein request (zie enrichment.py).
+
+        Args:
+            enrich_tool: enrich_candidate tool definitie
+            batch: via de Message Batches API (bij een API fout gelijktijdig), anders
+                gelijktijdig (ENRICHMENT_WORKERS)
+        """
+        requests = enrichment_requests(
+            self.candidates,
+            ENRICH_CANDIDATE_PROMPT,
+            enrich_tool,
+            Config.ENRICHMENT_MODEL,
+            Config.SEARCH_MAX_TOKENS,
+        )
+
+        if batch:
+            status_msg = (
+                f"[cyan]Batch met {len(requests)} verrijkingen wacht op resultaten...[/cyan]"
+            )
+            try:
+                with self.console.status(status_msg):
+                    messages = run_batch(
+                        self.client,
+                        requests,
+                        poll_seconds=Config.ENRICHMENT_BATCH_POLL_SECONDS,
+                        timeout_seconds=Config.ENRICHMENT_BATCH_TIMEOUT,
+                    )
+                # Batch requests lopen parallel: geen latency per request
+                responses = {custom_id: (message, 0.0) for custom_id, message in messages.items()}
+            except APIError as e:
+                # Geweigerde batch of API fout: de zoekfase is klaar, dus gewone requests
+                self.console.print(
+                    f"[yellow]⚠️  Message batch mislukt ({e}), gewone requests[/yellow]"
+                )
+                batch = False
+
+        if not batch:
+            status_msg = f"[cyan]Agent verrijkt {len(requests)} kandidaten...[/cyan]"
+            with self.console.status(status_msg):
+                responses = run_concurrent(self.client, requests, Config.ENRICHMENT_WORKERS)
+
+        enriched = 0
+        for request, candidate in zip(requests, self.candidates, strict=True):
+            if request["custom_id"] not in responses:
+                continue
+            message, seconds = responses[request["custom_id"]]
+            self.metrics.record_llm_call(
+                "report",
+                getattr(message, "usage", None),
+                seconds,
+                candidate["name"],
+                model=Config.ENRICHMENT_MODEL,
+            )
+            tool_input = tool_call_input(message, enrich_tool["name"])
+            if tool_input is not None:
+                # De kandidaat uit het request, ook als het model de naam anders schrijft
+                self._handle_enrich_candidate({**tool_input, "name": candidate["name"]})
+                enriched += 1
+
+        if enriched < len(self.candidates):
+            self.console.print(
+                f"[yellow]⚠️  {len(self.candidates) - enriched} kandidaten niet verrijkt "
+                "(request mislukt of verlopen)[/yellow]"
+            )
+
+    def _render_report(self, recent_guests, week_number):
+        """Rapport lokaal uit de kandidaatdata (report_rendering.py), optioneel met model-intro"""
+        intro = self._report_intro() if Config.REPORT_LLM_INTRO else None
+        return render_report(self.candidates, recent_guests, week_number, intro)
+
+    def _report_intro(self):
+        """Korte redactionele intro van het model; None als het request mislukt"""
+        prompt = REPORT_INTRO_PROMPT.format(
+            candidates_json=json.dumps(intro_summary(self.candidates), ensure_ascii=False)
+        )
+
+        with self.console.status("[cyan]Agent schrijft intro...[/cyan]"):
+            start = time.perf_counter()
+            try:
+                response = self.client.messages.create(
+                    model=Config.REPORT_MODEL,
+                    max_tokens=Config.REPORT_INTRO_MAX_TOKENS,
+                    messages=[{"role": "user", "content": prompt}],
+                )
+            except Exception as e:
+                self.console.print(f"[yellow]⚠️  Intro mislukt, standaard intro: {e}[/yellow]")
+                return None
+            self.metrics.record_llm_call(
+                "report",
+                getattr(response, "usage", None),
+                time.perf_counter() - start,
+                model=Config.REPORT_MODEL,
+            )
+
+        texts = [block.text for block in response.content if block.type == "text"]
+        return "".join(texts).strip() or None
+
+    def _assemble_report(self, recent_guests, week_number):
+        """Schrijf het rapport van de verrijkte kandidaten (één request, geen tools)"""
+        prompt = REPORT_ASSEMBLY_PROMPT.format(
+            candidates_json=json.dumps(self.candidates, indent=2, ensure_ascii=False),
+            recent_guests_json=json.dumps(recent_guests, indent=2, ensure_ascii=False),
+            week_number=week_number,
+            has_new_candidates=len(self.candidates) > 0,
+            has_recent_guests=len(recent_guests) > 0,
+        )
+
+        with self.console.status("[cyan]Agent schrijft rapport...[/cyan]"):
+            start = time.perf_counter()
+            response = self.client.messages.create(
+                model=Config.REPORT_MODEL,
+                max_tokens=Config.SEARCH_MAX_TOKENS,
+                messages=[{"role": "user", "content": prompt}],
+            )
+            self.metrics.record_llm_call(
+                "report",
+                getattr(response, "usage", None),
+                time.perf_counter() - start,
+                model=Config.REPORT_MODEL,
+            )
+
+        texts = [block.text for block in response.content if block.type == "text"]
+        return "".join(texts) or None
+
     def _handle_enrich_candidate(self, tool_input: dict) -> str:
         """Handle enrich_candidate tool call to update candidate with enriched data."""
         name = tool_input.get("name", "")
         enriched_topics = tool_input.get("enriched_topics", [])
         enriched_relevance = tool_input.get("enriched_relevance", "")
 
-        # Find candidate by name
-        for candidate in self.candidates:
-            if candidate["name"] == name:
-                # Update with enriched data
-                candidate["topics"] = enriched_topics
-                candidate["relevance_description"] = enriched_relevance
-                return f"✓ Kandidaat '{name}' verrijkt met {len(enriched_topics)} topics"
+        # Find candidate by identity (titles, initials, typos in the surname)
+        candidate = self._person_index("candidates").find_first(name)
+        if candidate is None:
+            return f"⚠️ Kandidaat '{name}' niet gevonden"
 
-        return f"⚠️ Kandidaat '{name}' niet gevonden"
+        # Update with enriched data
+        candidate["topics"] = enriched_topics
+        candidate["relevance_description"] = enriched_relevance
+        return f"✓ Kandidaat '{candidate['name']}' verrijkt met {len(enriched_topics)} topics"
 
     def _load_search_history(self):
-        """Laad search history voor learning"""
+        """Laad search history voor learning (SQLite: alleen de sessies in het leervenster)"""
+        if self.history_store is not None:
+            cutoff = datetime.now() - timedelta(weeks=LEARNING_WINDOW_WEEKS)
+            sessions = self.history_store.sessions_since(cutoff)
+            self._stored_sessions = len(sessions)
+            return {"sessions": sessions}
+
         try:
             with open("data/search_history.json", encoding="utf-8") as f:
                 return json.load(f)
@@ -95,295 +432,207 @@ class GuestFinderAgent:
             return {"sessions": []}
 
     def _save_search_history(self):
-        """Bewaar search history"""
+        """Bewaar search history (SQLite: alleen de nieuwe sessies toevoegen)"""
+        if self.history_store is not None:
+            sessions = self.search_history["sessions"]
+            self.history_store.add_sessions(sessions[self._stored_sessions :])
+            self._stored_sessions = len(sessions)
+            return
+
         import os
 
         os.makedirs("data", exist_ok=True)
         with open("data/search_history.json", "w", encoding="utf-8") as f:
             json.dump(self.search_history, f, indent=2, ensure_ascii=False)
 
-    def _get_recently_used_sources(self, weeks: int = 1):
-        """Haal bronnen op die recent zijn gebruikt (voor deduplicatie)"""
-        cutoff_date = datetime.now() - timedelta(weeks=weeks)
-        recent_sources = set()
+        # Nieuwe sessies ook in de opgeslagen weekbuckets (na de history zelf)
+        self._learning_aggregates()
 
-        for session in self.search_history.get("sessions", []):
-            try:
-                session_date = datetime.fromisoformat(session["date"])
-                if session_date >= cutoff_date:
-                    # Verzamel alle bronnen uit deze sessie
-                    for query in session.get("queries", []):
-                        for source in query.get("successful_sources", []):
-                            recent_sources.add(source)
-            except (ValueError, KeyError):
-                continue
+    def _learning_aggregates(self) -> LearningAggregates:
+        """
+        Leer-aggregaten over self.search_history["sessions"].
 
-        return list(recent_sources)
+        In JSON modus staan de weekbuckets in Config.LEARNING_DIR, zodat een nieuwe
+        run alleen de weken binnen het venster inleest in plaats van de hele history
+        te bucketen. Nieuwe sessies achteraan de lijst worden toegevoegd en opgeslagen;
+        past de opgeslagen stand niet meer bij de history (vervangen of ingekort), dan
+        worden ze opnieuw opgebouwd.
+        """
+        sessions = self.search_history.setdefault("sessions", [])
+        cached = self._learning
+        if cached is None or cached[0] is not sessions:
+            # SQLite laadt alleen het leervenster: dan blijven de aggregaten in het geheugen
+            directory = Config.LEARNING_DIR if self.history_store is None else None
+            cached = (sessions, LearningAggregates(directory))
+            self._learning = cached
+
+        aggregates = cached[1]
+        if not aggregates.covers(sessions):
+            aggregates.reset()
+        if len(aggregates) < len(sessions):
+            for session in sessions[len(aggregates) :]:
+                aggregates.add(session)
+            aggregates.save()
+        return aggregates
+
+    def _check_learning_consistency(self, weeks: int, source_weeks: int) -> bool:
+        """Vergelijk de aggregaten met een volledige scan (LEARNING_CONSISTENCY_CHECK)"""
+        errors = consistency_errors(
+            self._learning_aggregates(),
+            self.search_history.get("sessions", []),
+            datetime.now(),
+            insight_weeks=weeks,
+            source_weeks=source_weeks,
+        )
+        for error in errors:
+            self.console.print(f"[yellow]⚠️  Leer-aggregaten wijken af: {error}[/yellow]")
+        return not errors
 
-    def _get_learning_insights(self, weeks: int = 4):
-        """Analyseer recente search history voor learning insights"""
-        cutoff_date = datetime.now() - timedelta(weeks=weeks)
-        recent_sessions = []
+    def _get_recently_used_sources(self, weeks: int = 1):
+        """Haal bronnen op die recent zijn gebruikt (voor deduplicatie)"""
+        if Config.LEARNING_CONSISTENCY_CHECK and not self._check_learning_consistency(4, weeks):
+            return scan_recent_sources(
+                self.search_history.get("sessions", []), datetime.now(), weeks
+            )
 
-        for session in self.search_history.get("sessions", []):
-            try:
-                session_date = datetime.fromisoformat(session["date"])
-                if session_date >= cutoff_date:
-                    recent_sessions.append(session)
-            except (ValueError, KeyError):
-                continue
+        return self._learning_aggregates().recent_sources(datetime.now(), weeks)
 
-        if not recent_sessions:
-            return None
+    def _get_learning_insights(self, weeks: int = 4):
+        """
+        Analyseer recente search history voor learning insights
 
-        # Verzamel alle queries met hun performance
-        all_queries = []
-        for session in recent_sessions:
-            for query in session.get("queries", []):
-                all_queries.append(query)
-
-        # Sorteer queries op candidates gevonden (meest succesvol eerst)
-        successful_queries = [q for q in all_queries if q.get("candidates_found", 0) > 0]
-        successful_queries.sort(key=lambda x: x.get("candidates_found", 0), reverse=True)
-
-        # Verzamel meest productieve bronnen
-        source_stats = {}
-        for query in all_queries:
-            for source in query.get("successful_sources", []):
-                source_stats[source] = source_stats.get(source, 0) + 1
-
-        # Top 5 bronnen
-        top_sources = sorted(source_stats.items(), key=lambda x: x[1], reverse=True)[:5]
-
-        # Verzamel previous strategies (for reflection)
-        previous_strategies = []
-        for session in recent_sessions:
-            if "strategy" in session and session["strategy"]:
-                previous_strategies.append(
-                    {
-                        "week_focus": session["strategy"].get("week_focus", ""),
-                        "candidates_found": session.get("total_candidates", 0),
-                        "date": session.get("date", ""),
-                    }
-                )
+        Leest de wekelijkse aggregaten binnen het venster in plaats van de hele
+        history opnieuw te scannen (zie learning.py).
+        """
+        if Config.LEARNING_CONSISTENCY_CHECK and not self._check_learning_consistency(weeks, 1):
+            return scan_learning_insights(
+                self.search_history.get("sessions", []), datetime.now(), weeks
+            )
 
-        return {
-            "total_sessions": len(recent_sessions),
-            "total_queries": len(all_queries),
-            "successful_queries": len(successful_queries),
-            "top_performing_queries": successful_queries[:5],
-            "top_sources": [source for source, count in top_sources],
-            "previous_strategies": previous_strategies,  # NEW
-            "avg_candidates_per_query": (
-                sum(q.get("candidates_found", 0) for q in all_queries) / len(all_queries)
-                if all_queries
-                else 0
-            ),
-        }
+        return self._learning_aggregates().insights(datetime.now(), weeks)
 
     def _extract_persons_with_spacy(self, text: str) -> list[dict]:
         """
         Extract person names using spaCy NER (Dutch model).
         Falls back to regex if spaCy is not available.
 
+        The model is loaded once per process by the shared NER service.
+
         Returns list of dicts with: name, context, (optional) title_match
         """
-        try:
-            import spacy
-
-            # Try to load Dutch model
-            try:
-                nlp = spacy.load("nl_core_news_md")
-            except OSError:
-                # Model not downloaded, use regex fallback
-                if os.getenv("DEBUG_TOOLS"):
-                    self.console.print(
-                        "[dim]⚠️  spaCy model not found, using regex fallback[/dim]"
-                    )
-                return self._extract_persons_with_regex(text)
-
-            # Process text with spaCy
-            doc = nlp(text)
-
-            potential_persons = []
-            seen_names = set()
-
-            # Extract PERSON entities
-            for ent in doc.ents:
-                if ent.label_ == "PERSON":
-                    name = ent.text.strip()
-
-                    # Skip if already seen (case insensitive)
-                    if name.lower() in seen_names:
-                        continue
-
-                    # Skip single-word names (likely false positives)
-                    if len(name.split()) < 2:
-                        continue
-
-                    # Filter out common false positives
-                    name_lower = name.lower()
-
-                    # Skip if contains numbers (e.g., "Frans Vertregt06")
-                    if any(char.isdigit() for char in name):
-                        continue
-
-                    # Skip if contains certain keywords that indicate it's not a person
-                    false_positive_keywords = [
-                        "children",
-                        "hospital",
-                        "university",
-                        "institute",
-                        "foundation",
-                        "stichting",
-                        "ziekenhuis",
-                        "universiteit",
-                        "instituut",
-                        "company",
-                        "bedrijf",
-                        "ministerie",
-                        "gemeente",
-                    ]
-
-                    if any(keyword in name_lower for keyword in false_positive_keywords):
-                        continue
-
-                    # Skip very long names (>5 words, likely organization names)
-                    if len(name.split()) > 5:
-                        continue
-
-                    seen_names.add(name.lower())
-
-                    # Get context (sentence containing the entity)
-                    sentence = ent.sent.text.strip()
-
-                    # Get wider context (50 chars before, 100 after)
-                    start = max(0, ent.start_char - 50)
-                    end = min(len(text), ent.end_char + 100)
-                    context = text[start:end].replace("\n", " ")
-
-                    # Check if there's a title nearby (Prof., Dr., etc.)
-                    title_match = None
-                    for token in ent.sent:
-                        if token.text in ["Prof.", "Dr.", "Drs.", "Ir.", "Mr."]:
-                            # Check if title is close to the entity
-                            if abs(token.i - ent.start) <= 2:
-                                title_match = f"{token.text} {name}"
-                                break
-
-                    person = {
-                        "name": name,
-                        "context": context,
-                        "sentence": sentence,  # Full sentence for better context
-                    }
-
-                    if title_match:
-                        person["title_match"] = title_match
-
-                    potential_persons.append(person)
+        ner = get_ner_service()
 
+        if not ner.available:
+            # spaCy or model not installed, use regex fallback
             if os.getenv("DEBUG_TOOLS"):
-                self.console.print(
-                    f"[dim]🤖 spaCy found {len(potential_persons)} persons[/dim]"
-                )
+                self.console.print("[dim]⚠️  spaCy model not found, using regex fallback[/dim]")
+            return self._extract_persons_with_regex(text)
 
-            return potential_persons
+        potential_persons = ner.extract_persons(text)
 
-        except ImportError:
-            # spaCy not installed, use regex fallback
-            if os.getenv("DEBUG_TOOLS"):
-                self.console.print("[dim]⚠️  spaCy not installed, using regex fallback[/dim]")
-            return self._extract_persons_with_regex(text)
+        if os.getenv("DEBUG_TOOLS"):
+            self.console.print(f"[dim]🤖 spaCy found {len(potential_persons)} persons[/dim]")
+
+        return potential_persons
 
     def _extract_persons_with_regex(self, text: str) -> list[dict]:
         """
         Legacy regex-based person extraction (fallback).
         Kept for backwards compatibility when spaCy is unavailable.
         """
-        import re
+        unique_persons = extract_persons_regex(text)
 
-        potential_persons = []
+        if os.getenv("DEBUG_TOOLS"):
+            self.console.print(f"[dim]📝 Regex found {len(unique_persons)} persons[/dim]")
 
-        # Pattern 1: Names with titles (Prof., Dr., etc.)
-        title_patterns = [
-            r"(Prof\.?\s+(?:dr\.?\s+)?([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+))",
-            r"(Dr\.?\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+))",
-            r"(Drs\.?\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+))",
-            r"(Ir\.?\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+))",
-        ]
+        return unique_persons
 
-        for pattern in title_patterns:
-            matches = re.finditer(pattern, text)
-            for match in matches:
-                full_match = match.group(1)
-                name = match.group(2) if len(match.groups()) > 1 else match.group(1)
-                # Get context (50 chars before and after)
-                start = max(0, match.start() - 50)
-                end = min(len(text), match.end() + 100)
-                context = text[start:end].replace("\n", " ")
-                potential_persons.append(
-                    {"name": name, "title_match": full_match, "context": context}
-                )
+    def _process_page(self, html: str) -> tuple[str, list[dict]]:
+        """Parse HTML en extraheer personen (in worker process als de pool aan staat)."""
+        if self.extraction_pool.enabled:
+            try:
+                return self.extraction_pool.process(html)
+            except Exception as e:
+                # Pool kapot (bijv. worker gecrasht): verwerk inline
+                if os.getenv("DEBUG_TOOLS"):
+                    self.console.print(f"[dim]⚠️  Extraction pool failed: {e}[/dim]")
+
+        text = html_to_text(html)
+        return text, self._extract_persons_with_spacy(text)
+
+    def _page_result(self, url: str, status_code: int, html: str) -> dict:
+        """fetch_page_content tool result voor een opgehaalde pagina"""
+        if status_code != 200:
+            return {"url": url, "error": f"HTTP {status_code}", "status": "error"}
+
+        # Parse HTML and extract potential person names using spaCy
+        # (with regex fallback), in a worker process when enabled
+        text, unique_persons = self._process_page(html)
 
-        # Pattern 2: Names with job titles/roles
-        role_patterns = [
-            r"([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+),?\s+(hoogleraar|professor|docent|onderzoeker|CEO|CTO|directeur|hoofd|lead|manager|wethouder|burgemeester)",
-            r"(hoogleraar|professor|docent|onderzoeker|CEO|CTO|directeur|hoofd|lead|manager|wethouder|burgemeester)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)",
-            r"volgens\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)",
-            r"door\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+),",
-            r"zegt\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)",
-            r"vertelt\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)",
-            r"aldus\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)",
+        return self._build_page_result(url, text, unique_persons)
+
+    def _build_page_result(self, url: str, text: str, persons: list[dict]) -> dict:
+        """
+        Bouw het fetch_page_content resultaat binnen het karakterbudget.
+
+        Lange pagina's worden niet afgekapt op de eerste N karakters: we selecteren
+        de passages rond gevonden personen en query-termen (zie passages.py).
+        """
+        budget = Config.FETCH_CONTENT_MAX_CHARS
+        passages = select_passages(text, persons, query_terms(self.current_query), budget)
+        truncated = len(text) > budget
+
+        # Offsets zijn intern (voor passage-selectie), niet nodig voor het model
+        public_persons = [
+            {key: value for key, value in person.items() if key != "position"}
+            for person in persons[:10]  # Max 10 to avoid overload
         ]
 
-        for pattern in role_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                # Extract name from match groups
-                name = None
-                for group in match.groups():
-                    if (
-                        group
-                        and len(group.split()) >= 2
-                        and group[0].isupper()
-                        and group.lower()
-                        not in [
-                            "hoogleraar",
-                            "professor",
-                            "docent",
-                            "onderzoeker",
-                            "ceo",
-                            "cto",
-                            "directeur",
-                            "hoofd",
-                            "lead",
-                            "manager",
-                            "wethouder",
-                            "burgemeester",
-                        ]
-                    ):
-                        name = group
-                        break
-
-                if name:
-                    start = max(0, match.start() - 50)
-                    end = min(len(text), match.end() + 100)
-                    context = text[start:end].replace("\n", " ")
-                    potential_persons.append({"name": name, "context": context})
-
-        # Remove duplicates (same name)
-        seen_names = set()
-        unique_persons = []
-        for person in potential_persons:
-            name_lower = person["name"].lower()
-            if name_lower not in seen_names:
-                seen_names.add(name_lower)
-                unique_persons.append(person)
+        if Config.FETCH_COMPACT_MODE:
+            person_list = []
+            for person in public_persons:
+                entry = {"name": person["name"]}
+                if person.get("title_match"):
+                    entry["title_match"] = person["title_match"]
+                person_list.append(entry)
+
+            return {
+                "url": url,
+                "passages": passages,
+                "potential_persons": person_list,
+                "persons_found": len(persons),
+                "status": "success",
+            }
 
-        if os.getenv("DEBUG_TOOLS"):
-            self.console.print(f"[dim]📝 Regex found {len(unique_persons)} persons[/dim]")
+        content = PASSAGE_SEPARATOR.join(passages)
+        if truncated:
+            content += "\n\n[...tekst ingekort...]"
 
-        return unique_persons
+        return {
+            "url": url,
+            "content": content,
+            "potential_persons": public_persons,
+            "persons_found": len(persons),
+            "status": "success",
+        }
+
+    @staticmethod
+    def _format_search_results(search_result: dict) -> dict:
+        """web_search tool result voor de agent"""
+        if not search_result["results"]:
+            return {"results": [], "error": "No results found"}
+
+        return {
+            "results": [
+                {
+                    "title": r.get("title", ""),
+                    "snippet": r.get("snippet", ""),
+                    "url": r.get("link", ""),
+                }
+                for r in search_result["results"]
+            ],
+            "provider": search_result.get("provider", "unknown"),
+        }
 
     def _handle_tool_call(self, tool_name, tool_input, silent=False):
         """Verwerk tool calls van de agent"""
@@ -393,29 +642,13 @@ class GuestFinderAgent:
 
             # Use SmartSearchTool with automatic fallback
             search_result = self.smart_search.search(query, num_results=10)
-
-            if search_result["results"]:
-                # Format results for the agent
-                return {
-                    "results": [
-                        {
-                            "title": r.get("title", ""),
-                            "snippet": r.get("snippet", ""),
-                            "url": r.get("link", ""),
-                        }
-                        for r in search_result["results"]
-                    ],
-                    "provider": search_result.get("provider", "unknown"),
-                }
-            else:
-                return {"results": [], "error": "No results found"}
+            return self._format_search_results(search_result)
 
         elif tool_name == "fetch_page_content":
             url = tool_input["url"]
 
             try:
                 import requests
-                from bs4 import BeautifulSoup
 
                 response = requests.get(
                     url,
@@ -427,37 +660,7 @@ class GuestFinderAgent:
                     },
                 )
 
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, "html.parser")
-
-                    # Remove script and style elements
-                    for script in soup(["script", "style"]):
-                        script.decompose()
-
-                    # Get text content
-                    text = soup.get_text()
-
-                    # Clean up text
-                    lines = (line.strip() for line in text.splitlines())
-                    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-                    text = "\n".join(chunk for chunk in chunks if chunk)
-
-                    # Extract potential person names using spaCy (with regex fallback)
-                    unique_persons = self._extract_persons_with_spacy(text)
-
-                    # Truncate text if too long (max 4000 chars)
-                    if len(text) > 4000:
-                        text = text[:4000] + "\n\n[...tekst ingekort...]"
-
-                    return {
-                        "url": url,
-                        "content": text,
-                        "potential_persons": unique_persons[:10],  # Max 10 to avoid overload
-                        "persons_found": len(unique_persons),
-                        "status": "success",
-                    }
-                else:
-                    return {"url": url, "error": f"HTTP {response.status_code}", "status": "error"}
+                return self._page_result(url, response.status_code, response.text)
 
             except Exception as e:
                 return {"url": url, "error": str(e), "status": "error"}
@@ -466,34 +669,36 @@ class GuestFinderAgent:
             name = tool_input["name"]
             cutoff_date = datetime.now() - timedelta(weeks=Config.EXCLUDE_WEEKS)
 
-            for guest in self.previous_guests:
-                if guest["name"].lower() == name.lower():
-                    guest_date = datetime.fromisoformat(guest["date"])
-                    if guest_date >= cutoff_date:
-                        return {
-                            "already_recommended": True,
-                            "date": guest["date"],
-                            "weeks_ago": (datetime.now() - guest_date).days // 7,
-                        }
+            # Zelfde persoon ook bij titels, initialen of andere schrijfwijze
+            for guest in self._person_index("previous_guests").find(name):
+                guest_date = datetime.fromisoformat(guest["date"])
+                if guest_date >= cutoff_date:
+                    return {
+                        "already_recommended": True,
+                        "date": guest["date"],
+                        "weeks_ago": (datetime.now() - guest_date).days // 7,
+                    }
 
             return {"already_recommended": False}
 
         elif tool_name == "save_candidate":
-            # Check for duplicates based on name (case-insensitive)
-            candidate_name = tool_input.get("name", "").lower()
-            is_duplicate = any(
-                c.get("name", "").lower() == candidate_name for c in self.candidates
-            )
-
-            if is_duplicate:
-                return {
-                    "status": "duplicate",
-                    "message": f"Kandidaat '{tool_input.get('name')}' is al opgeslagen",
-                    "total_candidates": len(self.candidates),
-                }
+            # Check + append atomair: parallelle queries kunnen dezelfde persoon vinden
+            with self._state_lock:
+                # Check for duplicates based on identity (titles, initials, spelling)
+                existing = self._person_index("candidates").find_first(tool_input.get("name", ""))
+
+                if existing is not None:
+                    message = f"Kandidaat '{tool_input.get('name')}' is al opgeslagen"
+                    if existing.get("name") != tool_input.get("name"):
+                        message += f" als '{existing.get('name')}'"
+                    return {
+                        "status": "duplicate",
+                        "message": message,
+                        "total_candidates": len(self.candidates),
+                    }
 
-            self.candidates.append(tool_input)
-            return {"status": "saved", "total_candidates": len(self.candidates)}
+                self.candidates.append(tool_input)
+                return {"status": "saved", "total_candidates": len(self.candidates)}
 
         elif tool_name == "search_linkedin_profile":
             name = tool_input["name"]
@@ -510,8 +715,8 @@ class GuestFinderAgent:
 
         return {"error": "Unknown tool"}
 
-    def run_planning_phase(self):
-        """Fase 1: Agent maakt zoekstrategie"""
+    def _planning_request(self):
+        """Toon de planning fase en bouw de request (prompt met leergeschiedenis)"""
 
         self.console.print()
         self.console.print(
@@ -543,10 +748,9 @@ in {learning_insights["total_sessions"]} sessies.
                 candidates = query["candidates_found"]
                 learning_section += f'\n{i}. "{query_text}" → {candidates} kandidaten'
 
-            if learning_insights["top_sources"]:
+            if learning_insights["top_domains"]:
                 learning_section += "\n\n**Meest productieve bronnen:**\n"
-                for source in learning_insights["top_sources"][:5]:
-                    domain = source.split("/")[2] if "/" in source else source
+                for domain in learning_insights["top_domains"][:5]:
                     learning_section += f"- {domain}\n"
 
             avg = learning_insights["avg_candidates_per_query"]
@@ -593,64 +797,55 @@ Er is nog geen historische data beschikbaar.\n"
             learning_section=learning_section,
         )
 
-        with self.console.status("[cyan]Agent denkt na over zoekstrategie...[/cyan]"):
-            response = self.client.messages.create(
-                model=Config.MODEL,
-                max_tokens=Config.PLANNING_MAX_TOKENS,
-                thinking={"type": "enabled", "budget_tokens": Config.PLANNING_THINKING_BUDGET},
-                messages=[{"role": "user", "content": prompt}],
-            )
-
-        # Extraheer strategy uit response
-        strategy_text = None
-
-        for block in response.content:
-            if block.type == "text":
-                strategy_text = block.text
-
-        # Parse JSON uit strategy
-        try:
-            if strategy_text is None:
-                print("⚠️  Geen strategy text gevonden in response")
-                return None
-
-            # Zoek eerste valide JSON object in de tekst
-            start = strategy_text.find("{")
-            if start == -1:
-                raise json.JSONDecodeError("No JSON found in response", strategy_text, 0)
+        # Strategie via de submit_search_strategy tool (geforceerd kan niet met thinking)
+        request = {
+            "model": Config.PLANNING_MODEL,
+            "max_tokens": Config.PLANNING_MAX_TOKENS,
+            "tools": [get_strategy_tool()],
+            "tool_choice": strategy_tool_choice(Config.PLANNING_THINKING_BUDGET),
+            "messages": [{"role": "user", "content": prompt + PLANNING_TOOL_INSTRUCTION}],
+        }
+        if Config.PLANNING_THINKING_BUDGET > 0:
+            request["thinking"] = {
+                "type": "enabled",
+                "budget_tokens": Config.PLANNING_THINKING_BUDGET,
+            }
+        return request
 
-            # Probeer JSON te parsen met incremental depth tracking
-            depth = 0
-            in_string = False
-            escape_next = False
+    def run_planning_phase(self, on_query=None):
+        """
+        Fase 1: Agent maakt zoekstrategie
 
-            for i in range(start, len(strategy_text)):
-                char = strategy_text[i]
+        Met on_query wordt de planning gestreamd en krijgt on_query elke zoekopdracht
+        zodra die compleet is (zonder spinner: de zoekfase toont dan al voortgang).
+        """
+        with self.metrics.phase("planning"):
+            request = self._planning_request()
 
-                if escape_next:
-                    escape_next = False
-                    continue
+            start = time.perf_counter()
+            if on_query is not None and supports_streaming(self.client):
+                response = stream_strategy(self.client, request, on_query)
+            else:
+                with self.console.status("[cyan]Agent denkt na over zoekstrategie...[/cyan]"):
+                    response = self.client.messages.create(**request)
+            self.metrics.record_llm_call(
+                "planning",
+                getattr(response, "usage", None),
+                time.perf_counter() - start,
+                model=request["model"],
+            )
 
-                if char == "\\":
-                    escape_next = True
-                    continue
+            return self._strategy_from_response(response)
 
-                if char == '"' and not escape_next:
-                    in_string = not in_string
-                    continue
+    def _strategy_from_response(self, response):
+        """Parse de zoekstrategie uit de planning response (tool input, anders JSON in tekst)"""
+        strategy_json = strategy_tool_input(response)
 
-                if not in_string:
-                    if char == "{":
-                        depth += 1
-                    elif char == "}":
-                        depth -= 1
-                        if depth == 0:
-                            # Found complete JSON object
-                            json_str = strategy_text[start : i + 1]
-                            strategy_json = json.loads(json_str)
-                            break
-            else:
-                raise json.JSONDecodeError("No complete JSON found", strategy_text, 0)
+        try:
+            if strategy_json is None:
+                strategy_json = self._strategy_from_text(response)
+                if strategy_json is None:
+                    return None
 
             # Create summary table
             table = Table(show_header=False, box=None, padding=(0, 1))
@@ -674,12 +869,7 @@ Er is nog geen historische data beschikbaar.\n"
             )
 
             # Learning: Save strategy for this session
-            self.current_session_strategy = {
-                "week_focus": strategy_json.get("week_focus", ""),
-                "sectors_to_prioritize": strategy_json.get("sectors_to_prioritize", []),
-                "topics_to_cover": strategy_json.get("topics_to_cover", []),
-                "total_queries_planned": len(strategy_json.get("search_queries", [])),
-            }
+            self.current_session_strategy = self._strategy_summary(strategy_json)
 
             return strategy_json
 
@@ -687,13 +877,456 @@ Er is nog geen historische data beschikbaar.\n"
             self.console.print(f"[red]⚠️  Kon JSON niet parsen: {e}[/red]")
             return None
 
-    def run_search_phase(self, strategy):
-        """Fase 2: Voer zoekopdrachten uit"""
+    @staticmethod
+    def _strategy_from_text(response):
+        """Fallback zonder tool call: eerste complete JSON object in de tekst"""
+        # Extraheer strategy uit response
+        strategy_text = None
 
-        self.console.print()
-        self.console.print(
-            Panel.fit(
-                "[bold cyan]🔍 FASE 2: ZOEKEN[/bold cyan]\n"
+        for block in response.content:
+            if block.type == "text":
+                strategy_text = block.text
+
+        if strategy_text is None:
+            print("⚠️  Geen strategy text gevonden in response")
+            return None
+
+        # Zoek eerste valide JSON object in de tekst
+        start = strategy_text.find("{")
+        if start == -1:
+            raise json.JSONDecodeError("No JSON found in response", strategy_text, 0)
+
+        # Probeer JSON te parsen met incremental depth tracking
+        depth = 0
+        in_string = False
+        escape_next = False
+
+        for i in range(start, len(strategy_text)):
+            char = strategy_text[i]
+
+            if escape_next:
+                escape_next = False
+                continue
+
+            if char == "\\":
+                escape_next = True
+                continue
+
+            if char == '"' and not escape_next:
+                in_string = not in_string
+                continue
+
+            if not in_string:
+                if char == "{":
+                    depth += 1
+                elif char == "}":
+                    depth -= 1
+                    if depth == 0:
+                        # Found complete JSON object
+                        return json.loads(strategy_text[start : i + 1])
+
+        raise json.JSONDecodeError("No complete JSON found", strategy_text, 0)
+
+    @staticmethod
+    def _strategy_summary(strategy):
+        """Learning: samenvatting van de strategie voor search_history.json"""
+        return {
+            "week_focus": strategy.get("week_focus", ""),
+            "sectors_to_prioritize": strategy.get("sectors_to_prioritize", []),
+            "topics_to_cover": strategy.get("topics_to_cover", []),
+            "total_queries_planned": len(strategy.get("search_queries", [])),
+        }
+
+    def _query_prompt(self, query_obj, searches_done, total_searches):
+        """User message voor een zoekopdracht (alleen het dynamische deel)"""
+        dynamic_prompt = SEARCH_EXECUTION_PROMPT_DYNAMIC.format(
+            searches_done=searches_done,
+            total_searches=total_searches,
+            candidates_found=len(self.candidates),
+            target_candidates=Config.TARGET_CANDIDATES,
+            current_query=query_obj["query"],
+            query_rationale=query_obj.get("rationale", ""),
+        )
+        return {"role": "user", "content": dynamic_prompt}
+
+    def _search_request(self, conversation):
+        """
+        Request parameters voor een zoek-turn.
+
+        De statische instructies staan één keer in system (na de tools) met een vaste
+        cache breakpoint; een tweede breakpoint schuift mee met het laatste user bericht.
+        """
+        messages = conversation
+        if Config.ENABLE_PROMPT_CACHING:
+            messages = with_message_breakpoint(conversation)
+
+        return {
+            "model": Config.SEARCH_MODEL,
+            "max_tokens": Config.SEARCH_MAX_TOKENS,
+            "system": system_prompt(
+                SEARCH_EXECUTION_PROMPT_CACHEABLE, Config.ENABLE_PROMPT_CACHING
+            ),
+            "tools": cast(list[ToolParam], self.tools),
+            "messages": messages,
+        }
+
+    def _run_query(self, query_obj, conversation, cancel_event=None, compactor=None):
+        """
+        Voer één zoekopdracht uit als multi-turn tool loop.
+
+        Args:
+            query_obj: Query uit de strategie (query, rationale, priority)
+            conversation: Berichtenlijst waaraan deze query wordt toegevoegd
+                (gedeeld in sequentiële modus, eigen lijst per worker in parallelle modus)
+            cancel_event: Optioneel threading.Event; wordt tussen turns gecontroleerd
+            compactor: ConversationCompactor van deze conversatie (token tracking +
+                compaction van oude tool results)
+
+        Returns:
+            query_record voor learning
+        """
+        self.current_query = query_obj["query"]
+        started = time.perf_counter()
+        if compactor is None:
+            compactor = self._new_compactor()
+        first_turn = len(compactor.turns)
+
+        # Learning: Track sources used and candidates saved by this query
+        sources_used = []
+        candidates_found = 0
+
+        # Multi-turn conversation loop: agent kan meerdere tool calls doen
+        turn_count = 0
+
+        while turn_count < Config.MAX_TURNS_PER_QUERY:
+            if cancel_event is not None and cancel_event.is_set():
+                break
+            turn_count += 1
+
+            # Boven het token budget: vervang oude tool results door samenvattingen
+            compacted = compactor.maybe_compact(conversation)
+            if compacted and os.getenv("DEBUG_TOOLS"):
+                self.console.print(f"[dim]🗜  {compacted} oude tool results samengevat[/dim]")
+
+            # Agent doet zoekopdracht (of vervolgactie); bij streaming starten
+            # onafhankelijke I/O tools al zodra hun tool_use block compleet is
+            response, results, turn_usage = self._search_turn(
+                conversation, query_obj["query"], compactor
+            )
+
+            # DEBUG: Print stop reason
+            if os.getenv("DEBUG_TOOLS"):
+                self.console.print(
+                    f"[dim]Turn {turn_count}, Stop: {response.stop_reason}, "
+                    f"in: {turn_usage['input_tokens']} out: {turn_usage['output_tokens']}[/dim]"
+                )
+
+            turn = self._apply_search_turn(response, results, conversation)
+            if turn is None:
+                break
+            sources_used.extend(turn[0])
+            candidates_found += turn[1]
+
+            # Parallelle modus: stop de andere workers zodra het target is bereikt
+            if cancel_event is not None and len(self.candidates) >= Config.TARGET_CANDIDATES:
+                cancel_event.set()
+
+        return self._query_record(
+            query_obj,
+            sources_used,
+            candidates_found,
+            compactor.turns[first_turn:],
+            time.perf_counter() - started,
+        )
+
+    def _search_turn(self, conversation, query, compactor):
+        """
+        Eén model-turn in de zoekfase, met escalatie naar SEARCH_MODEL (zie routing.py).
+
+        Returns:
+            (response, tool results, usage van de laatste turn)
+        """
+        request = self._search_request(conversation)
+        if not Config.SEARCH_ESCALATION:
+            return self._run_search_request(request, self._timed_tool_call, query, compactor)
+
+        # Snel model voor routing; save_candidate wordt niet uitgevoerd maar geëscaleerd
+        request["model"] = Config.SEARCH_FAST_MODEL
+        memo = ToolResultMemo()
+        handler = memo.record(defer_escalation_tools(self._timed_tool_call))
+        response, results, turn_usage = self._run_search_request(request, handler, query, compactor)
+        if not needs_escalation(response):
+            return response, results, turn_usage
+
+        if os.getenv("DEBUG_TOOLS"):
+            self.console.print(f"[dim]⬆ Escalatie naar {Config.SEARCH_MODEL}[/dim]")
+        request["model"] = Config.SEARCH_MODEL
+        # Zoekresultaten en pagina's die de snelle turn al ophaalde niet opnieuw ophalen
+        handler = memo.reuse(self._timed_tool_call)
+        return self._run_search_request(request, handler, query, compactor)
+
+    def _run_search_request(self, request, handler, query, compactor):
+        """Model request + tool calls van een zoek-turn, met tokens en latency in de metrics"""
+        turn_start = time.perf_counter()
+        response, results = run_model_turn(
+            self.client,
+            request,
+            handler,
+            max_workers=Config.TOOL_WORKERS,
+            stream=Config.STREAM_RESPONSES,
+        )
+        # Bij streaming overlapt de LLM tijd met de vroeg gestarte tools
+        turn_usage = self._record_search_call(
+            response, time.perf_counter() - turn_start, query, compactor, request["model"]
+        )
+        return response, results, turn_usage
+
+    def _record_search_call(self, response, seconds, query, compactor, model):
+        """Metrics + token tracking (compaction, budget) van één zoek-request"""
+        usage = getattr(response, "usage", None)
+        self.metrics.record_llm_call("search", usage, seconds, query, model=model)
+        turn_usage = compactor.record_usage(usage, query)
+        self.search_turns.append(turn_usage)
+        return turn_usage
+
+    def _timed_tool_call(self, tool_name, tool_input):
+        """Tool call in de zoekfase (silent), met latency per query in de metrics"""
+        start = time.perf_counter()
+        try:
+            return self._handle_tool_call(tool_name, tool_input, silent=True)
+        finally:
+            self.metrics.record_tool_call(
+                "search", tool_name, time.perf_counter() - start, self.current_query
+            )
+
+    def _apply_search_turn(self, response, results, conversation):
+        """
+        Voeg een zoek-turn toe aan de conversatie.
+
+        Args:
+            response: Model response van deze turn
+            results: Tool results, één per tool_use block in de response
+            conversation: Berichtenlijst van de query
+
+        Returns:
+            (succesvolle bronnen, opgeslagen kandidaten), of None als de agent
+            geen tools meer aanroept (klaar met deze query)
+        """
+        sources_used = []
+        candidates_found = 0
+
+        # Verwerk response: tekst en alle tool calls in één assistant message
+        tool_uses = [block for block in response.content if block.type == "tool_use"]
+        assistant_content = [
+            block for block in response.content if block.type in ("text", "tool_use")
+        ]
+        if assistant_content:
+            conversation.append({"role": "assistant", "content": assistant_content})
+
+        # Stop loop als agent geen tool calls meer doet (klaar met deze query)
+        if not tool_uses:
+            if os.getenv("DEBUG_TOOLS"):
+                self.console.print("[dim]✓ Agent finished (no more tools)[/dim]")
+            return None
+
+        # DEBUG: Print tool calls
+        if os.getenv("DEBUG_TOOLS"):
+            for block in tool_uses:
+                self.console.print(f"[dim]🔧 Tool: {block.name}[/dim]")
+
+        tool_results = []
+        for block, result in zip(tool_uses, results, strict=True):
+            # DEBUG: Print results
+            if os.getenv("DEBUG_TOOLS"):
+                if block.name == "fetch_page_content":
+                    self.console.print(
+                        f"[dim]   → Status: {result.get('status')}, "
+                        f"Persons: {result.get('persons_found', 0)}[/dim]"
+                    )
+                elif block.name == "save_candidate":
+                    # block.input is a dict at runtime
+                    name = block.input.get("name", "unknown")  # type: ignore
+                    self.console.print(f"[dim]   → Saved: {name}[/dim]")
+
+            # Learning: Track successful fetch_page_content calls and saved candidates
+            if block.name == "fetch_page_content" and result.get("status") == "success":
+                sources_used.append(block.input.get("url", ""))
+            elif block.name == "save_candidate" and result.get("status") == "saved":
+                candidates_found += 1
+
+            tool_results.append(
+                {
+                    "type": "tool_result",
+                    "tool_use_id": block.id,
+                    "content": self._tool_result_content(block.name, result),
+                }
+            )
+
+        # Alle tool results in één user message, in volgorde van de tool_use blocks
+        conversation.append({"role": "user", "content": tool_results})
+
+        return sources_used, candidates_found
+
+    def _tool_result_content(self, tool_name, result):
+        """Tool result als tekst voor het model (compact) + grootte voor/na in de metrics"""
+        if Config.COMPACT_TOOL_RESULTS:
+            content = encode_tool_result(tool_name, result, Config.SEARCH_SNIPPET_MAX_CHARS)
+        else:
+            content = json.dumps(result)
+        self.metrics.record_tool_result(result_sizes(tool_name, result, content))
+        return content
+
+    def _query_record(self, query_obj, sources_used, candidates_found, query_turns, seconds):
+        """Learning: Record query performance (incl. tokens, cache en latency van deze query)"""
+        metrics = self.metrics.totals(phase="search", label=query_obj["query"])
+        return {
+            "query": query_obj["query"],
+            "rationale": query_obj.get("rationale", ""),
+            "priority": query_obj.get("priority", "medium"),
+            "candidates_found": candidates_found,
+            "successful_sources": sources_used,
+            "input_tokens": sum(
+                t["input_tokens"] + t["cache_read_input_tokens"] + t["cache_creation_input_tokens"]
+                for t in query_turns
+            ),
+            "output_tokens": sum(t["output_tokens"] for t in query_turns),
+            "cache_read_input_tokens": sum(t["cache_read_input_tokens"] for t in query_turns),
+            "cache_creation_input_tokens": sum(
+                t["cache_creation_input_tokens"] for t in query_turns
+            ),
+            "llm_seconds": metrics["llm_seconds"],
+            "tool_calls": metrics["tool_calls"],
+            "tool_seconds": metrics["tool_seconds"],
+            "duration_seconds": round(seconds, 3),
+            "timestamp": datetime.now().isoformat(),
+        }
+
+    def _new_compactor(self):
+        """Compactor voor een nieuwe zoekconversatie"""
+        return ConversationCompactor(
+            token_budget=Config.CONVERSATION_TOKEN_BUDGET,
+            keep_turns=Config.CONVERSATION_KEEP_TURNS,
+        )
+
+    def _new_budget(self):
+        """Budget controller voor een nieuwe zoekfase"""
+        return SearchBudget(
+            max_seconds=Config.SEARCH_TIME_BUDGET,
+            max_tokens=Config.SEARCH_TOKEN_BUDGET,
+            min_yield_per_100k_tokens=Config.MIN_YIELD_PER_100K_TOKENS,
+            min_yield_per_minute=Config.MIN_YIELD_PER_MINUTE,
+            window=Config.YIELD_WINDOW,
+        )
+
+    def _run_queries_sequential(self, queries, progress, task, total=None):
+        """
+        Voer queries na elkaar uit in één gedeelde conversatie
+
+        queries mag ook een generator zijn (gepipelinede planning); geef dan total mee.
+        """
+        if total is None:
+            total = len(queries)
+        # Hervatte run: verder in de (gecompacte) conversatie uit de checkpoint
+        conversation = self.checkpoint.conversation if self.checkpoint else []
+        # Eén gedeelde conversatie: één compactor die over alle queries heen meetelt
+        compactor = self._new_compactor()
+        queries_run = 0
+
+        for i, query_obj in enumerate(queries):
+            # Update progress description with current query
+            short_query = query_obj["query"][:100]
+            progress.update(
+                task,
+                description=f"[cyan]{short_query}...",
+                candidates=len(self.candidates),
+            )
+
+            # Check of we genoeg kandidaten hebben
+            if len(self.candidates) >= Config.TARGET_CANDIDATES:
+                progress.update(task, description="[green]✓ Target bereikt!", completed=True)
+                break
+
+            # Budget op of te weinig opbrengst: stop, of sla lage prioriteit over
+            if self.search_budget.check(query_obj) is not None:
+                if self.search_budget.stop_reason is not None:
+                    progress.update(task, description=f"[yellow]{self.search_budget.stop_reason}")
+                    break
+                progress.update(task, advance=1)
+                continue
+
+            conversation.append(self._query_prompt(query_obj, i, total))
+            query_record = self._run_query(query_obj, conversation, compactor=compactor)
+            self.current_session_queries.append(query_record)
+            self.search_budget.record(query_record)
+            queries_run += 1
+            self._save_checkpoint("searching", conversation=conversation)
+
+            # Update progress
+            progress.update(task, advance=1, candidates=len(self.candidates))
+
+        return queries_run
+
+    def _run_queries_parallel(self, queries, progress, task, workers):
+        """
+        Voer queries uit als onafhankelijke conversaties op worker threads.
+
+        Kandidaten komen in dezelfde lijst (save_candidate is atomair). Zodra
+        TARGET_CANDIDATES is bereikt worden wachtende queries geannuleerd en
+        stoppen lopende queries na hun huidige turn.
+        """
+        cancel_event = threading.Event()
+        records = {}
+
+        def run(index, query_obj):
+            if cancel_event.is_set() or self.search_budget.check(query_obj) is not None:
+                return index, None
+            conversation = [self._query_prompt(query_obj, index, len(queries))]
+            query_record = self._run_query(query_obj, conversation, cancel_event)
+            self.search_budget.record(query_record)
+            return index, query_record
+
+        progress.update(task, description=f"[cyan]{len(queries)} queries, {workers} parallel...")
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(contextvars.copy_context().run, run, i, query_obj)
+                for i, query_obj in enumerate(queries)
+            ]
+
+            for future in as_completed(futures):
+                if future.cancelled():
+                    continue
+                index, record = future.result()
+                if record is not None:
+                    records[index] = record
+                    self._save_checkpoint(
+                        "searching",
+                        queries=self.current_session_queries
+                        + [records[i] for i in sorted(records)],
+                    )
+
+                progress.update(task, advance=1, candidates=len(self.candidates))
+
+                # Check of we genoeg kandidaten hebben: annuleer wachtende queries
+                if len(self.candidates) >= Config.TARGET_CANDIDATES:
+                    cancel_event.set()
+                    for pending in futures:
+                        pending.cancel()
+                    progress.update(task, description="[green]✓ Target bereikt!")
+
+        # Learning: records in strategie-volgorde (ook van afgebroken queries)
+        for index in sorted(records):
+            self.current_session_queries.append(records[index])
+
+        return len(records)
+
+    def _start_search_phase(self, strategy):
+        """Toon de zoekfase en selecteer de queries (None bij ongeldige strategie)"""
+
+        self.console.print()
+        self.console.print(
+            Panel.fit(
+                "[bold cyan]🔍 FASE 2: ZOEKEN[/bold cyan]\n"
                 "Agent zoekt en analyseert potentiële gasten",
                 border_style="cyan",
             )
@@ -701,13 +1334,28 @@ Er is nog geen historische data beschikbaar.\n"
 
         if not strategy or "search_queries" not in strategy:
             self.console.print("[red]❌ Geen geldige strategie ontvangen[/red]")
-            return
-
-        queries = strategy["search_queries"]
-        conversation = []
+            return None
 
-        # Create progress bar
-        progress = Progress(
+        self._reset_search_state()
+        # Hoge prioriteit eerst: bij een budgetstop of lage opbrengst vallen de
+        # minst belangrijke queries af
+        queries = priority_order(strategy["search_queries"])[: Config.MAX_SEARCH_ITERATIONS]
+
+        # Hervatte run: afgeronde queries tellen mee voor het budget en worden overgeslagen
+        completed = set()
+        for record in self.current_session_queries:
+            self.search_budget.record(record)
+            completed.add(record["query"])
+        return [query_obj for query_obj in queries if query_obj["query"] not in completed]
+
+    def _reset_search_state(self):
+        """Nieuwe zoek-turns en budget voor de zoekfase"""
+        self.search_turns = []
+        self.search_budget = self._new_budget()
+
+    def _search_progress(self):
+        """Progress bar voor de zoekfase"""
+        return Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
             BarColumn(),
@@ -716,178 +1364,222 @@ Er is nog geen historische data beschikbaar.\n"
             TextColumn("[cyan]{task.fields[candidates]} kandidaten"),
         )
 
-        with Live(progress, console=self.console):
+    def _finish_search_phase(self, queries_run, total_queries):
+        """Toon de samenvatting van de zoekfase"""
+        summary = Table(show_header=False, box=None)
+        summary.add_row(
+            "[green]✓[/green]", "Kandidaten gevonden", f"[bold]{len(self.candidates)}[/bold]"
+        )
+        summary.add_row("[green]✓[/green]", "Queries uitgevoerd", f"{queries_run}/{total_queries}")
+
+        # Budget controller: overgeslagen queries en opbrengst
+        budget = self.search_budget
+        if budget.skipped:
+            reason = budget.stop_reason or budget.skipped[-1]["reason"]
+            summary.add_row(
+                "[yellow]⏭[/yellow]", "Overgeslagen", f"{len(budget.skipped)} queries ({reason})"
+            )
+        stats = budget.yield_stats()
+        if stats["per_100k_tokens"] is not None:
+            summary.add_row(
+                "[green]✓[/green]",
+                "Opbrengst",
+                f"{stats['per_100k_tokens']:.2f} kandidaten/100k tokens",
+            )
+
+        # Prompt caching: aandeel input tokens uit de cache en besparing
+        cache_stats = cache_report(self.search_turns)
+        if Config.ENABLE_PROMPT_CACHING and cache_stats["input_tokens"]:
+            summary.add_row(
+                "[green]✓[/green]",
+                "Prompt cache",
+                f"{cache_stats['read_ratio']:.0%} uit cache "
+                f"(~{cache_stats['saved_tokens']:,} tokens bespaard)",
+            )
+
+        self.console.print(
+            Panel(summary, title="[bold green]Zoeken Voltooid", border_style="green")
+        )
+
+    def run_search_phase(self, strategy):
+        """Fase 2: Voer zoekopdrachten uit"""
+        selected_queries = self._start_search_phase(strategy)
+        if selected_queries is None:
+            return
+
+        progress = self._search_progress()
+
+        with self.metrics.phase("search"), Live(progress, console=self.console):
             task = progress.add_task(
                 "[cyan]Zoeken...",
-                total=min(len(queries), Config.MAX_SEARCH_ITERATIONS),
+                total=len(selected_queries),
                 candidates=0,
             )
 
-            for i, query_obj in enumerate(queries[: Config.MAX_SEARCH_ITERATIONS]):
-                # Learning: Track candidates before query
-                candidates_before = len(self.candidates)
-
-                # Update progress description with current query
-                short_query = query_obj["query"][:100]
-                progress.update(
-                    task,
-                    description=f"[cyan]{short_query}...",
-                    candidates=len(self.candidates),
+            if Config.PARALLEL_QUERY_WORKERS > 1:
+                queries_run = self._run_queries_parallel(
+                    selected_queries, progress, task, Config.PARALLEL_QUERY_WORKERS
                 )
+            else:
+                queries_run = self._run_queries_sequential(selected_queries, progress, task)
 
-                # Check of we genoeg kandidaten hebben
-                if len(self.candidates) >= Config.TARGET_CANDIDATES:
-                    progress.update(task, description="[green]✓ Target bereikt!", completed=True)
+        self._finish_search_phase(queries_run, len(strategy["search_queries"]))
+
+    def _pipelined_queries(self, pending, progress, task):
+        """
+        Queries uit de streamende planning, zodra ze binnen zijn
+
+        Van de queries die klaarstaan gaat de hoogste prioriteit eerst. Komt de
+        strategie niet via de tool (tekst), dan komen alle queries pas aan het eind.
+        """
+        available = []
+        # Hervatte run: afgeronde queries niet opnieuw
+        seen = {record["query"] for record in self.current_session_queries}
+        planning_done = False
+        dispatched = 0
+
+        while dispatched < Config.MAX_SEARCH_ITERATIONS:
+            # Wacht alleen als er niets klaarstaat en de planning nog loopt
+            items = [pending.get()] if not available and not planning_done else []
+            while True:
+                try:
+                    items.append(pending.get_nowait())
+                except queue.Empty:
                     break
 
-                # Format dynamic part of the prompt
-                dynamic_prompt = SEARCH_EXECUTION_PROMPT_DYNAMIC.format(
-                    searches_done=i,
-                    total_searches=len(queries),
-                    candidates_found=len(self.candidates),
-                    target_candidates=Config.TARGET_CANDIDATES,
-                    current_query=query_obj["query"],
-                    query_rationale=query_obj.get("rationale", ""),
+            for kind, value in items:
+                if kind == "query":
+                    query_objs = [value]
+                else:
+                    planning_done = True
+                    query_objs = (value or {}).get("search_queries", [])
+                    if value:
+                        # Strategie in de checkpoint zodra de planning klaar is
+                        stage = "searching" if self.current_session_queries else "planned"
+                        self._save_checkpoint(stage, strategy=value)
+                        planned = len(value.get("search_queries", []))
+                        progress.update(task, total=min(planned, Config.MAX_SEARCH_ITERATIONS))
+                for query_obj in query_objs:
+                    if query_obj.get("query") and query_obj["query"] not in seen:
+                        seen.add(query_obj["query"])
+                        available.append(query_obj)
+
+            if not available:
+                if planning_done:
+                    return
+                continue
+
+            query_obj = priority_order(available)[0]
+            available.remove(query_obj)
+            dispatched += 1
+            yield query_obj
+
+    def run_pipelined_planning_and_search(self):
+        """
+        Fase 1 en 2 overlappend: de planning streamt op een eigen thread en elke
+        zoekopdracht gaat naar de zoekfase zodra hij compleet is.
+
+        Returns:
+            De strategie (None als de planning mislukt is)
+        """
+        pending = queue.SimpleQueue()
+        outcome = {}
+
+        def plan():
+            try:
+                outcome["strategy"] = self.run_planning_phase(
+                    on_query=lambda query_obj: pending.put(("query", query_obj))
                 )
+            except Exception as e:
+                outcome["error"] = e
+            finally:
+                pending.put(("done", outcome.get("strategy")))
 
-                # Use prompt caching if enabled: cache static instructions, vary dynamic part
-                # Cache TTL is 5 minutes - perfect for 8-12 query sessions
-                if Config.ENABLE_PROMPT_CACHING:
-                    # Use structured content with cache_control marker
-                    conversation.append(
-                        {
-                            "role": "user",
-                            "content": [
-                                {
-                                    "type": "text",
-                                    "text": SEARCH_EXECUTION_PROMPT_CACHEABLE,
-                                    "cache_control": {"type": "ephemeral"},
-                                },
-                                {"type": "text", "text": dynamic_prompt},
-                            ],
-                        }
-                    )
-                else:
-                    # Legacy mode: combine prompts into single string
-                    combined_prompt = SEARCH_EXECUTION_PROMPT_CACHEABLE + "\n\n" + dynamic_prompt
-                    conversation.append({"role": "user", "content": combined_prompt})
-
-                # Learning: Track sources used in this query
-                sources_used = []
-
-                # Multi-turn conversation loop: agent kan meerdere tool calls doen
-                max_turns = 10  # Safety limit
-                turn_count = 0
-
-                while turn_count < max_turns:
-                    turn_count += 1
-
-                    # Agent doet zoekopdracht (of vervolgactie)
-                    response = self.client.messages.create(
-                        model=Config.MODEL,
-                        max_tokens=Config.SEARCH_MAX_TOKENS,
-                        tools=cast(list[ToolParam], self.tools),
-                        messages=conversation,
-                    )
+        planner = threading.Thread(target=contextvars.copy_context().run, args=(plan,), daemon=True)
+        planner.start()
 
-                    # DEBUG: Print stop reason
-                    if os.getenv("DEBUG_TOOLS"):
-                        self.console.print(
-                            f"[dim]Turn {turn_count}, Stop: {response.stop_reason}[/dim]"
-                        )
+        self.console.print()
+        self.console.print(
+            Panel.fit(
+                "[bold cyan]📋🔍 FASE 1+2: PLANNING EN ZOEKEN[/bold cyan]\n"
+                "Zoekopdrachten starten zodra de agent ze heeft uitgeschreven",
+                border_style="cyan",
+            )
+        )
+        self._reset_search_state()
+        progress = self._search_progress()
 
-                    # Verwerk response en tool calls
-                    assistant_message = {"role": "assistant", "content": []}
-                    has_tool_use = False
+        with self.metrics.phase("search"), Live(progress, console=self.console):
+            task = progress.add_task(
+                "[cyan]Wachten op de eerste zoekopdracht...",
+                total=Config.MAX_SEARCH_ITERATIONS,
+                candidates=0,
+            )
+            queries_run = self._run_queries_sequential(
+                self._pipelined_queries(pending, progress, task),
+                progress,
+                task,
+                total=Config.MAX_SEARCH_ITERATIONS,
+            )
 
-                    for block in response.content:
-                        if block.type == "text":
-                            assistant_message["content"].append(block)
+        # Na een vroege stop (target, budget) schrijft de planning nog af
+        planner.join()
 
-                        elif block.type == "tool_use":
-                            has_tool_use = True
-
-                            # DEBUG: Print tool calls
-                            if os.getenv("DEBUG_TOOLS"):
-                                self.console.print(f"[dim]🔧 Tool: {block.name}[/dim]")
-
-                            # Voer tool uit (silent)
-                            result = self._handle_tool_call(block.name, block.input, silent=True)
-
-                            # DEBUG: Print results
-                            if os.getenv("DEBUG_TOOLS"):
-                                if block.name == "fetch_page_content":
-                                    self.console.print(
-                                        f"[dim]   → Status: {result.get('status')}, "
-                                        f"Persons: {result.get('persons_found', 0)}[/dim]"
-                                    )
-                                elif block.name == "save_candidate":
-                                    # block.input is a dict at runtime
-                                    name = block.input.get("name", "unknown")  # type: ignore
-                                    self.console.print(f"[dim]   → Saved: {name}[/dim]")
-
-                            # Learning: Track successful fetch_page_content calls
-                            if (
-                                block.name == "fetch_page_content"
-                                and result.get("status") == "success"
-                            ):
-                                sources_used.append(block.input.get("url", ""))
-
-                            # Voeg tool use en result toe aan conversatie
-                            assistant_message["content"].append(block)
-                            conversation.append(assistant_message)
-                            conversation.append(
-                                {
-                                    "role": "user",
-                                    "content": [
-                                        {
-                                            "type": "tool_result",
-                                            "tool_use_id": block.id,
-                                            "content": json.dumps(result),
-                                        }
-                                    ],
-                                }
-                            )
-
-                            # Reset voor volgende tool call
-                            assistant_message = {"role": "assistant", "content": []}
-
-                    # Voeg laatste assistant message toe als die text bevat
-                    if assistant_message["content"]:
-                        conversation.append(assistant_message)
-
-                    # Stop loop als agent geen tool calls meer doet (klaar met deze query)
-                    if not has_tool_use:
-                        if os.getenv("DEBUG_TOOLS"):
-                            self.console.print("[dim]✓ Agent finished (no more tools)[/dim]")
-                        break
-
-                # Learning: Calculate candidates found by this query
-                candidates_found = len(self.candidates) - candidates_before
-
-                # Learning: Record query performance
-                query_record = {
-                    "query": query_obj["query"],
-                    "rationale": query_obj.get("rationale", ""),
-                    "priority": query_obj.get("priority", "medium"),
-                    "candidates_found": candidates_found,
-                    "successful_sources": sources_used,
-                    "timestamp": datetime.now().isoformat(),
-                }
-                self.current_session_queries.append(query_record)
+        if "error" in outcome:
+            raise outcome["error"]
 
-                # Update progress
-                progress.update(task, advance=1, candidates=len(self.candidates))
+        strategy = outcome.get("strategy")
+        if strategy:
+            self._finish_search_phase(queries_run, len(strategy.get("search_queries", [])))
+        return strategy
 
-        # Show summary
+    def _pipeline_planning(self):
+        """Of planning en zoeken overlappen (streaming client, queries na elkaar)"""
+        return (
+            Config.PLANNING_PIPELINE
+            and Config.PARALLEL_QUERY_WORKERS <= 1
+            and supports_streaming(self.client)
+        )
+
+    @staticmethod
+    def _linkedin_query(candidate):
+        """LinkedIn zoekopdracht voor een kandidaat (None zonder naam of organisatie)"""
+        name = candidate.get("name", "")
+        organization = candidate.get("organization", "")
+        if not name or not organization:
+            return None
+        return f'"{name}" {organization} LinkedIn'
+
+    @staticmethod
+    def _apply_linkedin_result(candidate, search_result):
+        """Zet de eerste linkedin.com/in/ URL uit de zoekresultaten bij de kandidaat"""
+        for result in search_result.get("results", []):
+            # Check both 'url' and 'link' keys (different providers)
+            url = result.get("link", result.get("url", ""))
+            if "linkedin.com/in/" in url:
+                # Ensure contact_info exists
+                candidate.setdefault("contact_info", {})["linkedin"] = url
+                return True
+        return False
+
+    def _print_linkedin_header(self):
+        self.console.print()
+        self.console.print(
+            Panel.fit(
+                "[bold cyan]🔗 LINKEDIN ENRICHMENT[/bold cyan]\n"
+                "Zoek LinkedIn profielen voor kandidaten",
+                border_style="cyan",
+            )
+        )
+
+    def _print_linkedin_summary(self, enriched_count):
         summary = Table(show_header=False, box=None)
         summary.add_row(
-            "[green]✓[/green]", "Kandidaten gevonden", f"[bold]{len(self.candidates)}[/bold]"
+            "[green]✓[/green]", "LinkedIn profielen", f"{enriched_count}/{len(self.candidates)}"
         )
-        summary.add_row("[green]✓[/green]", "Queries uitgevoerd", f"{i + 1}/{len(queries)}")
 
         self.console.print(
-            Panel(summary, title="[bold green]Zoeken Voltooid", border_style="green")
+            Panel(summary, title="[bold green]LinkedIn Enrichment Voltooid", border_style="green")
         )
 
     def enrich_linkedin_profiles(self):
@@ -896,14 +1588,7 @@ Er is nog geen historische data beschikbaar.\n"
         if not self.candidates:
             return
 
-        self.console.print()
-        self.console.print(
-            Panel.fit(
-                "[bold cyan]🔗 LINKEDIN ENRICHMENT[/bold cyan]\n"
-                "Zoek LinkedIn profielen voor kandidaten",
-                border_style="cyan",
-            )
-        )
+        self._print_linkedin_header()
 
         enriched_count = 0
 
@@ -917,7 +1602,7 @@ Er is nog geen historische data beschikbaar.\n"
             TextColumn("[cyan]{task.fields[found]} gevonden"),
         )
 
-        with Live(progress, console=self.console):
+        with self.metrics.phase("linkedin"), Live(progress, console=self.console):
             task = progress.add_task(
                 "[cyan]LinkedIn profielen zoeken...",
                 total=len(self.candidates),
@@ -926,7 +1611,6 @@ Er is nog geen historische data beschikbaar.\n"
 
             for i, candidate in enumerate(self.candidates):
                 name = candidate.get("name", "")
-                organization = candidate.get("organization", "")
 
                 # Update progress with current candidate
                 short_name = name[:60] if name else "Onbekend"
@@ -937,31 +1621,19 @@ Er is nog geen historische data beschikbaar.\n"
                     found=enriched_count,
                 )
 
-                if not name or not organization:
-                    continue
-
                 # Search for LinkedIn profile
-                query = f'"{name}" {organization} LinkedIn'
+                query = self._linkedin_query(candidate)
+                if query is None:
+                    continue
 
                 try:
+                    start = time.perf_counter()
                     search_result = self.smart_search.search(query, num_results=5)
-                    results = search_result.get("results", [])
-
-                    # Find first linkedin.com/in/ URL
-                    linkedin_url = None
-                    for result in results:
-                        # Check both 'url' and 'link' keys (different providers)
-                        url = result.get("link", result.get("url", ""))
-                        if "linkedin.com/in/" in url:
-                            linkedin_url = url
-                            break
-
-                    if linkedin_url:
-                        # Ensure contact_info exists
-                        if "contact_info" not in candidate:
-                            candidate["contact_info"] = {}
+                    self.metrics.record_tool_call(
+                        "linkedin", "web_search", time.perf_counter() - start, name
+                    )
 
-                        candidate["contact_info"]["linkedin"] = linkedin_url
+                    if self._apply_linkedin_result(candidate, search_result):
                         enriched_count += 1
 
                         # Update found count
@@ -981,18 +1653,17 @@ Er is nog geen historische data beschikbaar.\n"
             )
 
         # Show summary
-        summary = Table(show_header=False, box=None)
-        summary.add_row(
-            "[green]✓[/green]", "LinkedIn profielen", f"{enriched_count}/{len(self.candidates)}"
-        )
-
-        self.console.print(
-            Panel(summary, title="[bold green]LinkedIn Enrichment Voltooid", border_style="green")
-        )
+        self._print_linkedin_summary(enriched_count)
 
     def generate_report(self):
         """Fase 3: Genereer eindrapport"""
 
+        # Hervatte run waarvan rapport en history al zijn opgeslagen: niets opnieuw toevoegen
+        report = self._saved_report()
+        if report is not None:
+            return report
+
+        phase_start = time.perf_counter()
         week_number = datetime.now().isocalendar()[1]
 
         # Als er geen nieuwe kandidaten zijn, skip rapport generatie
@@ -1015,111 +1686,31 @@ Er is nog geen historische data beschikbaar.\n"
             )
         )
 
-        # Define enrich_candidate tool for capturing enriched data
-        enrich_tool = {
-            "name": "enrich_candidate",
-            "description": (
-                "Sla verrijkte kandidaat informatie op met uitgebreide topics "
-                "en relevance description"
-            ),
-            "input_schema": {
-                "type": "object",
-                "properties": {
-                    "name": {
-                        "type": "string",
-                        "description": (
-                            "Volledige naam van de kandidaat "
-                            "(moet exact matchen met bestaande kandidaat)"
-                        ),
-                    },
-                    "enriched_topics": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": (
-                            "4-5 specifieke, concrete onderwerpen "
-                            "(bijv. 'Cijfers over AI-impact op banen in Nederland' "
-                            "niet alleen 'AI')"
-                        ),
-                    },
-                    "enriched_relevance": {
-                        "type": "string",
-                        "description": (
-                            "Uitgebreide relevance description van 3-5 zinnen die "
-                            "feitelijk beschrijft wat deze persoon doet en waarom relevant"
-                        ),
-                    },
-                },
-                "required": ["name", "enriched_topics", "enriched_relevance"],
-            },
-        }
-
-        prompt = REPORT_GENERATION_PROMPT.format(
-            candidates_json=json.dumps(self.candidates, indent=2, ensure_ascii=False),
-            recent_guests_json=json.dumps(recent_guests, indent=2, ensure_ascii=False),
-            week_number=week_number,
-            has_new_candidates=len(self.candidates) > 0,
-            has_recent_guests=len(recent_guests) > 0,
-        )
-
-        # Use multi-turn conversation to handle tool calls and report generation
-        conversation: list = [{"role": "user", "content": prompt}]
-        report = None
-
-        status_msg = "[cyan]Agent verrijkt kandidaten en schrijft rapport...[/cyan]"
-        with self.console.status(status_msg):
-            # Max 10 turns (enough for enriching all candidates + report)
-            for turn_num in range(10):
-                response = self.client.messages.create(
-                    model=Config.MODEL,
-                    max_tokens=Config.SEARCH_MAX_TOKENS,
-                    messages=conversation,  # type: ignore
-                    tools=[enrich_tool],  # type: ignore
-                )
-
-                # Debug: show what the agent is doing
-                if os.getenv("DEBUG_TOOLS"):
-                    self.console.print(f"[dim]Turn {turn_num + 1}: {response.stop_reason}[/dim]")
-                    for block in response.content:
-                        if block.type == "text":
-                            self.console.print(f"[dim]  Text: {block.text[:100]}...[/dim]")
-                        elif block.type == "tool_use":
-                            self.console.print(f"[dim]  Tool: {block.name}[/dim]")
-
-                # Check if there are tool calls in the response (regardless of stop reason)
-                has_tool_calls = any(block.type == "tool_use" for block in response.content)
-
-                if has_tool_calls:
-                    # Process tool calls
-                    tool_results = []
-                    for block in response.content:
-                        if block.type == "tool_use":
-                            if block.name == "enrich_candidate":
-                                # Convert tool input to dict
-                                tool_input = dict(block.input) if block.input else {}
-                                result = self._handle_enrich_candidate(tool_input)
-
-                                tool_results.append(
-                                    {
-                                        "type": "tool_result",
-                                        "tool_use_id": block.id,
-                                        "content": result,
-                                    }
-                                )
+        enrich_tool = get_enrich_tool()
 
-                    # Add assistant message and tool results to conversation
-                    conversation.append({"role": "assistant", "content": response.content})
-                    conversation.append({"role": "user", "content": tool_results})
+        batch = Config.ENRICHMENT_BATCH and supports_batches(self.client)
+        if Config.ENRICHMENT_BATCH and not batch:
+            self.console.print(
+                "[yellow]⚠️  Client ondersteunt geen Message Batches, "
+                "gewone requests voor de verrijking[/yellow]"
+            )
 
-                elif response.stop_reason == "end_turn":
-                    # Extract text from response
-                    for block in response.content:
-                        if block.type == "text":
-                            report = block.text
-                            break
-                    break
-                else:
-                    # Unexpected stop reason
-                    break
+        if batch or Config.FAST_REPORT:
+            # Eén request per kandidaat: als message batch (onbewaakte runs) of gelijktijdig
+            self._enrich_candidates(enrich_tool, batch=batch)
+            if Config.FAST_REPORT:
+                report = self._render_report(recent_guests, week_number)
+            else:
+                report = self._assemble_report(recent_guests, week_number)
+        else:
+            prompt = REPORT_GENERATION_PROMPT.format(
+                candidates_json=json.dumps(self.candidates, indent=2, ensure_ascii=False),
+                recent_guests_json=json.dumps(recent_guests, indent=2, ensure_ascii=False),
+                week_number=week_number,
+                has_new_candidates=len(self.candidates) > 0,
+                has_recent_guests=len(recent_guests) > 0,
+            )
+            report = self._enrich_and_write_report(prompt, enrich_tool)
 
         if not report:
             report = "Error: Kon geen rapport genereren"
@@ -1136,7 +1727,31 @@ Er is nog geen historische data beschikbaar.\n"
 
         self.console.print(Panel(summary, title="[bold green]Rapport Klaar", border_style="green"))
 
-        # Update previous_guests
+        # Save current candidates for interactive selector
+        self._save_candidates_for_selector()
+
+        self.metrics.add_phase_seconds("report", time.perf_counter() - phase_start)
+
+        self._save_run_history(week_number)
+        self._save_checkpoint("reported", report_file=filename)
+
+        return report
+
+    def _saved_report(self):
+        """Rapport van een hervatte run die de fase 'reported' al bereikte, anders None"""
+        if not self._checkpoint_reached("reported") or not self.checkpoint.report_file:
+            return None
+        try:
+            with open(self.checkpoint.report_file, encoding="utf-8") as f:
+                report = f.read()
+        except OSError:
+            return None
+
+        self.console.print(f"[cyan]↻ Rapport al opgeslagen: {self.checkpoint.report_file}[/cyan]")
+        return report
+
+    def _save_run_history(self, week_number):
+        """Voeg de kandidaten toe aan previous_guests en de sessie aan de search history"""
         for candidate in self.candidates:
             guest_entry = {
                 "name": candidate["name"],
@@ -1163,9 +1778,6 @@ Er is nog geen historische data beschikbaar.\n"
 
         self._save_previous_guests()
 
-        # Save current candidates for interactive selector
-        self._save_candidates_for_selector()
-
         # Learning: Save session data to search history
         session_record = {
             "date": datetime.now().isoformat(),
@@ -1174,12 +1786,14 @@ Er is nog geen historische data beschikbaar.\n"
             "total_candidates": len(self.candidates),
             "strategy": self.current_session_strategy,  # NEW: Save the planning strategy
             "queries": self.current_session_queries,
+            # Tokens, cache en latency per fase en per query
+            "metrics": self.metrics.summary(),
+            # Queries die de budget controller heeft overgeslagen (met reden)
+            "skipped_queries": self.search_budget.skipped,
         }
         self.search_history["sessions"].append(session_record)
         self._save_search_history()
 
-        return report
-
     def _save_candidates_for_selector(self):
         """Save current candidates to a file for the interactive selector."""
         import os
@@ -1196,23 +1810,231 @@ Er is nog geen historische data beschikbaar.\n"
         self.console.print(md)
         self.console.print("=" * 80)
 
-    def run_full_cycle(self):
-        """Voer volledige cyclus uit"""
+    def _open_checkpoint(self, resume=False):
+        """
+        Checkpoint voor deze run (None als checkpoints uit staan).
+
+        Met resume wordt de laatste onvoltooide run hervat: strategie, kandidaten,
+        afgeronde queries en de zoekconversatie komen uit de checkpoint.
+        """
+        if not Config.CHECKPOINTS_ENABLED:
+            return None
+
+        # Alleen runs van deze week zijn te hervatten; oudere en afgeronde runs opruimen
+        this_week = week_start(datetime.now())
+        RunCheckpoint.prune(Config.RUNS_DIR, keep=Config.RUNS_KEEP, before=this_week)
+
+        checkpoint = RunCheckpoint.latest(Config.RUNS_DIR, since=this_week) if resume else None
+        if checkpoint is None:
+            if resume:
+                self.console.print("[yellow]⚠️  Geen onvoltooide run gevonden - nieuwe run[/yellow]")
+            return RunCheckpoint.create(Config.RUNS_DIR)
+
+        self.candidates = checkpoint.candidates
+        self.current_session_queries = checkpoint.queries
+        if checkpoint.strategy:
+            self.current_session_strategy = self._strategy_summary(checkpoint.strategy)
+
+        self.console.print(
+            f"[cyan]↻ Run {checkpoint.run_id} hervat na fase '{checkpoint.stage}': "
+            f"{len(self.current_session_queries)} queries, "
+            f"{len(self.candidates)} kandidaten[/cyan]"
+        )
+        return checkpoint
+
+    def _strategy_cache_key(self):
+        """Sleutel in de strategie cache: ISO week, leergeschiedenis en prompt versie"""
+        now = datetime.now()
+        version = prompt_version(
+            PLANNING_PROMPT,
+            PLANNING_TOOL_INSTRUCTION,
+            get_strategy_tool(),
+            Config.PLANNING_MODEL,
+            Config.PLANNING_THINKING_BUDGET,
+        )
+        fingerprint = insights_fingerprint(self.search_history.get("sessions", []), now)
+        return StrategyCache.key(iso_week(now), fingerprint, version)
+
+    def _cached_strategy(self):
+        """Strategie van eerder deze week uit de cache (None als er geen is)"""
+        if self.strategy_cache is None:
+            return None
+        entry = self.strategy_cache.get(self._strategy_cache_key())
+        if entry is None:
+            return None
 
-        # Fase 1: Planning
-        strategy = self.run_planning_phase()
+        # Queries die een sessie sinds het plannen al heeft uitgevoerd gaan achteraan
+        completed = {
+            query.get("query")
+            for session in self.search_history.get("sessions", [])
+            if session.get("date", "") >= entry["created"]
+            for query in session.get("queries", [])
+        }
+        strategy, repeated = deprioritize_completed(entry["strategy"], completed)
 
-        if not strategy:
-            self.console.print("[red]❌ Planning fase mislukt[/red]")
+        self.console.print(
+            f"[cyan]♻️  Strategie van {entry['created'][:16].replace('T', ' ')} hergebruikt "
+            f"({len(strategy['search_queries'])} queries, {repeated} al uitgevoerd); "
+            f"gebruik --replan voor een nieuwe strategie[/cyan]"
+        )
+        self.current_session_strategy = {
+            **self._strategy_summary(strategy),
+            "reused_from": entry["created"],
+        }
+        return strategy
+
+    def _store_strategy(self, strategy):
+        """Bewaar een nieuwe strategie voor hergebruik deze week"""
+        if self.strategy_cache is not None:
+            self.strategy_cache.put(self._strategy_cache_key(), strategy)
+
+    def _reuse_strategy(self, replan=False):
+        """Strategie uit de checkpoint of (zonder replan) van eerder deze week, anders None"""
+        if self._checkpoint_reached("planned") and self.checkpoint.strategy:
+            return self.checkpoint.strategy
+        if replan:
             return None
 
+        strategy = self._cached_strategy()
+        if strategy is not None:
+            self._save_checkpoint("planned", strategy=strategy)
+        return strategy
+
+    def _checkpoint_reached(self, stage):
+        """Of deze fase al in een eerdere poging van de run is afgerond"""
+        return self.checkpoint is not None and self.checkpoint.reached(stage)
+
+    def _save_checkpoint(
+        self, stage, strategy=None, conversation=None, queries=None, report_file=None
+    ):
+        """Schrijf de checkpoint met de huidige kandidaten en queries (schrijffout: geen stop)"""
+        if self.checkpoint is None:
+            return
+
+        with self._state_lock:
+            candidates = list(self.candidates)
+        try:
+            self.checkpoint.save(
+                stage,
+                strategy=strategy,
+                conversation=conversation,
+                candidates=candidates,
+                queries=self.current_session_queries if queries is None else queries,
+                report_file=report_file,
+            )
+        except OSError as e:
+            self.console.print(f"[yellow]⚠️  Checkpoint niet opgeslagen: {e}[/yellow]")
+
+    def run_full_cycle(self, resume=False, replan=False):
+        """
+        Voer volledige cyclus uit
+
+        Args:
+            resume: ga verder vanaf de laatste checkpoint
+            replan: maak een nieuwe strategie, ook als er deze week al een is
+        """
+        self.checkpoint = self._open_checkpoint(resume)
+
+        if Config.ASYNC_RUNTIME:
+            # Zelfde fasen op één event loop (AsyncAnthropic, httpx, gelijktijdige lookups)
+            return asyncio.run(AsyncGuestRuntime(self).run_full_cycle(replan=replan))
+
+        # Fase 1: Planning (strategie uit de checkpoint of van eerder deze week; een
+        # gepipelinede run die stopte voor het einde van de planning plant opnieuw)
+        searched = self._checkpoint_reached("searched")
+        strategy = self._reuse_strategy(replan)
+        if strategy is None and self._pipeline_planning():
+            # Fase 1+2: zoeken start tijdens de planning
+            try:
+                strategy = self.run_pipelined_planning_and_search()
+            finally:
+                self.extraction_pool.shutdown()
+
+            if not strategy:
+                self.console.print("[red]❌ Planning fase mislukt[/red]")
+                return None
+            self._store_strategy(strategy)
+            self._save_checkpoint("searched")
+            searched = True
+        elif strategy is None:
+            strategy = self.run_planning_phase()
+
+            if not strategy:
+                self.console.print("[red]❌ Planning fase mislukt[/red]")
+                return None
+            self._store_strategy(strategy)
+            self._save_checkpoint("planned", strategy=strategy)
+
         # Fase 2: Zoeken
-        self.run_search_phase(strategy)
+        if not searched:
+            try:
+                self.run_search_phase(strategy)
+            finally:
+                # Worker processes zijn alleen nodig tijdens het zoeken
+                self.extraction_pool.shutdown()
+            self._save_checkpoint("searched")
 
         # Fase 2.5: LinkedIn Enrichment
-        self.enrich_linkedin_profiles()
+        if not self._checkpoint_reached("enriched"):
+            self.enrich_linkedin_profiles()
+            self._save_checkpoint("enriched")
 
         # Fase 3: Rapporteren
         report = self.generate_report()
+        self._save_checkpoint("done")
+
+        self.print_run_metrics()
 
         return report
+
+    def print_run_metrics(self):
+        """Toon tokens, cache en latency per fase"""
+        summary = self.metrics.summary()
+
+        table = Table(box=None, padding=(0, 1))
+        for column in (
+            "Fase",
+            "LLM calls",
+            "Input",
+            "Cache read",
+            "Cache write",
+            "Output",
+            "LLM s",
+            "Tools",
+            "Tool s",
+            "Wall s",
+        ):
+            table.add_column(column, justify="left" if column == "Fase" else "right")
+
+        rows = [(name, totals) for name, totals in summary["phases"].items()]
+        rows.append(("totaal", {**summary["total"], "wall_seconds": None}))
+        for name, totals in rows:
+            wall = totals["wall_seconds"]
+            table.add_row(
+                name,
+                str(totals["llm_calls"]),
+                f"{totals['input_tokens']:,}",
+                f"{totals['cache_read_input_tokens']:,}",
+                f"{totals['cache_creation_input_tokens']:,}",
+                f"{totals['output_tokens']:,}",
+                f"{totals['llm_seconds']:.1f}",
+                str(totals["tool_calls"]),
+                f"{totals['tool_seconds']:.1f}",
+                "" if wall is None else f"{wall:.1f}",
+            )
+
+        cache = summary["prompt_cache"]
+        tool_results = summary["tool_results"]
+        self.console.print(
+            Panel(
+                table,
+                title="[bold cyan]Run Statistieken",
+                subtitle=(
+                    f"{cache['read_ratio']:.0%} van de input uit prompt cache "
+                    f"(~{cache['saved_tokens']:,} tokens bespaard), tool results "
+                    f"~{tool_results['default_tokens']:,} → "
+                    f"{tool_results['compact_tokens']:,} tokens"
+                ),
+                border_style="cyan",
+            )
+        )
@@ -0,0 +1,402 @@
+"""Asyncio runtime for the guest search phases.
+
+Runs planning, search and LinkedIn enrichment on one event loop, with
+``AsyncAnthropic`` for the model and httpx for page downloads. Work that does
+not depend on the model runs while it is generating:
+
+- independent tool calls from one response run concurrently;
+- the top pages of each search result are downloaded before the model asks
+  for them (``Config.ASYNC_PREFETCH_PAGES``);
+- the LinkedIn lookup of a candidate starts as soon as it is saved.
+
+The agent keeps all state, prompts and stateful tools; this module only
+replaces the blocking I/O. ``GuestFinderAgent.run_full_cycle`` is a thin sync
+wrapper around ``AsyncGuestRuntime.run_full_cycle`` when ``ASYNC_RUNTIME`` is set.
+Planning uses the same strategy tool, but the search starts after the plan is
+complete (``Config.PLANNING_PIPELINE`` only applies to the sync runtime).
+"""
+
+import asyncio
+import os
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import httpx
+from rich.live import Live
+
+from src.utils.portkey_client import get_async_anthropic_client
+
+from .config import Config
+from .routing import needs_escalation
+from .tool_dispatch import CONCURRENT_TOOLS
+
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
+FETCH_TIMEOUT = 10
+
+
+def new_http_client() -> httpx.AsyncClient:
+    """HTTP client for page downloads (same timeout and redirects as requests.get)."""
+    return httpx.AsyncClient(
+        timeout=FETCH_TIMEOUT, follow_redirects=True, headers={"User-Agent": USER_AGENT}
+    )
+
+
+async def run_tool_calls(
+    tool_uses: list[Any],
+    handler: Callable[[str, dict], Awaitable[dict]],
+) -> list[dict]:
+    """
+    Async counterpart of ``dispatch_tool_calls``.
+
+    I/O tools run as concurrent tasks; stateful tools are awaited in response
+    order. Results are returned in the order of ``tool_uses``.
+    """
+    tasks = {
+        i: asyncio.create_task(handler(block.name, block.input))
+        for i, block in enumerate(tool_uses)
+        if block.name in CONCURRENT_TOOLS
+    }
+
+    results: list[dict | None] = [None] * len(tool_uses)
+    for i, block in enumerate(tool_uses):
+        if i not in tasks:
+            results[i] = await handler(block.name, block.input)
+    for i, task in tasks.items():
+        results[i] = await task
+
+    return results  # type: ignore[return-value]
+
+
+class AsyncGuestRuntime:
+    """
+    Asyncio driver for a GuestFinderAgent.
+
+    Args:
+        agent: GuestFinderAgent that holds the candidates, history and prompts
+        client: async Anthropic client (default: get_async_anthropic_client)
+        http: httpx.AsyncClient for page downloads (default: new_http_client)
+    """
+
+    def __init__(self, agent, client=None, http: httpx.AsyncClient | None = None):
+        self.agent = agent
+        self.client = client or get_async_anthropic_client(Config.ANTHROPIC_API_KEY)
+        self.http = http or new_http_client()
+        self._prefetched: dict[str, asyncio.Task] = {}
+        self._linkedin_lookups: dict[int, asyncio.Task] = {}
+        self._linkedin_limit = asyncio.Semaphore(max(Config.TOOL_WORKERS, 1))
+
+    async def run_full_cycle(self, replan=False):
+        """
+        Planning, search, LinkedIn enrichment and report on one event loop.
+
+        Phases already completed in the agent's checkpoint (``--resume``) are
+        skipped, and this week's strategy is reused unless ``replan`` is set.
+        """
+        agent = self.agent
+        try:
+            strategy = agent._reuse_strategy(replan)
+            if strategy is None:
+                strategy = await self.run_planning_phase()
+
+                if not strategy:
+                    agent.console.print("[red]❌ Planning fase mislukt[/red]")
+                    return None
+                agent._store_strategy(strategy)
+                agent._save_checkpoint("planned", strategy=strategy)
+
+            if not agent._checkpoint_reached("searched"):
+                try:
+                    await self.run_search_phase(strategy)
+                finally:
+                    # Worker processes are only needed while searching
+                    agent.extraction_pool.shutdown()
+                agent._save_checkpoint("searched")
+
+            if not agent._checkpoint_reached("enriched"):
+                await self.enrich_linkedin_profiles()
+                agent._save_checkpoint("enriched")
+
+            # The report is one sequential chain of model turns and file writes;
+            # nothing runs next to it, so it uses the synchronous implementation
+            report = await asyncio.to_thread(agent.generate_report)
+            agent._save_checkpoint("done")
+
+            agent.print_run_metrics()
+
+            return report
+        finally:
+            await self.aclose()
+
+    async def aclose(self):
+        """Cancel unused prefetches and close the HTTP client."""
+        pending = list(self._prefetched.values())
+        self._prefetched.clear()
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        await self.http.aclose()
+
+    async def run_planning_phase(self):
+        """Phase 1: search strategy."""
+        agent = self.agent
+        with agent.metrics.phase("planning"):
+            request = agent._planning_request()
+
+            with agent.console.status("[cyan]Agent denkt na over zoekstrategie...[/cyan]"):
+                start = time.perf_counter()
+                response = await self.client.messages.create(**request)
+                agent.metrics.record_llm_call(
+                    "planning",
+                    getattr(response, "usage", None),
+                    time.perf_counter() - start,
+                    model=request["model"],
+                )
+
+            return agent._strategy_from_response(response)
+
+    async def run_search_phase(self, strategy):
+        """Phase 2: run the search queries (concurrently with PARALLEL_QUERY_WORKERS > 1)."""
+        agent = self.agent
+        selected_queries = agent._start_search_phase(strategy)
+        if selected_queries is None:
+            return
+
+        progress = agent._search_progress()
+
+        with agent.metrics.phase("search"), Live(progress, console=agent.console):
+            task = progress.add_task("[cyan]Zoeken...", total=len(selected_queries), candidates=0)
+
+            if Config.PARALLEL_QUERY_WORKERS > 1:
+                queries_run = await self._run_queries_parallel(
+                    selected_queries, progress, task, Config.PARALLEL_QUERY_WORKERS
+                )
+            else:
+                queries_run = await self._run_queries_sequential(selected_queries, progress, task)
+
+        agent._finish_search_phase(queries_run, len(strategy["search_queries"]))
+
+    async def _run_queries_sequential(self, queries, progress, task):
+        """Queries one after another in one shared conversation."""
+        agent = self.agent
+        conversation: list = agent.checkpoint.conversation if agent.checkpoint else []
+        compactor = agent._new_compactor()
+        queries_run = 0
+
+        for i, query_obj in enumerate(queries):
+            progress.update(
+                task,
+                description=f"[cyan]{query_obj['query'][:100]}...",
+                candidates=len(agent.candidates),
+            )
+
+            if len(agent.candidates) >= Config.TARGET_CANDIDATES:
+                progress.update(task, description="[green]✓ Target bereikt!", completed=True)
+                break
+
+            if agent.search_budget.check(query_obj) is not None:
+                if agent.search_budget.stop_reason is not None:
+                    progress.update(task, description=f"[yellow]{agent.search_budget.stop_reason}")
+                    break
+                progress.update(task, advance=1)
+                continue
+
+            conversation.append(agent._query_prompt(query_obj, i, len(queries)))
+            query_record = await self._run_query(query_obj, conversation, compactor)
+            agent.current_session_queries.append(query_record)
+            agent.search_budget.record(query_record)
+            queries_run += 1
+            agent._save_checkpoint("searching", conversation=conversation)
+
+            progress.update(task, advance=1, candidates=len(agent.candidates))
+
+        return queries_run
+
+    async def _run_queries_parallel(self, queries, progress, task, workers):
+        """Queries as independent conversations, at most ``workers`` at a time."""
+        agent = self.agent
+        cancel_event = asyncio.Event()
+        limit = asyncio.Semaphore(workers)
+        records = {}
+
+        async def run(index, query_obj):
+            async with limit:
+                if cancel_event.is_set() or agent.search_budget.check(query_obj) is not None:
+                    return
+                conversation = [agent._query_prompt(query_obj, index, len(queries))]
+                records[index] = await self._run_query(
+                    query_obj, conversation, agent._new_compactor(), cancel_event
+                )
+                agent.search_budget.record(records[index])
+                agent._save_checkpoint(
+                    "searching",
+                    queries=agent.current_session_queries + [records[i] for i in sorted(records)],
+                )
+
+            progress.update(task, advance=1, candidates=len(agent.candidates))
+            if len(agent.candidates) >= Config.TARGET_CANDIDATES:
+                cancel_event.set()
+                progress.update(task, description="[green]✓ Target bereikt!")
+
+        progress.update(task, description=f"[cyan]{len(queries)} queries, {workers} parallel...")
+        await asyncio.gather(*(run(i, query_obj) for i, query_obj in enumerate(queries)))
+
+        # Learning: records in strategy order
+        for index in sorted(records):
+            agent.current_session_queries.append(records[index])
+
+        return len(records)
+
+    async def _run_query(self, query_obj, conversation, compactor, cancel_event=None):
+        """One search query as a multi-turn tool loop (see GuestFinderAgent._run_query)."""
+        agent = self.agent
+        # ContextVar: every task has its own current query
+        agent.current_query = query_obj["query"]
+        started = time.perf_counter()
+        first_turn = len(compactor.turns)
+        sources_used = []
+        candidates_found = 0
+
+        for _ in range(Config.MAX_TURNS_PER_QUERY):
+            if cancel_event is not None and cancel_event.is_set():
+                break
+
+            compactor.maybe_compact(conversation)
+            response = await self._search_turn(conversation, query_obj["query"], compactor)
+
+            tool_uses = [block for block in response.content if block.type == "tool_use"]
+            results = await run_tool_calls(tool_uses, self._timed_tool_call)
+
+            turn = agent._apply_search_turn(response, results, conversation)
+            if turn is None:
+                break
+            sources_used.extend(turn[0])
+            candidates_found += turn[1]
+
+            if cancel_event is not None and len(agent.candidates) >= Config.TARGET_CANDIDATES:
+                cancel_event.set()
+
+        return agent._query_record(
+            query_obj,
+            sources_used,
+            candidates_found,
+            compactor.turns[first_turn:],
+            time.perf_counter() - started,
+        )
+
+    async def _search_turn(self, conversation, query, compactor):
+        """One search model turn, escalated to SEARCH_MODEL when needed (see routing.py)."""
+        request = self.agent._search_request(conversation)
+        if Config.SEARCH_ESCALATION:
+            # Tools run after the response, so a save_candidate of the fast model never runs
+            request["model"] = Config.SEARCH_FAST_MODEL
+            response = await self._search_request(request, query, compactor)
+            if not needs_escalation(response):
+                return response
+            request["model"] = Config.SEARCH_MODEL
+        return await self._search_request(request, query, compactor)
+
+    async def _search_request(self, request, query, compactor):
+        start = time.perf_counter()
+        response = await self.client.messages.create(**request)
+        self.agent._record_search_call(
+            response, time.perf_counter() - start, query, compactor, request["model"]
+        )
+        return response
+
+    async def _timed_tool_call(self, tool_name, tool_input):
+        start = time.perf_counter()
+        try:
+            return await self._handle_tool_call(tool_name, tool_input)
+        finally:
+            self.agent.metrics.record_tool_call(
+                "search", tool_name, time.perf_counter() - start, self.agent.current_query
+            )
+
+    async def _handle_tool_call(self, tool_name, tool_input):
+        """Async tool handler: network I/O on the loop, state changes via the agent."""
+        agent = self.agent
+
+        if tool_name == "web_search":
+            search_result = await agent.smart_search.asearch(tool_input["query"], num_results=10)
+            result = agent._format_search_results(search_result)
+            self._prefetch(r["url"] for r in result["results"][: Config.ASYNC_PREFETCH_PAGES])
+            return result
+
+        if tool_name == "fetch_page_content":
+            url = tool_input["url"]
+            try:
+                status_code, html = await self._download(url)
+                # HTML parsing + NER is CPU work (inline or in a worker process)
+                return await asyncio.to_thread(agent._page_result, url, status_code, html)
+            except Exception as e:
+                return {"url": url, "error": str(e), "status": "error"}
+
+        result = agent._handle_tool_call(tool_name, tool_input, silent=True)
+        if tool_name == "save_candidate" and result.get("status") == "saved":
+            self._start_linkedin_lookup(tool_input)
+        return result
+
+    async def _download(self, url):
+        """Status code and HTML of a page (from a prefetch when one is running)."""
+        prefetch = self._prefetched.pop(url, None)
+        if prefetch is not None:
+            return await prefetch
+        return await self._get(url)
+
+    def _prefetch(self, urls):
+        """Start downloading pages the model is likely to fetch next."""
+        for url in urls:
+            if url and url not in self._prefetched:
+                self._prefetched[url] = asyncio.create_task(self._get(url))
+
+    async def _get(self, url):
+        response = await self.http.get(url)
+        return response.status_code, response.text
+
+    def _start_linkedin_lookup(self, candidate):
+        if id(candidate) in self._linkedin_lookups:
+            return
+        if self.agent._linkedin_query(candidate) is None:
+            return
+        self._linkedin_lookups[id(candidate)] = asyncio.create_task(
+            self._lookup_linkedin(candidate)
+        )
+
+    async def _lookup_linkedin(self, candidate):
+        agent = self.agent
+        async with self._linkedin_limit:
+            try:
+                start = time.perf_counter()
+                search_result = await agent.smart_search.asearch(
+                    agent._linkedin_query(candidate), num_results=5
+                )
+                agent.metrics.record_tool_call(
+                    "linkedin", "web_search", time.perf_counter() - start, candidate.get("name", "")
+                )
+            except Exception as e:
+                # Silent fail - LinkedIn is nice to have, not critical
+                if os.getenv("DEBUG_TOOLS"):
+                    agent.console.print(
+                        f"[dim]⚠️  LinkedIn search failed for {candidate.get('name')}: {e}[/dim]"
+                    )
+                return False
+
+        return agent._apply_linkedin_result(candidate, search_result)
+
+    async def enrich_linkedin_profiles(self):
+        """Phase 2.5: wait for the LinkedIn lookups (most already started during search)."""
+        agent = self.agent
+        if not agent.candidates:
+            return
+
+        agent._print_linkedin_header()
+
+        for candidate in agent.candidates:
+            self._start_linkedin_lookup(candidate)
+
+        with agent.metrics.phase("linkedin"):
+            with agent.console.status("[cyan]LinkedIn profielen zoeken...[/cyan]"):
+                found = await asyncio.gather(*self._linkedin_lookups.values())
+
+        agent._print_linkedin_summary(sum(found))
@@ -0,0 +1,154 @@
+"""Yield-aware budget for the search phase.
+
+Besides TARGET_CANDIDATES and MAX_SEARCH_ITERATIONS the search stops or thins
+out when it stops paying off:
+
+- queries run in planner priority order (high, medium, low);
+- a wall-clock or token budget stops the remaining queries;
+- when the marginal yield (candidates per 100k tokens, or per minute) of the
+  last few queries drops below a threshold, the remaining medium and low
+  priority queries are skipped. High priority queries still run.
+
+Yield is computed from the query records the search loop already produces
+(``candidates_found``, ``input_tokens``, ``output_tokens``, ``duration_seconds``).
+"""
+
+import threading
+import time
+from collections.abc import Callable
+
+PRIORITY_ORDER = {"high": 0, "medium": 1, "low": 2}
+
+
+def priority_order(queries: list[dict]) -> list[dict]:
+    """Queries sorted by planner priority; planner order within the same priority."""
+    return sorted(queries, key=lambda q: PRIORITY_ORDER.get(q.get("priority", "medium"), 1))
+
+
+class SearchBudget:
+    """
+    Tracks search yield and decides whether the next query should run.
+
+    Args:
+        max_seconds: wall-clock budget for the search phase (0 = none)
+        max_tokens: input + output token budget for the search phase (0 = none)
+        min_yield_per_100k_tokens: marginal yield below which non-high queries are skipped
+        min_yield_per_minute: same, per minute of query time (0 = not checked)
+        window: number of most recent queries that make up the marginal yield
+        clock: time source (for tests)
+    """
+
+    def __init__(
+        self,
+        max_seconds: float = 0,
+        max_tokens: int = 0,
+        min_yield_per_100k_tokens: float = 0,
+        min_yield_per_minute: float = 0,
+        window: int = 3,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_seconds = max_seconds
+        self.max_tokens = max_tokens
+        self.min_yield_per_100k_tokens = min_yield_per_100k_tokens
+        self.min_yield_per_minute = min_yield_per_minute
+        self.window = window
+        self._clock = clock
+        self._started = clock()
+        self._lock = threading.Lock()
+        self.records: list[dict] = []
+        self.skipped: list[dict] = []
+        self.stop_reason: str | None = None
+
+    def record(self, query_record: dict) -> None:
+        with self._lock:
+            self.records.append(query_record)
+
+    @property
+    def tokens_used(self) -> int:
+        with self._lock:
+            return sum(_tokens(r) for r in self.records)
+
+    @property
+    def seconds_used(self) -> float:
+        return self._clock() - self._started
+
+    def yield_stats(self, records: list[dict] | None = None) -> dict:
+        """Candidates per 100k tokens and per minute (None when nothing was measured)."""
+        if records is None:
+            with self._lock:
+                records = list(self.records)
+
+        candidates = sum(r.get("candidates_found", 0) for r in records)
+        tokens = sum(_tokens(r) for r in records)
+        seconds = sum(r.get("duration_seconds", 0) for r in records)
+        return {
+            "candidates": candidates,
+            "per_100k_tokens": candidates * 100_000 / tokens if tokens else None,
+            "per_minute": candidates * 60 / seconds if seconds else None,
+        }
+
+    def marginal_yield(self) -> dict | None:
+        """Yield over the last ``window`` queries (None until the window is full)."""
+        with self._lock:
+            if self.window <= 0 or len(self.records) < self.window:
+                return None
+            recent = self.records[-self.window :]
+        return self.yield_stats(recent)
+
+    def check(self, query_obj: dict) -> str | None:
+        """
+        Reason not to run this query, or None to run it.
+
+        A budget overrun stops all remaining queries (``stop_reason`` is set);
+        low marginal yield only skips queries that are not high priority.
+        """
+        if self.stop_reason is None:
+            if self.max_seconds and self.seconds_used >= self.max_seconds:
+                self.stop_reason = f"tijdbudget ({self.max_seconds:.0f}s) bereikt"
+            elif self.max_tokens and self.tokens_used >= self.max_tokens:
+                self.stop_reason = f"tokenbudget ({self.max_tokens:,}) bereikt"
+        if self.stop_reason is not None:
+            return self._skip(query_obj, self.stop_reason)
+
+        if query_obj.get("priority", "medium") == "high":
+            return None
+
+        reason = self._low_yield_reason()
+        if reason is not None:
+            return self._skip(query_obj, reason)
+        return None
+
+    def _low_yield_reason(self) -> str | None:
+        marginal = self.marginal_yield()
+        if marginal is None:
+            return None
+
+        per_tokens = marginal["per_100k_tokens"]
+        if (
+            self.min_yield_per_100k_tokens
+            and per_tokens is not None
+            and per_tokens < self.min_yield_per_100k_tokens
+        ):
+            return f"lage opbrengst ({per_tokens:.2f} kandidaten/100k tokens)"
+
+        per_minute = marginal["per_minute"]
+        if self.min_yield_per_minute and per_minute is not None:
+            if per_minute < self.min_yield_per_minute:
+                return f"lage opbrengst ({per_minute:.2f} kandidaten/minuut)"
+
+        return None
+
+    def _skip(self, query_obj: dict, reason: str) -> str:
+        with self._lock:
+            self.skipped.append(
+                {
+                    "query": query_obj["query"],
+                    "priority": query_obj.get("priority", "medium"),
+                    "reason": reason,
+                }
+            )
+        return reason
+
+
+def _tokens(record: dict) -> int:
+    return record.get("input_tokens", 0) + record.get("output_tokens", 0)
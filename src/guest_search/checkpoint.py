@@ -0,0 +1,227 @@
+"""Checkpoints of a guest search run, for resuming after a crash.
+
+Candidates and search history are only written at the end of the report
+phase, so a crash during the search used to lose the planning, all search
+turns and all candidates. A ``RunCheckpoint`` is written to
+``data/runs/<run_id>/checkpoint.json`` after planning, after every query and
+after each later phase, and holds what a rerun needs to continue:
+
+- the strategy (no new planning call);
+- the shared search conversation, with all tool results compacted;
+- the candidates and the query records (completed queries are skipped);
+- the last completed stage, and the report file once the run history
+  (previous guests, search session) has been saved, so a resumed run never
+  appends the same guests twice.
+
+``RunCheckpoint.latest()`` returns the most recent unfinished run (optionally
+only runs updated since a given time, e.g. the start of this week);
+``RunCheckpoint.prune()`` removes old finished and stale runs.
+"""
+
+import copy
+import json
+import logging
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from .compaction import compact_messages
+
+logger = logging.getLogger(__name__)
+
+RUNS_DIR = "data/runs"
+
+# Completed stages in run order
+STAGES = ("started", "planned", "searching", "searched", "enriched", "reported", "done")
+
+CHECKPOINT_FILE = "checkpoint.json"
+
+
+class RunCheckpoint:
+    """
+    Checkpoint file of one run.
+
+    Args:
+        run_dir: directory of this run (``<runs_dir>/<run_id>``)
+        state: loaded state (default: a new run)
+    """
+
+    def __init__(self, run_dir: str | Path, state: dict | None = None):
+        self.run_dir = Path(run_dir)
+        self.state = state or {
+            "run_id": self.run_dir.name,
+            "stage": "started",
+            "updated": None,
+            "strategy": None,
+            "conversation": [],
+            "candidates": [],
+            "queries": [],
+            "report_file": None,
+        }
+
+    @classmethod
+    def create(cls, runs_dir: str | Path = RUNS_DIR, run_id: str | None = None):
+        """New run directory (run_id defaults to the current date and time)."""
+        run_id = run_id or datetime.now().strftime("%Y%m%d-%H%M%S")
+        return cls(Path(runs_dir) / run_id)
+
+    @classmethod
+    def load(cls, run_dir: str | Path):
+        """Checkpoint of an existing run (None when missing or unreadable)."""
+        path = Path(run_dir) / CHECKPOINT_FILE
+        try:
+            with open(path, encoding="utf-8") as f:
+                return cls(run_dir, json.load(f))
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Failed to load checkpoint {path}: {e}")
+            return None
+
+    @classmethod
+    def latest(cls, runs_dir: str | Path = RUNS_DIR, since: datetime | None = None):
+        """Most recent run that did not finish (and was updated since ``since``), or None."""
+        for checkpoint in cls._all(runs_dir):
+            if checkpoint.stage == "done":
+                continue
+            if since is not None and not checkpoint.updated_since(since):
+                continue
+            return checkpoint
+        return None
+
+    @classmethod
+    def prune(
+        cls, runs_dir: str | Path = RUNS_DIR, keep: int = 10, before: datetime | None = None
+    ) -> int:
+        """
+        Remove finished runs except the newest ``keep``, and unfinished runs last
+        updated before ``before`` (they can no longer be resumed).
+
+        Returns:
+            number of removed run directories
+        """
+        removed = 0
+        finished = 0
+        for checkpoint in cls._all(runs_dir):
+            if checkpoint.stage == "done":
+                finished += 1
+                if finished <= keep:
+                    continue
+            elif before is None or checkpoint.updated_since(before):
+                continue
+            try:
+                shutil.rmtree(checkpoint.run_dir)
+                removed += 1
+            except OSError as e:
+                logger.warning(f"Failed to remove run {checkpoint.run_dir}: {e}")
+        return removed
+
+    @classmethod
+    def _all(cls, runs_dir: str | Path):
+        """Readable checkpoints, newest run first."""
+        runs_dir = Path(runs_dir)
+        if not runs_dir.is_dir():
+            return
+        for run_dir in sorted(runs_dir.iterdir(), reverse=True):
+            checkpoint = cls.load(run_dir) if run_dir.is_dir() else None
+            if checkpoint is not None:
+                yield checkpoint
+
+    def updated_since(self, since: datetime) -> bool:
+        """Whether the checkpoint was last written at or after ``since``."""
+        try:
+            return datetime.fromisoformat(self.state["updated"]) >= since
+        except (KeyError, TypeError, ValueError):
+            return False
+
+    @property
+    def run_id(self) -> str:
+        return self.state["run_id"]
+
+    @property
+    def stage(self) -> str:
+        return self.state["stage"]
+
+    @property
+    def strategy(self) -> dict | None:
+        return self.state["strategy"]
+
+    @property
+    def conversation(self) -> list[dict]:
+        return copy.deepcopy(self.state["conversation"])
+
+    @property
+    def candidates(self) -> list[dict]:
+        return copy.deepcopy(self.state["candidates"])
+
+    @property
+    def queries(self) -> list[dict]:
+        return copy.deepcopy(self.state["queries"])
+
+    @property
+    def report_file(self) -> str | None:
+        return self.state.get("report_file")
+
+    def reached(self, stage: str) -> bool:
+        """Whether ``stage`` (or a later one) has been completed."""
+        return STAGES.index(self.stage) >= STAGES.index(stage)
+
+    def save(
+        self,
+        stage: str,
+        strategy: dict | None = None,
+        conversation: list | None = None,
+        candidates: list[dict] | None = None,
+        queries: list[dict] | None = None,
+        report_file: str | None = None,
+    ) -> None:
+        """Update the given parts and write the checkpoint atomically."""
+        if strategy is not None:
+            self.state["strategy"] = strategy
+        if conversation is not None:
+            self.state["conversation"] = compact_conversation(conversation)
+        if candidates is not None:
+            self.state["candidates"] = list(candidates)
+        if queries is not None:
+            self.state["queries"] = list(queries)
+        if report_file is not None:
+            self.state["report_file"] = report_file
+        self.state["stage"] = stage
+        self.state["updated"] = datetime.now().isoformat()
+
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        path = self.run_dir / CHECKPOINT_FILE
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, indent=2, ensure_ascii=False, default=str)
+        # A crash while writing leaves the previous checkpoint intact
+        os.replace(tmp_path, path)
+
+
+def compact_conversation(conversation: list) -> list[dict]:
+    """
+    JSON-safe copy of a conversation with every tool result compacted.
+
+    SDK content blocks become plain text/tool_use dicts, which the API accepts
+    as input on the next request.
+    """
+    messages = []
+    for message in conversation:
+        content = message["content"]
+        if isinstance(content, list):
+            content = [_plain_block(block) for block in content]
+        messages.append({"role": message["role"], "content": content})
+    compact_messages(messages)
+    return messages
+
+
+def _plain_block(block: Any) -> dict:
+    if isinstance(block, dict):
+        return dict(block)
+    if block.type == "tool_use":
+        return {"type": "tool_use", "id": block.id, "name": block.name, "input": block.input}
+    if block.type == "text":
+        return {"type": "text", "text": block.text}
+    return block.model_dump()
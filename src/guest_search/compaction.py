@@ -0,0 +1,164 @@
+"""Compaction of the long-running search conversation.
+
+Every fetched page and search result would otherwise stay in context for the
+rest of the run, so each turn re-sends all of them. Once the conversation
+exceeds a token budget, tool results outside a sliding window of recent turns
+are replaced by short summaries (URL + persons found, or result titles + URLs).
+The tool_use/tool_result pairing is kept intact.
+"""
+
+import json
+from typing import Any
+
+# Rough chars-per-token ratio for Dutch/English text (used when no usage is known)
+CHARS_PER_TOKEN = 4
+
+# Search results kept per compacted web_search result
+MAX_COMPACT_RESULTS = 5
+
+
+def estimate_tokens(conversation: list[dict]) -> int:
+    """Estimate the input tokens of a conversation from its serialized size."""
+    return len(json.dumps(conversation, default=str, ensure_ascii=False)) // CHARS_PER_TOKEN
+
+
+def summarize_tool_result(result: dict) -> dict:
+    """Compact summary of a tool result; the model can fetch the page again if needed."""
+    if "potential_persons" in result:
+        # fetch_page_content
+        return {
+            "url": result.get("url", ""),
+            "status": result.get("status"),
+            "persons": [p.get("name", "") for p in result["potential_persons"]],
+            "compacted": True,
+        }
+
+    if "results" in result:
+        # web_search
+        return {
+            "results": [
+                {"title": r.get("title", ""), "url": r.get("url", "")}
+                for r in result["results"][:MAX_COMPACT_RESULTS]
+            ],
+            "result_count": len(result["results"]),
+            "compacted": True,
+        }
+
+    # Small results (save_candidate, check_previous_guests, errors) stay as they are
+    return result
+
+
+USAGE_FIELDS = (
+    "input_tokens",
+    "output_tokens",
+    "cache_read_input_tokens",
+    "cache_creation_input_tokens",
+)
+
+
+def usage_counts(usage: Any) -> dict[str, int]:
+    """Token counts of an API response usage object (0 when missing, e.g. mocked clients)."""
+    counts = {}
+    for field in USAGE_FIELDS:
+        value = getattr(usage, field, None)
+        counts[field] = value if isinstance(value, int) else 0
+    return counts
+
+
+class ConversationCompactor:
+    """
+    Tracks token usage per turn and compacts old tool results over a budget.
+
+    Args:
+        token_budget: input tokens above which older tool results are compacted
+        keep_turns: number of most recent tool_result messages kept in full
+    """
+
+    def __init__(self, token_budget: int, keep_turns: int):
+        self.token_budget = token_budget
+        self.keep_turns = keep_turns
+        self.turns: list[dict] = []
+        self.compacted_results = 0
+        self._last_input_tokens: int | None = None
+
+    def record_usage(self, usage: Any, label: str = "") -> dict:
+        """Record the usage of one API response (input includes cache reads/writes)."""
+        turn = {"label": label, **usage_counts(usage)}
+        self.turns.append(turn)
+
+        total_input = (
+            turn["input_tokens"]
+            + turn["cache_read_input_tokens"]
+            + turn["cache_creation_input_tokens"]
+        )
+        self._last_input_tokens = total_input or None
+        return turn
+
+    def context_tokens(self, conversation: list[dict]) -> int:
+        """Input tokens of the last turn, or an estimate when unknown."""
+        if self._last_input_tokens is not None:
+            return self._last_input_tokens
+        return estimate_tokens(conversation)
+
+    def maybe_compact(self, conversation: list[dict]) -> int:
+        """Compact the conversation in place when over budget. Returns results compacted."""
+        if self.token_budget <= 0 or self.context_tokens(conversation) <= self.token_budget:
+            return 0
+
+        tool_messages = [
+            message
+            for message in conversation
+            if message["role"] == "user"
+            and isinstance(message["content"], list)
+            and any(_is_tool_result(block) for block in message["content"])
+        ]
+        if self.keep_turns > 0:
+            tool_messages = tool_messages[: -self.keep_turns]
+
+        compacted = compact_messages(tool_messages)
+        if compacted:
+            self.compacted_results += compacted
+            # Size changed; estimate until the next response reports real usage
+            self._last_input_tokens = None
+        return compacted
+
+    def totals(self) -> dict:
+        """Summed usage over all recorded turns."""
+        return {field: sum(turn[field] for turn in self.turns) for field in USAGE_FIELDS}
+
+
+def compact_messages(messages: list[dict]) -> int:
+    """Compact all tool results in these messages in place. Returns results compacted."""
+    compacted = 0
+    for message in messages:
+        if not isinstance(message["content"], list):
+            continue
+        for block in message["content"]:
+            if _is_tool_result(block) and _compact_block(block):
+                compacted += 1
+    return compacted
+
+
+def _is_tool_result(block: Any) -> bool:
+    return isinstance(block, dict) and block.get("type") == "tool_result"
+
+
+def _compact_block(block: dict) -> bool:
+    """Replace the content of a tool_result block by its summary. Returns True if changed."""
+    content = block.get("content")
+    if not isinstance(content, str):
+        return False
+
+    try:
+        result = json.loads(content)
+    except json.JSONDecodeError:
+        return False
+    if not isinstance(result, dict) or result.get("compacted"):
+        return False
+
+    summary = summarize_tool_result(result)
+    if summary is result:
+        return False
+
+    block["content"] = json.dumps(summary, ensure_ascii=False)
+    return True
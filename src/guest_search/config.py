@@ -9,14 +9,110 @@ class Config:
     ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
     MODEL = "claude-sonnet-4-20250514"
 
+    # Model per fase (env override, standaard MODEL). De planning gebruikt extended
+    # thinking, dus PLANNING_MODEL moet dat ondersteunen
+    PLANNING_MODEL = os.getenv("PLANNING_MODEL") or MODEL
+    SEARCH_MODEL = os.getenv("SEARCH_MODEL") or MODEL
+    # Rapport fase: enrich_candidate turns en daarna het schrijven van het rapport
+    ENRICHMENT_MODEL = os.getenv("ENRICHMENT_MODEL") or MODEL
+    REPORT_MODEL = os.getenv("REPORT_MODEL") or MODEL
+    TOPIC_SEARCH_MODEL = os.getenv("TOPIC_SEARCH_MODEL") or MODEL
+    # Escalatie in de zoekfase: SEARCH_FAST_MODEL doet de zoek-turns (zoeken, pagina's
+    # ophalen); wil het een kandidaat opslaan, dan doet SEARCH_MODEL die turn opnieuw
+    SEARCH_ESCALATION = os.getenv("SEARCH_ESCALATION", "false").lower() == "true"
+    SEARCH_FAST_MODEL = os.getenv("SEARCH_FAST_MODEL", "claude-haiku-4-5")
+
     # Planning fase
     PLANNING_MAX_TOKENS = 50000  # Must be > thinking budget
     PLANNING_THINKING_BUDGET = 20000
+    # Planning en zoeken overlappen: de strategie wordt gestreamd (submit_search_strategy
+    # tool) en elke zoekopdracht start zodra hij compleet is. Alleen met een streaming
+    # client en queries na elkaar (PARALLEL_QUERY_WORKERS <= 1)
+    PLANNING_PIPELINE = os.getenv("PLANNING_PIPELINE", "true").lower() == "true"
+    # Strategie hergebruiken binnen dezelfde ISO week (zelfde leergeschiedenis, prompt
+    # en model); --replan maakt altijd een nieuwe
+    STRATEGY_CACHE_ENABLED = os.getenv("STRATEGY_CACHE_ENABLED", "true").lower() == "true"
+    STRATEGY_CACHE_DIR = os.getenv("STRATEGY_CACHE_DIR", "data/cache/strategies")
 
     # Zoek fase
     SEARCH_MAX_TOKENS = 8000
     MAX_SEARCH_ITERATIONS = 12
     TARGET_CANDIDATES = 8
+    # Max aantal model turns per zoekopdracht (safety limit)
+    MAX_TURNS_PER_QUERY = 10
+    # Budget voor de zoekfase (0 = geen limiet): wall-clock seconden en input+output tokens
+    SEARCH_TIME_BUDGET = int(os.getenv("SEARCH_TIME_BUDGET", "0"))
+    SEARCH_TOKEN_BUDGET = int(os.getenv("SEARCH_TOKEN_BUDGET", "0"))
+    # Minimale opbrengst over de laatste YIELD_WINDOW queries; daaronder worden de
+    # resterende medium/low priority queries overgeslagen (0 = niet controleren)
+    MIN_YIELD_PER_100K_TOKENS = float(os.getenv("MIN_YIELD_PER_100K_TOKENS", "0"))
+    MIN_YIELD_PER_MINUTE = float(os.getenv("MIN_YIELD_PER_MINUTE", "0"))
+    YIELD_WINDOW = int(os.getenv("YIELD_WINDOW", "3"))
+    # Aantal queries dat tegelijk draait, elk als eigen conversatie (0/1 = na elkaar)
+    PARALLEL_QUERY_WORKERS = int(os.getenv("PARALLEL_QUERY_WORKERS", "0"))
+
+    # Conversatie compaction: boven dit aantal input tokens worden oude tool results
+    # samengevat (URL + personen); de laatste N tool result turns blijven volledig
+    CONVERSATION_TOKEN_BUDGET = int(os.getenv("CONVERSATION_TOKEN_BUDGET", "40000"))
+    CONVERSATION_KEEP_TURNS = int(os.getenv("CONVERSATION_KEEP_TURNS", "4"))
+
+    # Pagina-inhoud (fetch_page_content)
+    # Max aantal karakters paginatekst per tool result
+    FETCH_CONTENT_MAX_CHARS = 4000
+    # Compact mode: stuur alleen geselecteerde passages + personenlijst (geen volledige context)
+    FETCH_COMPACT_MODE = os.getenv("FETCH_COMPACT_MODE", "false").lower() == "true"
+    # Tool results compact serialiseren (geen provider, gededupliceerde context en URLs)
+    COMPACT_TOOL_RESULTS = os.getenv("COMPACT_TOOL_RESULTS", "true").lower() == "true"
+    # Max lengte van een web_search snippet in het tool result
+    SEARCH_SNIPPET_MAX_CHARS = int(os.getenv("SEARCH_SNIPPET_MAX_CHARS", "300"))
+    # Aantal worker processes voor HTML parsing + NER (0 = inline in het hoofdproces)
+    EXTRACTION_WORKERS = int(os.getenv("EXTRACTION_WORKERS", "2"))
+    # Max aantal tool calls uit één response dat parallel draait (1 = na elkaar)
+    TOOL_WORKERS = int(os.getenv("TOOL_WORKERS", "4"))
+    # Stream model responses; zoek/fetch tools starten zodra hun tool_use block compleet is
+    STREAM_RESPONSES = os.getenv("STREAM_RESPONSES", "true").lower() == "true"
+    # Asyncio runtime (AsyncAnthropic + httpx): alle I/O van een run op één event loop
+    ASYNC_RUNTIME = os.getenv("ASYNC_RUNTIME", "false").lower() == "true"
+    # Asyncio runtime: aantal pagina's uit elk zoekresultaat dat alvast wordt gedownload
+    ASYNC_PREFETCH_PAGES = int(os.getenv("ASYNC_PREFETCH_PAGES", "2"))
+    # Cache van NER resultaten per paginatekst (hash), per spaCy model versie
+    NER_CACHE_ENABLED = os.getenv("NER_CACHE_ENABLED", "true").lower() == "true"
+    # Bewaar de cache ook op schijf in NER_CACHE_DIR, gedeeld tussen runs en
+    # extractie-workers (die na elke zoekfase stoppen en hun geheugen verliezen)
+    NER_CACHE_DISK = os.getenv("NER_CACHE_DISK", "true").lower() == "true"
+    NER_CACHE_DIR = os.getenv("NER_CACHE_DIR", "data/cache/ner")
+    # Max aantal pagina's in het in-memory LRU deel van de cache
+    NER_CACHE_SIZE = int(os.getenv("NER_CACHE_SIZE", "512"))
+    # Checkpoint van elke run (na planning en na elke query) voor --resume
+    CHECKPOINTS_ENABLED = os.getenv("CHECKPOINTS_ENABLED", "true").lower() == "true"
+    RUNS_DIR = os.getenv("RUNS_DIR", "data/runs")
+    # Aantal afgeronde runs dat in RUNS_DIR blijft staan (oudere worden opgeruimd)
+    RUNS_KEEP = int(os.getenv("RUNS_KEEP", "10"))
+    # Opslag van previous_guests en search_history: "json" (data/*.json, volledig
+    # geladen en herschreven) of "sqlite" (HISTORY_DB met indexen op datum en naam;
+    # een nieuwe database wordt eerst uit de JSON bestanden gevuld)
+    HISTORY_STORE = os.getenv("HISTORY_STORE", "json").lower()
+    HISTORY_DB = os.getenv("HISTORY_DB", "data/history.sqlite")
+    # Vergelijk de bijgehouden leer-aggregaten bij elke planning met een volledige
+    # scan van de search history (waarschuwt en gebruikt de scan bij verschillen)
+    LEARNING_CONSISTENCY_CHECK = os.getenv("LEARNING_CONSISTENCY_CHECK", "false").lower() == "true"
+    # Weekbuckets van de leer-aggregaten bij HISTORY_STORE=json (een bestand per week)
+    LEARNING_DIR = os.getenv("LEARNING_DIR", "data/learning")
+
+    # Rapport fase: verrijking via de Message Batches API (één request per kandidaat,
+    # 50% goedkoper, resultaten kunnen lang duren; bedoeld voor onbewaakte runs)
+    ENRICHMENT_BATCH = os.getenv("ENRICHMENT_BATCH", "false").lower() == "true"
+    ENRICHMENT_BATCH_POLL_SECONDS = int(os.getenv("ENRICHMENT_BATCH_POLL_SECONDS", "30"))
+    # Daarna wordt de batch geannuleerd; niet verrijkte kandidaten blijven zoals ze zijn
+    ENRICHMENT_BATCH_TIMEOUT = int(os.getenv("ENRICHMENT_BATCH_TIMEOUT", "3600"))
+
+    # Snel rapport: verrijking met één request per kandidaat (max ENRICHMENT_WORKERS
+    # tegelijk) en het rapport lokaal uit een template, zonder rapport-conversatie
+    FAST_REPORT = os.getenv("FAST_REPORT", "false").lower() == "true"
+    ENRICHMENT_WORKERS = int(os.getenv("ENRICHMENT_WORKERS", "4"))
+    # Snel rapport: korte redactionele intro door het model (anders uit de data)
+    REPORT_LLM_INTRO = os.getenv("REPORT_LLM_INTRO", "true").lower() == "true"
+    REPORT_INTRO_MAX_TOKENS = 1000
 
     # Filtering
     EXCLUDE_WEEKS = 8
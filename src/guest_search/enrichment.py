@@ -0,0 +1,149 @@
+"""Per-candidate enrichment requests: as a message batch or concurrently.
+
+The report phase normally enriches candidates in one multi-turn
+``enrich_candidate`` tool loop. That loop runs one turn at a time, re-sends
+the full candidates JSON every turn and stops after 10 turns. Instead, every
+candidate can get its own small request with ``enrich_candidate`` as forced
+tool choice (``enrichment_requests``), sent in one of two ways:
+
+- ``run_batch`` (``Config.ENRICHMENT_BATCH``): one message batch, polled until
+  it has ended. Batch requests cost half of regular requests and don't count
+  against the regular rate limits, but results may take minutes (up to 24
+  hours), so this is meant for unattended runs;
+- ``run_concurrent`` (``Config.FAST_REPORT``): regular requests on a thread
+  pool of ``Config.ENRICHMENT_WORKERS``, done in seconds.
+
+Requests that fail, expire or don't finish before the batch timeout leave
+their candidate as it is; the report is written from the data that is
+available.
+"""
+
+import json
+import logging
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+CUSTOM_ID_PREFIX = "candidate-"
+
+
+def supports_batches(client: Any) -> bool:
+    """
+    True if the client implements ``messages.batches``.
+
+    Checked on the class, like ``streaming.supports_streaming``: the Portkey
+    adapter and the record/replay cache only implement ``messages.create``.
+    """
+    messages = getattr(client, "messages", None)
+    return getattr(type(messages), "batches", None) is not None
+
+
+def enrichment_requests(
+    candidates: list[dict], prompt: str, tool: dict, model: str, max_tokens: int
+) -> list[dict]:
+    """
+    One batch request per candidate.
+
+    Args:
+        candidates: candidates to enrich
+        prompt: prompt template with a ``{candidate_json}`` placeholder
+        tool: the enrich_candidate tool definition
+        model: model for the requests
+        max_tokens: max_tokens per request
+    """
+    return [
+        {
+            "custom_id": f"{CUSTOM_ID_PREFIX}{index}",
+            "params": {
+                "model": model,
+                "max_tokens": max_tokens,
+                "tools": [tool],
+                "tool_choice": {"type": "tool", "name": tool["name"]},
+                "messages": [
+                    {
+                        "role": "user",
+                        "content": prompt.format(
+                            candidate_json=json.dumps(candidate, indent=2, ensure_ascii=False)
+                        ),
+                    }
+                ],
+            },
+        }
+        for index, candidate in enumerate(candidates)
+    ]
+
+
+def run_batch(
+    client: Any,
+    requests: list[dict],
+    poll_seconds: float = 30,
+    timeout_seconds: float = 3600,
+    sleep: Callable[[float], None] = time.sleep,
+    clock: Callable[[], float] = time.monotonic,
+) -> dict[str, Any]:
+    """
+    Submit a message batch, wait until it has ended and collect the results.
+
+    A batch that is still running at the timeout is canceled; requests that
+    completed before the cancel still return their result.
+
+    Returns:
+        Response message per custom_id, for the requests that succeeded
+    """
+    batches = client.messages.batches
+    batch = batches.create(requests=requests)
+    logger.info(f"Submitted message batch {batch.id} with {len(requests)} requests")
+
+    deadline = clock() + timeout_seconds
+    canceled = False
+    while batch.processing_status != "ended":
+        if not canceled and clock() >= deadline:
+            logger.warning(f"Message batch {batch.id} not done after {timeout_seconds}s, canceling")
+            batch = batches.cancel(batch.id)
+            canceled = True
+            continue
+        sleep(poll_seconds)
+        batch = batches.retrieve(batch.id)
+
+    messages = {}
+    for entry in batches.results(batch.id):
+        if entry.result.type == "succeeded":
+            messages[entry.custom_id] = entry.result.message
+        else:
+            logger.warning(f"Batch request {entry.custom_id}: {entry.result.type}")
+    return messages
+
+
+def run_concurrent(client: Any, requests: list[dict], workers: int = 4) -> dict[str, Any]:
+    """
+    Send the requests as regular ``messages.create`` calls, ``workers`` at a time.
+
+    Returns:
+        (response message, seconds) per custom_id, for the requests that succeeded
+    """
+
+    def create(request: dict) -> tuple[Any, float]:
+        start = time.perf_counter()
+        message = client.messages.create(**request["params"])
+        return message, time.perf_counter() - start
+
+    responses = {}
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        futures = {r["custom_id"]: executor.submit(create, r) for r in requests}
+        for custom_id, future in futures.items():
+            try:
+                responses[custom_id] = future.result()
+            except Exception as e:
+                logger.warning(f"Enrichment request {custom_id} failed: {e}")
+    return responses
+
+
+def tool_call_input(message: Any, tool_name: str) -> dict | None:
+    """Input of the first call of ``tool_name`` in a response, if any."""
+    for block in message.content:
+        if block.type == "tool_use" and block.name == tool_name:
+            return dict(block.input) if block.input else {}
+    return None
@@ -0,0 +1,386 @@
+"""HTML parsing and person extraction, optionally offloaded to worker processes.
+
+Parsing pages with BeautifulSoup and running spaCy NER is CPU-bound. The
+``ExtractionPool`` runs this work in a process pool where every worker loads
+the spaCy pipeline once, so concurrent fetches are parsed in parallel and the
+main process stays free for API I/O and Rich rendering.
+
+Workers are started with "spawn", not the Linux default "fork": the pool is
+created from tool threads while the planner thread, Rich ``Live`` and the HTTP
+clients run, and forking a multithreaded process can deadlock on their locks.
+"""
+
+import multiprocessing
+import re
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from bs4 import BeautifulSoup
+
+from .identity import canonical_name
+
+SPACY_MODEL = "nl_core_news_md"
+
+# Keywords that indicate an entity is an organization rather than a person
+FALSE_POSITIVE_KEYWORDS = [
+    "children",
+    "hospital",
+    "university",
+    "institute",
+    "foundation",
+    "stichting",
+    "ziekenhuis",
+    "universiteit",
+    "instituut",
+    "company",
+    "bedrijf",
+    "ministerie",
+    "gemeente",
+]
+
+PERSON_TITLES = ["Prof.", "Dr.", "Drs.", "Ir.", "Mr."]
+
+
+def html_to_text(html: str) -> str:
+    """Convert an HTML page to cleaned plain text (scripts/styles removed)."""
+    soup = BeautifulSoup(html, "html.parser")
+
+    # Remove script and style elements
+    for script in soup(["script", "style"]):
+        script.decompose()
+
+    # Get text content
+    text = soup.get_text()
+
+    # Clean up text
+    lines = (line.strip() for line in text.splitlines())
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    return "\n".join(chunk for chunk in chunks if chunk)
+
+
+def persons_from_doc(doc, text: str) -> list[dict]:
+    """
+    Collect PERSON entities from a processed spaCy doc.
+
+    Returns list of dicts with: name, context, sentence, position, (optional) title_match
+    """
+    potential_persons = []
+    seen_names = set()
+
+    for ent in doc.ents:
+        if ent.label_ != "PERSON":
+            continue
+
+        name = ent.text.strip()
+
+        # Skip if already seen (same person, also with titles or other spelling)
+        name_key = canonical_name(name)
+        if name_key in seen_names:
+            continue
+
+        # Skip single-word names (likely false positives)
+        if len(name.split()) < 2:
+            continue
+
+        # Skip if contains numbers (e.g., "Frans Vertregt06")
+        if any(char.isdigit() for char in name):
+            continue
+
+        # Skip if contains certain keywords that indicate it's not a person
+        name_lower = name.lower()
+        if any(keyword in name_lower for keyword in FALSE_POSITIVE_KEYWORDS):
+            continue
+
+        # Skip very long names (>5 words, likely organization names)
+        if len(name.split()) > 5:
+            continue
+
+        seen_names.add(name_key)
+
+        # Get context (sentence containing the entity)
+        sentence = ent.sent.text.strip()
+
+        # Get wider context (50 chars before, 100 after)
+        start = max(0, ent.start_char - 50)
+        end = min(len(text), ent.end_char + 100)
+        context = text[start:end].replace("\n", " ")
+
+        # Check if there's a title nearby (Prof., Dr., etc.)
+        title_match = None
+        for token in ent.sent:
+            if token.text in PERSON_TITLES:
+                # Check if title is close to the entity
+                if abs(token.i - ent.start) <= 2:
+                    title_match = f"{token.text} {name}"
+                    break
+
+        person = {
+            "name": name,
+            "context": context,
+            "sentence": sentence,  # Full sentence for better context
+            "position": ent.start_char,
+        }
+
+        if title_match:
+            person["title_match"] = title_match
+
+        potential_persons.append(person)
+
+    return potential_persons
+
+
+# ============================================
+# REGEX FALLBACK
+# ============================================
+
+# Bump when the extractor output changes (used in cache keys)
+REGEX_EXTRACTOR_VERSION = "regex-3"
+
+_NAME = r"[A-Z][a-z]+(?:\s+[A-Z][a-z]+)+"
+
+_ROLE_WORDS = (
+    "hoogleraar",
+    "professor",
+    "docent",
+    "onderzoeker",
+    "CEO",
+    "CTO",
+    "directeur",
+    "hoofd",
+    "lead",
+    "manager",
+    "wethouder",
+    "burgemeester",
+)
+_ROLES = "|".join(_ROLE_WORDS)
+
+# Role words are never names on their own
+ROLE_STOPWORDS = frozenset(word.lower() for word in _ROLE_WORDS)
+
+# Pattern kinds, in the order the original per-pattern passes ran. Results are
+# emitted in this order so deduplication keeps the same first occurrence.
+_TITLE_KINDS = ("prof", "dr", "drs", "ir")
+_ROLE_AFTER_NAME = "name_role"
+_KEYWORD_KINDS = ("role_name", "volgens", "door", "zegt", "vertelt", "aldus")
+_KIND_ORDER = {
+    kind: index for index, kind in enumerate(_TITLE_KINDS + (_ROLE_AFTER_NAME,) + _KEYWORD_KINDS)
+}
+
+# The passes below wrap their alternatives in ``X(?<=(?=...).)``: the leading
+# character class X lets the regex engine skip ahead to candidate positions,
+# and the lookahead (evaluated one character back, at the match start) keeps
+# the named groups zero-width so matches of different kinds may overlap like
+# the separate passes did.
+
+# Pass 1: names with titles (case-sensitive)
+_TITLE_PATTERN = re.compile(
+    r"[PDI](?<=(?="
+    r"(?P<prof>Prof\.?\s+(?:dr\.?\s+)?(?P<prof_name>" + _NAME + r"))"
+    r"|(?P<dr>Dr\.?\s+(?P<dr_name>" + _NAME + r"))"
+    r"|(?P<drs>Drs\.?\s+(?P<drs_name>" + _NAME + r"))"
+    r"|(?P<ir>Ir\.?\s+(?P<ir_name>" + _NAME + r"))"
+    r").)"
+)
+
+_KEYWORD_FIRST_CHARS = "".join(sorted({word[0].lower() for word in _ROLE_WORDS} | set("vdza")))
+
+# Pass 2: keyword followed by a name (role before name, quote verbs). Role words
+# also match without a name: those hits anchor the name-before-role search.
+_KEYWORD_PATTERN = re.compile(
+    r"[" + _KEYWORD_FIRST_CHARS + r"](?<=(?="
+    r"(?P<role_name>(?P<role>" + _ROLES + r")(?:\s+(?P<role_name_name>" + _NAME + r"))?)"
+    r"|(?P<volgens>volgens\s+(?P<volgens_name>" + _NAME + r"))"
+    r"|(?P<door>door\s+(?P<door_name>" + _NAME + r"),)"
+    r"|(?P<zegt>zegt\s+(?P<zegt_name>" + _NAME + r"))"
+    r"|(?P<vertelt>vertelt\s+(?P<vertelt_name>" + _NAME + r"))"
+    r"|(?P<aldus>aldus\s+(?P<aldus_name>" + _NAME + r"))"
+    r").)",
+    re.IGNORECASE | re.DOTALL,
+)
+
+# Pass 3: name followed by a role. Only runs inside the stretch of letters,
+# whitespace and commas that leads up to a role word found by pass 2; a match
+# can't contain any other character, so the result equals a full-text scan.
+_NAME_ROLE_PATTERN = re.compile(
+    r"(?P<name_role_name>" + _NAME + r"),?\s+(?:" + _ROLES + r")", re.IGNORECASE
+)
+_NAME_ROLE_CHARS = re.compile(r"[A-Za-z\s,]*", re.IGNORECASE)
+
+
+def _is_role_name(name: str) -> bool:
+    """Name check of the role/quote patterns (capitalized, 2+ words, no role word)."""
+    return len(name.split()) >= 2 and name[0].isupper() and name.lower() not in ROLE_STOPWORDS
+
+
+def _role_segments(text: str, role_spans: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    """
+    Return (start, end) ranges where a name-before-role match can occur.
+
+    Each range runs from the start of the letter/whitespace/comma stretch that
+    contains a role word up to the end of the last role word in that stretch.
+    """
+    reversed_text = text[::-1]
+    segments = []
+
+    for role_start, role_end in role_spans:
+        # ",?\s+role" needs whitespace right before the role word
+        if role_start == 0 or not text[role_start - 1].isspace():
+            continue
+        run = _NAME_ROLE_CHARS.match(reversed_text, len(text) - role_start)
+        start = role_start - (run.end() - run.start())
+        if segments and segments[-1][0] == start:
+            segments[-1] = (start, role_end)
+        else:
+            segments.append((start, role_end))
+
+    return segments
+
+
+def extract_persons_regex(text: str) -> list[dict]:
+    """
+    Regex-based person extraction (fallback when spaCy is unavailable).
+
+    Two precompiled full-text passes replace the eleven original per-pattern
+    passes; the name-before-role pattern only runs around role words found by
+    the second pass. Matches of the same kind never overlap (like re.finditer
+    per pattern), and the output is identical to running the patterns one by one.
+    """
+    if not text:
+        return []
+
+    # (kind order, full match start, full match end, name, name start, title match)
+    matches = []
+    role_spans = []
+
+    for pattern, kinds in ((_TITLE_PATTERN, _TITLE_KINDS), (_KEYWORD_PATTERN, _KEYWORD_KINDS)):
+        last_end = dict.fromkeys(kinds, 0)
+        for match in pattern.finditer(text):
+            # Exactly one alternative matches at a position (distinct keywords)
+            kind = next(k for k in kinds if match.group(k) is not None)
+            name_group = f"{kind}_name"
+            start, end = match.span(kind)
+
+            if kind == "role_name":
+                role_spans.append(match.span("role"))
+                if match.group(name_group) is None:
+                    continue
+
+            if start < last_end[kind]:
+                # Inside an earlier match of the same kind: a single pass would skip it
+                continue
+            last_end[kind] = end
+            matches.append(
+                (
+                    _KIND_ORDER[kind],
+                    start,
+                    end,
+                    match.group(name_group),
+                    match.start(name_group),
+                    match.group(kind) if kind in _TITLE_KINDS else None,
+                )
+            )
+
+    for segment_start, segment_end in _role_segments(text, role_spans):
+        for match in _NAME_ROLE_PATTERN.finditer(text, segment_start, segment_end):
+            matches.append(
+                (
+                    _KIND_ORDER[_ROLE_AFTER_NAME],
+                    match.start(),
+                    match.end(),
+                    match.group("name_role_name"),
+                    match.start("name_role_name"),
+                    None,
+                )
+            )
+
+    # Emit in original pattern order so deduplication keeps the same occurrence
+    matches.sort(key=lambda m: m[0])
+
+    seen_names = set()
+    unique_persons = []
+
+    for _order, start, end, name, position, title_match in matches:
+        if title_match is None and not _is_role_name(name):
+            continue
+
+        name_key = canonical_name(name)
+        if name_key in seen_names:
+            continue
+        seen_names.add(name_key)
+
+        # Get context (50 chars before, 100 after)
+        context = text[max(0, start - 50) : min(len(text), end + 100)].replace("\n", " ")
+
+        person = {"name": name}
+        if title_match is not None:
+            person["title_match"] = title_match
+        person["context"] = context
+        person["position"] = position
+        unique_persons.append(person)
+
+    return unique_persons
+
+
+# ============================================
+# WORKER PROCESS
+# ============================================
+
+
+def _init_worker():
+    """Load the spaCy pipeline once when a worker process starts."""
+    from .ner import get_ner_service
+
+    get_ner_service().load()
+
+
+def process_page(html: str) -> tuple[str, list[dict]]:
+    """Parse HTML and extract persons. Runs inside a worker process."""
+    from .ner import get_ner_service
+
+    text = html_to_text(html)
+    return text, get_ner_service().extract_persons(text)
+
+
+class ExtractionPool:
+    """
+    Process pool for HTML parsing and person extraction.
+
+    The pool is started lazily on first use. Each worker loads the shared NER
+    service once (see ``_init_worker``) and is reused for all later pages.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._executor: ProcessPoolExecutor | None = None
+        # Pages may be submitted from several tool threads at once
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether extraction runs in worker processes (False = inline)."""
+        return self.workers > 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                )
+            return self._executor
+
+    def submit(self, html: str) -> Future:
+        """Submit a page for processing; the future resolves to (text, persons)."""
+        return self._get_executor().submit(process_page, html)
+
+    def process(self, html: str) -> tuple[str, list[dict]]:
+        """Process a page in a worker and wait for the result."""
+        return self.submit(html).result()
+
+    def shutdown(self):
+        """Stop the worker processes (a new pool is started on next use)."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,209 @@
+"""SQLite store for previously recommended guests and search sessions.
+
+With ``Config.HISTORY_STORE = "sqlite"`` the agent, the interactive selector
+and the maintenance scripts read and write ``previous_guests`` and the
+``search_history`` sessions here instead of in ``data/previous_guests.json``
+and ``data/search_history.json``. Both JSON files are loaded, scanned and
+rewritten in full on every run; the store keeps one row per record with
+indexes on the date and the canonical name (``identity.canonical_name``), so:
+
+- startup only reads the guests and sessions inside the windows the agent
+  uses (``guests_since`` / ``sessions_since``);
+- a run appends its new guests and its session instead of rewriting history.
+
+Dates are stored normalized (``datetime.isoformat``), so they sort as text.
+Guests without a valid date are kept with an empty date and, like in the JSON
+scans, never fall inside a window.
+
+A new database is filled from the JSON files on first use; ``import_history.py``
+imports them again (rows that are already present are skipped).
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from .config import Config
+from .identity import canonical_name
+
+logger = logging.getLogger(__name__)
+
+PREVIOUS_GUESTS_FILE = "data/previous_guests.json"
+SEARCH_HISTORY_FILE = "data/search_history.json"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS guests (
+    id INTEGER PRIMARY KEY,
+    name_key TEXT NOT NULL,
+    date TEXT NOT NULL,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS guests_date ON guests (date);
+CREATE UNIQUE INDEX IF NOT EXISTS guests_name_date ON guests (name_key, date);
+
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    date TEXT NOT NULL UNIQUE,
+    record TEXT NOT NULL
+);
+"""
+
+
+def normalized_date(value) -> str:
+    """ISO date of a record as sortable text ("" when missing or invalid)."""
+    try:
+        return datetime.fromisoformat(value).isoformat()
+    except (TypeError, ValueError):
+        return ""
+
+
+class HistoryStore:
+    """
+    Guests and search sessions in one SQLite file.
+
+    Records are stored as JSON and returned as the same dicts that were
+    added, in insertion order. Safe to share between threads.
+
+    Args:
+        path: database file (created with its directory when missing)
+    """
+
+    def __init__(self, path: str | Path = "data/history.sqlite"):
+        self.path = Path(path)
+        self.created = not self.path.exists()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.executescript(SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    # Guests
+
+    def add_guests(self, guests: list[dict]) -> int:
+        """Append guests; returns how many were new (same name and date: skipped)."""
+        with self._lock, self._db:
+            return self._insert_guests(guests)
+
+    def guests_since(self, cutoff: datetime) -> list[dict]:
+        """Guests recommended on or after ``cutoff`` (uses the date index)."""
+        return self._records(
+            "SELECT record FROM guests WHERE date >= ? ORDER BY id", (cutoff.isoformat(),)
+        )
+
+    def guests_named(self, name: str) -> list[dict]:
+        """All recommendations of a person (canonical name, uses the name index)."""
+        return self._records(
+            "SELECT record FROM guests WHERE name_key = ? ORDER BY id", (canonical_name(name),)
+        )
+
+    def all_guests(self) -> list[dict]:
+        return self._records("SELECT record FROM guests ORDER BY id")
+
+    def replace_guests(self, guests: list[dict]) -> None:
+        """Replace all guests in one transaction (maintenance scripts that rewrite every record)."""
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM guests")
+            self._insert_guests(guests)
+
+    def _insert_guests(self, guests: list[dict]) -> int:
+        rows = [
+            (
+                canonical_name(guest.get("name", "")),
+                normalized_date(guest.get("date")),
+                _dump(guest),
+            )
+            for guest in guests
+        ]
+        before = self._db.total_changes
+        self._db.executemany(
+            "INSERT OR IGNORE INTO guests (name_key, date, record) VALUES (?, ?, ?)", rows
+        )
+        return self._db.total_changes - before
+
+    def count_guests(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM guests").fetchone()[0]
+
+    # Search sessions
+
+    def add_sessions(self, sessions: list[dict]) -> int:
+        """Append sessions; returns how many were new (same date: skipped)."""
+        rows = [(normalized_date(s.get("date")), _dump(s)) for s in sessions]
+        # Sessions without a valid date cannot be told apart; they are not stored
+        rows = [row for row in rows if row[0]]
+        with self._lock, self._db:
+            before = self._db.total_changes
+            self._db.executemany(
+                "INSERT OR IGNORE INTO sessions (date, record) VALUES (?, ?)", rows
+            )
+            return self._db.total_changes - before
+
+    def sessions_since(self, cutoff: datetime) -> list[dict]:
+        """Search sessions on or after ``cutoff`` (uses the date index)."""
+        return self._records(
+            "SELECT record FROM sessions WHERE date >= ? ORDER BY date", (cutoff.isoformat(),)
+        )
+
+    def all_sessions(self) -> list[dict]:
+        return self._records("SELECT record FROM sessions ORDER BY date")
+
+    def count_sessions(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    # Import
+
+    def import_json(
+        self,
+        previous_guests_file: str | Path = PREVIOUS_GUESTS_FILE,
+        search_history_file: str | Path = SEARCH_HISTORY_FILE,
+    ) -> tuple[int, int]:
+        """
+        Import the JSON files (missing files are skipped).
+
+        Returns:
+            (new guests, new sessions)
+        """
+        guests = _load_json(previous_guests_file, [])
+        history = _load_json(search_history_file, {"sessions": []})
+        return self.add_guests(guests), self.add_sessions(history.get("sessions", []))
+
+    def _records(self, sql: str, params: tuple = ()) -> list[dict]:
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+
+def open_history_store(path: str | Path | None = None) -> HistoryStore | None:
+    """
+    The configured store, or None when history lives in the JSON files.
+
+    A newly created database is filled from the JSON files first.
+    """
+    if Config.HISTORY_STORE != "sqlite":
+        return None
+
+    store = HistoryStore(path or Config.HISTORY_DB)
+    if store.created:
+        guests, sessions = store.import_json()
+        if guests or sessions:
+            logger.info(f"Imported {guests} guests and {sessions} sessions into {store.path}")
+    return store
+
+
+def _dump(record: dict) -> str:
+    return json.dumps(record, ensure_ascii=False, default=str)
+
+
+def _load_json(path: str | Path, default):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
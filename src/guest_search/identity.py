@@ -0,0 +1,258 @@
+"""Person identity: canonical name keys and a lookup index.
+
+"Prof. dr. Jan de Vries", "Jan De Vries" and "J. de Vries" refer to the same
+person. ``canonical_name`` folds diacritics, strips academic titles and
+normalizes Dutch tussenvoegsels; ``PersonIndex`` maps names to identities via
+an exact key (O(1)), initials + surname, and a trigram index for typos in the
+surname. Different given names or tussenvoegsels are always different people.
+"""
+
+import re
+import unicodedata
+from collections import defaultdict
+from collections.abc import Iterable
+
+# Titles before the name (Prof. dr. ir.) and postnominals after it (MSc, PhD)
+TITLES = frozenset({"prof", "dr", "drs", "ir", "ing", "mr", "ds", "bc", "dhr", "mevr", "mw", "sir"})
+POSTNOMINALS = frozenset({"msc", "phd", "mba", "bsc", "llm"})
+# Short degrees that are also surnames ("Jack Ma"): only a postnominal after a
+# comma ("Jan de Vries, MA") or when written with periods ("M.A.")
+SHORT_POSTNOMINALS = frozenset({"ma", "ba", "md"})
+
+# Dutch (and a few foreign) surname prefixes
+TUSSENVOEGSELS = frozenset(
+    {"van", "de", "der", "den", "het", "'t", "ten", "ter", "te", "in", "op", "von", "la", "le"}
+)
+
+# Abbreviated tussenvoegsels: "v.", "v.d.", "vd", "v/d"
+_ABBREVIATIONS = {"v": ["van"], "vd": ["van", "der"], "vdr": ["van", "der"]}
+
+# Minimum trigram similarity (Dice) of the surnames for a fuzzy match; given names
+# and tussenvoegsels must be equal, one typo in "Hendriksen" scores ~0.73
+FUZZY_THRESHOLD = 0.7
+
+_TOKEN_SPLIT = re.compile(r"[\s.,/\-]+")
+_NON_NAME_CHARS = re.compile(r"[^a-z0-9']")
+
+
+def _degree(letters: str, periods: str = r"\.?") -> str:
+    """Pattern for a degree with optional ("Ph.D.") or required ("M.A.") periods."""
+    return (periods + r"\s?").join(letters)
+
+
+def _degrees(names: Iterable[str], periods: str = r"\.?") -> str:
+    return "|".join(_degree(letters, periods) for letters in sorted(names))
+
+
+# A postnominal at the end of a (folded) name
+_POSTNOMINAL = re.compile(
+    r"(?:(?:,\s*|\s+)(?:" + _degrees(POSTNOMINALS) + r")"
+    r"|,\s*(?:" + _degrees(SHORT_POSTNOMINALS) + r")"
+    r"|\s+(?:" + _degrees(SHORT_POSTNOMINALS, periods=r"\.") + r"))\.?\s*$"
+)
+
+
+def _fold(text: str) -> str:
+    """Lowercase and strip diacritics ("Müller" -> "muller")."""
+    decomposed = unicodedata.normalize("NFKD", text.replace("’", "'"))
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).lower()
+
+
+def _title_free_tokens(text: str) -> list[str]:
+    tokens = [_NON_NAME_CHARS.sub("", token) for token in _TOKEN_SPLIT.split(text)]
+    tokens = [token for token in tokens if token and token != "'"]
+
+    while tokens and tokens[0] in TITLES:
+        tokens.pop(0)
+    return tokens
+
+
+def name_tokens(name: str) -> list[str]:
+    """Split a name into normalized tokens without titles and postnominals."""
+    text = _fold(name)
+    tokens = _title_free_tokens(text)
+
+    # Postnominals are never stripped down to a single name token
+    while (match := _POSTNOMINAL.search(text)) is not None:
+        rest = _title_free_tokens(text[: match.start()])
+        if len(rest) < 2:
+            break
+        text, tokens = text[: match.start()], rest
+
+    normalized = []
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        # The first token is a first name or initial ("V. de Vries"), never a prefix
+        if normalized and i < len(tokens) - 1:
+            if token == "v" and tokens[i + 1] == "d" and i < len(tokens) - 2:
+                normalized.extend(["van", "der"])
+                i += 2
+                continue
+            if token in _ABBREVIATIONS:
+                normalized.extend(_ABBREVIATIONS[token])
+                i += 1
+                continue
+        normalized.append(token)
+        i += 1
+
+    return normalized
+
+
+def canonical_name(name: str) -> str:
+    """Canonical key for exact identity matching ("Prof. dr. Jan de Vries" -> "jan de vries")."""
+    return " ".join(name_tokens(name))
+
+
+def _split_name(tokens: list[str]) -> tuple[list[str], list[str], str]:
+    """Return (given names, tussenvoegsels, surname core) for a tokenized name."""
+    if len(tokens) < 2:
+        return [], [], tokens[0] if tokens else ""
+
+    # Given names run until the first tussenvoegsel, or up to the last token
+    given_end = len(tokens) - 1
+    for i in range(1, len(tokens) - 1):
+        if tokens[i] in TUSSENVOEGSELS:
+            given_end = i
+            break
+
+    return tokens[:given_end], tokens[given_end:-1], tokens[-1]
+
+
+def _initials_only(given: list[str]) -> bool:
+    return all(len(token) == 1 for token in given)
+
+
+def _trigrams(key: str) -> set[str]:
+    padded = f"  {key} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class PersonIndex:
+    """
+    Index of persons by identity.
+
+    Records are dicts with a name field (or plain name strings). Every name
+    variant added for the same identity becomes an exact alias, so repeat
+    lookups are a single dict access.
+    """
+
+    def __init__(self, records: Iterable[dict | str] = (), name_field: str = "name"):
+        self.name_field = name_field
+        self._aliases: dict[str, str] = {}  # canonical key -> identity
+        # identity -> (given names, tussenvoegsels, surname core)
+        self._parts: dict[str, tuple[tuple[str, ...], tuple[str, ...], str]] = {}
+        self._by_surname: dict[tuple[tuple[str, ...], str], set[str]] = defaultdict(set)
+        self._by_trigram: dict[str, set[str]] = defaultdict(set)  # surname trigrams
+        self._records: dict[str, list] = {}
+        self._count = 0
+
+        for record in records:
+            self.add(record)
+
+    def __len__(self) -> int:
+        """Number of records added."""
+        return self._count
+
+    def __contains__(self, name: str) -> bool:
+        return self.lookup(name) is not None
+
+    def _name(self, record: dict | str) -> str:
+        if isinstance(record, str):
+            return record
+        return record.get(self.name_field) or ""
+
+    def lookup(self, name: str) -> str | None:
+        """Return the identity a name refers to, or None if unknown."""
+        tokens = name_tokens(name)
+        key = " ".join(tokens)
+        if not key:
+            return None
+
+        identity = self._aliases.get(key)
+        if identity is not None:
+            return identity
+
+        given, prefix, surname = _split_name(tokens)
+        if not given:
+            return None
+
+        if _initials_only(given):
+            # "J. de Vries" matches "Jan de Vries" when only one such person is known;
+            # a full name never resolves to initials ("Joost" may not be "J.")
+            matches = [
+                identity
+                for identity in self._by_surname.get((tuple(prefix), surname), ())
+                if self._has_initials(identity, given)
+            ]
+            return matches[0] if len(matches) == 1 else None
+
+        return self._fuzzy_lookup(tuple(given), tuple(prefix), surname)
+
+    def _has_initials(self, identity: str, initials: list[str]) -> bool:
+        """Whether a full-name identity starts with these initials."""
+        given = self._parts[identity][0]
+        return (
+            not _initials_only(list(given))
+            and len(initials) <= len(given)
+            and all(initial == name[0] for initial, name in zip(initials, given, strict=False))
+        )
+
+    def _fuzzy_lookup(self, given: tuple, prefix: tuple, surname: str) -> str | None:
+        """
+        Best surname trigram match above FUZZY_THRESHOLD.
+
+        Only typos in the surname are forgiven: given names and tussenvoegsels
+        must be equal ("Peter" is not "Pieter", "den Boer" is not "de Boer").
+        """
+        grams = _trigrams(surname)
+        shared: dict[str, int] = defaultdict(int)
+        for gram in grams:
+            for identity in self._by_trigram.get(gram, ()):
+                shared[identity] += 1
+
+        best, best_score = None, FUZZY_THRESHOLD
+        for identity, count in shared.items():
+            identity_given, identity_prefix, identity_surname = self._parts[identity]
+            if identity_given != given or identity_prefix != prefix:
+                continue
+            score = 2 * count / (len(grams) + len(_trigrams(identity_surname)))
+            if score >= best_score:
+                best, best_score = identity, score
+        return best
+
+    def add(self, record: dict | str) -> str | None:
+        """Add a record; returns its identity (None for records without a usable name)."""
+        self._count += 1
+        name = self._name(record)
+        tokens = name_tokens(name)
+        key = " ".join(tokens)
+        if not key:
+            return None
+
+        identity = self.lookup(name)
+        if identity is None:
+            identity = key
+            self._records[identity] = []
+            given, prefix, surname = _split_name(tokens)
+            self._parts[identity] = (tuple(given), tuple(prefix), surname)
+            if given:
+                self._by_surname[(tuple(prefix), surname)].add(identity)
+                for gram in _trigrams(surname):
+                    self._by_trigram[gram].add(identity)
+
+        self._aliases[key] = identity
+        self._records[identity].append(record)
+        return identity
+
+    def find(self, name: str) -> list:
+        """All records of the identity a name refers to, in insertion order."""
+        identity = self.lookup(name)
+        if identity is None:
+            return []
+        return list(self._records[identity])
+
+    def find_first(self, name: str):
+        """First record of the identity a name refers to, or None."""
+        records = self.find(name)
+        return records[0] if records else None
@@ -1,12 +1,14 @@
 """Interactive terminal UI for selecting and managing guests."""
 
 import json
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from rich.console import Console
 from rich.panel import Panel
 from rich.prompt import Prompt
 
+from .history_store import open_history_store
+from .identity import PersonIndex
 from .trello_manager import TrelloManager
 
 
@@ -29,14 +31,18 @@ class InteractiveGuestSelector:
             self.new_candidates = []
 
     def load_recent_guests(self, previous_guests_file: str = "data/previous_guests.json"):
-        """Load recent guests (last 2 weeks) from previous_guests.json."""
+        """Load recent guests (last 2 weeks) from previous_guests.json or the history store."""
+        store = open_history_store()
+        if store is not None:
+            self.recent_guests = store.guests_since(datetime.now() - timedelta(weeks=2))
+            store.close()
+            return
+
         try:
             with open(previous_guests_file, encoding="utf-8") as f:
                 all_guests = json.load(f)
 
             # Filter for last 2 weeks
-            from datetime import timedelta
-
             cutoff_date = datetime.now() - timedelta(weeks=2)
             self.recent_guests = []
 
@@ -191,10 +197,10 @@ class InteractiveGuestSelector:
                 guest_types.append("new")
 
         # Filter recent guests to exclude duplicates with new candidates
-        # Compare by name (case-insensitive)
-        new_candidate_names = {c.get("name", "").lower() for c in self.new_candidates}
+        # Compare by identity (titles, initials, spelling variants)
+        new_candidate_names = PersonIndex(self.new_candidates)
         filtered_recent_guests = [
-            g for g in self.recent_guests if g.get("name", "").lower() not in new_candidate_names
+            g for g in self.recent_guests if g.get("name", "") not in new_candidate_names
         ]
 
         # Add recent guests (excluding duplicates)
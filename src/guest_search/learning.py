@@ -0,0 +1,466 @@
+"""Incrementally maintained learning aggregates over the search history.
+
+Planning reads the learning insights (top queries, productive sources,
+previous strategies) of the last weeks and the sources used last week. A
+rescan parses every session date and rebuilds the source counts on each
+planning run, so its cost grows with the whole history.
+
+``LearningAggregates`` keeps the same numbers per ISO week and updates them
+when a session is added. A query for the last N weeks merges the week buckets
+inside the window and only looks at single sessions in the week the window
+starts in, so it reads O(window) instead of O(history). The merge uses the
+position of every session, query and source in the history, so ties sort as
+in the rescan and the results are identical (``consistency_errors`` checks
+this against ``scan_learning_insights`` / ``scan_recent_sources``).
+
+With a directory the week buckets are also stored on disk: one JSON file per
+week plus an index with the number of sessions added. A new process reads the
+index and only loads the week files a query needs, so planning in a fresh run
+doesn't bucket the whole history again.
+"""
+
+import json
+import logging
+import os
+import shutil
+from bisect import insort
+from datetime import datetime, timedelta
+from pathlib import Path
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+TOP_QUERIES = 5
+TOP_SOURCES = 5
+
+# Bump when the stored format of the week buckets changes (the store is rebuilt)
+STORE_VERSION = 1
+
+
+def source_domain(source: str) -> str:
+    """Domain of a source URL (the source itself when it has none)."""
+    return urlparse(source).netloc or source
+
+
+def _session_date(session: dict) -> datetime | None:
+    try:
+        return datetime.fromisoformat(session["date"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class _Totals:
+    """Mergeable counts of a set of sessions; positions keep the history order."""
+
+    def __init__(self):
+        self.sessions = 0
+        self.queries = 0
+        self.candidates = 0
+        self.successful = 0
+        # ((-candidates_found, position), query) of the best successful queries
+        self.top_queries: list[tuple] = []
+        # source/domain -> [count, position of first use]
+        self.sources: dict[str, list] = {}
+        self.domains: dict[str, list] = {}
+        # (position, strategy entry)
+        self.strategies: list[tuple] = []
+
+    def add_session(self, position: int, session: dict) -> None:
+        self.sessions += 1
+        for q_index, query in enumerate(session.get("queries", [])):
+            found = query.get("candidates_found", 0)
+            self.queries += 1
+            self.candidates += found
+            if found > 0:
+                self.successful += 1
+                self.top_queries.append(((-found, (position, q_index)), query))
+            for s_index, source in enumerate(query.get("successful_sources", [])):
+                first_use = (position, q_index, s_index)
+                _count(self.sources, source, 1, first_use)
+                _count(self.domains, source_domain(source), 1, first_use)
+        self.top_queries = sorted(self.top_queries, key=lambda item: item[0])[:TOP_QUERIES]
+
+        if session.get("strategy"):
+            entry = {
+                "week_focus": session["strategy"].get("week_focus", ""),
+                "candidates_found": session.get("total_candidates", 0),
+                "date": session.get("date", ""),
+            }
+            self.strategies.append((position, entry))
+
+    def merge(self, other: "_Totals") -> None:
+        self.sessions += other.sessions
+        self.queries += other.queries
+        self.candidates += other.candidates
+        self.successful += other.successful
+        self.top_queries = sorted(self.top_queries + other.top_queries, key=lambda item: item[0])[
+            :TOP_QUERIES
+        ]
+        for source, (count, first_use) in other.sources.items():
+            _count(self.sources, source, count, first_use)
+        for domain, (count, first_use) in other.domains.items():
+            _count(self.domains, domain, count, first_use)
+        self.strategies.extend(other.strategies)
+
+    def to_json(self) -> dict:
+        return {
+            "sessions": self.sessions,
+            "queries": self.queries,
+            "candidates": self.candidates,
+            "successful": self.successful,
+            "top_queries": self.top_queries,
+            "sources": self.sources,
+            "domains": self.domains,
+            "strategies": self.strategies,
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> "_Totals":
+        # JSON turns the position tuples into lists; they are compared with tuples
+        totals = cls()
+        totals.sessions = data["sessions"]
+        totals.queries = data["queries"]
+        totals.candidates = data["candidates"]
+        totals.successful = data["successful"]
+        totals.top_queries = [
+            ((found, tuple(position)), query) for (found, position), query in data["top_queries"]
+        ]
+        totals.sources = {
+            key: [count, tuple(first)] for key, (count, first) in data["sources"].items()
+        }
+        totals.domains = {
+            key: [count, tuple(first)] for key, (count, first) in data["domains"].items()
+        }
+        totals.strategies = [(position, entry) for position, entry in data["strategies"]]
+        return totals
+
+    def insights(self) -> dict | None:
+        """Insights in the format of ``scan_learning_insights``."""
+        if not self.sessions:
+            return None
+
+        return {
+            "total_sessions": self.sessions,
+            "total_queries": self.queries,
+            "successful_queries": self.successful,
+            "top_performing_queries": [query for _key, query in self.top_queries],
+            "top_sources": _ranked(self.sources, TOP_SOURCES),
+            "top_domains": _ranked(self.domains, TOP_SOURCES),
+            "previous_strategies": [entry for _position, entry in sorted(self.strategies)],
+            "avg_candidates_per_query": self.candidates / self.queries if self.queries else 0,
+        }
+
+
+class LearningAggregates:
+    """
+    Learning totals per ISO week, updated per added session.
+
+    Sessions are added in history order (``add``); ``len`` is the number of
+    sessions added, so a caller can add only the tail of a growing list.
+
+    With a ``directory``, ``save`` writes the changed weeks and the index, and
+    a new instance loads a week file the first time a query or ``add`` needs
+    it. Without one everything stays in memory.
+    """
+
+    def __init__(self, directory: str | Path | None = None):
+        self.directory = Path(directory) if directory is not None else None
+        self._added = 0
+        # Date of the last added session (to recognize the same history later)
+        self._last_date = None
+        # Monday of the week -> totals of all sessions in that week (None = not loaded)
+        self._weeks: dict[datetime, _Totals | None] = {}
+        # Monday of the week -> [(date, position, session)] for the window boundary
+        self._week_sessions: dict[datetime, list[tuple]] = {}
+        self._week_starts: list[datetime] = []
+        self._changed: set[datetime] = set()
+        if self.directory is not None:
+            self._load_index()
+
+    def __len__(self) -> int:
+        return self._added
+
+    def covers(self, sessions: list[dict]) -> bool:
+        """True if the added sessions are the first ``len(self)`` of ``sessions``."""
+        if self._added > len(sessions):
+            return False
+        return self._added == 0 or sessions[self._added - 1].get("date") == self._last_date
+
+    def add(self, session: dict) -> None:
+        position = self._added
+        self._added += 1
+        self._last_date = session.get("date")
+
+        date = _session_date(session)
+        if date is None:
+            return
+
+        week = _week_start(date)
+        totals, week_sessions = self._bucket(week)
+        if week_sessions and week_sessions[-1][1] >= position:
+            # Stored by a save that didn't get to write the index
+            return
+        totals.add_session(position, session)
+        week_sessions.append((date, position, session))
+        self._changed.add(week)
+
+    def reset(self) -> None:
+        """Drop all sessions, also the stored ones."""
+        self._added = 0
+        self._last_date = None
+        self._weeks = {}
+        self._week_sessions = {}
+        self._week_starts = []
+        self._changed = set()
+        if self.directory is not None:
+            shutil.rmtree(self.directory / "weeks", ignore_errors=True)
+            (self.directory / "index.json").unlink(missing_ok=True)
+
+    def save(self) -> None:
+        """Write the changed weeks, then the index (no-op without a directory)."""
+        if self.directory is None:
+            return
+
+        for week in sorted(self._changed):
+            stored = {
+                "totals": self._weeks[week].to_json(),
+                "sessions": [
+                    [date.isoformat(), position, _stored_session(session)]
+                    for date, position, session in self._week_sessions[week]
+                ],
+            }
+            if not _write_json(self._week_path(week), stored):
+                return
+        self._changed = set()
+
+        index = {"version": STORE_VERSION, "sessions": self._added, "last_date": self._last_date}
+        _write_json(self.directory / "index.json", index)
+
+    def _load_index(self):
+        path = self.directory / "index.json"
+        try:
+            with open(path, encoding="utf-8") as f:
+                index = json.load(f)
+        except FileNotFoundError:
+            index = None
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Failed to load learning index {path}: {e}")
+            index = None
+
+        if not isinstance(index, dict) or index.get("version") != STORE_VERSION:
+            # Week files without a usable index can't be trusted
+            self.reset()
+            return
+
+        self._added = index["sessions"]
+        self._last_date = index.get("last_date")
+        for week_path in (self.directory / "weeks").glob("*.json"):
+            self._weeks[datetime.fromisoformat(week_path.stem)] = None
+        self._week_starts = sorted(self._weeks)
+
+    def _week_path(self, week: datetime) -> Path:
+        return self.directory / "weeks" / f"{week.date().isoformat()}.json"
+
+    def _bucket(self, week: datetime) -> tuple[_Totals, list[tuple]]:
+        """Totals and sessions of a week (loaded from disk or created on first use)."""
+        if week not in self._weeks:
+            self._weeks[week] = _Totals()
+            self._week_sessions[week] = []
+            insort(self._week_starts, week)
+        elif self._weeks[week] is None:
+            self._load_week(week)
+        return self._weeks[week], self._week_sessions[week]
+
+    def _load_week(self, week: datetime):
+        path = self._week_path(week)
+        try:
+            with open(path, encoding="utf-8") as f:
+                stored = json.load(f)
+            self._weeks[week] = _Totals.from_json(stored["totals"])
+            self._week_sessions[week] = [
+                (datetime.fromisoformat(date), position, session)
+                for date, position, session in stored["sessions"]
+            ]
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            # Counts as empty for now; without the index the next run rebuilds the store
+            logger.warning(f"Failed to load learning week {path}: {e}")
+            (self.directory / "index.json").unlink(missing_ok=True)
+            self._weeks[week] = _Totals()
+            self._week_sessions[week] = []
+
+    def _window(self, cutoff: datetime) -> _Totals:
+        """Totals of all sessions dated on or after ``cutoff``."""
+        totals = _Totals()
+        for week in reversed(self._week_starts):
+            if week >= cutoff:
+                totals.merge(self._bucket(week)[0])
+                continue
+            if week + timedelta(weeks=1) > cutoff:
+                # The window starts in this week: only its sessions from the cutoff on
+                for date, position, session in self._bucket(week)[1]:
+                    if date >= cutoff:
+                        totals.add_session(position, session)
+            break
+        return totals
+
+    def insights(self, now: datetime, weeks: int = 4) -> dict | None:
+        """Learning insights of the last ``weeks`` weeks (None without sessions)."""
+        return self._window(now - timedelta(weeks=weeks)).insights()
+
+    def recent_sources(self, now: datetime, weeks: int = 1) -> list[str]:
+        """Sources used in the last ``weeks`` weeks, in order of first use."""
+        sources = self._window(now - timedelta(weeks=weeks)).sources
+        return sorted(sources, key=lambda source: sources[source][1])
+
+
+def scan_learning_insights(sessions: list[dict], now: datetime, weeks: int = 4) -> dict | None:
+    """Learning insights from a full rescan of the history (reference implementation)."""
+    cutoff_date = now - timedelta(weeks=weeks)
+    recent_sessions = []
+
+    for session in sessions:
+        session_date = _session_date(session)
+        if session_date is not None and session_date >= cutoff_date:
+            recent_sessions.append(session)
+
+    if not recent_sessions:
+        return None
+
+    all_queries = []
+    for session in recent_sessions:
+        for query in session.get("queries", []):
+            all_queries.append(query)
+
+    successful_queries = [q for q in all_queries if q.get("candidates_found", 0) > 0]
+    successful_queries.sort(key=lambda x: x.get("candidates_found", 0), reverse=True)
+
+    source_stats = {}
+    domain_stats = {}
+    for query in all_queries:
+        for source in query.get("successful_sources", []):
+            source_stats[source] = source_stats.get(source, 0) + 1
+            domain = source_domain(source)
+            domain_stats[domain] = domain_stats.get(domain, 0) + 1
+
+    top_sources = sorted(source_stats.items(), key=lambda x: x[1], reverse=True)[:TOP_SOURCES]
+    top_domains = sorted(domain_stats.items(), key=lambda x: x[1], reverse=True)[:TOP_SOURCES]
+
+    previous_strategies = []
+    for session in recent_sessions:
+        if "strategy" in session and session["strategy"]:
+            previous_strategies.append(
+                {
+                    "week_focus": session["strategy"].get("week_focus", ""),
+                    "candidates_found": session.get("total_candidates", 0),
+                    "date": session.get("date", ""),
+                }
+            )
+
+    return {
+        "total_sessions": len(recent_sessions),
+        "total_queries": len(all_queries),
+        "successful_queries": len(successful_queries),
+        "top_performing_queries": successful_queries[:TOP_QUERIES],
+        "top_sources": [source for source, count in top_sources],
+        "top_domains": [domain for domain, count in top_domains],
+        "previous_strategies": previous_strategies,
+        "avg_candidates_per_query": (
+            sum(q.get("candidates_found", 0) for q in all_queries) / len(all_queries)
+            if all_queries
+            else 0
+        ),
+    }
+
+
+def scan_recent_sources(sessions: list[dict], now: datetime, weeks: int = 1) -> list[str]:
+    """Sources used in the last ``weeks`` weeks from a full rescan (reference implementation)."""
+    cutoff_date = now - timedelta(weeks=weeks)
+    recent_sources = {}
+
+    for session in sessions:
+        session_date = _session_date(session)
+        if session_date is not None and session_date >= cutoff_date:
+            for query in session.get("queries", []):
+                for source in query.get("successful_sources", []):
+                    recent_sources[source] = None
+
+    return list(recent_sources)
+
+
+def consistency_errors(
+    aggregates: LearningAggregates,
+    sessions: list[dict],
+    now: datetime,
+    insight_weeks: int = 4,
+    source_weeks: int = 1,
+) -> list[str]:
+    """Differences between the aggregates and a full rescan (empty when consistent)."""
+    errors = []
+
+    if len(aggregates) != len(sessions):
+        errors.append(f"aggregates cover {len(aggregates)} of {len(sessions)} sessions")
+
+    expected = scan_learning_insights(sessions, now, insight_weeks)
+    actual = aggregates.insights(now, insight_weeks)
+    if (expected is None) != (actual is None):
+        errors.append(f"insights: expected {expected!r}, got {actual!r}")
+    elif expected is not None:
+        for key in expected:
+            if expected[key] != actual.get(key):
+                errors.append(
+                    f"insights[{key!r}]: expected {expected[key]!r}, got {actual.get(key)!r}"
+                )
+
+    expected_sources = scan_recent_sources(sessions, now, source_weeks)
+    actual_sources = aggregates.recent_sources(now, source_weeks)
+    if expected_sources != actual_sources:
+        errors.append(f"recent sources: expected {expected_sources!r}, got {actual_sources!r}")
+
+    return errors
+
+
+def _week_start(date: datetime) -> datetime:
+    # Same timezone as the session dates, so naive and aware dates never mix in a bucket key
+    return (date - timedelta(days=date.weekday())).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+
+
+def _stored_session(session: dict) -> dict:
+    """The fields of a session that the aggregates read (for the week files)."""
+    stored = {
+        "date": session.get("date"),
+        "total_candidates": session.get("total_candidates", 0),
+        "queries": session.get("queries", []),
+    }
+    if session.get("strategy"):
+        stored["strategy"] = {"week_focus": session["strategy"].get("week_focus", "")}
+    return stored
+
+
+def _write_json(path: Path, data) -> bool:
+    tmp_path = path.with_suffix(".tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, default=str)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Failed to store learning aggregates {path}: {e}")
+        return False
+    return True
+
+
+def _count(stats: dict, key: str, count: int, first_use: tuple) -> None:
+    entry = stats.get(key)
+    if entry is None:
+        stats[key] = [count, first_use]
+    else:
+        entry[0] += count
+        entry[1] = min(entry[1], first_use)
+
+
+def _ranked(stats: dict, limit: int) -> list[str]:
+    """Keys by count, ties by first use (as a stable sort over the history would)."""
+    ranked = sorted(stats.items(), key=lambda item: (-item[1][0], item[1][1]))
+    return [key for key, _entry in ranked[:limit]]
@@ -0,0 +1,162 @@
+"""Process-wide spaCy NER service.
+
+Loading ``nl_core_news_md`` takes seconds and several hundred MB, so the
+pipeline is loaded lazily once per process and shared by every extraction.
+Only the NER component (plus the tok2vec it listens to) runs; sentence
+boundaries for the person context come from a lightweight sentencizer.
+Results are cached by page text hash (see ``ner_cache``), so a page that was
+already processed by any query, session or worker skips NER entirely.
+"""
+
+import threading
+from collections.abc import Callable, Iterable
+
+from .config import Config
+from .extraction import (
+    REGEX_EXTRACTOR_VERSION,
+    SPACY_MODEL,
+    extract_persons_regex,
+    persons_from_doc,
+)
+from .ner_cache import NerCache
+
+# Texts per nlp.pipe batch
+BATCH_SIZE = 16
+
+# Bump when persons_from_doc output changes (part of the cache key)
+PERSONS_FORMAT_VERSION = "persons-2"
+
+
+def _load_spacy_model(model_name: str):
+    import spacy
+
+    return spacy.load(model_name)
+
+
+class NerService:
+    """
+    Lazily initialised spaCy NER pipeline.
+
+    Falls back to the regex extractor when spaCy or the model is unavailable.
+    """
+
+    def __init__(
+        self,
+        model_name: str = SPACY_MODEL,
+        loader: Callable | None = None,
+        cache: NerCache | None = None,
+    ):
+        self.model_name = model_name
+        self._loader = loader or _load_spacy_model
+        self.cache = cache
+        self._nlp = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Load the pipeline (once). Returns the nlp object or None if unavailable."""
+        if self._loaded:
+            return self._nlp
+
+        with self._lock:
+            if not self._loaded:
+                try:
+                    self._nlp = self._prepare(self._loader(self.model_name))
+                except (ImportError, OSError):
+                    # spaCy not installed or model not downloaded
+                    self._nlp = None
+                self._loaded = True
+
+        return self._nlp
+
+    @staticmethod
+    def _prepare(nlp):
+        """Disable every pipe except NER (and its tok2vec), add a sentencizer."""
+        keep = {"ner", "sentencizer"}
+
+        # Keep the shared tok2vec only when NER listens to it
+        if "tok2vec" in nlp.pipe_names:
+            listeners = getattr(nlp.get_pipe("tok2vec"), "listening_components", [])
+            if "ner" in listeners:
+                keep.add("tok2vec")
+
+        nlp.select_pipes(disable=[name for name in nlp.pipe_names if name not in keep])
+
+        # ent.sent needs sentence boundaries; parser/senter are disabled now
+        if "sentencizer" not in nlp.component_names:
+            nlp.add_pipe("sentencizer", first=True)
+
+        return nlp
+
+    @property
+    def available(self) -> bool:
+        """Whether spaCy NER is used (False = regex fallback)."""
+        return self.load() is not None
+
+    @property
+    def model_version(self) -> str | None:
+        """Version of the loaded model, or None for the regex fallback."""
+        nlp = self.load()
+        if nlp is None:
+            return None
+        return nlp.meta.get("version")
+
+    @property
+    def extractor_version(self) -> str:
+        """Identifies the extractor output; changes with the model name or version."""
+        if self.load() is None:
+            return REGEX_EXTRACTOR_VERSION
+        return f"{self.model_name}-{self.model_version}-{PERSONS_FORMAT_VERSION}"
+
+    def _extract_uncached(self, texts: list[str]) -> list[list[dict]]:
+        nlp = self.load()
+        if nlp is None:
+            return [extract_persons_regex(text) for text in texts]
+        if len(texts) == 1:
+            return [persons_from_doc(nlp(texts[0]), texts[0])]
+
+        return [
+            persons_from_doc(doc, text)
+            for doc, text in zip(nlp.pipe(texts, batch_size=BATCH_SIZE), texts, strict=True)
+        ]
+
+    def extract_persons(self, text: str) -> list[dict]:
+        """Extract persons from a single text."""
+        return self.extract_persons_batch([text])[0]
+
+    def extract_persons_batch(self, texts: Iterable[str]) -> list[list[dict]]:
+        """Extract persons from many texts at once using nlp.pipe (cached texts are skipped)."""
+        texts = list(texts)
+        if self.cache is None:
+            return self._extract_uncached(texts)
+
+        version = self.extractor_version
+        results = [self.cache.get(text, version) for text in texts]
+        missing = [i for i, persons in enumerate(results) if persons is None]
+
+        if missing:
+            extracted = self._extract_uncached([texts[i] for i in missing])
+            for i, persons in zip(missing, extracted, strict=True):
+                self.cache.put(texts[i], version, persons)
+                results[i] = persons
+
+        return results
+
+
+_service: NerService | None = None
+_service_lock = threading.Lock()
+
+
+def get_ner_service() -> NerService:
+    """Return the process-wide NER service (created on first use)."""
+    global _service
+
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                cache = None
+                if Config.NER_CACHE_ENABLED:
+                    cache_dir = Config.NER_CACHE_DIR if Config.NER_CACHE_DISK else None
+                    cache = NerCache(cache_dir, Config.NER_CACHE_SIZE)
+                _service = NerService(cache=cache)
+    return _service
@@ -0,0 +1,110 @@
+"""Content-hash keyed cache for person extraction results.
+
+The same page is often fetched by several queries, sessions or agents. Results
+are keyed by a hash of the cleaned page text and stored per extractor version
+(spaCy model name + version, or the regex extractor version), so a model
+upgrade automatically starts with an empty cache.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+def text_hash(text: str) -> str:
+    """Return the cache key for a cleaned page text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class NerCache:
+    """
+    Two-level cache: in-memory LRU in front of one JSON file per page on disk.
+
+    Entries live in ``<cache_dir>/<extractor version>/<hash>.json``, so worker
+    processes share results through the disk and never rewrite a shared file.
+    Without a ``cache_dir`` only the in-memory LRU is used.
+    """
+
+    def __init__(self, cache_dir: str | None = "data/cache/ner", max_entries: int = 512):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.max_entries = max_entries
+        self._memory: OrderedDict[tuple[str, str], list[dict]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, version: str, key: str) -> Path:
+        # Model versions may contain characters that are unsafe in paths
+        namespace = re.sub(r"[^A-Za-z0-9._-]", "_", version)
+        return self.cache_dir / namespace / f"{key}.json"
+
+    def get(self, text: str, version: str) -> list[dict] | None:
+        """Return cached persons for this text and extractor version, or None."""
+        key = text_hash(text)
+
+        with self._lock:
+            persons = self._memory.get((version, key))
+            if persons is not None:
+                self._memory.move_to_end((version, key))
+                self.hits += 1
+                return [dict(person) for person in persons]
+            if self.cache_dir is None:
+                self.misses += 1
+                return None
+
+        path = self._path(version, key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                persons = json.load(f)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Failed to load NER cache entry {path}: {e}")
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self._remember((version, key), persons)
+            self.hits += 1
+        return [dict(person) for person in persons]
+
+    def put(self, text: str, version: str, persons: list[dict]):
+        """Store persons for this text and extractor version."""
+        key = text_hash(text)
+
+        with self._lock:
+            self._remember((version, key), [dict(person) for person in persons])
+        if self.cache_dir is None:
+            return
+
+        path = self._path(version, key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temp file first so concurrent readers never see half a file
+            tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(persons, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.error(f"Failed to save NER cache entry {path}: {e}")
+
+    def _remember(self, entry: tuple[str, str], persons: list[dict]):
+        self._memory[entry] = persons
+        self._memory.move_to_end(entry)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def clear_memory(self):
+        """Drop the in-memory entries (disk entries are kept)."""
+        with self._lock:
+            self._memory.clear()
@@ -0,0 +1,162 @@
+"""Person-centric passage selection for fetched pages.
+
+Instead of sending the first N characters of a page to the agent, we assemble
+the windows around detected persons and query terms, so people further down
+the page are not cut off by truncation.
+"""
+
+import re
+
+PASSAGE_SEPARATOR = "\n[...]\n"
+
+# Window around a hit: a bit of lead-in for the role, more after for affiliation
+CONTEXT_BEFORE = 150
+CONTEXT_AFTER = 350
+
+# Page lead (title/intro) is always a candidate passage
+LEAD_CHARS = 300
+
+# Limit windows per query term so one frequent word can't flood the budget
+MAX_HITS_PER_TERM = 5
+
+# Words that appear in nearly every query and carry no signal on the page
+_QUERY_STOPWORDS = frozenset(
+    {
+        "de",
+        "het",
+        "een",
+        "van",
+        "en",
+        "in",
+        "op",
+        "voor",
+        "met",
+        "over",
+        "bij",
+        "naar",
+        "the",
+        "and",
+        "for",
+        "with",
+        "of",
+        "nederland",
+        "nederlandse",
+        "dutch",
+        "netherlands",
+        "site",
+    }
+)
+
+
+def query_terms(query: str) -> list[str]:
+    """Extract lowercase search terms from a query string.
+
+    Search operators (site:, quotes) and stopwords are dropped, years and
+    other pure numbers too since they rarely mark a relevant passage.
+    """
+    if not query:
+        return []
+
+    query = re.sub(r"\bsite:\S+", " ", query.lower())
+    terms = []
+    for word in re.findall(r"\w+", query):
+        if len(word) < 3 or word.isdigit() or word in _QUERY_STOPWORDS:
+            continue
+        if word not in terms:
+            terms.append(word)
+    return terms
+
+
+def _snap_start(text: str, start: int) -> int:
+    """Move a window start back to the start of its line when that is close by."""
+    line_start = text.rfind("\n", 0, start) + 1
+    return line_start if start - line_start <= 80 else start
+
+
+def _snap_end(text: str, end: int) -> int:
+    """Move a window end forward to the end of its line when that is close by."""
+    line_end = text.find("\n", end)
+    if line_end == -1:
+        line_end = len(text)
+    return line_end if line_end - end <= 80 else end
+
+
+def select_passages(
+    text: str,
+    persons: list[dict],
+    terms: list[str] | None = None,
+    budget: int = 4000,
+) -> list[str]:
+    """Select the most relevant passages of ``text`` within ``budget`` characters.
+
+    Args:
+        text: Cleaned page text
+        persons: Extracted persons; ``position`` (char offset) is used when present
+        terms: Lowercase query terms (see ``query_terms``)
+        budget: Maximum number of characters of passage text (incl. separators)
+
+    Returns:
+        Passages in document order. Short pages are returned as a single passage.
+    """
+    if len(text) <= budget:
+        return [text] if text else []
+
+    # Collect (start, end, weight) hits
+    hits: list[tuple[int, int, float]] = []
+
+    for person in persons:
+        name = person.get("name", "")
+        position = person.get("position")
+        if position is None:
+            position = text.find(name)
+        if position is None or position < 0:
+            continue
+        weight = 4.0 if person.get("title_match") else 3.0
+        hits.append((position, position + len(name), weight))
+
+    lower_text = text.lower()
+    for term in terms or []:
+        for count, match in enumerate(re.finditer(re.escape(term), lower_text)):
+            if count >= MAX_HITS_PER_TERM:
+                break
+            hits.append((match.start(), match.end(), 1.0))
+
+    if not hits:
+        return [text[:budget]]
+
+    # Expand hits into windows and merge overlapping ones into segments
+    windows = [(0, LEAD_CHARS, 0.5, 0)]
+    for start, end, weight in hits:
+        win_start = _snap_start(text, max(0, start - CONTEXT_BEFORE))
+        win_end = _snap_end(text, min(len(text), end + CONTEXT_AFTER))
+        windows.append((win_start, win_end, weight, start))
+    windows.sort()
+
+    segments: list[list] = []  # [start, end, score]
+    for win_start, win_end, weight, _hit in windows:
+        if segments and win_start <= segments[-1][1]:
+            segments[-1][1] = max(segments[-1][1], win_end)
+            segments[-1][2] += weight
+        else:
+            segments.append([win_start, win_end, weight])
+
+    # Greedy selection: densest segments first
+    ranked = sorted(segments, key=lambda s: (-s[2] / (s[1] - s[0] + 1), s[0]))
+    remaining = budget
+    selected: list[tuple[int, int]] = []
+
+    for seg_start, seg_end, _score in ranked:
+        cost = seg_end - seg_start + (len(PASSAGE_SEPARATOR) if selected else 0)
+        if cost <= remaining:
+            selected.append((seg_start, seg_end))
+            remaining -= cost
+        elif remaining > CONTEXT_AFTER:
+            # Take the head of the segment (hits come right after its start)
+            usable = remaining - (len(PASSAGE_SEPARATOR) if selected else 0)
+            selected.append((seg_start, seg_start + usable))
+            remaining = 0
+        if remaining <= 0:
+            break
+
+    selected.sort()
+    return [text[start:end].strip() for start, end in selected if text[start:end].strip()]
@@ -0,0 +1,128 @@
+"""Structured planning output, parsed while it streams.
+
+The planner hands in its strategy through the ``submit_search_strategy`` tool
+(see ``tools.get_strategy_tool``). The tool input arrives as
+``input_json_delta`` chunks; ``QueryStreamParser`` picks every complete item of
+``search_queries`` out of those chunks, so the search phase can start on the
+first query while the planner is still writing the rest of the plan.
+
+Extended thinking cannot be combined with a forced ``tool_choice``, so with a
+thinking budget the tool is offered with ``tool_choice: auto`` and the prompt
+asks for it (see ``strategy_tool_choice``). A plan that still comes back as
+text is parsed from the final message by the agent.
+"""
+
+import json
+from collections.abc import Callable
+from typing import Any
+
+STRATEGY_TOOL = "submit_search_strategy"
+
+QUERIES_KEY = "search_queries"
+
+
+def strategy_tool_choice(thinking_budget: int) -> dict:
+    """Forced strategy tool, or ``auto`` when extended thinking is enabled."""
+    if thinking_budget > 0:
+        return {"type": "auto"}
+    return {"type": "tool", "name": STRATEGY_TOOL}
+
+
+def strategy_tool_input(message: Any) -> dict | None:
+    """Input of the strategy tool call in a planning response (None without one)."""
+    for block in message.content:
+        if block.type == "tool_use" and block.name == STRATEGY_TOOL:
+            return block.input if isinstance(block.input, dict) else None
+    return None
+
+
+class QueryStreamParser:
+    """
+    Incremental parser for the strategy tool input.
+
+    ``feed`` takes the next chunk of the input JSON and returns the
+    ``search_queries`` items that were completed by it. Only the top-level
+    ``search_queries`` array is tracked; strings (including escaped quotes and
+    braces inside them) are skipped, so nothing is parsed twice.
+    """
+
+    def __init__(self):
+        self._text = ""
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_key = ""
+        self._in_queries = False
+        self._item_start = 0
+
+    def feed(self, chunk: str) -> list[dict]:
+        completed = []
+        offset = len(self._text)
+        self._text += chunk
+
+        for position in range(offset, len(self._text)):
+            char = self._text[position]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        # Keys and values at the top level; the key is the string before '['
+                        self._last_key = self._text[self._string_start : position]
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = position + 1
+            elif char in "{[":
+                self._depth += 1
+                if char == "[" and self._depth == 2 and self._last_key == QUERIES_KEY:
+                    self._in_queries = True
+                elif char == "{" and self._in_queries and self._depth == 3:
+                    self._item_start = position
+            elif char in "}]":
+                if char == "}" and self._in_queries and self._depth == 3:
+                    item = self._parse(self._text[self._item_start : position + 1])
+                    if item is not None:
+                        completed.append(item)
+                elif char == "]" and self._in_queries and self._depth == 2:
+                    self._in_queries = False
+                self._depth -= 1
+
+        return completed
+
+    @staticmethod
+    def _parse(item_json: str) -> dict | None:
+        try:
+            item = json.loads(item_json)
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(item, dict) or not item.get("query"):
+            return None
+        return item
+
+
+def stream_strategy(client: Any, request: dict, on_query: Callable[[dict], None]) -> Any:
+    """
+    Stream a planning request and call ``on_query`` for each completed query.
+
+    Returns the final message, which holds the full strategy (tool input, or
+    text when the model did not use the tool).
+    """
+    parser = None
+    with client.messages.stream(**request) as message_stream:
+        for event in message_stream:
+            if event.type == "content_block_start":
+                block = event.content_block
+                is_strategy = block.type == "tool_use" and block.name == STRATEGY_TOOL
+                parser = QueryStreamParser() if is_strategy else None
+            elif event.type == "content_block_delta" and parser is not None:
+                if event.delta.type == "input_json_delta":
+                    for query_obj in parser.feed(event.delta.partial_json):
+                        on_query(query_obj)
+        return message_stream.get_final_message()
@@ -0,0 +1,72 @@
+"""Prompt caching helpers for the search conversation.
+
+The request prefix is ordered tools -> system -> messages. The static search
+instructions live in ``system`` with a cache breakpoint at its end, so tools +
+instructions form one stable cached prefix shared by every query (and every
+parallel worker). A second, rolling breakpoint on the latest user message lets
+the growing conversation be read from cache on the next turn.
+"""
+
+from typing import Any
+
+EPHEMERAL = {"type": "ephemeral"}
+
+# Price multipliers relative to uncached input tokens (Anthropic prompt caching)
+CACHE_READ_MULTIPLIER = 0.1
+CACHE_WRITE_MULTIPLIER = 1.25
+
+
+def system_prompt(text: str, enabled: bool) -> str | list[dict]:
+    """System prompt with a stable cache breakpoint (plain string when caching is off)."""
+    if not enabled:
+        return text
+    return [{"type": "text", "text": text, "cache_control": EPHEMERAL}]
+
+
+def with_message_breakpoint(conversation: list[dict]) -> list[dict]:
+    """
+    Copy of the conversation with one cache breakpoint on the last user message.
+
+    The conversation itself is not modified, so older messages never carry a
+    stale breakpoint (the API allows at most four).
+    """
+    for index in range(len(conversation) - 1, -1, -1):
+        message = conversation[index]
+        if message["role"] != "user":
+            continue
+
+        content = message["content"]
+        if isinstance(content, str):
+            blocks = [{"type": "text", "text": content}]
+        else:
+            blocks = list(content)
+        if not blocks or not isinstance(blocks[-1], dict):
+            return conversation
+
+        blocks[-1] = {**blocks[-1], "cache_control": EPHEMERAL}
+        return [*conversation[:index], {**message, "content": blocks}, *conversation[index + 1 :]]
+
+    return conversation
+
+
+def cache_report(turns: list[dict[str, Any]]) -> dict:
+    """
+    Prompt cache statistics over recorded turns (see ConversationCompactor.turns).
+
+    ``read_ratio`` is the share of all input tokens served from cache;
+    ``saved_tokens`` is the saving expressed in uncached input tokens.
+    """
+    uncached = sum(turn["input_tokens"] for turn in turns)
+    read = sum(turn["cache_read_input_tokens"] for turn in turns)
+    written = sum(turn["cache_creation_input_tokens"] for turn in turns)
+    total = uncached + read + written
+
+    saved = read * (1 - CACHE_READ_MULTIPLIER) - written * (CACHE_WRITE_MULTIPLIER - 1)
+    return {
+        "turns": len(turns),
+        "input_tokens": total,
+        "cache_read_input_tokens": read,
+        "cache_creation_input_tokens": written,
+        "read_ratio": read / total if total else 0.0,
+        "saved_tokens": round(saved),
+    }
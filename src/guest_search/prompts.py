@@ -70,6 +70,15 @@ Verschillende invalshoeken dekken
 Denk grondig na voordat je de strategie formuleert. Gebruik je thinking budget om de \
 beste aanpak te bepalen."""
 
+# Planning via de submit_search_strategy tool (achter PLANNING_PROMPT geplakt)
+PLANNING_TOOL_INSTRUCTION = """
+
+## Aanleveren
+
+Lever het JSON-object aan via de tool `submit_search_strategy`, niet als tekst. \
+Zet de zoekopdrachten met prioriteit "high" vooraan: het zoeken begint al met de \
+eerste zoekopdracht terwijl je de rest nog schrijft."""
+
 # Cacheable part of search prompt (static instructions - repeated 8-12x per session)
 SEARCH_EXECUTION_PROMPT_CACHEABLE = """## 🔍 Zoek Instructies (CACHEABLE)
 
@@ -219,7 +228,8 @@ Als je een interessante persoon vindt met voldoende informatie:
 
 Werk systematisch en fetch URLs om echte personen te vinden!"""
 
-# Dynamic part of search prompt (changes per query)
+# Dynamic part of search prompt (changes per query, appended as user message;
+# the static part above is sent once as cached system prompt)
 SEARCH_EXECUTION_PROMPT_DYNAMIC = """## 📊 Huidige Sessie Status
 
 - Zoekopdrachten uitgevoerd: {searches_done}/{total_searches}
@@ -231,35 +241,10 @@ SEARCH_EXECUTION_PROMPT_DYNAMIC = """## 📊 Huidige Sessie Status
 
 **Rationale**: {query_rationale}
 
-Voer deze query nu uit volgens de bovenstaande instructies."""
-
-REPORT_GENERATION_PROMPT = """
-Je taak: Maak een rapport van de gevonden kandidaten voor AIToday Live.
-
-## Nieuwe kandidaten deze week
-{candidates_json}
+Voer deze query nu uit volgens de zoekinstructies."""
 
-## Recent aanbevolen kandidaten (laatste 2 weken)
-{recent_guests_json}
-
-Indicatoren:
-
-## STAP 1: Verrijk ELKE kandidaat
-
-Voor elke kandidaat in de lijst hierboven moet je de `enrich_candidate` tool aanroepen.
-
-Voor elke kandidaat:
-- Bedenk 4-5 SPECIFIEKE onderwerpen (NIET "AI", WEL "Cijfers over AI-impact op banen in Nederland")
-- Schrijf 3-5 zinnen relevance die feitelijk beschrijft wat deze persoon doet en waarom relevant
-- Roep dan enrich_candidate aan met: name, enriched_topics, enriched_relevance
-
-Begin nu met het aanroepen van enrich_candidate voor de eerste kandidaat.
-
-## STAP 2: Genereer rapport (PAS NA alle tool calls)
-
-Na het verrijken van alle kandidaten, genereer het volledige markdown rapport
-
-## Rapport specificaties
+# Rapport specificaties, gedeeld door de tool loop en de batch modus
+REPORT_SPECIFICATIONS = """## Rapport specificaties
 
 ### Structuur:
 
@@ -309,3 +294,77 @@ iconisch, mysterieus, symfonie, essentieel, cruciaal, betoverend, navigeren, rob
 geheimen, dynamisch, krachtig, scala, "in een wereld van", "met een twist", "hand in hand"
 
 Genereer nu het volledige rapport in markdown formaat."""
+
+REPORT_GENERATION_PROMPT = (
+    """
+Je taak: Maak een rapport van de gevonden kandidaten voor AIToday Live.
+
+## Nieuwe kandidaten deze week
+{candidates_json}
+
+## Recent aanbevolen kandidaten (laatste 2 weken)
+{recent_guests_json}
+
+Indicatoren:
+
+## STAP 1: Verrijk ELKE kandidaat
+
+Voor elke kandidaat in de lijst hierboven moet je de `enrich_candidate` tool aanroepen.
+
+Voor elke kandidaat:
+- Bedenk 4-5 SPECIFIEKE onderwerpen (NIET "AI", WEL "Cijfers over AI-impact op banen in Nederland")
+- Schrijf 3-5 zinnen relevance die feitelijk beschrijft wat deze persoon doet en waarom relevant
+- Roep dan enrich_candidate aan met: name, enriched_topics, enriched_relevance
+
+Begin nu met het aanroepen van enrich_candidate voor de eerste kandidaat.
+
+## STAP 2: Genereer rapport (PAS NA alle tool calls)
+
+Na het verrijken van alle kandidaten, genereer het volledige markdown rapport
+
+"""
+    + REPORT_SPECIFICATIONS
+)
+
+# Verrijking per kandidaat (één request per kandidaat, zie enrichment.py)
+ENRICH_CANDIDATE_PROMPT = """
+Je taak: Verrijk deze kandidaat voor het rapport van AIToday Live.
+
+## Kandidaat
+{candidate_json}
+
+- Bedenk 4-5 SPECIFIEKE onderwerpen (NIET "AI", WEL "Cijfers over AI-impact op banen in Nederland")
+- Schrijf 3-5 zinnen relevance die feitelijk beschrijft wat deze persoon doet en waarom relevant
+- Roep dan enrich_candidate aan met: name (exact zoals hierboven), enriched_topics,
+  enriched_relevance"""
+
+# Batch modus: rapport van de al verrijkte kandidaten (geen tools)
+REPORT_ASSEMBLY_PROMPT = (
+    """
+Je taak: Maak een rapport van de gevonden kandidaten voor AIToday Live.
+
+## Nieuwe kandidaten deze week
+{candidates_json}
+
+## Recent aanbevolen kandidaten (laatste 2 weken)
+{recent_guests_json}
+
+De nieuwe kandidaten zijn al verrijkt: gebruik hun topics als "Mogelijke onderwerpen" en
+hun relevance_description voor "Waarom interessant".
+
+"""
+    + REPORT_SPECIFICATIONS
+)
+
+# Snel rapport: alleen de intro komt van het model, de rest wordt lokaal opgemaakt
+REPORT_INTRO_PROMPT = """
+Schrijf de intro voor het rapport "Potentiële gasten voor AIToday Live" van deze week.
+
+## Nieuwe kandidaten
+{candidates_json}
+
+- 2-3 zinnen over deze week: welke thema's en welke sectoren
+- Positief maar feitelijk, toegankelijk (casual professioneel), geen buzzwoorden
+- Gebruik NIET: rijk, reis, inspireren, magie, essentieel, cruciaal, navigeren, robuust,
+  dynamisch, krachtig, scala, "in een wereld van"
+- Geef alleen de intro tekst, zonder titel of kopjes"""
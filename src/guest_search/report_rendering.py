@@ -0,0 +1,159 @@
+"""Local rendering of the guest report.
+
+With ``Config.FAST_REPORT`` the report is not written by the model: after the
+per-candidate enrichment (see ``enrichment``) the candidates and recent guests
+are structured data, and the markdown follows the fixed structure of
+``REPORT_SPECIFICATIONS`` in ``prompts``. Only the short intro can come from
+the model (``Config.REPORT_LLM_INTRO``, see ``intro_summary``); without it,
+``default_intro`` writes one from the data.
+"""
+
+from collections import Counter
+from datetime import datetime
+
+MAX_SOURCES = 3
+
+MONTHS = (
+    "januari",
+    "februari",
+    "maart",
+    "april",
+    "mei",
+    "juni",
+    "juli",
+    "augustus",
+    "september",
+    "oktober",
+    "november",
+    "december",
+)
+
+TITLE = "# Potentiële gasten voor AIToday Live - Week {week_number}"
+
+CANDIDATE = """### {name_and_role}
+
+**Mogelijke onderwerpen:**
+{topics}
+
+**Waarom interessant:** {relevance}
+
+**Bronnen:**
+{sources}"""
+
+RECENT_GUEST = """### {name_and_role}
+
+**Waarom toen aanbevolen:** {why_now}
+
+**Bronnen:**
+{sources}
+
+**Aanbevolen op:** {date}"""
+
+
+def render_report(
+    candidates: list[dict], recent_guests: list[dict], week_number: int, intro: str | None = None
+) -> str:
+    """Markdown report of the new candidates and the recently recommended guests."""
+    parts = [TITLE.format(week_number=week_number), intro or default_intro(candidates)]
+
+    if candidates:
+        parts.append("## Nieuwe kandidaten")
+        parts.extend(_candidate(candidate) for candidate in candidates)
+
+    if recent_guests:
+        parts.append("## Recent aanbevolen (herhaling)")
+        parts.extend(_recent_guest(guest) for guest in recent_guests)
+
+    return "\n\n".join(parts) + "\n"
+
+
+def default_intro(candidates: list[dict]) -> str:
+    """Intro from the data: number of candidates and the most common organizations."""
+    if not candidates:
+        return "Deze week zijn er geen nieuwe kandidaten gevonden."
+
+    organizations = Counter(c.get("organization") for c in candidates if c.get("organization"))
+    noun = "kandidaat" if len(candidates) == 1 else "kandidaten"
+    intro = f"Deze week {len(candidates)} nieuwe {noun}"
+    if organizations:
+        top = [name for name, _count in organizations.most_common(3)]
+        intro += f", onder andere van {_join(top)}"
+    return intro + "."
+
+
+def intro_summary(candidates: list[dict]) -> list[dict]:
+    """Compact candidate data for the intro request (no sources or descriptions)."""
+    return [
+        {
+            "name": candidate.get("name", ""),
+            "role": candidate.get("role", ""),
+            "organization": candidate.get("organization", ""),
+            "topics": candidate.get("topics", [])[:3],
+        }
+        for candidate in candidates
+    ]
+
+
+def _candidate(candidate: dict) -> str:
+    section = CANDIDATE.format(
+        name_and_role=_name_and_role(candidate),
+        topics="\n".join(f"- {topic}" for topic in candidate.get("topics", [])) or "-",
+        relevance=candidate.get("relevance_description", ""),
+        sources=_sources(candidate.get("sources", [])),
+    )
+
+    contact = candidate.get("contact_info") or {}
+    details = []
+    if contact.get("email"):
+        details.append(contact["email"])
+    if contact.get("linkedin"):
+        details.append(f"[LinkedIn]({contact['linkedin']})")
+    if details:
+        section += f"\n\n**Contact:** {' | '.join(details)}"
+    return section
+
+
+def _recent_guest(guest: dict) -> str:
+    return RECENT_GUEST.format(
+        name_and_role=_name_and_role(guest),
+        why_now=guest.get("why_now", ""),
+        sources=_sources(guest.get("sources", [])),
+        date=_readable_date(guest.get("date", "")),
+    )
+
+
+def _name_and_role(person: dict) -> str:
+    text = person.get("name", "")
+    if person.get("role") and person.get("organization"):
+        return f"{text} - {person['role']} bij {person['organization']}"
+    if person.get("role") or person.get("organization"):
+        return f"{text} - {person.get('role') or person.get('organization')}"
+    return text
+
+
+def _sources(sources: list) -> str:
+    """Max MAX_SOURCES sources; plain URLs (save_candidate) or dicts with url/title."""
+    lines = []
+    for source in sources[:MAX_SOURCES]:
+        if isinstance(source, dict):
+            url = source.get("url", "")
+            title = source.get("title") or url
+        else:
+            url = title = str(source)
+        if url:
+            lines.append(f"- [{title}]({url})")
+    return "\n".join(lines) or "-"
+
+
+def _readable_date(value: str) -> str:
+    try:
+        date = datetime.fromisoformat(value)
+    except ValueError:
+        return value
+    return f"{date.day} {MONTHS[date.month - 1]} {date.year}"
+
+
+def _join(items: list[str]) -> str:
+    if len(items) == 1:
+        return items[0]
+    return ", ".join(items[:-1]) + f" en {items[-1]}"
@@ -0,0 +1,95 @@
+"""Escalation of search turns from a fast model to the search model.
+
+Most search turns are routing: search, then fetch one or more result pages.
+With ``Config.SEARCH_ESCALATION`` those turns run on ``SEARCH_FAST_MODEL``.
+When the fast model wants to call a decision tool (``save_candidate``), its
+response is discarded and the same turn is requested again from
+``SEARCH_MODEL``, which makes the actual decision:
+
+- decision tools of the fast response are never executed
+  (``defer_escalation_tools``);
+- its I/O tools (``CONCURRENT_TOOLS``) may already have run, by early start
+  while streaming or in the regular dispatch. Their results are kept in a
+  ``ToolResultMemo`` and the escalated turn reuses them for the same tool and
+  input, so an escalated turn fetches every page once;
+- the escalated response replaces the fast one in the conversation, so the
+  transcript only contains decisions of the search model.
+
+Prompt caches are per model: fast turns and escalated turns each read and
+write their own cache entries.
+"""
+
+import json
+import threading
+from collections.abc import Callable
+from typing import Any
+
+from .tool_dispatch import CONCURRENT_TOOLS
+
+# Tool calls that are decided by the search model, not by the fast model
+ESCALATION_TOOLS = frozenset({"save_candidate"})
+
+
+def needs_escalation(response: Any) -> bool:
+    """True if the response calls a decision tool."""
+    return any(
+        block.type == "tool_use" and block.name in ESCALATION_TOOLS for block in response.content
+    )
+
+
+def defer_escalation_tools(
+    handler: Callable[[str, dict], dict],
+) -> Callable[[str, dict], dict]:
+    """Tool handler that skips decision tools (the turn is escalated instead)."""
+
+    def handle(tool_name: str, tool_input: dict) -> dict:
+        if tool_name in ESCALATION_TOOLS:
+            return {"status": "escalated"}
+        return handler(tool_name, tool_input)
+
+    return handle
+
+
+class ToolResultMemo:
+    """
+    Results of the read-only I/O tools of a fast turn, by tool and input.
+
+    ``record`` wraps the handler of the fast turn, ``reuse`` the handler of the
+    escalated turn; each stored result is handed out once. Thread-safe, tools
+    run concurrently.
+    """
+
+    def __init__(self):
+        self._results: dict[tuple[str, str], dict] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    @staticmethod
+    def _key(tool_name: str, tool_input: dict) -> tuple[str, str]:
+        return tool_name, json.dumps(tool_input, sort_keys=True, default=str)
+
+    def record(self, handler: Callable[[str, dict], dict]) -> Callable[[str, dict], dict]:
+        """Handler that stores the results of I/O tools."""
+
+        def handle(tool_name: str, tool_input: dict) -> dict:
+            result = handler(tool_name, tool_input)
+            if tool_name in CONCURRENT_TOOLS:
+                with self._lock:
+                    self._results[self._key(tool_name, tool_input)] = result
+            return result
+
+        return handle
+
+    def reuse(self, handler: Callable[[str, dict], dict]) -> Callable[[str, dict], dict]:
+        """Handler that returns a stored result instead of running the tool again."""
+
+        def handle(tool_name: str, tool_input: dict) -> dict:
+            with self._lock:
+                result = self._results.pop(self._key(tool_name, tool_input), None)
+            if result is not None:
+                return result
+            return handler(tool_name, tool_input)
+
+        return handle
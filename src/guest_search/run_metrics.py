@@ -0,0 +1,150 @@
+"""Token, cache and latency accounting for one agent run.
+
+Every LLM call records its token usage (input, output, cache reads and cache
+writes) and wall time; every tool call records its latency. Records carry a
+phase (planning, search, linkedin, report) and an optional label (the search
+query), and are aggregated per phase, per query and per model for the session
+record in ``search_history.json``. Tool results sent to the model also record their
+size before and after compact serialization (see ``tool_results``).
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any
+
+from .compaction import USAGE_FIELDS, usage_counts
+from .prompt_cache import cache_report
+from .tool_results import size_report
+
+PHASES = ("planning", "search", "linkedin", "report")
+
+
+def _empty_totals() -> dict:
+    return {
+        "llm_calls": 0,
+        **dict.fromkeys(USAGE_FIELDS, 0),
+        "llm_seconds": 0.0,
+        "tool_calls": 0,
+        "tool_seconds": 0.0,
+    }
+
+
+class RunMetrics:
+    """Thread-safe collector of LLM and tool call measurements (parallel queries, tool threads)."""
+
+    def __init__(self):
+        self.llm_calls: list[dict] = []
+        self.tool_calls: list[dict] = []
+        self.phase_seconds: dict[str, float] = {}
+        self.tool_results: list[dict] = []
+        self._lock = threading.Lock()
+
+    def record_llm_call(
+        self, phase: str, usage: Any, seconds: float, label: str = "", model: str = ""
+    ) -> dict:
+        """Record one LLM response (usage may be None for mocked clients)."""
+        call = {
+            "phase": phase,
+            "label": label,
+            "model": model,
+            **usage_counts(usage),
+            "seconds": seconds,
+        }
+        with self._lock:
+            self.llm_calls.append(call)
+        return call
+
+    def record_tool_call(self, phase: str, tool: str, seconds: float, label: str = "") -> None:
+        with self._lock:
+            self.tool_calls.append(
+                {"phase": phase, "label": label, "tool": tool, "seconds": seconds}
+            )
+
+    def record_tool_result(self, sizes: dict) -> None:
+        """Record the serialized size of one tool result (see ``tool_results.result_sizes``)."""
+        with self._lock:
+            self.tool_results.append(sizes)
+
+    def add_phase_seconds(self, name: str, seconds: float) -> None:
+        """Add wall time to a phase (added up when a phase runs more than once)."""
+        with self._lock:
+            self.phase_seconds[name] = self.phase_seconds.get(name, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, name: str):
+        """Measure the wall time of a phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_phase_seconds(name, time.perf_counter() - start)
+
+    def totals(self, phase: str | None = None, label: str | None = None) -> dict:
+        """Summed counts and times, optionally for one phase and/or label."""
+        totals = _empty_totals()
+        with self._lock:
+            llm_calls = list(self.llm_calls)
+            tool_calls = list(self.tool_calls)
+
+        for call in llm_calls:
+            if _matches(call, phase, label):
+                totals["llm_calls"] += 1
+                for field in USAGE_FIELDS:
+                    totals[field] += call[field]
+                totals["llm_seconds"] += call["seconds"]
+
+        for call in tool_calls:
+            if _matches(call, phase, label):
+                totals["tool_calls"] += 1
+                totals["tool_seconds"] += call["seconds"]
+
+        totals["llm_seconds"] = round(totals["llm_seconds"], 3)
+        totals["tool_seconds"] = round(totals["tool_seconds"], 3)
+        return totals
+
+    def model_totals(self) -> dict:
+        """LLM calls, tokens and time per model (see Config.*_MODEL)."""
+        with self._lock:
+            llm_calls = list(self.llm_calls)
+
+        models: dict[str, dict] = {}
+        for call in llm_calls:
+            totals = models.setdefault(
+                call["model"] or "default",
+                {"llm_calls": 0, **dict.fromkeys(USAGE_FIELDS, 0), "llm_seconds": 0.0},
+            )
+            totals["llm_calls"] += 1
+            for field in USAGE_FIELDS:
+                totals[field] += call[field]
+            totals["llm_seconds"] += call["seconds"]
+
+        for totals in models.values():
+            totals["llm_seconds"] = round(totals["llm_seconds"], 3)
+        return models
+
+    def summary(self) -> dict:
+        """Per phase, query and model aggregates plus the prompt cache report (JSON)."""
+        phases = {}
+        for name in PHASES:
+            totals = self.totals(phase=name)
+            totals["wall_seconds"] = round(self.phase_seconds.get(name, 0.0), 3)
+            phases[name] = totals
+
+        queries = {}
+        for call in self.llm_calls + self.tool_calls:
+            if call["phase"] == "search" and call["label"] and call["label"] not in queries:
+                queries[call["label"]] = self.totals(phase="search", label=call["label"])
+
+        return {
+            "phases": phases,
+            "queries": queries,
+            "models": self.model_totals(),
+            "total": self.totals(),
+            "prompt_cache": cache_report(self.llm_calls),
+            "tool_results": size_report(self.tool_results),
+        }
+
+
+def _matches(call: dict, phase: str | None, label: str | None) -> bool:
+    return (phase is None or call["phase"] == phase) and (label is None or call["label"] == label)
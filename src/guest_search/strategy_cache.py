@@ -0,0 +1,140 @@
+"""Reuse of planning strategies within a week.
+
+A planning call costs a full thinking budget, also when the run is repeated
+the same day after a crash or a config change. Strategies are stored per key
+of:
+
+- the ISO week of the run;
+- a fingerprint of the learning history the planner sees (sessions in the
+  insight window before this week; see ``insights_fingerprint``);
+- the prompt version: planning prompt, strategy tool schema and model.
+
+Sessions of the current week are left out of the fingerprint on purpose: a
+rerun after a completed session still finds the week's plan, and the queries
+that session already ran are moved to the back (``deprioritize_completed``).
+A change in the prompt, the tool or the model starts a new plan.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+def iso_week(date: datetime) -> str:
+    """ISO week of a date, e.g. ``2026-W42``."""
+    year, week, _weekday = date.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def week_start(date: datetime) -> datetime:
+    """Monday 00:00 of the ISO week of a date."""
+    return (date - timedelta(days=date.weekday())).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+
+
+def insights_fingerprint(sessions: list[dict], now: datetime, weeks: int = 4) -> str:
+    """
+    Hash of the sessions that make up the learning history for this week.
+
+    Only sessions in the ``weeks`` before the start of the current ISO week
+    count, so the fingerprint is the same on every day of the week.
+    """
+    end = week_start(now)
+    start = end - timedelta(weeks=weeks)
+    relevant = []
+    for session in sessions:
+        try:
+            date = datetime.fromisoformat(session["date"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if start <= date < end:
+            relevant.append(
+                [
+                    session["date"],
+                    session.get("total_candidates", 0),
+                    [q.get("query", "") for q in session.get("queries", [])],
+                ]
+            )
+    return _hash(relevant)
+
+
+def prompt_version(*parts) -> str:
+    """Hash of everything that shapes the plan besides the history (prompt, tool, model)."""
+    return _hash(list(parts))
+
+
+def deprioritize_completed(strategy: dict, completed: set[str]) -> tuple[dict, int]:
+    """
+    Strategy with already run queries moved to the back at low priority.
+
+    Returns:
+        (new strategy, number of queries that were already run)
+    """
+    fresh, repeated = [], []
+    for query_obj in strategy.get("search_queries", []):
+        if query_obj.get("query") in completed:
+            repeated.append({**query_obj, "priority": "low", "already_run": True})
+        else:
+            fresh.append(query_obj)
+    return {**strategy, "search_queries": fresh + repeated}, len(repeated)
+
+
+class StrategyCache:
+    """
+    One JSON file per key in ``cache_dir``: the strategy and when it was made.
+
+    Read or write errors only log a warning; the agent then plans as usual.
+    """
+
+    def __init__(self, cache_dir: str = "data/cache/strategies"):
+        self.cache_dir = Path(cache_dir)
+
+    @staticmethod
+    def key(week: str, fingerprint: str, version: str) -> str:
+        return f"{week}-{fingerprint[:12]}-{version[:12]}"
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> dict | None:
+        """Stored entry (``strategy``, ``created``) for this key, or None."""
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Failed to load cached strategy {path}: {e}")
+            return None
+        if not isinstance(entry, dict) or not entry.get("strategy"):
+            return None
+        return entry
+
+    def put(self, key: str, strategy: dict, created: datetime | None = None) -> None:
+        """Store a strategy under this key (replaces an older one)."""
+        entry = {
+            "key": key,
+            "created": (created or datetime.now()).isoformat(),
+            "strategy": strategy,
+        }
+        path = self._path(key)
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to store strategy {path}: {e}")
+
+
+def _hash(value) -> str:
+    canonical = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
@@ -0,0 +1,95 @@
+"""Streaming model turns with early tool execution.
+
+With ``messages.create`` no tool can start before the whole response has
+arrived. When streaming, a ``tool_use`` block is complete as soon as its
+``content_block_stop`` event arrives (input JSON closed), so independent I/O
+tools (see ``CONCURRENT_TOOLS``) start right away while the model is still
+generating the rest of the response. Stateful tools run in response order on
+the calling thread after the message is complete, as in ``dispatch_tool_calls``.
+"""
+
+import contextvars
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+
+from .tool_dispatch import CONCURRENT_TOOLS, dispatch_tool_calls
+
+
+def supports_streaming(client: Any) -> bool:
+    """
+    True if the client's messages resource implements ``stream``.
+
+    Checked on the class, so mocks and the Portkey adapter (create only) fall
+    back to a regular request.
+    """
+    messages = getattr(client, "messages", None)
+    return callable(getattr(type(messages), "stream", None))
+
+
+def run_model_turn(
+    client: Any,
+    request: dict,
+    handler: Callable[[str, dict], dict],
+    max_workers: int = 4,
+    stream: bool = True,
+    should_dispatch: Callable[[Any], bool] | None = None,
+) -> tuple[Any, list[dict]]:
+    """
+    Request one model response and run the tools it asks for.
+
+    Args:
+        client: Anthropic(-compatible) client
+        request: keyword arguments for messages.create / messages.stream
+        handler: function(tool_name, tool_input) -> result dict
+        max_workers: threads for concurrent tools (1 = strictly sequential)
+        stream: stream the response and start tools as soon as their block is complete
+        should_dispatch: called with the complete response; when it returns False
+            no tool runs (only I/O tools already started while streaming did) and
+            the results are empty, e.g. for a loop that stops on ``end_turn``
+
+    Returns:
+        (response message, one result per tool_use block in response order)
+    """
+    if not stream or not supports_streaming(client):
+        response = client.messages.create(**request)
+        if should_dispatch is not None and not should_dispatch(response):
+            return response, []
+        tool_uses = [block for block in response.content if block.type == "tool_use"]
+        return response, dispatch_tool_calls(tool_uses, handler, max_workers=max_workers)
+
+    futures: dict[str, Future] = {}
+    with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as executor:
+        with client.messages.stream(**request) as message_stream:
+            for event in message_stream:
+                if event.type != "content_block_stop":
+                    continue
+                block = event.content_block
+                if block.type != "tool_use" or block.name not in CONCURRENT_TOOLS:
+                    continue
+                if max_workers <= 1:
+                    continue
+
+                # Input JSON is complete: start the I/O while the response streams on
+                futures[block.id] = executor.submit(
+                    contextvars.copy_context().run, handler, block.name, block.input
+                )
+            response = message_stream.get_final_message()
+
+        if should_dispatch is not None and not should_dispatch(response):
+            # Early started I/O finishes when the executor shuts down; results are unused
+            return response, []
+
+        tool_uses = [block for block in response.content if block.type == "tool_use"]
+        results: list[dict | None] = [None] * len(tool_uses)
+
+        # Stateful tools in order on this thread, while early started I/O finishes
+        for i, block in enumerate(tool_uses):
+            if block.id not in futures:
+                results[i] = handler(block.name, block.input)
+
+        for i, block in enumerate(tool_uses):
+            if block.id in futures:
+                results[i] = futures[block.id].result()
+
+    return response, results  # type: ignore[return-value]
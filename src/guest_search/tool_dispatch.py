@@ -0,0 +1,57 @@
+"""Concurrent execution of the tool_use blocks from one model response.
+
+When the model asks for several pages or searches in one response, those calls
+are independent network I/O and run in a thread pool. Tools that read or change
+agent state run in response order on the calling thread, so a
+``check_previous_guests`` followed by ``save_candidate`` behaves as before.
+"""
+
+import contextvars
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+# Tools without shared agent state (safe to run concurrently)
+CONCURRENT_TOOLS = frozenset({"web_search", "fetch_page_content", "search_linkedin_profile"})
+
+
+def dispatch_tool_calls(
+    tool_uses: list[Any],
+    handler: Callable[[str, dict], dict],
+    max_workers: int = 4,
+) -> list[dict]:
+    """
+    Run tool_use blocks and return their results in the same order.
+
+    Args:
+        tool_uses: tool_use content blocks (with .name and .input)
+        handler: function(tool_name, tool_input) -> result dict
+        max_workers: threads for concurrent tools (1 = strictly sequential)
+
+    Returns:
+        One result per tool_use block, ordered like ``tool_uses``
+    """
+    concurrent = [i for i, block in enumerate(tool_uses) if block.name in CONCURRENT_TOOLS]
+    if max_workers <= 1 or len(concurrent) < 2:
+        return [handler(block.name, block.input) for block in tool_uses]
+
+    results: list[dict | None] = [None] * len(tool_uses)
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(concurrent))) as executor:
+        # Each call runs in a copy of the caller's context (e.g. the current query)
+        futures = {
+            i: executor.submit(
+                contextvars.copy_context().run, handler, tool_uses[i].name, tool_uses[i].input
+            )
+            for i in concurrent
+        }
+
+        # Stateful tools run in order on this thread while the I/O is in flight
+        for i, block in enumerate(tool_uses):
+            if i not in futures:
+                results[i] = handler(block.name, block.input)
+
+        for i, future in futures.items():
+            results[i] = future.result()
+
+    return results  # type: ignore[return-value]
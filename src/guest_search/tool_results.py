@@ -0,0 +1,117 @@
+"""Compact serialization of tool results for the model.
+
+Tool results stay in the conversation and are re-sent on every later turn, so
+each byte counts many times. ``encode_tool_result`` serializes a result per
+tool with tight separators and drops what the model does not use:
+
+- web_search: no ``provider``, no empty fields, snippets capped at
+  ``snippet_max_chars``, duplicate URLs removed;
+- fetch_page_content: per person only the name, ``title_match`` and a
+  ``context`` that is not already part of the page text sent along
+  (``sentence`` overlaps with context and page text and is dropped);
+- other tools: tight separators only.
+
+The tool handlers still return the full result dicts (logging, learning and
+tests use them); only the text sent to the model changes.
+"""
+
+import json
+from typing import Any
+
+from .compaction import CHARS_PER_TOKEN
+
+# Default maximum length of a web_search snippet
+SNIPPET_MAX_CHARS = 300
+
+
+def encode_tool_result(
+    tool_name: str, result: Any, snippet_max_chars: int = SNIPPET_MAX_CHARS
+) -> str:
+    """Compact JSON for the tool_result content of one tool call."""
+    if isinstance(result, dict):
+        if tool_name == "web_search":
+            result = compact_search_result(result, snippet_max_chars)
+        elif tool_name == "fetch_page_content":
+            result = compact_page_result(result)
+    return json.dumps(result, ensure_ascii=False, separators=(",", ":"))
+
+
+def compact_search_result(result: dict, snippet_max_chars: int = SNIPPET_MAX_CHARS) -> dict:
+    """web_search result without provider, empty fields and duplicate URLs."""
+    compact: dict[str, Any] = {key: value for key, value in result.items() if key != "provider"}
+    if "results" not in result:
+        return compact
+
+    seen_urls = set()
+    results = []
+    for item in result["results"]:
+        url = item.get("url", "")
+        url_key = url.rstrip("/")
+        if url_key and url_key in seen_urls:
+            continue
+        seen_urls.add(url_key)
+
+        entry = {key: value for key, value in item.items() if value}
+        snippet = entry.get("snippet", "")
+        if snippet_max_chars and len(snippet) > snippet_max_chars:
+            entry["snippet"] = snippet[:snippet_max_chars].rstrip() + "…"
+        results.append(entry)
+
+    compact["results"] = results
+    return compact
+
+
+def compact_page_result(result: dict) -> dict:
+    """fetch_page_content result with person context deduplicated against the page text."""
+    if "potential_persons" not in result:
+        return result
+
+    page_text = _normalize(result.get("content") or " ".join(result.get("passages", [])))
+
+    persons = []
+    for person in result["potential_persons"]:
+        entry = {"name": person.get("name", "")}
+        if person.get("title_match"):
+            entry["title_match"] = person["title_match"]
+        context = person.get("context", "")
+        if context and _normalize(context) not in page_text:
+            entry["context"] = context
+        persons.append(entry)
+
+    return {**result, "potential_persons": persons}
+
+
+def result_sizes(tool_name: str, result: Any, encoded: str) -> dict:
+    """Estimated tokens of the default ``json.dumps`` serialization and of ``encoded``."""
+    return {
+        "tool": tool_name,
+        "default_tokens": len(json.dumps(result, default=str)) // CHARS_PER_TOKEN,
+        "compact_tokens": len(encoded) // CHARS_PER_TOKEN,
+    }
+
+
+def size_report(sizes: list[dict]) -> dict:
+    """Before/after totals per tool and overall for a list of ``result_sizes``."""
+    per_tool: dict[str, dict] = {}
+    for size in sizes:
+        tool = per_tool.setdefault(
+            size["tool"], {"results": 0, "default_tokens": 0, "compact_tokens": 0}
+        )
+        tool["results"] += 1
+        tool["default_tokens"] += size["default_tokens"]
+        tool["compact_tokens"] += size["compact_tokens"]
+
+    default_tokens = sum(tool["default_tokens"] for tool in per_tool.values())
+    compact_tokens = sum(tool["compact_tokens"] for tool in per_tool.values())
+    return {
+        "results": len(sizes),
+        "default_tokens": default_tokens,
+        "compact_tokens": compact_tokens,
+        "saved_ratio": round(1 - compact_tokens / default_tokens, 3) if default_tokens else 0.0,
+        "per_tool": per_tool,
+    }
+
+
+def _normalize(text: str) -> str:
+    """Collapse whitespace (person context has newlines replaced by spaces)."""
+    return " ".join(text.split())
@@ -39,10 +39,15 @@ def get_tools():
             - Vakmedia artikelen om experts te extraheren
 
             De tool returnt:
-            - content: De volledige paginatext (max 4000 chars)
+            - content: De meest relevante passages van de pagina (max 4000 chars),
+              geselecteerd rond gevonden personen en zoektermen; passages worden
+              gescheiden door [...]
             - potential_persons: Lijst van gedetecteerde personen met context
             - persons_found: Aantal unieke personen gevonden
 
+            In compact mode bevat het resultaat `passages` (lijst) in plaats van
+            `content`, en alleen namen (en titels) in `potential_persons`.
+
             De tool gebruikt patroonherkenning om personen te vinden:
             - Titels: Prof., Dr., Drs., Ir.
             - Rollen: hoogleraar, CEO, directeur, wethouder, etc.
@@ -112,3 +117,91 @@ def get_tools():
             },
         },
     ]
+
+
+def get_enrich_tool():
+    """Tool waarmee de agent verrijkte kandidaat informatie opslaat (rapport fase)"""
+
+    return {
+        "name": "enrich_candidate",
+        "description": (
+            "Sla verrijkte kandidaat informatie op met uitgebreide topics en relevance description"
+        ),
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "name": {
+                    "type": "string",
+                    "description": (
+                        "Volledige naam van de kandidaat "
+                        "(moet exact matchen met bestaande kandidaat)"
+                    ),
+                },
+                "enriched_topics": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": (
+                        "4-5 specifieke, concrete onderwerpen "
+                        "(bijv. 'Cijfers over AI-impact op banen in Nederland' "
+                        "niet alleen 'AI')"
+                    ),
+                },
+                "enriched_relevance": {
+                    "type": "string",
+                    "description": (
+                        "Uitgebreide relevance description van 3-5 zinnen die "
+                        "feitelijk beschrijft wat deze persoon doet en waarom relevant"
+                    ),
+                },
+            },
+            "required": ["name", "enriched_topics", "enriched_relevance"],
+        },
+    }
+
+
+def get_strategy_tool():
+    """Tool waarmee de agent de zoekstrategie aanlevert (planning fase)"""
+
+    return {
+        "name": "submit_search_strategy",
+        "description": (
+            "Lever de zoekstrategie voor deze week aan. Zet de zoekopdrachten met de "
+            "hoogste prioriteit vooraan: elke zoekopdracht wordt uitgevoerd zodra hij binnen is"
+        ),
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "week_focus": {
+                    "type": "string",
+                    "description": "Korte analyse van wat deze week relevant is",
+                },
+                "search_queries": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "query": {
+                                "type": "string",
+                                "description": "Concrete zoekopdracht",
+                            },
+                            "rationale": {
+                                "type": "string",
+                                "description": "Waarom deze zoekopdracht",
+                            },
+                            "expected_sources": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                                "description": "Type bronnen waar je op mikt",
+                            },
+                            "priority": {"type": "string", "enum": ["high", "medium", "low"]},
+                        },
+                        "required": ["query", "rationale", "priority"],
+                    },
+                    "description": "8-12 zoekopdrachten, hoogste prioriteit eerst",
+                },
+                "sectors_to_prioritize": {"type": "array", "items": {"type": "string"}},
+                "topics_to_cover": {"type": "array", "items": {"type": "string"}},
+            },
+            "required": ["week_focus", "search_queries"],
+        },
+    }
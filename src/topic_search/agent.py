@@ -1,8 +1,10 @@
 """Topic Finder Agent - Zoekt interessante AI-topics voor de podcast."""
 
+import asyncio
 import json
 from datetime import datetime
 from typing import Any, cast
+from urllib.parse import urlparse
 
 from anthropic.types import ToolParam
 from rich.console import Console
@@ -13,6 +15,10 @@ from rich.progress import BarColumn, Progress, SpinnerColumn, TextColumn
 from rich.table import Table
 
 from src.guest_search.config import Config
+from src.guest_search.extraction import html_to_text
+from src.guest_search.streaming import run_model_turn
+from src.guest_search.tool_results import encode_tool_result
+from src.topic_search.async_runtime import AsyncTopicRuntime
 from src.topic_search.prompts import TOPIC_REPORT_GENERATION_PROMPT, TOPIC_SEARCH_PROMPT
 from src.utils.portkey_client import get_anthropic_client
 from src.utils.smart_search_tool import SmartSearchTool
@@ -21,6 +27,9 @@ from src.utils.smart_search_tool import SmartSearchTool
 class TopicFinderAgent:
     """Agent die interessante AI-topics zoekt voor de podcast."""
 
+    # Max aantal model turns in de zoekfase (prevent infinite loops)
+    MAX_ITERATIONS = 20
+
     def __init__(self):
         self.client = get_anthropic_client(Config.ANTHROPIC_API_KEY)
         self.topics = []
@@ -138,55 +147,77 @@ class TopicFinderAgent:
             },
         ]
 
-    def _handle_tool_call(self, tool_name, tool_input, silent=False, progress=None, task=None):
-        """Verwerk tool calls van de agent."""
+    @staticmethod
+    def _format_search_results(search_result):
+        """web_search tool result voor de agent."""
+        if not search_result["results"]:
+            return {"results": [], "error": "No results found"}
+
+        return {
+            "results": [
+                {
+                    "title": r.get("title", ""),
+                    "snippet": r.get("snippet", ""),
+                    "url": r.get("link", ""),
+                }
+                for r in search_result["results"]
+            ],
+            "provider": search_result.get("provider", "unknown"),
+        }
+
+    @staticmethod
+    def _page_result(url, status_code, html):
+        """fetch_page_content tool result voor een opgehaalde pagina."""
+        if status_code != 200:
+            return {"url": url, "error": f"HTTP {status_code}", "status": "error"}
+
+        text = html_to_text(html)
+
+        # Truncate if too long (max 4000 chars)
+        if len(text) > 4000:
+            text = text[:4000] + "\n\n[...tekst ingekort...]"
+
+        return {"url": url, "content": text, "status": "success"}
+
+    @staticmethod
+    def _tool_result_content(tool_name, result):
+        """Tool result als tekst voor het model (compact, zie tool_results.py)."""
+        if Config.COMPACT_TOOL_RESULTS:
+            return encode_tool_result(tool_name, result, Config.SEARCH_SNIPPET_MAX_CHARS)
+        return json.dumps(result)
+
+    def _show_activity(self, tool_name, tool_input, progress=None, task=None):
+        """Toon de huidige zoekopdracht of het domein dat wordt opgehaald."""
+        if not progress or task is None:
+            return
 
         if tool_name == "web_search":
+            # Update progress with current search query
             query = tool_input["query"]
+            short_query = query[:45] if len(query) > 45 else query
+            description = f"[cyan]🔍 Zoeken: {short_query}..."
+        else:
+            # Update progress with domain being fetched
+            url = tool_input["url"]
+            domain = urlparse(url).netloc or url[:30]
+            description = f"[cyan]📄 Ophalen: {domain}..."
 
-            # Update progress with current search query
-            if progress and task is not None:
-                short_query = query[:45] if len(query) > 45 else query
-                progress.update(
-                    task,
-                    description=f"[cyan]🔍 Zoeken: {short_query}...",
-                    topics=len(self.topics),
-                )
+        progress.update(task, description=description, topics=len(self.topics))
 
-            search_result = self.smart_search.search(query, num_results=10)
+    def _handle_tool_call(self, tool_name, tool_input, silent=False, progress=None, task=None):
+        """Verwerk tool calls van de agent."""
 
-            if search_result["results"]:
-                return {
-                    "results": [
-                        {
-                            "title": r.get("title", ""),
-                            "snippet": r.get("snippet", ""),
-                            "url": r.get("link", ""),
-                        }
-                        for r in search_result["results"]
-                    ],
-                    "provider": search_result.get("provider", "unknown"),
-                }
-            else:
-                return {"results": [], "error": "No results found"}
+        if tool_name == "web_search":
+            self._show_activity(tool_name, tool_input, progress, task)
+            search_result = self.smart_search.search(tool_input["query"], num_results=10)
+            return self._format_search_results(search_result)
 
         elif tool_name == "fetch_page_content":
             url = tool_input["url"]
-
-            # Update progress with domain being fetched
-            if progress and task is not None:
-                from urllib.parse import urlparse
-
-                domain = urlparse(url).netloc or url[:30]
-                progress.update(
-                    task,
-                    description=f"[cyan]📄 Ophalen: {domain}...",
-                    topics=len(self.topics),
-                )
+            self._show_activity(tool_name, tool_input, progress, task)
 
             try:
                 import requests
-                from bs4 import BeautifulSoup
 
                 response = requests.get(
                     url,
@@ -197,29 +228,7 @@ class TopicFinderAgent:
                         )
                     },
                 )
-
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, "html.parser")
-
-                    # Remove script and style elements
-                    for script in soup(["script", "style"]):
-                        script.decompose()
-
-                    # Get text content
-                    text = soup.get_text()
-
-                    # Clean up text
-                    lines = (line.strip() for line in text.splitlines())
-                    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-                    text = "\n".join(chunk for chunk in chunks if chunk)
-
-                    # Truncate if too long (max 4000 chars)
-                    if len(text) > 4000:
-                        text = text[:4000] + "\n\n[...tekst ingekort...]"
-
-                    return {"url": url, "content": text, "status": "success"}
-                else:
-                    return {"url": url, "error": f"HTTP {response.status_code}", "status": "error"}
+                return self._page_result(url, response.status_code, response.text)
 
             except Exception as e:
                 return {"url": url, "error": str(e), "status": "error"}
@@ -241,8 +250,8 @@ class TopicFinderAgent:
 
         return {"error": "Unknown tool"}
 
-    def run_topic_search(self):
-        """Zoek interessante AI-topics."""
+    def _start_topic_search(self):
+        """Toon de zoekfase en geef de startconversatie terug."""
 
         self.console.print()
         self.console.print(
@@ -257,96 +266,123 @@ class TopicFinderAgent:
         day_of_week = datetime.now().strftime("%A")
 
         prompt = TOPIC_SEARCH_PROMPT.format(current_date=current_date, day_of_week=day_of_week)
+        conversation: list[Any] = [{"role": "user", "content": prompt}]
+        return conversation
 
-        # Create progress bar
-        progress = Progress(
+    def _topic_progress(self):
+        """Progress bar voor de zoekfase."""
+        return Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
             BarColumn(),
             TextColumn("[cyan]{task.fields[topics]} topics"),
         )
 
-        tools = cast(list[ToolParam], self._get_topic_tools())
-        conversation: list[Any] = [{"role": "user", "content": prompt}]
-
-        with Live(progress, console=self.console):
-            task = progress.add_task(
-                "[cyan]Zoeken naar interessante AI-topics...", total=None, topics=0
-            )
-
-            # Agent zoekt topics met iteratieve tool calls
-            max_iterations = 20  # Prevent infinite loops
-            iteration = 0
-
-            while iteration < max_iterations:
-                iteration += 1
-
-                response = self.client.messages.create(
-                    model=Config.MODEL,
-                    max_tokens=Config.SEARCH_MAX_TOKENS,
-                    tools=tools,
-                    messages=conversation,
+    def _search_request(self, conversation):
+        """Request parameters voor een zoek-turn."""
+        return {
+            "model": Config.TOPIC_SEARCH_MODEL,
+            "max_tokens": Config.SEARCH_MAX_TOKENS,
+            "tools": cast(list[ToolParam], self._get_topic_tools()),
+            "messages": conversation,
+        }
+
+    def _apply_topic_turn(self, response, results, conversation, progress, task):
+        """
+        Voeg een zoek-turn toe aan de conversatie.
+
+        Returns:
+            True als de agent verder zoekt, False als hij klaar is
+        """
+        # Check stop reason
+        if response.stop_reason == "end_turn":
+            # Agent is done
+            return False
+
+        tool_results = iter(results)
+
+        # Process response and tool calls
+        assistant_message: dict[str, Any] = {"role": "assistant", "content": []}
+        has_tool_calls = False
+
+        for block in response.content:
+            if block.type == "text":
+                assistant_message["content"].append(block)
+
+            elif block.type == "tool_use":
+                has_tool_calls = True
+
+                # Result of the tool (already executed, silent with progress updates)
+                result = next(tool_results)
+
+                # Add tool use and result to conversation
+                assistant_message["content"].append(block)
+                conversation.append(assistant_message)
+                conversation.append(
+                    {
+                        "role": "user",
+                        "content": [
+                            {
+                                "type": "tool_result",
+                                "tool_use_id": block.id,
+                                "content": self._tool_result_content(block.name, result),
+                            }
+                        ],
+                    }
                 )
 
-                # Check stop reason
-                if response.stop_reason == "end_turn":
-                    # Agent is done
-                    break
+                # Reset for next iteration
+                assistant_message = {"role": "assistant", "content": []}
 
-                # Process response and tool calls
-                assistant_message: dict[str, Any] = {"role": "assistant", "content": []}
-                has_tool_calls = False
+                # Update progress
+                progress.update(task, topics=len(self.topics))
 
-                for block in response.content:
-                    if block.type == "text":
-                        assistant_message["content"].append(block)
+        # Add last assistant message if it has text
+        if assistant_message["content"] and not has_tool_calls:
+            conversation.append(assistant_message)
 
-                    elif block.type == "tool_use":
-                        has_tool_calls = True
+        # No tool calls (text only, or no end_turn): stop
+        return has_tool_calls
 
-                        # Execute tool (silent) with progress updates
-                        result = self._handle_tool_call(
-                            block.name, block.input, silent=True, progress=progress, task=task
-                        )
+    def _finish_topic_search(self):
+        """Toon de samenvatting van de zoekfase."""
+        summary = Table(show_header=False, box=None)
+        summary.add_row("[green]✓[/green]", "Topics gevonden", f"[bold]{len(self.topics)}[/bold]")
 
-                        # Add tool use and result to conversation
-                        assistant_message["content"].append(block)
-                        conversation.append(assistant_message)
-                        conversation.append(
-                            {
-                                "role": "user",
-                                "content": [
-                                    {
-                                        "type": "tool_result",
-                                        "tool_use_id": block.id,
-                                        "content": json.dumps(result),
-                                    }
-                                ],
-                            }
-                        )
+        self.console.print(
+            Panel(summary, title="[bold green]Zoeken Voltooid", border_style="green")
+        )
 
-                        # Reset for next iteration
-                        assistant_message = {"role": "assistant", "content": []}
+    def run_topic_search(self):
+        """Zoek interessante AI-topics."""
+        conversation = self._start_topic_search()
+        progress = self._topic_progress()
 
-                        # Update progress
-                        progress.update(task, topics=len(self.topics))
+        with Live(progress, console=self.console):
+            task = progress.add_task(
+                "[cyan]Zoeken naar interessante AI-topics...", total=None, topics=0
+            )
 
-                # Add last assistant message if it has text
-                if assistant_message["content"] and not has_tool_calls:
-                    conversation.append(assistant_message)
-                    break
+            # Agent zoekt topics met iteratieve tool calls
+            for _ in range(self.MAX_ITERATIONS):
+                # Stream the response; search/fetch tools start while it is still arriving
+                response, results = run_model_turn(
+                    self.client,
+                    self._search_request(conversation),
+                    lambda name, tool_input: self._handle_tool_call(
+                        name, tool_input, silent=True, progress=progress, task=task
+                    ),
+                    max_workers=Config.TOOL_WORKERS,
+                    stream=Config.STREAM_RESPONSES,
+                    # Bij end_turn is de agent klaar: geen save_topic meer uitvoeren
+                    should_dispatch=lambda response: response.stop_reason != "end_turn",
+                )
 
-                # If no tool calls and no end_turn, something went wrong
-                if not has_tool_calls:
+                if not self._apply_topic_turn(response, results, conversation, progress, task):
                     break
 
         # Show summary
-        summary = Table(show_header=False, box=None)
-        summary.add_row("[green]✓[/green]", "Topics gevonden", f"[bold]{len(self.topics)}[/bold]")
-
-        self.console.print(
-            Panel(summary, title="[bold green]Zoeken Voltooid", border_style="green")
-        )
+        self._finish_topic_search()
 
     def generate_report(self):
         """Genereer rapport met gevonden topics."""
@@ -372,7 +408,7 @@ class TopicFinderAgent:
 
         with self.console.status("[cyan]Agent schrijft rapport...[/cyan]"):
             response = self.client.messages.create(
-                model=Config.MODEL,
+                model=Config.REPORT_MODEL,
                 max_tokens=Config.SEARCH_MAX_TOKENS,
                 messages=[{"role": "user", "content": prompt}],
             )
@@ -418,6 +454,10 @@ class TopicFinderAgent:
     def run_full_cycle(self):
         """Voer volledige cyclus uit: zoeken en rapporteren."""
 
+        if Config.ASYNC_RUNTIME:
+            # Zelfde fasen op één event loop (AsyncAnthropic, httpx)
+            return asyncio.run(AsyncTopicRuntime(self).run_full_cycle())
+
         # Search for topics
         self.run_topic_search()
 
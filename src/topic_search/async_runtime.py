@@ -0,0 +1,92 @@
+"""Asyncio runtime for the topic search.
+
+Counterpart of ``src.guest_search.async_runtime`` for the TopicFinderAgent:
+model turns via ``AsyncAnthropic``, web searches and page downloads as
+concurrent tasks on one event loop.
+"""
+
+import asyncio
+
+import httpx
+from rich.live import Live
+
+from src.guest_search.async_runtime import new_http_client, run_tool_calls
+from src.guest_search.config import Config
+from src.utils.portkey_client import get_async_anthropic_client
+
+
+class AsyncTopicRuntime:
+    """
+    Asyncio driver for a TopicFinderAgent.
+
+    Args:
+        agent: TopicFinderAgent that holds the topics and prompts
+        client: async Anthropic client (default: get_async_anthropic_client)
+        http: httpx.AsyncClient for page downloads (default: new_http_client)
+    """
+
+    def __init__(self, agent, client=None, http: httpx.AsyncClient | None = None):
+        self.agent = agent
+        self.client = client or get_async_anthropic_client(Config.ANTHROPIC_API_KEY)
+        self.http = http or new_http_client()
+
+    async def run_full_cycle(self):
+        """Search and report on one event loop."""
+        try:
+            await self.run_topic_search()
+        finally:
+            await self.http.aclose()
+
+        # Single report request + file writes: the synchronous implementation
+        return await asyncio.to_thread(self.agent.generate_report)
+
+    async def run_topic_search(self):
+        """Search for AI topics with an async tool loop."""
+        agent = self.agent
+        conversation = agent._start_topic_search()
+        progress = agent._topic_progress()
+
+        with Live(progress, console=agent.console):
+            task = progress.add_task(
+                "[cyan]Zoeken naar interessante AI-topics...", total=None, topics=0
+            )
+
+            async def handler(tool_name, tool_input):
+                return await self._handle_tool_call(tool_name, tool_input, progress, task)
+
+            for _ in range(agent.MAX_ITERATIONS):
+                response = await self.client.messages.create(**agent._search_request(conversation))
+                tool_uses = [block for block in response.content if block.type == "tool_use"]
+                # end_turn ends the search: its tool calls (save_topic) are not executed
+                if response.stop_reason == "end_turn":
+                    tool_uses = []
+                results = await run_tool_calls(tool_uses, handler)
+
+                if not agent._apply_topic_turn(response, results, conversation, progress, task):
+                    break
+
+        agent._finish_topic_search()
+
+    async def _handle_tool_call(self, tool_name, tool_input, progress, task):
+        """Async tool handler: network I/O on the loop, save_topic via the agent."""
+        agent = self.agent
+
+        if tool_name == "web_search":
+            agent._show_activity(tool_name, tool_input, progress, task)
+            search_result = await agent.smart_search.asearch(tool_input["query"], num_results=10)
+            return agent._format_search_results(search_result)
+
+        if tool_name == "fetch_page_content":
+            url = tool_input["url"]
+            agent._show_activity(tool_name, tool_input, progress, task)
+            try:
+                response = await self.http.get(url)
+                return await asyncio.to_thread(
+                    agent._page_result, url, response.status_code, response.text
+                )
+            except Exception as e:
+                return {"url": url, "error": str(e), "status": "error"}
+
+        return agent._handle_tool_call(
+            tool_name, tool_input, silent=True, progress=progress, task=task
+        )
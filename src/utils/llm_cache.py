@@ -0,0 +1,134 @@
+"""Record/replay cache for LLM calls.
+
+``RecordReplayClient`` wraps the client returned by ``get_anthropic_client``
+(``Anthropic`` or ``AnthropicPortkeyAdapter``). Each request is hashed on the
+fields that determine the answer (model, system, messages, tools,
+tool_choice, thinking):
+
+- ``record``: call the wrapped client and store the response;
+- ``replay``: serve stored responses only; a request that was never recorded
+  raises ``ReplayMissError`` (no API key or network needed);
+- ``auto``: replay when stored, otherwise record.
+
+Replaying a recorded run gives whole ``run_full_cycle`` runs offline, at zero
+API cost and with deterministic timing. Prompts contain the current date, so
+a replay matches a recording from the same day (or a frozen clock), and the
+search tools need their own stubs or cache.
+
+The wrapper has no ``messages.stream``: the agents fall back to
+``messages.create``, so recorded and replayed runs take the same code path.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+from anthropic.types import Message
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+MODES = ("off", "record", "replay", "auto")
+
+# Request fields that determine the response (max_tokens, metadata and headers don't)
+KEY_FIELDS = ("model", "system", "messages", "tools", "tool_choice", "thinking")
+
+
+class ReplayMissError(LookupError):
+    """No recorded response for a request in replay mode."""
+
+
+def request_key(request: dict) -> str:
+    """Stable hash of a messages.create request (prompt cache markers are ignored)."""
+    relevant = {field: _plain(request[field]) for field in KEY_FIELDS if field in request}
+    canonical = json.dumps(relevant, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class RecordReplayClient:
+    """
+    Client wrapper with a record/replay cache for ``messages.create``.
+
+    Args:
+        client: wrapped client (may be None in replay mode)
+        mode: "record", "replay" or "auto"
+        cache_dir: directory with one JSON file per recorded response
+    """
+
+    def __init__(self, client, mode: str = "auto", cache_dir: str = "data/cache/llm"):
+        if mode not in MODES or mode == "off":
+            raise ValueError(f"Unknown LLM cache mode: {mode!r}")
+        if client is None and mode != "replay":
+            raise ValueError(f"LLM cache mode {mode!r} needs a client to record with")
+
+        self.client = client
+        self.mode = mode
+        self.cache_dir = Path(cache_dir)
+        self.messages = self
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.recorded = 0
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def create(self, **request) -> Any:
+        key = request_key(request)
+        path = self._path(key)
+
+        if self.mode in ("replay", "auto"):
+            response = self._load(path)
+            if response is not None:
+                with self._lock:
+                    self.hits += 1
+                return response
+            if self.mode == "replay":
+                raise ReplayMissError(
+                    f"No recorded LLM response for request {key[:12]} in {self.cache_dir} "
+                    "(record it first with LLM_CACHE_MODE=record)"
+                )
+
+        response = self.client.messages.create(**request)
+        self._store(path, response)
+        with self._lock:
+            self.recorded += 1
+        return response
+
+    def _load(self, path: Path) -> Message | None:
+        try:
+            with open(path, encoding="utf-8") as f:
+                return Message.model_validate(json.load(f))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to load recorded LLM response {path}: {e}")
+            return None
+
+    def _store(self, path: Path, response: Any) -> None:
+        if not isinstance(response, Message):
+            logger.warning(f"Not recording LLM response of type {type(response).__name__}")
+            return
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(response.model_dump(mode="json"), f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+
+def _plain(value: Any) -> Any:
+    """JSON-like form of request values; SDK blocks and dict blocks hash the same."""
+    if isinstance(value, BaseModel):
+        value = value.model_dump(exclude_none=True)
+    elif hasattr(value, "__dict__") and not isinstance(value, type):
+        value = vars(value)
+
+    if isinstance(value, dict):
+        return {k: _plain(v) for k, v in value.items() if k != "cache_control" and v is not None}
+    if isinstance(value, list | tuple):
+        return [_plain(item) for item in value]
+    return value
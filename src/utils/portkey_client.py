@@ -4,9 +4,12 @@ This module provides a factory function that returns either a standard Anthropic
 client or a Portkey client using Model Catalog, depending on environment configuration.
 """
 
+import asyncio
 import os
 
-from anthropic import Anthropic
+from anthropic import Anthropic, AsyncAnthropic
+
+from src.utils.llm_cache import RecordReplayClient
 
 
 def get_anthropic_client(api_key: str):
@@ -19,6 +22,10 @@ def get_anthropic_client(api_key: str):
     If PORTKEY_MODEL_NAME is set, uses that model, otherwise defaults to
     'claude-sonnet-4-5-20250929'.
 
+    If LLM_CACHE_MODE is 'record', 'replay' or 'auto', the client is wrapped in
+    a RecordReplayClient that stores/serves responses in LLM_CACHE_DIR
+    (see src/utils/llm_cache.py). Replay mode does not create an API client.
+
     Args:
         api_key: Anthropic API key (used only when Portkey is not configured)
 
@@ -30,6 +37,18 @@ def get_anthropic_client(api_key: str):
         >>> client = get_anthropic_client(Config.ANTHROPIC_API_KEY)
         >>> response = client.messages.create(...)
     """
+    cache_mode = os.getenv("LLM_CACHE_MODE", "off").lower()
+    if cache_mode == "off":
+        return _create_client(api_key)
+
+    cache_dir = os.getenv("LLM_CACHE_DIR", "data/cache/llm")
+    print(f"📼 LLM record/replay cache: {cache_mode} ({cache_dir})")
+    client = None if cache_mode == "replay" else _create_client(api_key)
+    return RecordReplayClient(client, cache_mode, cache_dir)
+
+
+def _create_client(api_key: str):
+    """Anthropic client or Portkey adapter (see get_anthropic_client)."""
     portkey_api_key = os.getenv("PORTKEY_API_KEY")
 
     if portkey_api_key:
@@ -57,6 +76,37 @@ def get_anthropic_client(api_key: str):
         return Anthropic(api_key=api_key)
 
 
+def get_async_anthropic_client(api_key: str):
+    """
+    Get an async Anthropic client, optionally using Portkey for observability.
+
+    Without Portkey this is ``AsyncAnthropic``. The Portkey adapter and the
+    record/replay cache are synchronous, so they are wrapped in an
+    ``AsyncClientBridge`` that runs their calls in a thread.
+
+    Args:
+        api_key: Anthropic API key (used only when Portkey is not configured)
+
+    Returns:
+        Client whose ``messages.create`` is a coroutine
+    """
+    client = get_anthropic_client(api_key)
+    if isinstance(client, Anthropic):
+        return AsyncAnthropic(api_key=api_key)
+    return AsyncClientBridge(client)
+
+
+class AsyncClientBridge:
+    """Async ``messages.create`` on top of a synchronous client (runs in a worker thread)."""
+
+    def __init__(self, client):
+        self.client = client
+        self.messages = self
+
+    async def create(self, **kwargs):
+        return await asyncio.to_thread(self.client.messages.create, **kwargs)
+
+
 class AnthropicPortkeyAdapter:
     """
     Adapter that wraps Portkey client to provide Anthropic-compatible interface.
@@ -11,9 +11,11 @@ Dit systeem schakelt automatisch tussen search providers:
 5. Web scraping als laatste redmiddel
 """
 
+import asyncio
 import json
 import logging
 import os
+import threading
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -56,6 +58,8 @@ class SearchResultCache:
         self.cache_file = Path(cache_file)
         self.cache_file.parent.mkdir(parents=True, exist_ok=True)
         self.cache_duration = timedelta(days=1)
+        # Concurrent tool calls may search at the same time
+        self._lock = threading.RLock()
         self.cache_data = self.load_cache()
 
     def load_cache(self) -> dict:
@@ -71,7 +75,7 @@ class SearchResultCache:
     def save_cache(self):
         """Save cache data to file"""
         try:
-            with open(self.cache_file, "w", encoding="utf-8") as f:
+            with self._lock, open(self.cache_file, "w", encoding="utf-8") as f:
                 json.dump(self.cache_data, f, indent=2, ensure_ascii=False)
         except OSError as e:
             logger.error(f"Failed to save search cache: {e}")
@@ -106,8 +110,9 @@ class SearchResultCache:
         # Check if cache is still valid (within 1 day)
         if datetime.now() - cached_time > self.cache_duration:
             # Remove expired entry
-            del self.cache_data[cache_key]
-            self.save_cache()
+            with self._lock:
+                self.cache_data.pop(cache_key, None)
+                self.save_cache()
             return None
 
         result_count = len(cached_entry["results"])
@@ -120,15 +125,15 @@ class SearchResultCache:
         """Cache search results"""
         cache_key = self._generate_cache_key(query, provider, **kwargs)
 
-        self.cache_data[cache_key] = {
-            "timestamp": datetime.now().isoformat(),
-            "query": query,
-            "provider": provider,
-            "results": results,
-            "result_count": len(results),
-        }
-
-        self.save_cache()
+        with self._lock:
+            self.cache_data[cache_key] = {
+                "timestamp": datetime.now().isoformat(),
+                "query": query,
+                "provider": provider,
+                "results": results,
+                "result_count": len(results),
+            }
+            self.save_cache()
         logger.info(f"Cached {len(results)} results for query '{query}' with provider '{provider}'")
 
     def clear_expired_entries(self):
@@ -856,6 +861,15 @@ class SmartSearchTool:
             "timestamp": datetime.now().isoformat(),
         }
 
+    async def asearch(self, query: str, **kwargs) -> dict[str, Any]:
+        """
+        Async variant van search() voor de asyncio runtime
+
+        De providers gebruiken blocking requests; de search draait daarom in een
+        worker thread zodat de event loop vrij blijft (cache is thread-safe).
+        """
+        return await asyncio.to_thread(self.search, query, **kwargs)
+
     def get_status(self) -> dict[str, Any]:
         """Krijg status van alle providers en cache"""
         status: dict[str, Any] = {
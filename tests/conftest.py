@@ -8,6 +8,34 @@ from unittest.mock import MagicMock
 
 import pytest
 
+# ============================================
+# ISOLATION
+# ============================================
+
+
+@pytest.fixture(autouse=True)
+def isolated_ner_cache(tmp_path, monkeypatch):
+    """Keep the NER cache of each test in tmp_path and start with a fresh service."""
+    from src.guest_search import ner
+
+    cache_dir = str(tmp_path / "ner_cache")
+    # ner.Config: some tests reload the config module
+    monkeypatch.setattr(ner.Config, "NER_CACHE_DIR", cache_dir)
+    # Spawned extraction workers read the config from the environment
+    monkeypatch.setenv("NER_CACHE_DIR", cache_dir)
+    monkeypatch.setattr(ner, "_service", None)
+    yield
+
+
+@pytest.fixture(autouse=True)
+def isolated_learning_dir(tmp_path, monkeypatch):
+    """Keep the stored learning aggregates of each test in tmp_path."""
+    from src.guest_search import agent
+
+    monkeypatch.setattr(agent.Config, "LEARNING_DIR", str(tmp_path / "learning"))
+    yield
+
+
 # ============================================
 # FILE SYSTEM FIXTURES
 # ============================================
@@ -0,0 +1,256 @@
+"""Tests for the asyncio runtime of the guest and topic agents."""
+
+import asyncio
+import sys
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from src.guest_search.agent import GuestFinderAgent
+from src.guest_search.async_runtime import AsyncGuestRuntime, run_tool_calls
+from src.guest_search.config import Config
+from src.utils.portkey_client import AsyncClientBridge
+
+PAGE_HTML = "<html><body><p>Dr. Anna Visser, hoogleraar AI aan de TU Delft.</p></body></html>"
+
+
+def _tool_use(name, tool_input, block_id):
+    return SimpleNamespace(type="tool_use", name=name, input=tool_input, id=block_id)
+
+
+def _response(*blocks, stop_reason="tool_use"):
+    return SimpleNamespace(stop_reason=stop_reason, content=list(blocks), usage=None)
+
+
+class FakeAsyncClient:
+    """Async messages.create that returns the scripted responses in order."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+        self.messages = self
+
+    async def create(self, **request):
+        self.requests.append(request)
+        return self.responses.pop(0)
+
+
+def _http(pages, requested=None):
+    def handle(request):
+        url = str(request.url)
+        if requested is not None:
+            requested.append(url)
+        if url not in pages:
+            return httpx.Response(404)
+        return httpx.Response(200, text=pages[url])
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handle))
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    monkeypatch.setattr(Config, "PARALLEL_QUERY_WORKERS", 0)
+    monkeypatch.setattr(Config, "EXTRACTION_WORKERS", 0)
+    with patch("src.guest_search.agent.get_anthropic_client"):
+        agent = GuestFinderAgent()
+    agent.candidates = []
+    agent.previous_guests = []
+    agent.smart_search = MagicMock()
+    return agent
+
+
+@pytest.fixture
+def fresh_topic_modules():
+    """
+    Import the topic agent for one test only.
+
+    test_topic_agent patches get_anthropic_client in src.utils.portkey_client, which
+    only takes effect when src.topic_search.agent is first imported inside that test.
+    """
+    loaded = set(sys.modules)
+    yield
+    for name in [n for n in sys.modules if n.startswith("src.topic_search") and n not in loaded]:
+        del sys.modules[name]
+
+
+class TestRunToolCalls:
+    """Test async tool dispatch."""
+
+    def test_io_tools_concurrent_results_in_order(self):
+        started = []
+
+        async def handler(name, tool_input):
+            started.append(tool_input["url"])
+            # Both fetches must be running before either can finish
+            while len(started) < 2:
+                await asyncio.sleep(0)
+            return {"url": tool_input["url"]}
+
+        tool_uses = [
+            _tool_use("fetch_page_content", {"url": "a"}, "t1"),
+            _tool_use("fetch_page_content", {"url": "b"}, "t2"),
+        ]
+
+        results = asyncio.run(asyncio.wait_for(run_tool_calls(tool_uses, handler), 2))
+
+        assert results == [{"url": "a"}, {"url": "b"}]
+
+
+class TestAsyncSearchPhase:
+    """Test the search phase on the event loop."""
+
+    def test_fetch_uses_http_client_and_saves_candidate(self, agent):
+        client = FakeAsyncClient(
+            [
+                _response(_tool_use("fetch_page_content", {"url": "https://a.nl/"}, "t1")),
+                _response(
+                    _tool_use("save_candidate", {"name": "Anna Visser", "organization": ""}, "t2")
+                ),
+                _response(SimpleNamespace(type="text", text="Klaar"), stop_reason="end_turn"),
+            ]
+        )
+        runtime = AsyncGuestRuntime(agent, client=client, http=_http({"https://a.nl/": PAGE_HTML}))
+
+        asyncio.run(runtime.run_search_phase({"search_queries": [{"query": "AI zorg"}]}))
+
+        assert [c["name"] for c in agent.candidates] == ["Anna Visser"]
+        record = agent.current_session_queries[0]
+        assert record["successful_sources"] == ["https://a.nl/"]
+        assert record["candidates_found"] == 1
+        # Static instructions are sent as system prompt, as in the sync loop
+        assert "system" in client.requests[0]
+
+    def test_search_results_prefetched(self, agent, monkeypatch):
+        monkeypatch.setattr(Config, "ASYNC_PREFETCH_PAGES", 1)
+        agent.smart_search.asearch = _async_return(
+            {"results": [{"title": "A", "link": "https://a.nl/"}, {"link": "https://b.nl/"}]}
+        )
+        client = FakeAsyncClient(
+            [
+                _response(_tool_use("web_search", {"query": "AI"}, "t1")),
+                _response(_tool_use("fetch_page_content", {"url": "https://a.nl/"}, "t2")),
+                _response(SimpleNamespace(type="text", text="Klaar"), stop_reason="end_turn"),
+            ]
+        )
+        requested = []
+        runtime = AsyncGuestRuntime(
+            agent, client=client, http=_http({"https://a.nl/": PAGE_HTML}, requested)
+        )
+
+        asyncio.run(runtime.run_search_phase({"search_queries": [{"query": "AI zorg"}]}))
+
+        # Only the top result is prefetched, and the later fetch reuses the download
+        assert requested == ["https://a.nl/"]
+        assert agent.current_session_queries[0]["successful_sources"] == ["https://a.nl/"]
+
+
+class TestAsyncLinkedIn:
+    """Test LinkedIn lookups started during the search."""
+
+    def test_lookup_started_on_save(self, agent):
+        lookups = []
+
+        async def asearch(query, **kwargs):
+            lookups.append(query)
+            return {"results": [{"link": "https://www.linkedin.com/in/anna-visser"}]}
+
+        agent.smart_search.asearch = asearch
+        client = FakeAsyncClient(
+            [
+                _response(
+                    _tool_use(
+                        "save_candidate", {"name": "Anna Visser", "organization": "TU Delft"}, "t1"
+                    )
+                ),
+                _response(SimpleNamespace(type="text", text="Klaar"), stop_reason="end_turn"),
+            ]
+        )
+        runtime = AsyncGuestRuntime(agent, client=client, http=_http({}))
+
+        async def run():
+            await runtime.run_search_phase({"search_queries": [{"query": "AI zorg"}]})
+            # Already running before the enrichment phase
+            assert len(runtime._linkedin_lookups) == 1
+            await runtime.enrich_linkedin_profiles()
+
+        asyncio.run(run())
+
+        assert lookups == ['"Anna Visser" TU Delft LinkedIn']
+        linkedin = agent.candidates[0]["contact_info"]["linkedin"]
+        assert linkedin == "https://www.linkedin.com/in/anna-visser"
+
+
+class TestSyncWrapper:
+    """Test that the sync API delegates to the runtime."""
+
+    def test_run_full_cycle_uses_async_runtime(self, agent, monkeypatch):
+        monkeypatch.setattr(Config, "ASYNC_RUNTIME", True)
+
+        async def run_full_cycle(self, replan=False):
+            return "rapport"
+
+        with patch.object(AsyncGuestRuntime, "run_full_cycle", run_full_cycle):
+            with patch("src.guest_search.async_runtime.get_async_anthropic_client"):
+                assert agent.run_full_cycle() == "rapport"
+
+    def test_topic_search_on_event_loop(self, fresh_topic_modules):
+        from src.topic_search.agent import TopicFinderAgent
+        from src.topic_search.async_runtime import AsyncTopicRuntime
+
+        with patch("src.topic_search.agent.get_anthropic_client"):
+            with patch("src.topic_search.agent.SmartSearchTool"):
+                agent = TopicFinderAgent()
+        client = FakeAsyncClient(
+            [
+                _response(
+                    _tool_use("fetch_page_content", {"url": "https://a.nl/"}, "t1"),
+                    _tool_use("save_topic", {"title": "AI in de zorg"}, "t2"),
+                ),
+                _response(SimpleNamespace(type="text", text="Klaar"), stop_reason="end_turn"),
+            ]
+        )
+        runtime = AsyncTopicRuntime(agent, client=client, http=_http({"https://a.nl/": PAGE_HTML}))
+
+        asyncio.run(runtime.run_topic_search())
+
+        assert [t["title"] for t in agent.topics] == ["AI in de zorg"]
+        tool_result = client.requests[1]["messages"][2]["content"][0]
+        assert "Anna Visser" in tool_result["content"]
+
+    def test_topic_end_turn_does_not_run_tool_calls(self, fresh_topic_modules):
+        from src.topic_search.agent import TopicFinderAgent
+        from src.topic_search.async_runtime import AsyncTopicRuntime
+
+        with patch("src.topic_search.agent.get_anthropic_client"):
+            with patch("src.topic_search.agent.SmartSearchTool"):
+                agent = TopicFinderAgent()
+        client = FakeAsyncClient(
+            [_response(_tool_use("save_topic", {"title": "AI"}, "t1"), stop_reason="end_turn")]
+        )
+        runtime = AsyncTopicRuntime(agent, client=client, http=_http({}))
+
+        asyncio.run(runtime.run_topic_search())
+
+        assert agent.topics == []
+
+
+class TestAsyncClientBridge:
+    """Test the async wrapper for synchronous clients (Portkey adapter)."""
+
+    def test_create_runs_sync_client(self):
+        sync_client = MagicMock()
+        sync_client.messages.create.return_value = "response"
+
+        bridge = AsyncClientBridge(sync_client)
+
+        assert asyncio.run(bridge.messages.create(model="m")) == "response"
+        sync_client.messages.create.assert_called_once_with(model="m")
+
+
+def _async_return(value):
+    async def call(*args, **kwargs):
+        return value
+
+    return call
@@ -0,0 +1,137 @@
+"""Tests for the yield-aware search budget."""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from src.guest_search.budget import SearchBudget, priority_order
+from src.guest_search.config import Config
+
+
+def _record(candidates=0, tokens=100_000, seconds=60):
+    return {
+        "candidates_found": candidates,
+        "input_tokens": tokens,
+        "output_tokens": 0,
+        "duration_seconds": seconds,
+    }
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestPriorityOrder:
+    """Test planner priority ordering."""
+
+    def test_high_first_stable_within_priority(self):
+        queries = [
+            {"query": "a", "priority": "low"},
+            {"query": "b", "priority": "high"},
+            {"query": "c"},
+            {"query": "d", "priority": "high"},
+        ]
+
+        assert [q["query"] for q in priority_order(queries)] == ["b", "d", "c", "a"]
+
+
+class TestSearchBudget:
+    """Test budget stops and low-yield skips."""
+
+    def test_token_budget_stops_all_remaining_queries(self):
+        budget = SearchBudget(max_tokens=150_000)
+        budget.record(_record(candidates=3))
+        assert budget.check({"query": "a", "priority": "high"}) is None
+
+        budget.record(_record(candidates=3))
+
+        assert budget.check({"query": "b", "priority": "high"}) is not None
+        assert "tokenbudget" in budget.stop_reason
+        assert budget.skipped == [{"query": "b", "priority": "high", "reason": budget.stop_reason}]
+
+    def test_time_budget(self):
+        clock = FakeClock()
+        budget = SearchBudget(max_seconds=300, clock=clock)
+        assert budget.check({"query": "a"}) is None
+
+        clock.now = 301
+
+        assert budget.check({"query": "b"}) is not None
+        assert "tijdbudget" in budget.stop_reason
+
+    def test_low_yield_skips_only_non_high(self):
+        budget = SearchBudget(min_yield_per_100k_tokens=0.5, window=2)
+        budget.record(_record(candidates=2))
+        budget.record(_record(candidates=0))
+        budget.record(_record(candidates=0))
+
+        assert budget.check({"query": "a", "priority": "high"}) is None
+        assert "lage opbrengst" in budget.check({"query": "b", "priority": "medium"})
+        assert budget.stop_reason is None
+        # A productive query lifts the marginal yield again
+        budget.record(_record(candidates=2))
+        assert budget.check({"query": "c", "priority": "low"}) is None
+
+    def test_no_judgement_without_full_window_or_tokens(self):
+        budget = SearchBudget(min_yield_per_100k_tokens=0.5, min_yield_per_minute=1, window=2)
+        budget.record(_record(candidates=0))
+        assert budget.check({"query": "a", "priority": "low"}) is None
+
+        # Mocked clients report no usage or time: nothing to judge
+        budget = SearchBudget(min_yield_per_100k_tokens=0.5, min_yield_per_minute=1, window=2)
+        budget.record(_record(candidates=0, tokens=0, seconds=0))
+        budget.record(_record(candidates=0, tokens=0, seconds=0))
+        assert budget.check({"query": "b", "priority": "low"}) is None
+
+    def test_yield_stats(self):
+        budget = SearchBudget()
+        budget.record(_record(candidates=1, tokens=50_000, seconds=30))
+
+        stats = budget.yield_stats()
+
+        assert stats == {"candidates": 1, "per_100k_tokens": 2.0, "per_minute": 2.0}
+
+
+class TestSearchPhaseBudget:
+    """Test the budget in the guest agent's search loop."""
+
+    def test_low_priority_queries_skipped_after_unproductive_queries(self, monkeypatch):
+        from src.guest_search.agent import GuestFinderAgent
+
+        monkeypatch.setattr(Config, "PARALLEL_QUERY_WORKERS", 0)
+        monkeypatch.setattr(Config, "MIN_YIELD_PER_100K_TOKENS", 1.0)
+        monkeypatch.setattr(Config, "YIELD_WINDOW", 2)
+        with patch("src.guest_search.agent.get_anthropic_client"):
+            agent = GuestFinderAgent()
+        agent.candidates = []
+        agent.client = MagicMock()
+        usage = SimpleNamespace(
+            input_tokens=100_000,
+            output_tokens=0,
+            cache_read_input_tokens=0,
+            cache_creation_input_tokens=0,
+        )
+        agent.client.messages.create.return_value = MagicMock(
+            stop_reason="end_turn",
+            content=[SimpleNamespace(type="text", text="Niets gevonden")],
+            usage=usage,
+        )
+
+        agent.run_search_phase(
+            {
+                "search_queries": [
+                    {"query": "laag", "priority": "low"},
+                    {"query": "hoog 1", "priority": "high"},
+                    {"query": "hoog 2", "priority": "high"},
+                    {"query": "hoog 3", "priority": "high"},
+                    {"query": "medium", "priority": "medium"},
+                ]
+            }
+        )
+
+        ran = [record["query"] for record in agent.current_session_queries]
+        assert ran == ["hoog 1", "hoog 2", "hoog 3"]
+        assert [s["query"] for s in agent.search_budget.skipped] == ["medium", "laag"]
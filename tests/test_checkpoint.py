@@ -0,0 +1,223 @@
+"""Tests for run checkpoints and resuming an interrupted run."""
+
+import json
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.guest_search.checkpoint import RunCheckpoint, compact_conversation
+from src.guest_search.config import Config
+
+STRATEGY = {
+    "week_focus": "AI in de zorg",
+    "search_queries": [
+        {"query": "AI zorg hoogleraar", "priority": "high"},
+        {"query": "AI ziekenhuis onderzoek", "priority": "high"},
+    ],
+}
+
+
+def _tool_use(name, tool_input, block_id):
+    return SimpleNamespace(type="tool_use", name=name, input=tool_input, id=block_id)
+
+
+def _response(*blocks, stop_reason="tool_use"):
+    return MagicMock(stop_reason=stop_reason, content=list(blocks), usage=None)
+
+
+def _done():
+    return _response(SimpleNamespace(type="text", text="Klaar"), stop_reason="end_turn")
+
+
+class TestRunCheckpoint:
+    """Test checkpoint files."""
+
+    def test_save_and_load(self, tmp_path):
+        checkpoint = RunCheckpoint.create(tmp_path, run_id="run-1")
+        page = {"url": "https://a.nl/", "content": "x" * 500, "potential_persons": []}
+        conversation = [
+            {"role": "user", "content": "Zoek gasten"},
+            {"role": "assistant", "content": [_tool_use("fetch_page_content", {}, "t1")]},
+            {
+                "role": "user",
+                "content": [
+                    {"type": "tool_result", "tool_use_id": "t1", "content": json.dumps(page)}
+                ],
+            },
+        ]
+
+        checkpoint.save(
+            "searching",
+            strategy=STRATEGY,
+            conversation=conversation,
+            candidates=[{"name": "Anna Visser"}],
+            queries=[{"query": "AI zorg hoogleraar"}],
+        )
+        loaded = RunCheckpoint.load(tmp_path / "run-1")
+
+        assert loaded.stage == "searching"
+        assert loaded.strategy == STRATEGY
+        assert loaded.candidates == [{"name": "Anna Visser"}]
+        restored = loaded.conversation
+        assert restored[1]["content"][0] == {
+            "type": "tool_use",
+            "id": "t1",
+            "name": "fetch_page_content",
+            "input": {},
+        }
+        assert json.loads(restored[2]["content"][0]["content"])["compacted"] is True
+        # The live conversation is not compacted
+        assert "compacted" not in json.loads(conversation[2]["content"][0]["content"])
+
+    def test_latest_skips_finished_runs(self, tmp_path):
+        RunCheckpoint.create(tmp_path, run_id="20250101-090000").save("searching")
+        RunCheckpoint.create(tmp_path, run_id="20250102-090000").save("done")
+        (tmp_path / "20250103-090000").mkdir()
+
+        assert RunCheckpoint.latest(tmp_path).run_id == "20250101-090000"
+        assert RunCheckpoint.latest(tmp_path / "missing") is None
+
+    def test_latest_only_since(self, tmp_path):
+        old = RunCheckpoint.create(tmp_path, run_id="20250101-090000")
+        old.save("searching")
+        old.state["updated"] = (datetime.now() - timedelta(weeks=3)).isoformat()
+        (old.run_dir / "checkpoint.json").write_text(json.dumps(old.state))
+
+        since = datetime.now() - timedelta(days=1)
+
+        assert RunCheckpoint.latest(tmp_path, since=since) is None
+        assert RunCheckpoint.latest(tmp_path).run_id == "20250101-090000"
+
+    def test_prune_keeps_newest_finished_and_recent_unfinished(self, tmp_path):
+        for day in range(1, 5):
+            RunCheckpoint.create(tmp_path, run_id=f"2025010{day}-090000").save("done")
+        RunCheckpoint.create(tmp_path, run_id="20250105-090000").save("searching")
+        stale = RunCheckpoint.create(tmp_path, run_id="20241201-090000")
+        stale.state.update(stage="searching", updated="2024-12-01T09:00:00")
+        stale.run_dir.mkdir()
+        (stale.run_dir / "checkpoint.json").write_text(json.dumps(stale.state))
+
+        removed = RunCheckpoint.prune(tmp_path, keep=2, before=datetime.now() - timedelta(days=1))
+
+        assert removed == 3
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "20250103-090000",
+            "20250104-090000",
+            "20250105-090000",
+        ]
+
+    def test_reached(self, tmp_path):
+        checkpoint = RunCheckpoint.create(tmp_path)
+        checkpoint.save("searched")
+
+        assert checkpoint.reached("planned")
+        assert not checkpoint.reached("enriched")
+
+    def test_compact_conversation_keeps_plain_messages(self):
+        conversation = [{"role": "user", "content": "Zoek gasten"}]
+
+        assert compact_conversation(conversation) == conversation
+
+
+class TestResume:
+    """Test resuming run_full_cycle after a crash during the search."""
+
+    @pytest.fixture
+    def new_agent(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(Config, "RUNS_DIR", str(tmp_path))
+        monkeypatch.setattr(Config, "CHECKPOINTS_ENABLED", True)
+        monkeypatch.setattr(Config, "PARALLEL_QUERY_WORKERS", 0)
+        monkeypatch.setattr(Config, "ASYNC_RUNTIME", False)
+        monkeypatch.setattr(Config, "STRATEGY_CACHE_DIR", str(tmp_path / "strategies"))
+
+        def create():
+            from src.guest_search.agent import GuestFinderAgent
+
+            with patch("src.guest_search.agent.get_anthropic_client"):
+                agent = GuestFinderAgent()
+            agent.candidates = []
+            agent.previous_guests = []
+            agent.client = MagicMock()
+            agent.enrich_linkedin_profiles = MagicMock()
+            agent.generate_report = MagicMock(return_value="rapport")
+            agent.print_run_metrics = MagicMock()
+            return agent
+
+        return create
+
+    def test_resume_after_crash_in_second_query(self, new_agent, tmp_path):
+        agent = new_agent()
+        agent.run_planning_phase = MagicMock(return_value=STRATEGY)
+        agent.client.messages.create.side_effect = [
+            _response(_tool_use("save_candidate", {"name": "Anna Visser"}, "t1")),
+            _done(),
+            RuntimeError("connection reset"),
+        ]
+
+        with pytest.raises(RuntimeError):
+            agent.run_full_cycle()
+
+        resumed = new_agent()
+        resumed.run_planning_phase = MagicMock()
+        resumed.client.messages.create.side_effect = [_done()]
+
+        assert resumed.run_full_cycle(resume=True) == "rapport"
+
+        # No new planning and only the second query runs again
+        resumed.run_planning_phase.assert_not_called()
+        assert resumed.client.messages.create.call_count == 1
+        assert [c["name"] for c in resumed.candidates] == ["Anna Visser"]
+        queries = [record["query"] for record in resumed.current_session_queries]
+        assert queries == ["AI zorg hoogleraar", "AI ziekenhuis onderzoek"]
+        # The shared conversation continues from the checkpoint
+        messages = resumed.client.messages.create.call_args.kwargs["messages"]
+        assert len(messages) == 5
+        assert RunCheckpoint.latest(tmp_path) is None
+
+    def test_resume_without_checkpoint_starts_new_run(self, new_agent):
+        agent = new_agent()
+        agent.run_planning_phase = MagicMock(return_value=None)
+
+        assert agent.run_full_cycle(resume=True) is None
+        agent.run_planning_phase.assert_called_once()
+
+
+class TestReportSaved:
+    """Test that a resumed run does not save the run history twice."""
+
+    @pytest.fixture
+    def agent(self, tmp_path, monkeypatch):
+        from src.guest_search.agent import GuestFinderAgent
+
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "output" / "reports").mkdir(parents=True)
+        monkeypatch.setattr(Config, "FAST_REPORT", True)
+        monkeypatch.setattr(Config, "ENRICHMENT_BATCH", False)
+        monkeypatch.setattr(Config, "HISTORY_STORE", "json")
+        with patch("src.guest_search.agent.get_anthropic_client"):
+            agent = GuestFinderAgent()
+        agent.client = MagicMock()
+        agent.previous_guests = []
+        agent.search_history = {"sessions": []}
+        agent.candidates = [{"name": "Anna Visser", "organization": "TU Delft"}]
+        agent.checkpoint = RunCheckpoint.create(tmp_path / "runs", run_id="run-1")
+        agent._enrich_candidates = MagicMock()
+        agent._render_report = MagicMock(return_value="# Rapport")
+        return agent
+
+    def test_history_saved_once(self, agent, tmp_path):
+        assert agent.generate_report() == "# Rapport"
+
+        checkpoint = RunCheckpoint.load(tmp_path / "runs" / "run-1")
+        assert checkpoint.stage == "reported"
+        assert checkpoint.report_file.startswith("output/reports/")
+
+        # Crash before "done", then resume: the saved report is returned as is
+        agent.checkpoint = checkpoint
+        assert agent.generate_report() == "# Rapport"
+
+        assert agent._render_report.call_count == 1
+        assert [g["name"] for g in agent.previous_guests] == ["Anna Visser"]
+        assert len(agent.search_history["sessions"]) == 1
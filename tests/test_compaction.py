@@ -0,0 +1,195 @@
+"""Tests for compaction of the search conversation."""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from src.guest_search.compaction import (
+    ConversationCompactor,
+    estimate_tokens,
+    summarize_tool_result,
+)
+
+PAGE_RESULT = {
+    "url": "https://example.com/artikel",
+    "content": "Lange tekst " * 400,
+    "potential_persons": [{"name": "Jan de Vries", "context": "..."}, {"name": "Anna Smit"}],
+    "persons_found": 2,
+    "status": "success",
+}
+SEARCH_RESULT = {
+    "results": [
+        {"title": f"Titel {i}", "snippet": "Snippet " * 30, "url": f"https://site{i}.nl"}
+        for i in range(10)
+    ],
+    "provider": "Serper",
+}
+
+
+def _turn(index, result):
+    """Assistant tool_use + user tool_result pair."""
+    tool_use = SimpleNamespace(type="tool_use", id=f"toolu_{index}", name="tool", input={})
+    return [
+        {"role": "assistant", "content": [tool_use]},
+        {
+            "role": "user",
+            "content": [
+                {
+                    "type": "tool_result",
+                    "tool_use_id": f"toolu_{index}",
+                    "content": json.dumps(result),
+                }
+            ],
+        },
+    ]
+
+
+def _conversation(turns=6):
+    conversation = [{"role": "user", "content": "Zoek gasten"}]
+    for i in range(turns):
+        conversation.extend(_turn(i, PAGE_RESULT if i % 2 == 0 else SEARCH_RESULT))
+    return conversation
+
+
+def _tool_contents(conversation):
+    return [
+        json.loads(block["content"])
+        for message in conversation
+        if message["role"] == "user" and isinstance(message["content"], list)
+        for block in message["content"]
+        if block["type"] == "tool_result"
+    ]
+
+
+class TestSummaries:
+    """Test tool result summaries."""
+
+    def test_page_summary_keeps_url_and_persons(self):
+        summary = summarize_tool_result(PAGE_RESULT)
+
+        assert summary == {
+            "url": "https://example.com/artikel",
+            "status": "success",
+            "persons": ["Jan de Vries", "Anna Smit"],
+            "compacted": True,
+        }
+
+    def test_search_summary_keeps_titles_and_urls(self):
+        summary = summarize_tool_result(SEARCH_RESULT)
+
+        assert summary["result_count"] == 10
+        assert summary["results"][0] == {"title": "Titel 0", "url": "https://site0.nl"}
+        assert "snippet" not in summary["results"][0]
+
+    def test_small_results_unchanged(self):
+        result = {"status": "saved", "total_candidates": 3}
+
+        assert summarize_tool_result(result) is result
+
+
+class TestConversationCompactor:
+    """Test budget-triggered compaction."""
+
+    def test_no_compaction_under_budget(self):
+        conversation = _conversation()
+        compactor = ConversationCompactor(token_budget=10**6, keep_turns=2)
+
+        assert compactor.maybe_compact(conversation) == 0
+        assert not any(c.get("compacted") for c in _tool_contents(conversation))
+
+    def test_compacts_all_but_recent_turns(self):
+        conversation = _conversation(turns=6)
+        before = estimate_tokens(conversation)
+        compactor = ConversationCompactor(token_budget=100, keep_turns=2)
+
+        compacted = compactor.maybe_compact(conversation)
+
+        contents = _tool_contents(conversation)
+        assert compacted == 4
+        assert [bool(c.get("compacted")) for c in contents] == [True] * 4 + [False] * 2
+        assert estimate_tokens(conversation) < before / 2
+        # tool_use ids still pair with their results
+        assert conversation[-1]["content"][0]["tool_use_id"] == "toolu_5"
+
+    def test_compaction_is_idempotent(self):
+        conversation = _conversation()
+        compactor = ConversationCompactor(token_budget=100, keep_turns=2)
+        compactor.maybe_compact(conversation)
+
+        assert compactor.maybe_compact(conversation) == 0
+
+    def test_uses_reported_usage_for_budget(self):
+        conversation = _conversation(turns=2)
+        compactor = ConversationCompactor(token_budget=5000, keep_turns=0)
+        compactor.record_usage(
+            SimpleNamespace(
+                input_tokens=200,
+                output_tokens=50,
+                cache_read_input_tokens=6000,
+                cache_creation_input_tokens=0,
+            )
+        )
+
+        assert compactor.context_tokens(conversation) == 6200
+        assert compactor.maybe_compact(conversation) == 2
+
+    def test_usage_per_turn(self):
+        compactor = ConversationCompactor(token_budget=0, keep_turns=4)
+        compactor.record_usage(SimpleNamespace(input_tokens=100, output_tokens=10), "q1")
+        compactor.record_usage(MagicMock(), "q1")  # Mocked clients report no usage
+
+        assert len(compactor.turns) == 2
+        assert compactor.turns[0]["label"] == "q1"
+        assert compactor.totals()["input_tokens"] == 100
+        assert compactor.totals()["output_tokens"] == 10
+
+    def test_zero_budget_disables_compaction(self):
+        conversation = _conversation()
+
+        assert ConversationCompactor(token_budget=0, keep_turns=0).maybe_compact(conversation) == 0
+
+
+class TestSearchPhaseCompaction:
+    """Test compaction and token tracking inside run_search_phase."""
+
+    def test_old_pages_compacted_and_tokens_recorded(self, monkeypatch):
+        from unittest.mock import patch
+
+        from src.guest_search.agent import GuestFinderAgent
+        from src.guest_search.config import Config
+
+        monkeypatch.setattr(Config, "CONVERSATION_TOKEN_BUDGET", 1000)
+        monkeypatch.setattr(Config, "CONVERSATION_KEEP_TURNS", 1)
+        with patch("src.guest_search.agent.get_anthropic_client"):
+            agent = GuestFinderAgent()
+        agent.candidates = []
+
+        def fetch_response(i):
+            block = SimpleNamespace(
+                type="tool_use", name="fetch_page_content", input={"url": f"https://p{i}.nl"}
+            )
+            block.id = f"toolu_{i}"
+            return MagicMock(
+                stop_reason="tool_use",
+                content=[block],
+                usage=SimpleNamespace(input_tokens=800 * (i + 1), output_tokens=20),
+            )
+
+        done = MagicMock(
+            stop_reason="end_turn",
+            content=[SimpleNamespace(type="text", text="Klaar")],
+            usage=SimpleNamespace(input_tokens=900, output_tokens=5),
+        )
+        agent.client = MagicMock()
+        agent.client.messages.create.side_effect = [fetch_response(i) for i in range(3)] + [done]
+
+        with patch.object(agent, "_handle_tool_call", return_value=PAGE_RESULT):
+            agent.run_search_phase({"search_queries": [{"query": "AI zorg"}]})
+
+        messages = agent.client.messages.create.call_args_list[-1].kwargs["messages"]
+        contents = _tool_contents(messages)
+        assert [bool(c.get("compacted")) for c in contents] == [True, True, False]
+
+        record = agent.current_session_queries[0]
+        assert record["input_tokens"] == 800 + 1600 + 2400 + 900
+        assert record["output_tokens"] == 65
@@ -48,6 +48,14 @@ class TestConfigurationLoading:
         assert Config.MODEL == "claude-sonnet-4-20250514"
         assert "claude" in Config.MODEL.lower()
 
+    def test_phase_models_default_to_model(self):
+        """Test per-phase models fall back to MODEL."""
+        from src.guest_search.config import Config
+
+        for name in ("PLANNING", "SEARCH", "ENRICHMENT", "REPORT", "TOPIC_SEARCH"):
+            assert getattr(Config, f"{name}_MODEL") == Config.MODEL
+        assert Config.SEARCH_ESCALATION is False
+
     def test_token_budgets(self):
         """Test token budget configurations."""
         from src.guest_search.config import Config
@@ -234,6 +242,13 @@ class TestConfigurationDefaults:
         # Should require at least 2 sources
         assert Config.MIN_SOURCES_PER_CANDIDATE == 2
 
+    def test_yield_budget_off_by_default(self):
+        """Test that the search phase never skips planned queries on yield by default."""
+        from src.guest_search.config import Config
+
+        assert Config.MIN_YIELD_PER_100K_TOKENS == 0
+        assert Config.MIN_YIELD_PER_MINUTE == 0
+
 
 class TestConfigurationValidation:
     """Test configuration value validation."""
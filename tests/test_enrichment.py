@@ -0,0 +1,325 @@
+"""Tests for per-candidate enrichment (message batch and concurrent) and report assembly."""
+
+import json
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+from anthropic import APIConnectionError
+
+from src.guest_search.agent import GuestFinderAgent
+from src.guest_search.config import Config
+from src.guest_search.enrichment import (
+    enrichment_requests,
+    run_batch,
+    run_concurrent,
+    supports_batches,
+    tool_call_input,
+)
+from src.guest_search.tools import get_enrich_tool
+
+CANDIDATES = [
+    {"name": "Anna Visser", "organization": "TU Delft", "topics": ["AI"]},
+    {"name": "Mark de Jong", "organization": "TNO", "topics": ["AI"]},
+]
+
+
+def _enriched(name):
+    tool_input = {
+        "name": name,
+        "enriched_topics": [f"Onderwerp van {name}"],
+        "enriched_relevance": f"{name} werkt aan toegepaste AI.",
+    }
+    return SimpleNamespace(
+        content=[SimpleNamespace(type="tool_use", name="enrich_candidate", input=tool_input)],
+        usage=None,
+    )
+
+
+def _result(custom_id, message=None, result_type="succeeded"):
+    return SimpleNamespace(
+        custom_id=custom_id, result=SimpleNamespace(type=result_type, message=message)
+    )
+
+
+class FakeBatches:
+    """messages.batches that ends after a number of polls."""
+
+    def __init__(self, results, polls=2):
+        self.results_list = results
+        self.polls = polls
+        self.created = []
+        self.canceled = False
+
+    def _batch(self, status):
+        return SimpleNamespace(id="batch_1", processing_status=status)
+
+    def create(self, requests):
+        self.created.append(requests)
+        return self._batch("in_progress")
+
+    def retrieve(self, batch_id):
+        self.polls -= 1
+        return self._batch("ended" if self.polls <= 0 else "in_progress")
+
+    def cancel(self, batch_id):
+        self.canceled = True
+        self.polls = 1
+        return self._batch("canceling")
+
+    def results(self, batch_id):
+        return iter(self.results_list)
+
+
+class FakeMessages:
+    def __init__(self, batches):
+        self._batches = batches
+        self.create = MagicMock(
+            return_value=SimpleNamespace(
+                content=[SimpleNamespace(type="text", text="# Rapport")], usage=None
+            )
+        )
+
+    @property
+    def batches(self):
+        return self._batches
+
+
+class TestBatchHelpers:
+    """Test request building and polling."""
+
+    def test_one_forced_tool_request_per_candidate(self):
+        requests = enrichment_requests(
+            CANDIDATES, "Kandidaat: {candidate_json}", get_enrich_tool(), "model-x", 1000
+        )
+
+        assert [r["custom_id"] for r in requests] == ["candidate-0", "candidate-1"]
+        params = requests[1]["params"]
+        assert params["tool_choice"] == {"type": "tool", "name": "enrich_candidate"}
+        assert params["model"] == "model-x"
+        assert "Mark de Jong" in params["messages"][0]["content"]
+        assert json.loads(params["messages"][0]["content"][len("Kandidaat: ") :]) == CANDIDATES[1]
+
+    def test_polls_until_ended_and_skips_failed_requests(self):
+        batches = FakeBatches(
+            [
+                _result("candidate-0", _enriched("Anna Visser")),
+                _result("candidate-1", None, "errored"),
+            ]
+        )
+        client = SimpleNamespace(messages=FakeMessages(batches))
+        sleeps = []
+
+        messages = run_batch(client, [{"custom_id": "candidate-0"}], 5, 60, sleep=sleeps.append)
+
+        assert list(messages) == ["candidate-0"]
+        assert sleeps == [5, 5]
+        assert not batches.canceled
+
+    def test_cancels_at_timeout(self):
+        batches = FakeBatches([], polls=100)
+        client = SimpleNamespace(messages=FakeMessages(batches))
+        now = iter(range(0, 1000, 10))
+
+        assert run_batch(client, [], 10, 25, sleep=lambda s: None, clock=lambda: next(now)) == {}
+        assert batches.canceled
+
+    def test_supports_batches(self):
+        assert supports_batches(SimpleNamespace(messages=FakeMessages(FakeBatches([]))))
+        assert not supports_batches(MagicMock())
+
+    def test_tool_call_input(self):
+        assert tool_call_input(_enriched("Anna Visser"), "enrich_candidate")["name"] == (
+            "Anna Visser"
+        )
+        assert tool_call_input(_enriched("Anna Visser"), "save_candidate") is None
+
+
+class TestBatchReport:
+    """Test generate_report in batch mode."""
+
+    @pytest.fixture
+    def agent(self, monkeypatch, tmp_path):
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "output" / "reports").mkdir(parents=True)
+        monkeypatch.setattr(Config, "ENRICHMENT_BATCH", True)
+        monkeypatch.setattr(Config, "ENRICHMENT_BATCH_POLL_SECONDS", 0)
+        with patch("src.guest_search.agent.get_anthropic_client"):
+            agent = GuestFinderAgent()
+        agent.candidates = [dict(c) for c in CANDIDATES]
+        agent.previous_guests = []
+        return agent
+
+    def test_enriches_in_batch_then_writes_report(self, agent):
+        batches = FakeBatches(
+            [
+                _result("candidate-0", _enriched("Anna Visser")),
+                # The request's candidate is enriched, whatever name the model writes
+                _result("candidate-1", _enriched("M. de Jong")),
+            ],
+            polls=1,
+        )
+        agent.client = SimpleNamespace(messages=FakeMessages(batches))
+
+        assert agent.generate_report() == "# Rapport"
+
+        assert len(batches.created[0]) == 2
+        assert agent.candidates[1]["topics"] == ["Onderwerp van M. de Jong"]
+        # One report request without tools, with the enriched candidates
+        report_request = agent.client.messages.create.call_args.kwargs
+        assert "tools" not in report_request
+        assert "Onderwerp van Anna Visser" in report_request["messages"][0]["content"]
+
+    def test_falls_back_to_concurrent_requests_on_api_error(self, agent):
+        batches = FakeBatches([])
+        batches.create = MagicMock(
+            side_effect=APIConnectionError(request=httpx.Request("POST", "https://api"))
+        )
+        agent.client = SimpleNamespace(messages=FakeMessages(batches))
+        report = agent.client.messages.create.return_value
+
+        def create(**request):
+            if "tool_choice" not in request:
+                return report
+            content = request["messages"][0]["content"]
+            name = next(c["name"] for c in CANDIDATES if c["name"] in content)
+            return _enriched(name)
+
+        agent.client.messages.create.side_effect = create
+
+        assert agent.generate_report() == "# Rapport"
+        assert agent.candidates[1]["topics"] == ["Onderwerp van Mark de Jong"]
+
+    def test_falls_back_to_tool_loop_without_batches(self, agent):
+        agent.client = MagicMock()
+        agent.client.messages.create.return_value = SimpleNamespace(
+            stop_reason="end_turn",
+            content=[SimpleNamespace(type="text", text="# Rapport")],
+            usage=None,
+        )
+
+        assert agent.generate_report() == "# Rapport"
+        assert "tools" in agent.client.messages.create.call_args.kwargs
+
+
+class TestToolLoopReport:
+    """Test the multi-turn enrichment and report loop."""
+
+    def test_name_variants_count_as_enriched(self, monkeypatch, tmp_path):
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "output" / "reports").mkdir(parents=True)
+        monkeypatch.setattr(Config, "ENRICHMENT_BATCH", False)
+        monkeypatch.setattr(Config, "FAST_REPORT", False)
+        monkeypatch.setattr(Config, "ENRICHMENT_MODEL", "enrich-model")
+        monkeypatch.setattr(Config, "REPORT_MODEL", "report-model")
+        with patch("src.guest_search.agent.get_anthropic_client"):
+            agent = GuestFinderAgent()
+        agent.candidates = [dict(c) for c in CANDIDATES]
+        agent.previous_guests = []
+        agent.client = MagicMock()
+        enrich = [_enriched("Anna Visser"), _enriched("M. de Jong")]
+        agent.client.messages.create.side_effect = [
+            SimpleNamespace(
+                stop_reason="tool_use",
+                content=[
+                    SimpleNamespace(id=f"t{i}", **vars(message.content[0]))
+                    for i, message in enumerate(enrich)
+                ],
+                usage=None,
+            ),
+            SimpleNamespace(
+                stop_reason="end_turn",
+                content=[SimpleNamespace(type="text", text="# Rapport")],
+                usage=None,
+            ),
+        ]
+
+        assert agent.generate_report() == "# Rapport"
+
+        models = [c.kwargs["model"] for c in agent.client.messages.create.call_args_list]
+        assert models == ["enrich-model", "report-model"]
+        assert agent.candidates[1]["topics"] == ["Onderwerp van M. de Jong"]
+
+
+class TestConcurrentEnrichment:
+    """Test concurrent per-candidate requests."""
+
+    def test_runs_within_worker_limit_and_skips_failures(self):
+        lock = threading.Lock()
+        running = []
+        peak = []
+
+        def create(**params):
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+            time.sleep(0.02)
+            with lock:
+                running.pop()
+            if params["name"] == "fails":
+                raise RuntimeError("overloaded")
+            return _enriched(params["name"])
+
+        client = SimpleNamespace(messages=SimpleNamespace(create=create))
+        names = ["a", "b", "fails", "c", "d"]
+        requests = [{"custom_id": name, "params": {"name": name}} for name in names]
+
+        responses = run_concurrent(client, requests, workers=2)
+
+        assert sorted(responses) == ["a", "b", "c", "d"]
+        assert max(peak) == 2
+        message, seconds = responses["a"]
+        assert tool_call_input(message, "enrich_candidate")["name"] == "a"
+        assert seconds > 0
+
+
+class TestFastReport:
+    """Test generate_report with FAST_REPORT."""
+
+    @pytest.fixture
+    def agent(self, monkeypatch, tmp_path):
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "output" / "reports").mkdir(parents=True)
+        monkeypatch.setattr(Config, "FAST_REPORT", True)
+        monkeypatch.setattr(Config, "ENRICHMENT_BATCH", False)
+        with patch("src.guest_search.agent.get_anthropic_client"):
+            agent = GuestFinderAgent()
+        agent.candidates = [dict(c) for c in CANDIDATES]
+        agent.previous_guests = []
+        agent.client = MagicMock()
+        return agent
+
+    @staticmethod
+    def _create(**request):
+        if "tools" in request:
+            content = request["messages"][0]["content"]
+            name = next(c["name"] for c in CANDIDATES if c["name"] in content)
+            return _enriched(name)
+        return SimpleNamespace(content=[SimpleNamespace(type="text", text="Intro van de week.")])
+
+    def test_enriches_per_candidate_and_renders_locally(self, agent):
+        agent.client.messages.create.side_effect = self._create
+
+        report = agent.generate_report()
+
+        calls = agent.client.messages.create.call_args_list
+        # Two small enrichment requests and one intro request, no report conversation
+        assert len(calls) == 3
+        assert sum("tools" in c.kwargs for c in calls) == 2
+        assert report.startswith("# Potentiële gasten voor AIToday Live - Week")
+        assert "Intro van de week." in report
+        assert "- Onderwerp van Mark de Jong" in report
+        intro_prompt = calls[-1].kwargs["messages"][0]["content"]
+        assert "relevance_description" not in intro_prompt
+
+    def test_default_intro_without_llm(self, agent, monkeypatch):
+        monkeypatch.setattr(Config, "REPORT_LLM_INTRO", False)
+        agent.client.messages.create.side_effect = self._create
+
+        report = agent.generate_report()
+
+        assert agent.client.messages.create.call_count == 2
+        assert "Deze week 2 nieuwe kandidaten" in report
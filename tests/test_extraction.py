@@ -0,0 +1,123 @@
+"""Tests for HTML parsing and the extraction worker pool."""
+
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.guest_search.agent import GuestFinderAgent
+from src.guest_search.extraction import ExtractionPool, html_to_text, process_page
+
+SAMPLE_HTML = """
+<html>
+    <head><style>body { color: red; }</style></head>
+    <body>
+        <script>var tracking = true;</script>
+        <h1>Nieuw AI-lab in Delft</h1>
+        <p>Prof. Jan de Vries is hoogleraar AI aan de TU Delft.</p>
+        <p>Volgens Maria Jansen is dit een belangrijke stap.</p>
+    </body>
+</html>
+"""
+
+
+class TestHtmlToText:
+    """Test HTML cleaning."""
+
+    def test_removes_scripts_and_styles(self):
+        text = html_to_text(SAMPLE_HTML)
+
+        assert "tracking" not in text
+        assert "color: red" not in text
+        assert "Nieuw AI-lab in Delft" in text
+
+    def test_collapses_whitespace_lines(self):
+        text = html_to_text(SAMPLE_HTML)
+
+        assert all(line.strip() == line and line for line in text.splitlines())
+
+
+class TestProcessPage:
+    """Test the worker entry point."""
+
+    def test_process_page_returns_text_and_persons(self):
+        text, persons = process_page(SAMPLE_HTML)
+
+        names = [p["name"] for p in persons]
+        assert "Jan de Vries" in text
+        assert any("Vries" in name or "Jansen" in name for name in names)
+
+    @pytest.mark.slow
+    def test_pool_processes_in_worker(self):
+        pool = ExtractionPool(workers=1)
+        try:
+            text, persons = pool.process(SAMPLE_HTML)
+        finally:
+            pool.shutdown()
+
+        assert "Nieuw AI-lab in Delft" in text
+        assert isinstance(persons, list)
+
+    def test_pool_results_outlive_the_workers(self):
+        from src.guest_search import ner
+
+        pool = ExtractionPool(workers=1)
+        try:
+            pool.process(SAMPLE_HTML)
+        finally:
+            pool.shutdown()
+
+        assert list(Path(ner.Config.NER_CACHE_DIR).glob("*/*.json"))
+
+    def test_pool_spawns_workers(self):
+        pool = ExtractionPool(workers=1)
+        with patch("src.guest_search.extraction.ProcessPoolExecutor") as executor:
+            pool.submit(SAMPLE_HTML)
+
+        assert executor.call_args.kwargs["mp_context"].get_start_method() == "spawn"
+
+    def test_pool_disabled_with_zero_workers(self):
+        pool = ExtractionPool(workers=0)
+
+        assert not pool.enabled
+
+
+class TestAgentPageProcessing:
+    """Test how the agent routes page processing."""
+
+    @pytest.fixture
+    def agent(self):
+        with patch("src.guest_search.agent.get_anthropic_client"):
+            return GuestFinderAgent()
+
+    def test_inline_when_pool_disabled(self, agent):
+        agent.extraction_pool = ExtractionPool(workers=0)
+
+        text, persons = agent._process_page(SAMPLE_HTML)
+
+        assert "Jan de Vries" in text
+        assert isinstance(persons, list)
+
+    def test_falls_back_inline_when_pool_fails(self, agent):
+        agent.extraction_pool = MagicMock(enabled=True)
+        agent.extraction_pool.process.side_effect = RuntimeError("worker crashed")
+
+        text, persons = agent._process_page(SAMPLE_HTML)
+
+        assert "Jan de Vries" in text
+        assert isinstance(persons, list)
+
+    @patch("requests.get")
+    def test_fetch_page_content_uses_pool(self, mock_get, agent):
+        mock_get.return_value = MagicMock(status_code=200, text=SAMPLE_HTML)
+        agent.extraction_pool = MagicMock(enabled=True)
+        agent.extraction_pool.process.return_value = (
+            "Prof. Jan de Vries",
+            [{"name": "Jan de Vries", "context": "Prof. Jan de Vries", "position": 6}],
+        )
+
+        result = agent._handle_tool_call("fetch_page_content", {"url": "https://example.com"})
+
+        agent.extraction_pool.process.assert_called_once_with(SAMPLE_HTML)
+        assert result["status"] == "success"
+        assert result["potential_persons"][0]["name"] == "Jan de Vries"
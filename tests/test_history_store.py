@@ -0,0 +1,177 @@
+"""Tests for the SQLite store of previous guests and search sessions."""
+
+import json
+import os
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from src.guest_search.config import Config
+from src.guest_search.history_store import HistoryStore, normalized_date, open_history_store
+
+
+def _guest(name, days_ago, **fields):
+    return {"name": name, "date": (datetime.now() - timedelta(days=days_ago)).isoformat(), **fields}
+
+
+def _session(days_ago, queries=("q",)):
+    return {
+        "date": (datetime.now() - timedelta(days=days_ago)).isoformat(),
+        "queries": [{"query": q, "candidates_found": 1} for q in queries],
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = HistoryStore(tmp_path / "history.sqlite")
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def sqlite_history(tmp_path, monkeypatch):
+    """Working directory with JSON history files and HISTORY_STORE=sqlite."""
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    guests = [_guest("Anna Visser", 3), _guest("Jan de Vries", 100)]
+    sessions = [_session(2, ["AI zorg"]), _session(200, ["oud"])]
+    (data_dir / "previous_guests.json").write_text(json.dumps(guests), encoding="utf-8")
+    (data_dir / "search_history.json").write_text(
+        json.dumps({"sessions": sessions}), encoding="utf-8"
+    )
+
+    monkeypatch.setattr(Config, "HISTORY_STORE", "sqlite")
+    monkeypatch.setattr(Config, "HISTORY_DB", str(data_dir / "history.sqlite"))
+    original_dir = os.getcwd()
+    os.chdir(tmp_path)
+    yield data_dir
+    os.chdir(original_dir)
+
+
+class TestHistoryStore:
+    """Test guests and sessions in the store."""
+
+    def test_guests_since_uses_window(self, store):
+        store.add_guests([_guest("Anna Visser", 3), _guest("Jan de Vries", 100)])
+
+        recent = store.guests_since(datetime.now() - timedelta(weeks=2))
+
+        assert [g["name"] for g in recent] == ["Anna Visser"]
+        assert store.count_guests() == 2
+
+    def test_records_round_trip(self, store):
+        guest = _guest("Anna Visser", 1, sources=[{"url": "https://a.nl", "title": "Ä"}])
+
+        store.add_guests([guest])
+
+        assert store.all_guests() == [guest]
+
+    def test_same_name_and_date_is_skipped(self, store):
+        guest = _guest("Prof. dr. Anna Visser", 1)
+        same_person = {**guest, "name": "Anna Visser"}
+
+        assert store.add_guests([guest]) == 1
+        assert store.add_guests([same_person]) == 0
+
+    def test_guests_named_uses_canonical_name(self, store):
+        store.add_guests([_guest("Jan de Vries", 10), _guest("Anna Visser", 5)])
+
+        found = store.guests_named("Dr. Jan De Vries")
+
+        assert [g["name"] for g in found] == ["Jan de Vries"]
+
+    def test_invalid_date_never_in_window(self, store):
+        store.add_guests([{"name": "Zonder Datum", "date": "vorige week"}])
+
+        assert store.guests_since(datetime(2000, 1, 1)) == []
+        assert store.count_guests() == 1
+
+    def test_replace_guests(self, store):
+        store.add_guests([_guest("Anna Visser", 1)])
+
+        store.replace_guests([_guest("Jan de Vries", 1, topics=["AI"])])
+
+        assert [g["name"] for g in store.all_guests()] == ["Jan de Vries"]
+
+    def test_sessions_since_in_date_order(self, store):
+        store.add_sessions([_session(1, ["nieuw"]), _session(30, ["oud"]), _session(3, ["mid"])])
+
+        recent = store.sessions_since(datetime.now() - timedelta(weeks=1))
+
+        assert [s["queries"][0]["query"] for s in recent] == ["mid", "nieuw"]
+
+    def test_normalized_date_sorts_as_text(self):
+        assert normalized_date("2025-03-01") == "2025-03-01T00:00:00"
+        assert normalized_date("2025-03-01") < normalized_date("2025-03-01T09:30:00")
+        assert normalized_date(None) == ""
+
+
+class TestImport:
+    """Test importing the JSON files."""
+
+    def test_import_is_idempotent(self, store, sqlite_history):
+        assert store.import_json() == (2, 2)
+        assert store.import_json() == (0, 0)
+
+    def test_missing_files_are_skipped(self, store, tmp_path):
+        assert store.import_json(tmp_path / "geen.json", tmp_path / "ook_geen.json") == (0, 0)
+
+    def test_new_database_is_filled_from_json(self, sqlite_history):
+        store = open_history_store()
+
+        assert store.count_guests() == 2
+        assert store.count_sessions() == 2
+        store.close()
+
+    def test_json_mode_has_no_store(self, monkeypatch):
+        monkeypatch.setattr(Config, "HISTORY_STORE", "json")
+
+        assert open_history_store() is None
+
+
+class TestAgentWithStore:
+    """Test the agent reading and appending history through the store."""
+
+    def _agent(self):
+        from src.guest_search.agent import GuestFinderAgent
+
+        with patch("src.guest_search.agent.get_anthropic_client"):
+            return GuestFinderAgent()
+
+    def test_loads_only_windows(self, sqlite_history):
+        agent = self._agent()
+
+        assert [g["name"] for g in agent.previous_guests] == ["Anna Visser"]
+        assert [s["queries"][0]["query"] for s in agent.search_history["sessions"]] == ["AI zorg"]
+
+    def test_saves_only_new_records(self, sqlite_history):
+        agent = self._agent()
+        agent.previous_guests.append(_guest("Piet Jansen", 0))
+        agent.search_history["sessions"].append(_session(0, ["nieuw"]))
+
+        agent._save_previous_guests()
+        agent._save_search_history()
+        agent._save_previous_guests()
+
+        store = agent.history_store
+        assert store.count_guests() == 3
+        assert store.count_sessions() == 3
+        # JSON files are no longer written
+        guests = json.loads((sqlite_history / "previous_guests.json").read_text())
+        assert len(guests) == 2
+
+    def test_check_previous_guests_within_window(self, sqlite_history):
+        agent = self._agent()
+
+        result = agent._handle_tool_call("check_previous_guests", {"name": "A. Visser"})
+
+        assert result["already_recommended"]
+
+    def test_selector_reads_recent_guests_from_store(self, sqlite_history):
+        from src.guest_search.interactive_selector import InteractiveGuestSelector
+
+        selector = InteractiveGuestSelector()
+        selector.load_recent_guests()
+
+        assert [g["name"] for g in selector.recent_guests] == ["Anna Visser"]
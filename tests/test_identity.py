@@ -0,0 +1,185 @@
+"""Tests for person name canonicalization and the identity index."""
+
+from unittest.mock import patch
+
+import pytest
+
+from enrich_previous_guests import find_candidate_by_name
+from src.guest_search.agent import GuestFinderAgent
+from src.guest_search.identity import PersonIndex, canonical_name
+from src.guest_search.interactive_selector import InteractiveGuestSelector
+
+
+class TestCanonicalName:
+    """Test the canonical name key."""
+
+    @pytest.mark.parametrize(
+        "name",
+        ["Prof. dr. Jan de Vries", "Jan De Vries", "jan  de vries", "Dr Jan de Vries PhD"],
+    )
+    def test_titles_and_case(self, name):
+        assert canonical_name(name) == "jan de vries"
+
+    def test_diacritics_folded(self):
+        assert canonical_name("Éric Müller") == canonical_name("Eric Muller")
+
+    @pytest.mark.parametrize("name", ["Jan v.d. Berg", "Jan vd Berg", "Jan van der Berg"])
+    def test_tussenvoegsel_abbreviations(self, name):
+        assert canonical_name(name) == "jan van der berg"
+
+    def test_leading_initial_is_not_a_tussenvoegsel(self):
+        assert canonical_name("V. de Vries") == "v de vries"
+
+    @pytest.mark.parametrize("name", ["Jack Ma", "Yi Ma", "Anna Md", "Piet Ba"])
+    def test_short_degree_surname_is_kept(self, name):
+        assert canonical_name(name) == name.lower()
+
+    @pytest.mark.parametrize(
+        "name", ["Jan de Vries, MA", "Jan de Vries M.A.", "Jan de Vries, Ph.D.", "Jan de Vries MSc"]
+    )
+    def test_postnominals_stripped(self, name):
+        assert canonical_name(name) == "jan de vries"
+
+    def test_postnominal_never_leaves_single_token(self):
+        assert canonical_name("Dr. Vries, PhD") == "vries phd"
+
+    def test_short_degree_surname_does_not_merge_first_names(self):
+        index = PersonIndex(["Jack Ma"])
+
+        assert "Jack Ba" not in index
+        assert "Jack Ma, MBA" in index
+
+    def test_empty(self):
+        assert canonical_name("Prof. dr.") == ""
+
+
+class TestPersonIndex:
+    """Test exact, initials and fuzzy lookups."""
+
+    def test_exact_lookup_with_titles(self):
+        index = PersonIndex([{"name": "Jan de Vries"}])
+
+        assert index.lookup("Prof. dr. Jan de Vries") == "jan de vries"
+
+    def test_initials_match_full_first_name(self):
+        index = PersonIndex(["Jan de Vries"])
+
+        assert "J. de Vries" in index
+
+    def test_full_first_name_never_matches_stored_initials(self):
+        index = PersonIndex(["J. de Vries"])
+
+        assert "Jan de Vries" not in index
+        assert index.lookup("J. de Vries") == "j de vries"
+
+    def test_initials_do_not_merge_different_first_names(self):
+        index = PersonIndex()
+        index.add("J. de Vries")
+        index.add("Jan de Vries")
+
+        assert index.lookup("Joost de Vries") is None
+        assert index.add("Joost de Vries") == "joost de vries"
+        assert index.lookup("Jan de Vries") == "jan de vries"
+
+    def test_initials_must_match_every_given_name(self):
+        index = PersonIndex(["Jan Peter de Vries", "Jan Willem de Vries"])
+
+        assert index.lookup("J.P. de Vries") == "jan peter de vries"
+        assert "J. de Vries" not in index
+
+    def test_ambiguous_initials_do_not_match(self):
+        index = PersonIndex(["Jan de Vries", "Joost de Vries"])
+
+        assert "J. de Vries" not in index
+        assert index.lookup("Joost de Vries") == "joost de vries"
+
+    def test_different_first_names_are_different_people(self):
+        index = PersonIndex(["Jan de Vries"])
+
+        assert "Karel de Vries" not in index
+
+    def test_fuzzy_match_on_typo(self):
+        index = PersonIndex(["Marieke Hendriksen"])
+
+        assert index.lookup("Marieke Hendrikson") == "marieke hendriksen"
+        assert "Guest 2" not in PersonIndex(["Guest 1"])
+
+    def test_fuzzy_match_needs_same_first_name(self):
+        index = PersonIndex(["Pieter Jansen"])
+
+        assert "Peter Jansen" not in index
+
+    def test_fuzzy_match_needs_same_tussenvoegsel(self):
+        index = PersonIndex(["Eva de Boer"])
+
+        assert "Eva den Boer" not in index
+        assert index.lookup("Eva de Boer") == "eva de boer"
+
+    def test_variants_share_records(self):
+        index = PersonIndex()
+        first = {"name": "Prof. dr. Jan de Vries", "date": "2024-10-01"}
+        second = {"name": "J. de Vries", "date": "2024-10-08"}
+        index.add(first)
+        index.add(second)
+
+        assert index.find("Jan de Vries") == [first, second]
+        assert index.find_first("jan de vries") is first
+        assert len(index) == 2
+
+    def test_unknown_name(self):
+        assert PersonIndex(["Jan de Vries"]).find("Piet Bakker") == []
+
+
+class TestCallSites:
+    """Test that the agent, selector and scripts use identity matching."""
+
+    @pytest.fixture
+    def agent(self):
+        with patch("src.guest_search.agent.get_anthropic_client"):
+            agent = GuestFinderAgent()
+        agent.candidates = []
+        agent.previous_guests = []
+        return agent
+
+    def test_save_candidate_detects_variant(self, agent):
+        agent._handle_tool_call("save_candidate", {"name": "Prof. dr. Jan de Vries"})
+
+        result = agent._handle_tool_call("save_candidate", {"name": "J. de Vries"})
+
+        assert result["status"] == "duplicate"
+        assert "Prof. dr. Jan de Vries" in result["message"]
+        assert len(agent.candidates) == 1
+
+    def test_candidate_index_follows_replaced_list(self, agent):
+        agent._handle_tool_call("save_candidate", {"name": "Jan de Vries"})
+        agent.candidates = []
+
+        result = agent._handle_tool_call("save_candidate", {"name": "Jan de Vries"})
+
+        assert result["status"] == "saved"
+
+    def test_check_previous_guests_matches_variant(self, agent):
+        from datetime import datetime
+
+        agent.previous_guests = [{"name": "Dr. Jan de Vries", "date": datetime.now().isoformat()}]
+
+        result = agent._handle_tool_call("check_previous_guests", {"name": "jan de vries"})
+
+        assert result["already_recommended"] is True
+
+    def test_selector_filters_recent_variants(self):
+        selector = InteractiveGuestSelector()
+        selector.new_candidates = [{"name": "Jan de Vries"}]
+        selector.recent_guests = [{"name": "Prof. J. de Vries"}, {"name": "Piet Bakker"}]
+
+        with patch.object(selector, "display_guest"), patch.object(selector.console, "clear"):
+            all_guests, guest_types = selector.display_all_guests()
+
+        assert [g["name"] for g in all_guests] == ["Jan de Vries", "Piet Bakker"]
+        assert guest_types == ["new", "recent"]
+
+    def test_find_candidate_by_name(self):
+        candidates = PersonIndex([{"name": "Jan de Vries", "topics": ["AI"]}])
+
+        assert find_candidate_by_name("Prof. Jan de Vries", candidates)["topics"] == ["AI"]
+        assert find_candidate_by_name("Piet Bakker", candidates) is None
@@ -0,0 +1,261 @@
+"""Tests for the incrementally maintained learning aggregates."""
+
+import json
+import random
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.guest_search.config import Config
+from src.guest_search.learning import (
+    LearningAggregates,
+    consistency_errors,
+    scan_learning_insights,
+    scan_recent_sources,
+)
+
+# Wednesday afternoon, so the 1 and 4 week windows start halfway a week
+NOW = datetime(2026, 10, 14, 15, 0)
+
+SOURCES = [
+    "https://www.nu.nl/tech/1",
+    "https://www.nu.nl/tech/2",
+    "https://fd.nl/artikel",
+    "https://www.uva.nl/nieuws",
+    "https://www.tudelft.nl/agenda",
+    "https://www.nrc.nl/nieuws",
+]
+
+
+def _session(date, queries, strategy=None):
+    session = {
+        "date": date.isoformat() if isinstance(date, datetime) else date,
+        "total_candidates": sum(q[1] for q in queries),
+        "queries": [
+            {"query": text, "candidates_found": found, "successful_sources": list(sources)}
+            for text, found, sources in queries
+        ],
+    }
+    if strategy:
+        session["strategy"] = {"week_focus": strategy}
+    return session
+
+
+def _random_history(seed, count=60):
+    rng = random.Random(seed)
+    sessions = []
+    for i in range(count):
+        date = NOW - timedelta(hours=rng.randint(0, 24 * 7 * 8))
+        queries = [
+            (f"query {rng.randint(0, 15)}", rng.choice([0, 0, 1, 2, 3]), rng.sample(SOURCES, 2))
+            for _ in range(rng.randint(0, 4))
+        ]
+        sessions.append(_session(date, queries, strategy=f"focus {i}" if i % 3 else None))
+    sessions.insert(count // 2, {"date": "vorige week", "queries": []})
+    sessions.insert(count // 3, {"queries": [{"query": "zonder datum", "candidates_found": 9}]})
+    return sessions
+
+
+def _aggregates(sessions):
+    aggregates = LearningAggregates()
+    for session in sessions:
+        aggregates.add(session)
+    return aggregates
+
+
+class TestLearningAggregates:
+    """Test the aggregates against a full rescan."""
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_rescan(self, seed):
+        sessions = _random_history(seed)
+
+        assert consistency_errors(_aggregates(sessions), sessions, NOW) == []
+
+    @pytest.mark.parametrize("weeks", [1, 2, 4, 6, 10])
+    def test_matches_rescan_for_each_window(self, weeks):
+        sessions = _random_history(42)
+        aggregates = _aggregates(sessions)
+
+        assert aggregates.insights(NOW, weeks) == scan_learning_insights(sessions, NOW, weeks)
+        assert aggregates.recent_sources(NOW, weeks) == scan_recent_sources(sessions, NOW, weeks)
+
+    def test_incremental_add_matches_rescan(self):
+        sessions = _random_history(7)
+        aggregates = LearningAggregates()
+
+        for end, session in enumerate(sessions, 1):
+            aggregates.add(session)
+            assert consistency_errors(aggregates, sessions[:end], NOW) == []
+
+    def test_boundary_week_only_counts_sessions_in_window(self):
+        cutoff = NOW - timedelta(weeks=1)
+        sessions = [
+            _session(cutoff - timedelta(hours=1), [("te oud", 5, [SOURCES[0]])]),
+            _session(cutoff + timedelta(hours=1), [("net op tijd", 2, [SOURCES[2]])]),
+        ]
+
+        insights = _aggregates(sessions).insights(NOW, weeks=1)
+
+        assert insights["total_sessions"] == 1
+        assert [q["query"] for q in insights["top_performing_queries"]] == ["net op tijd"]
+        assert _aggregates(sessions).recent_sources(NOW, weeks=1) == [SOURCES[2]]
+
+    def test_ties_keep_history_order(self):
+        sessions = [
+            _session(NOW - timedelta(days=20), [("eerste", 2, [SOURCES[3]])]),
+            _session(NOW - timedelta(days=1), [("tweede", 2, [SOURCES[2]])]),
+        ]
+
+        insights = _aggregates(sessions).insights(NOW)
+
+        assert [q["query"] for q in insights["top_performing_queries"]] == ["eerste", "tweede"]
+        assert insights["top_sources"] == [SOURCES[3], SOURCES[2]]
+
+    def test_domains_are_counted_over_urls(self):
+        sessions = [
+            _session(
+                NOW - timedelta(days=1),
+                [("q", 1, [SOURCES[2], SOURCES[0]]), ("r", 1, [SOURCES[1]])],
+            )
+        ]
+
+        insights = _aggregates(sessions).insights(NOW)
+
+        assert insights["top_domains"] == ["www.nu.nl", "fd.nl"]
+
+    def test_no_sessions_in_window(self):
+        sessions = [_session(NOW - timedelta(weeks=10), [("oud", 1, [])])]
+
+        assert _aggregates(sessions).insights(NOW) is None
+        assert _aggregates(sessions).recent_sources(NOW) == []
+
+
+class TestStoredAggregates:
+    """Test the week buckets on disk."""
+
+    def test_reloaded_store_matches_rescan(self, tmp_path):
+        sessions = _random_history(3)
+        aggregates = LearningAggregates(tmp_path)
+        for session in sessions:
+            aggregates.add(session)
+        aggregates.save()
+
+        assert consistency_errors(LearningAggregates(tmp_path), sessions, NOW) == []
+
+    def test_only_weeks_in_the_window_are_loaded(self, tmp_path):
+        sessions = _random_history(4)
+        stored = LearningAggregates(tmp_path)
+        for session in sessions:
+            stored.add(session)
+        stored.save()
+
+        aggregates = LearningAggregates(tmp_path)
+        insights = aggregates.insights(NOW, weeks=2)
+
+        assert insights == scan_learning_insights(sessions, NOW, weeks=2)
+        loaded = [week for week, totals in aggregates._weeks.items() if totals is not None]
+        assert loaded
+        assert min(loaded) > NOW - timedelta(weeks=3)
+        assert len(loaded) < len(aggregates._weeks)
+
+    def test_session_stored_before_the_index_is_not_counted_twice(self, tmp_path):
+        sessions = _random_history(5, count=10)
+        aggregates = LearningAggregates(tmp_path)
+        for session in sessions:
+            aggregates.add(session)
+        aggregates.save()
+        # Crash after the week file, before the index: the index misses the last session
+        (tmp_path / "index.json").write_text(
+            json.dumps({"version": 1, "sessions": len(sessions) - 1, "last_date": None})
+        )
+
+        reloaded = LearningAggregates(tmp_path)
+        reloaded.add(sessions[-1])
+
+        assert consistency_errors(reloaded, sessions, NOW) == []
+
+    def test_week_files_without_index_are_dropped(self, tmp_path):
+        aggregates = LearningAggregates(tmp_path)
+        aggregates.add(_session(NOW, [("q", 1, [SOURCES[0]])]))
+        aggregates.save()
+        (tmp_path / "index.json").unlink()
+
+        reloaded = LearningAggregates(tmp_path)
+
+        assert len(reloaded) == 0
+        assert reloaded.insights(NOW) is None
+        assert not list(tmp_path.glob("weeks/*.json"))
+
+
+class TestAgentAggregates:
+    """Test the agent keeping the aggregates in sync with its history."""
+
+    @pytest.fixture
+    def agent(self):
+        from src.guest_search.agent import GuestFinderAgent
+
+        with patch("src.guest_search.agent.get_anthropic_client"):
+            agent = GuestFinderAgent()
+        agent.search_history = {"sessions": []}
+        return agent
+
+    def test_appended_sessions_are_added(self, agent):
+        now = datetime.now()
+        agent.search_history["sessions"].append(_session(now, [("eerste", 1, [SOURCES[0]])]))
+        first = agent._learning_aggregates()
+
+        agent.search_history["sessions"].append(_session(now, [("tweede", 3, [SOURCES[2]])]))
+        insights = agent._get_learning_insights(weeks=4)
+
+        assert agent._learning_aggregates() is first
+        assert len(first) == 2
+        assert [q["query"] for q in insights["top_performing_queries"]] == ["tweede", "eerste"]
+
+    def test_replaced_history_is_rebuilt(self, agent):
+        agent.search_history["sessions"].append(_session(datetime.now(), [("oud", 1, [])]))
+        agent._get_learning_insights()
+
+        agent.search_history = {"sessions": [_session(datetime.now(), [("nieuw", 1, [])])]}
+
+        insights = agent._get_learning_insights()
+        assert [q["query"] for q in insights["top_performing_queries"]] == ["nieuw"]
+
+    def test_new_run_reuses_stored_buckets(self, agent):
+        now = datetime.now()
+        agent.search_history["sessions"].append(_session(now, [("eerste", 1, [SOURCES[0]])]))
+        agent._learning_aggregates()
+
+        # A new run loads the same history from search_history.json
+        agent.search_history = json.loads(json.dumps(agent.search_history))
+        with patch.object(LearningAggregates, "add") as add:
+            insights = agent._get_learning_insights()
+
+        add.assert_not_called()
+        assert [q["query"] for q in insights["top_performing_queries"]] == ["eerste"]
+
+    def test_save_search_history_stores_buckets(self, agent, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        agent.search_history["sessions"].append(_session(datetime.now(), [("q", 2, [])]))
+
+        agent._save_search_history()
+
+        aggregates = LearningAggregates(Config.LEARNING_DIR)
+        assert len(aggregates) == 1
+        assert aggregates.insights(datetime.now())["total_queries"] == 1
+
+    def test_consistency_check_falls_back_to_rescan(self, agent, monkeypatch):
+        monkeypatch.setattr(Config, "LEARNING_CONSISTENCY_CHECK", True)
+        agent.console = MagicMock()
+        session = _session(datetime.now(), [("q", 1, [SOURCES[0]])])
+        agent.search_history["sessions"].append(session)
+        agent._learning_aggregates()
+        # Changed in place: the aggregates no longer match the history
+        session["queries"][0]["candidates_found"] = 4
+
+        insights = agent._get_learning_insights()
+
+        assert insights["top_performing_queries"][0]["candidates_found"] == 4
+        assert insights["avg_candidates_per_query"] == 4
+        agent.console.print.assert_called()
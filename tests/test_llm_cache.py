@@ -0,0 +1,149 @@
+"""Tests for the LLM record/replay cache."""
+
+import asyncio
+import os
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from anthropic.types import Message, TextBlock, ToolUseBlock, Usage
+
+from src.guest_search.streaming import supports_streaming
+from src.utils.llm_cache import RecordReplayClient, ReplayMissError, request_key
+from src.utils.portkey_client import (
+    AnthropicPortkeyAdapter,
+    AsyncClientBridge,
+    get_anthropic_client,
+    get_async_anthropic_client,
+)
+
+REQUEST = {
+    "model": "claude-sonnet-4-5",
+    "max_tokens": 1000,
+    "system": [{"type": "text", "text": "Je zoekt gasten", "cache_control": {"type": "x"}}],
+    "messages": [{"role": "user", "content": "Zoek AI experts"}],
+    "tools": [{"name": "web_search", "input_schema": {"type": "object"}}],
+}
+
+
+def _message(text="Klaar"):
+    return Message(
+        id="msg_1",
+        type="message",
+        role="assistant",
+        model="claude-sonnet-4-5",
+        content=[
+            TextBlock(type="text", text=text),
+            ToolUseBlock(type="tool_use", id="toolu_1", name="web_search", input={"query": "AI"}),
+        ],
+        stop_reason="tool_use",
+        usage=Usage(input_tokens=100, output_tokens=20),
+    )
+
+
+class TestRequestKey:
+    """Test request hashing."""
+
+    def test_ignores_cache_markers_and_max_tokens(self):
+        other = {
+            **REQUEST,
+            "max_tokens": 50,
+            "system": [{"type": "text", "text": "Je zoekt gasten"}],
+        }
+
+        assert request_key(other) == request_key(REQUEST)
+
+    def test_sdk_blocks_and_dicts_hash_the_same(self):
+        block = ToolUseBlock(type="tool_use", id="toolu_1", name="web_search", input={"q": 1})
+        as_dict = {"type": "tool_use", "id": "toolu_1", "name": "web_search", "input": {"q": 1}}
+
+        def request(content):
+            return {**REQUEST, "messages": [{"role": "assistant", "content": [content]}]}
+
+        assert request_key(request(block)) == request_key(request(as_dict))
+
+    def test_thinking_and_messages_change_the_key(self):
+        thinking = {**REQUEST, "thinking": {"type": "enabled", "budget_tokens": 2000}}
+        messages = {**REQUEST, "messages": [{"role": "user", "content": "Iets anders"}]}
+
+        assert len({request_key(REQUEST), request_key(thinking), request_key(messages)}) == 3
+
+
+class TestRecordReplay:
+    """Test recording and replaying responses."""
+
+    def test_record_then_replay_offline(self, tmp_path):
+        inner = MagicMock()
+        inner.messages.create.return_value = _message()
+        RecordReplayClient(inner, "record", tmp_path).messages.create(**REQUEST)
+
+        replay = RecordReplayClient(None, "replay", tmp_path)
+        response = replay.messages.create(**REQUEST)
+
+        inner.messages.create.assert_called_once()
+        assert response == _message()
+        assert response.content[1].input == {"query": "AI"}
+        assert replay.hits == 1
+
+    def test_replay_miss_raises(self, tmp_path):
+        with pytest.raises(ReplayMissError):
+            RecordReplayClient(None, "replay", tmp_path).messages.create(**REQUEST)
+
+    def test_auto_records_once(self, tmp_path):
+        inner = MagicMock()
+        inner.messages.create.return_value = _message()
+        client = RecordReplayClient(inner, "auto", tmp_path)
+
+        client.messages.create(**REQUEST)
+        client.messages.create(**REQUEST)
+
+        assert inner.messages.create.call_count == 1
+        assert (client.recorded, client.hits) == (1, 1)
+
+    def test_portkey_adapter_responses_recorded(self, tmp_path):
+        portkey = MagicMock()
+        portkey.chat.completions.create.return_value = SimpleNamespace(
+            id="chatcmpl-1",
+            model="claude-sonnet-4-5",
+            choices=[
+                SimpleNamespace(
+                    message=SimpleNamespace(content="Hallo", tool_calls=None),
+                    finish_reason="stop",
+                )
+            ],
+            usage=SimpleNamespace(prompt_tokens=10, completion_tokens=2),
+        )
+        adapter = AnthropicPortkeyAdapter(portkey, "@test", "claude-sonnet-4-5")
+        RecordReplayClient(adapter, "record", tmp_path).messages.create(**REQUEST)
+
+        response = RecordReplayClient(None, "replay", tmp_path).messages.create(**REQUEST)
+
+        assert response.content[0].text == "Hallo"
+        assert response.stop_reason == "end_turn"
+
+    def test_no_streaming_so_create_is_used(self, tmp_path):
+        assert not supports_streaming(RecordReplayClient(None, "replay", tmp_path))
+
+
+class TestClientFactory:
+    """Test LLM_CACHE_MODE in get_anthropic_client."""
+
+    def test_replay_mode_needs_no_api_client(self, tmp_path):
+        env = {"LLM_CACHE_MODE": "replay", "LLM_CACHE_DIR": str(tmp_path)}
+        with patch.dict(os.environ, env):
+            with patch("src.utils.portkey_client._create_client") as create_client:
+                client = get_anthropic_client("")
+            async_client = get_async_anthropic_client("")
+
+        create_client.assert_not_called()
+        assert isinstance(client, RecordReplayClient)
+        assert isinstance(async_client, AsyncClientBridge)
+
+    def test_async_bridge_replays(self, tmp_path):
+        inner = MagicMock()
+        inner.messages.create.return_value = _message("Async")
+        RecordReplayClient(inner, "record", tmp_path).messages.create(**REQUEST)
+
+        bridge = AsyncClientBridge(RecordReplayClient(None, "replay", tmp_path))
+
+        assert asyncio.run(bridge.messages.create(**REQUEST)).content[0].text == "Async"
@@ -0,0 +1,137 @@
+"""Tests for the content-hash keyed NER result cache."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.guest_search.ner import NerService
+from src.guest_search.ner_cache import NerCache, text_hash
+
+PERSONS = [{"name": "Jan de Vries", "context": "Prof. Jan de Vries", "position": 6}]
+
+
+class TestNerCache:
+    """Test the in-memory LRU and disk storage."""
+
+    def test_roundtrip(self, tmp_path):
+        cache = NerCache(tmp_path)
+
+        assert cache.get("tekst", "v1") is None
+        cache.put("tekst", "v1", PERSONS)
+
+        assert cache.get("tekst", "v1") == PERSONS
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_persists_across_instances(self, tmp_path):
+        NerCache(tmp_path).put("tekst", "v1", PERSONS)
+
+        assert NerCache(tmp_path).get("tekst", "v1") == PERSONS
+        assert (tmp_path / "v1" / f"{text_hash('tekst')}.json").exists()
+
+    def test_version_is_part_of_key(self, tmp_path):
+        cache = NerCache(tmp_path)
+        cache.put("tekst", "nl_core_news_md-3.7.0", PERSONS)
+
+        assert cache.get("tekst", "nl_core_news_md-3.8.0") is None
+
+    def test_lru_evicts_oldest_entry(self, tmp_path):
+        cache = NerCache(tmp_path, max_entries=2)
+        for text in ("a", "b", "c"):
+            cache.put(text, "v1", PERSONS)
+
+        assert list(cache._memory) == [("v1", text_hash("b")), ("v1", text_hash("c"))]
+        # Evicted entries are still on disk
+        assert cache.get("a", "v1") == PERSONS
+
+    def test_memory_only_without_cache_dir(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        cache = NerCache(None)
+
+        cache.put("tekst", "v1", PERSONS)
+
+        assert cache.get("tekst", "v1") == PERSONS
+        assert cache.get("ander", "v1") is None
+        assert list(tmp_path.iterdir()) == []
+
+    def test_service_uses_disk_cache_by_default(self, monkeypatch):
+        from src.guest_search import ner
+
+        assert ner.Config.NER_CACHE_DISK is True
+        assert str(ner.get_ner_service().cache.cache_dir) == ner.Config.NER_CACHE_DIR
+
+        monkeypatch.setattr(ner, "_service", None)
+        monkeypatch.setattr(ner.Config, "NER_CACHE_DISK", False)
+        assert ner.get_ner_service().cache.cache_dir is None
+
+    def test_returns_copies(self, tmp_path):
+        cache = NerCache(tmp_path)
+        cache.put("tekst", "v1", PERSONS)
+
+        cache.get("tekst", "v1")[0].pop("position")
+
+        assert cache.get("tekst", "v1") == PERSONS
+
+    def test_corrupt_entry_is_a_miss(self, tmp_path):
+        cache = NerCache(tmp_path)
+        path = tmp_path / "v1" / f"{text_hash('tekst')}.json"
+        path.parent.mkdir()
+        path.write_text("{niet compleet")
+
+        assert cache.get("tekst", "v1") is None
+
+
+class TestNerServiceCaching:
+    """Test that the NER service skips extraction for cached pages."""
+
+    @pytest.fixture
+    def spacy_model(self):
+        spacy = pytest.importorskip("spacy")
+
+        def load(model_name, version="3.7.0"):
+            nlp = spacy.blank("nl")
+            nlp.meta["version"] = version
+            ruler = nlp.add_pipe("entity_ruler", name="ner")
+            ruler.add_patterns([{"label": "PERSON", "pattern": "Maria Jansen"}])
+            return nlp
+
+        return load
+
+    def test_cached_page_skips_ner(self, tmp_path, spacy_model):
+        text = "Volgens Maria Jansen is dit belangrijk."
+        first = NerService(loader=spacy_model, cache=NerCache(tmp_path)).extract_persons(text)
+
+        service = NerService(loader=spacy_model, cache=NerCache(tmp_path))
+        with patch("src.guest_search.ner.persons_from_doc") as persons_from_doc:
+            second = service.extract_persons(text)
+
+        persons_from_doc.assert_not_called()
+        assert second == first
+        assert first[0]["name"] == "Maria Jansen"
+
+    def test_model_version_change_invalidates(self, tmp_path, spacy_model):
+        text = "Volgens Maria Jansen is dit belangrijk."
+        NerService(loader=spacy_model, cache=NerCache(tmp_path)).extract_persons(text)
+
+        upgraded = NerService(
+            loader=lambda name: spacy_model(name, version="3.8.0"), cache=NerCache(tmp_path)
+        )
+        with patch("src.guest_search.ner.persons_from_doc", return_value=[]) as persons_from_doc:
+            upgraded.extract_persons(text)
+
+        persons_from_doc.assert_called_once()
+
+    def test_batch_mixes_cached_and_new_texts(self, tmp_path, spacy_model):
+        cache = NerCache(tmp_path)
+        service = NerService(loader=spacy_model, cache=cache)
+        texts = ["Maria Jansen, CEO van Acme.", "Geen personen hier."]
+        service.extract_persons(texts[0])
+
+        batch = service.extract_persons_batch(texts)
+
+        assert batch == [service.extract_persons(text) for text in texts]
+        assert cache.hits >= 1
+
+    def test_regex_fallback_uses_regex_version(self, tmp_path):
+        service = NerService(loader=MagicMock(side_effect=OSError("model not found")))
+
+        assert service.extractor_version.startswith("regex-")
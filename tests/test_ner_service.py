@@ -0,0 +1,89 @@
+"""Tests for the shared spaCy NER service."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.guest_search.ner import NerService, get_ner_service
+
+spacy = pytest.importorskip("spacy")
+
+SAMPLE_TEXT = (
+    "Prof. Jan de Vries is hoogleraar AI aan de Universiteit van Amsterdam. "
+    "Volgens Maria Jansen is dit een belangrijke ontwikkeling."
+)
+
+
+def _fake_model(model_name):
+    """Small stand-in for nl_core_news_md: blank Dutch pipeline with a PERSON ruler."""
+    nlp = spacy.blank("nl")
+    nlp.add_pipe("attribute_ruler")  # Unused pipe that should be disabled
+    ruler = nlp.add_pipe("entity_ruler", name="ner")
+    ruler.add_patterns(
+        [
+            {"label": "PERSON", "pattern": "Jan de Vries"},
+            {"label": "PERSON", "pattern": "Maria Jansen"},
+        ]
+    )
+    return nlp
+
+
+class TestNerService:
+    """Test loading and extraction of the NER service."""
+
+    def test_loads_model_once(self):
+        loader = MagicMock(side_effect=_fake_model)
+        service = NerService(loader=loader)
+
+        service.extract_persons(SAMPLE_TEXT)
+        service.extract_persons(SAMPLE_TEXT)
+        service.extract_persons_batch([SAMPLE_TEXT, SAMPLE_TEXT])
+
+        loader.assert_called_once_with("nl_core_news_md")
+
+    def test_keeps_only_ner_and_sentencizer(self):
+        service = NerService(loader=_fake_model)
+
+        nlp = service.load()
+
+        assert nlp.pipe_names == ["sentencizer", "ner"]
+        assert "attribute_ruler" in nlp.disabled
+
+    def test_extract_persons(self):
+        service = NerService(loader=_fake_model)
+
+        persons = service.extract_persons(SAMPLE_TEXT)
+
+        names = [p["name"] for p in persons]
+        assert names == ["Jan de Vries", "Maria Jansen"]
+        assert persons[0]["title_match"] == "Prof. Jan de Vries"
+        assert persons[0]["sentence"].startswith("Prof. Jan de Vries")
+        assert persons[1]["position"] == SAMPLE_TEXT.index("Maria Jansen")
+
+    def test_batch_matches_single_extraction(self):
+        service = NerService(loader=_fake_model)
+        texts = [SAMPLE_TEXT, "Geen personen hier.", "Maria Jansen, CEO van Acme."]
+
+        batch = service.extract_persons_batch(texts)
+
+        assert batch == [service.extract_persons(text) for text in texts]
+
+    def test_regex_fallback_when_model_missing(self):
+        service = NerService(loader=MagicMock(side_effect=OSError("model not found")))
+
+        persons = service.extract_persons(SAMPLE_TEXT)
+
+        assert not service.available
+        assert service.model_version is None
+        assert any("Vries" in p["name"] or "Jansen" in p["name"] for p in persons)
+        assert service.extract_persons_batch([SAMPLE_TEXT]) == [persons]
+
+    def test_model_version(self):
+        service = NerService(loader=_fake_model)
+
+        assert service.model_version == service.load().meta["version"]
+
+
+def test_get_ner_service_is_shared():
+    """The service is created once per process."""
+    assert get_ner_service() is get_ner_service()
@@ -0,0 +1,141 @@
+"""Tests for parallel query workers in the search phase."""
+
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.guest_search.agent import GuestFinderAgent
+from src.guest_search.config import Config
+
+
+def _response(*blocks, stop_reason="tool_use"):
+    return MagicMock(stop_reason=stop_reason, content=list(blocks))
+
+
+def _tool_use(name, tool_input, block_id):
+    return SimpleNamespace(type="tool_use", name=name, input=tool_input, id=block_id)
+
+
+def _last_prompt(messages):
+    """Index and query of the last query prompt in a conversation."""
+    for index in range(len(messages) - 1, -1, -1):
+        if messages[index]["role"] != "user":
+            continue
+        content = messages[index]["content"]
+        if isinstance(content, list) and content[0]["type"] == "tool_result":
+            continue
+        text = content if isinstance(content, str) else content[-1]["text"]
+        query = next(q for q in ("query-a", "query-b", "query-c", "query-d") if q in text)
+        return index, query
+    raise AssertionError("no query prompt")
+
+
+class FakeClient:
+    """Per query: first turn saves the query's person and fetches two pages, second turn ends."""
+
+    def __init__(self, persons):
+        self.persons = persons
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.messages = MagicMock()
+        self.messages.create.side_effect = self.create
+
+    def create(self, messages, **kwargs):
+        with self.lock:
+            self.calls += 1
+        index, query = _last_prompt(messages)
+        if index < len(messages) - 1:
+            return _response(SimpleNamespace(type="text", text="Klaar"), stop_reason="end_turn")
+        return _response(
+            _tool_use("save_candidate", {"name": self.persons[query]}, f"{query}-save"),
+            _tool_use("fetch_page_content", {"url": f"https://{query}/1"}, f"{query}-1"),
+            _tool_use("fetch_page_content", {"url": f"https://{query}/2"}, f"{query}-2"),
+        )
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    monkeypatch.setattr(Config, "PARALLEL_QUERY_WORKERS", 3)
+    with patch("src.guest_search.agent.get_anthropic_client"):
+        agent = GuestFinderAgent()
+    agent.candidates = []
+    agent.previous_guests = []
+    return agent
+
+
+def _run(agent, persons, queries):
+    agent.client = FakeClient(persons)
+    fetched = []
+    handle_tool_call = agent._handle_tool_call
+
+    def handler(name, tool_input, silent=False):
+        if name == "fetch_page_content":
+            fetched.append((agent.current_query, tool_input["url"]))
+            return {"url": tool_input["url"], "status": "success"}
+        return handle_tool_call(name, tool_input, silent=silent)
+
+    strategy = {"search_queries": [{"query": q, "rationale": "test"} for q in queries]}
+    with patch.object(agent, "_handle_tool_call", side_effect=handler):
+        agent.run_search_phase(strategy)
+    return fetched
+
+
+class TestParallelQueries:
+    """Test running queries as independent conversations."""
+
+    def test_records_per_query_in_strategy_order(self, agent):
+        persons = {"query-a": "Anna Smit", "query-b": "Bram Bos", "query-c": "Carla Dijk"}
+
+        _run(agent, persons, ["query-a", "query-b", "query-c"])
+
+        records = agent.current_session_queries
+        assert [r["query"] for r in records] == ["query-a", "query-b", "query-c"]
+        assert [r["candidates_found"] for r in records] == [1, 1, 1]
+        assert records[1]["successful_sources"] == ["https://query-b/1", "https://query-b/2"]
+        assert {c["name"] for c in agent.candidates} == set(persons.values())
+
+    def test_same_person_from_two_workers_saved_once(self, agent):
+        persons = {
+            "query-a": "Jan de Vries",
+            "query-b": "Prof. Jan de Vries",
+            "query-c": "Bram Bos",
+        }
+
+        _run(agent, persons, ["query-a", "query-b", "query-c"])
+
+        assert sorted(c["name"] for c in agent.candidates).count("Bram Bos") == 1
+        assert len(agent.candidates) == 2
+        assert sum(r["candidates_found"] for r in agent.current_session_queries) == 2
+
+    def test_current_query_is_per_worker(self, agent):
+        persons = {"query-a": "Anna Smit", "query-b": "Bram Bos", "query-c": "Carla Dijk"}
+
+        fetched = _run(agent, persons, ["query-a", "query-b", "query-c"])
+
+        assert len(fetched) == 6
+        assert all(url.startswith(f"https://{query}/") for query, url in fetched)
+
+    def test_stops_at_target(self, agent, monkeypatch):
+        monkeypatch.setattr(Config, "TARGET_CANDIDATES", 1)
+        monkeypatch.setattr(Config, "PARALLEL_QUERY_WORKERS", 2)
+        persons = {
+            q: f"Persoon {q[-1].upper()} Achternaam"
+            for q in ("query-a", "query-b", "query-c", "query-d")
+        }
+
+        _run(agent, persons, ["query-a", "query-b", "query-c", "query-d"])
+
+        # At most the two queries already in flight run; the rest is cancelled
+        assert len(agent.current_session_queries) <= 2
+        assert agent.client.calls <= 4
+
+    def test_sequential_mode_unchanged(self, agent, monkeypatch):
+        monkeypatch.setattr(Config, "PARALLEL_QUERY_WORKERS", 0)
+        persons = {"query-a": "Anna Smit", "query-b": "Bram Bos"}
+
+        _run(agent, persons, ["query-a", "query-b"])
+
+        assert [c["name"] for c in agent.candidates] == ["Anna Smit", "Bram Bos"]
+        assert [r["candidates_found"] for r in agent.current_session_queries] == [1, 1]
@@ -0,0 +1,150 @@
+"""Tests for person-centric passage selection in fetch_page_content."""
+
+from unittest.mock import patch
+
+import pytest
+
+from src.guest_search.agent import GuestFinderAgent
+from src.guest_search.config import Config
+from src.guest_search.passages import PASSAGE_SEPARATOR, query_terms, select_passages
+
+
+def _long_page(person_sentence: str, filler_lines: int = 120) -> str:
+    """Build a long page with the person sentence far below the first 4000 chars."""
+    filler = "\n".join(
+        f"Regel {i}: algemene tekst over het nieuws van deze week zonder namen."
+        for i in range(filler_lines)
+    )
+    return f"AI in de zorg\n{filler}\n{person_sentence}\n{filler}"
+
+
+class TestQueryTerms:
+    """Test extraction of query terms."""
+
+    def test_drops_operators_stopwords_and_numbers(self):
+        terms = query_terms('site:agconnect.nl "AI Act" implementatie Nederland 2025')
+
+        assert "implementatie" in terms
+        assert "act" in terms
+        assert "nederland" not in terms
+        assert "2025" not in terms
+        assert not any("agconnect" in t for t in terms)
+
+    def test_empty_query(self):
+        assert query_terms("") == []
+
+    def test_deduplicates_terms(self):
+        assert query_terms("zorg AI zorg") == ["zorg"]
+
+
+class TestSelectPassages:
+    """Test passage selection within a character budget."""
+
+    def test_short_text_returned_unchanged(self):
+        text = "Prof. Jan de Vries is hoogleraar AI."
+        assert select_passages(text, [], [], budget=4000) == [text]
+
+    def test_empty_text(self):
+        assert select_passages("", [], [], budget=4000) == []
+
+    def test_person_beyond_first_budget_is_included(self):
+        sentence = "Volgens Lisa van Dam, cardioloog bij het AMC, voorspelt AI hartinfarcten."
+        text = _long_page(sentence)
+        position = text.index("Lisa van Dam")
+        assert position > 4000
+
+        persons = [{"name": "Lisa van Dam", "context": "...", "position": position}]
+        passages = select_passages(text, persons, [], budget=4000)
+
+        joined = PASSAGE_SEPARATOR.join(passages)
+        assert "Lisa van Dam" in joined
+        assert "cardioloog bij het AMC" in joined
+        assert len(joined) <= 4000
+
+    def test_position_falls_back_to_name_search(self):
+        sentence = "Directeur AI Mark de Wit presenteert het plan."
+        text = _long_page(sentence)
+
+        passages = select_passages(text, [{"name": "Mark de Wit"}], [], budget=2000)
+
+        assert any("Mark de Wit" in p for p in passages)
+
+    def test_query_terms_select_passages(self):
+        sentence = "Het ziekenhuis gebruikt radiologie software met deep learning."
+        text = _long_page(sentence)
+
+        passages = select_passages(text, [], ["radiologie"], budget=1500)
+
+        assert any("radiologie" in p for p in passages)
+
+    def test_passages_in_document_order(self):
+        text = _long_page("Dr. Anna Smit werkt bij TNO.") + "\nProf. Kees Bos, TU Delft."
+        persons = [
+            {"name": "Kees Bos", "position": text.index("Kees Bos"), "title_match": "Prof."},
+            {"name": "Anna Smit", "position": text.index("Anna Smit")},
+        ]
+
+        passages = select_passages(text, persons, [], budget=4000)
+        joined = PASSAGE_SEPARATOR.join(passages)
+
+        assert joined.index("Anna Smit") < joined.index("Kees Bos")
+
+    def test_budget_is_respected_with_many_persons(self):
+        text = "\n".join(f"Onderzoeker Persoon{i} Achternaam{i} werkt aan AI." for i in range(500))
+        persons = [
+            {"name": f"Persoon{i} Achternaam{i}", "position": text.index(f"Persoon{i} ")}
+            for i in range(0, 500, 7)
+        ]
+
+        passages = select_passages(text, persons, ["onderzoeker"], budget=3000)
+
+        assert len(PASSAGE_SEPARATOR.join(passages)) <= 3000
+
+
+class TestPageResult:
+    """Test the fetch_page_content result built by the agent."""
+
+    @pytest.fixture
+    def agent(self):
+        with patch("src.guest_search.agent.get_anthropic_client"):
+            return GuestFinderAgent()
+
+    def test_result_hides_positions(self, agent):
+        persons = [{"name": "Jan Jansen", "context": "CEO Jan Jansen", "position": 4}]
+
+        result = agent._build_page_result("https://example.com", "CEO Jan Jansen", persons)
+
+        assert result["content"] == "CEO Jan Jansen"
+        assert "position" not in result["potential_persons"][0]
+        assert result["persons_found"] == 1
+
+    def test_long_page_marked_as_truncated(self, agent):
+        text = _long_page("Volgens Lisa van Dam is dit belangrijk.")
+        persons = [{"name": "Lisa van Dam", "context": "...", "position": text.index("Lisa")}]
+
+        result = agent._build_page_result("https://example.com", text, persons)
+
+        assert "Lisa van Dam" in result["content"]
+        assert result["content"].endswith("[...tekst ingekort...]")
+
+    def test_compact_mode(self, agent, monkeypatch):
+        monkeypatch.setattr(Config, "FETCH_COMPACT_MODE", True)
+        persons = [
+            {
+                "name": "Jan de Vries",
+                "context": "Prof. Jan de Vries is hoogleraar",
+                "sentence": "Prof. Jan de Vries is hoogleraar.",
+                "title_match": "Prof. Jan de Vries",
+                "position": 6,
+            }
+        ]
+
+        result = agent._build_page_result(
+            "https://example.com", "Prof. Jan de Vries is hoogleraar.", persons
+        )
+
+        assert "content" not in result
+        assert result["passages"] == ["Prof. Jan de Vries is hoogleraar."]
+        assert result["potential_persons"] == [
+            {"name": "Jan de Vries", "title_match": "Prof. Jan de Vries"}
+        ]
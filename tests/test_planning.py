@@ -0,0 +1,241 @@
+"""Tests for the structured planning output and planning/search pipelining."""
+
+import json
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.guest_search.agent import GuestFinderAgent
+from src.guest_search.config import Config
+from src.guest_search.planning import (
+    STRATEGY_TOOL,
+    QueryStreamParser,
+    strategy_tool_choice,
+    strategy_tool_input,
+)
+
+STRATEGY = {
+    "week_focus": 'AI in de zorg, "brede" blik {niet alleen ziekenhuizen}',
+    "sectors_to_prioritize": ["zorg", "overheid"],
+    "search_queries": [
+        {
+            "query": "AI radiologie ziekenhuis",
+            "rationale": 'Pilots met "beeldherkenning" } en { accolades',
+            "expected_sources": ["ICT&health", "persberichten"],
+            "priority": "medium",
+        },
+        {
+            "query": "AI Act toezicht Nederland",
+            "rationale": "Nieuwe richtlijnen",
+            "expected_sources": [],
+            "priority": "high",
+        },
+        {"query": "Groene AI datacenters", "rationale": "Energie", "priority": "low"},
+    ],
+    "topics_to_cover": ["ethiek"],
+}
+
+
+def _feed_in_chunks(parser, text, size):
+    found = []
+    for start in range(0, len(text), size):
+        found.extend(parser.feed(text[start : start + size]))
+    return found
+
+
+class TestQueryStreamParser:
+    """Test picking complete search queries out of partial tool input JSON."""
+
+    @pytest.mark.parametrize("size", [1, 7, 64, 100_000])
+    def test_queries_complete_in_any_chunking(self, size):
+        text = json.dumps(STRATEGY, ensure_ascii=False)
+
+        found = _feed_in_chunks(QueryStreamParser(), text, size)
+
+        assert found == STRATEGY["search_queries"]
+
+    def test_query_returned_as_soon_as_its_object_closes(self):
+        text = json.dumps(STRATEGY)
+        first_end = text.index('"AI Act toezicht')
+        parser = QueryStreamParser()
+
+        assert parser.feed(text[:first_end]) == [STRATEGY["search_queries"][0]]
+        assert parser.feed(text[first_end:]) == STRATEGY["search_queries"][1:]
+
+    def test_other_arrays_are_ignored(self):
+        text = json.dumps({"topics_to_cover": [{"query": "geen zoekopdracht"}], "week_focus": ""})
+
+        assert QueryStreamParser().feed(text) == []
+
+    def test_items_without_query_are_skipped(self):
+        text = json.dumps({"search_queries": [{"rationale": "leeg"}, {"query": "ok"}]})
+
+        assert QueryStreamParser().feed(text) == [{"query": "ok"}]
+
+
+class TestStrategyTool:
+    """Test tool choice and reading the strategy from a tool call."""
+
+    def test_tool_forced_without_thinking(self):
+        assert strategy_tool_choice(0) == {"type": "tool", "name": STRATEGY_TOOL}
+
+    def test_auto_with_thinking(self):
+        assert strategy_tool_choice(20000) == {"type": "auto"}
+
+    def test_tool_input_from_response(self):
+        response = SimpleNamespace(
+            content=[
+                SimpleNamespace(type="thinking", thinking="..."),
+                SimpleNamespace(type="tool_use", name=STRATEGY_TOOL, input=STRATEGY, id="t1"),
+            ]
+        )
+
+        assert strategy_tool_input(response) == STRATEGY
+
+    def test_no_tool_call(self):
+        response = SimpleNamespace(content=[SimpleNamespace(type="text", text="{}")])
+
+        assert strategy_tool_input(response) is None
+
+
+@pytest.fixture
+def agent():
+    with patch("src.guest_search.agent.get_anthropic_client"):
+        agent = GuestFinderAgent()
+    agent.candidates = []
+    agent.previous_guests = []
+    agent.client = MagicMock()
+    return agent
+
+
+class TestAgentPlanning:
+    """Test the planning request and strategy parsing in the agent."""
+
+    def test_request_offers_strategy_tool(self, agent):
+        request = agent._planning_request()
+
+        assert [tool["name"] for tool in request["tools"]] == [STRATEGY_TOOL]
+        # Extended thinking: the tool cannot be forced
+        assert request["tool_choice"] == {"type": "auto"}
+        assert request["thinking"]["budget_tokens"] == Config.PLANNING_THINKING_BUDGET
+
+    def test_request_without_thinking_forces_tool(self, agent, monkeypatch):
+        monkeypatch.setattr(Config, "PLANNING_THINKING_BUDGET", 0)
+
+        request = agent._planning_request()
+
+        assert request["tool_choice"] == {"type": "tool", "name": STRATEGY_TOOL}
+        assert "thinking" not in request
+
+    def test_strategy_from_tool_call(self, agent):
+        agent.client.messages.create.return_value = MagicMock(
+            content=[
+                SimpleNamespace(type="text", text="Hier is {een} strategie"),
+                SimpleNamespace(type="tool_use", name=STRATEGY_TOOL, input=STRATEGY, id="t1"),
+            ]
+        )
+
+        strategy = agent.run_planning_phase()
+
+        assert strategy == STRATEGY
+        assert agent.current_session_strategy["total_queries_planned"] == 3
+
+
+class FakePlanningStream:
+    """Streams the strategy tool input; waits for the first search after the first query."""
+
+    def __init__(self, strategy, search_started):
+        self.text = json.dumps(strategy)
+        self.strategy = strategy
+        self.search_started = search_started
+        self.search_started_during_planning = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __iter__(self):
+        tool_use = SimpleNamespace(type="tool_use", name=STRATEGY_TOOL, id="t1", input={})
+        yield SimpleNamespace(type="content_block_start", index=0, content_block=tool_use)
+
+        first_end = self.text.index("}") + 1
+        yield self._delta(self.text[:first_end])
+        # The rest of the plan is "still generating" until the first search ran
+        self.search_started_during_planning = self.search_started.wait(timeout=2)
+        yield self._delta(self.text[first_end:])
+
+    @staticmethod
+    def _delta(chunk):
+        return SimpleNamespace(
+            type="content_block_delta",
+            index=0,
+            delta=SimpleNamespace(type="input_json_delta", partial_json=chunk),
+        )
+
+    def get_final_message(self):
+        tool_use = SimpleNamespace(
+            type="tool_use", name=STRATEGY_TOOL, id="t1", input=self.strategy
+        )
+        return SimpleNamespace(content=[tool_use], usage=None)
+
+
+class PlanningMessages:
+    def __init__(self, planning_stream):
+        self.planning_stream = planning_stream
+
+    def stream(self, **request):
+        return self.planning_stream
+
+
+class PlanningClient:
+    def __init__(self, strategy):
+        self.search_started = threading.Event()
+        self.messages = PlanningMessages(FakePlanningStream(strategy, self.search_started))
+
+
+class TestPipelinedPlanning:
+    """Test searching while the planner is still writing the plan."""
+
+    def _run(self, agent, strategy):
+        agent.client = PlanningClient(strategy)
+        ran = []
+
+        def run_query(query_obj, conversation, compactor=None):
+            ran.append(query_obj["query"])
+            agent.client.search_started.set()
+            return {"query": query_obj["query"], "candidates_found": 0, "input_tokens": 0}
+
+        with patch.object(agent, "_run_query", side_effect=run_query):
+            result = agent.run_pipelined_planning_and_search()
+        return result, ran
+
+    def test_first_query_runs_before_plan_is_complete(self, agent):
+        strategy = {
+            "week_focus": "Test",
+            "search_queries": [
+                {"query": "eerste", "rationale": "a", "priority": "low"},
+                {"query": "tweede", "rationale": "b", "priority": "high"},
+                {"query": "derde", "rationale": "c", "priority": "medium"},
+            ],
+        }
+
+        result, ran = self._run(agent, strategy)
+
+        assert result == strategy
+        assert agent.client.messages.planning_stream.search_started_during_planning
+        # First query as soon as it arrived, then the rest by priority
+        assert ran == ["eerste", "tweede", "derde"]
+        assert [r["query"] for r in agent.current_session_queries] == ran
+
+    def test_pipeline_requires_streaming_client(self, agent, monkeypatch):
+        monkeypatch.setattr(Config, "PLANNING_PIPELINE", True)
+        monkeypatch.setattr(Config, "PARALLEL_QUERY_WORKERS", 0)
+
+        assert not agent._pipeline_planning()
+
+        agent.client = PlanningClient(STRATEGY)
+        assert agent._pipeline_planning()
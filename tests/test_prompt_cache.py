@@ -0,0 +1,118 @@
+"""Tests for prompt caching of the search instructions."""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from src.guest_search.prompt_cache import (
+    EPHEMERAL,
+    cache_report,
+    system_prompt,
+    with_message_breakpoint,
+)
+from src.guest_search.prompts import SEARCH_EXECUTION_PROMPT_CACHEABLE
+
+
+def _turn(uncached, read=0, written=0):
+    return {
+        "input_tokens": uncached,
+        "output_tokens": 10,
+        "cache_read_input_tokens": read,
+        "cache_creation_input_tokens": written,
+    }
+
+
+class TestSystemPrompt:
+    """Test the cached system prompt."""
+
+    def test_cache_breakpoint_when_enabled(self):
+        assert system_prompt("Instructies", True) == [
+            {"type": "text", "text": "Instructies", "cache_control": EPHEMERAL}
+        ]
+
+    def test_plain_string_when_disabled(self):
+        assert system_prompt("Instructies", False) == "Instructies"
+
+
+class TestMessageBreakpoint:
+    """Test the rolling breakpoint on the last user message."""
+
+    def test_only_last_user_message_marked(self):
+        conversation = [
+            {"role": "user", "content": "Query 1"},
+            {"role": "assistant", "content": [SimpleNamespace(type="text", text="...")]},
+            {"role": "user", "content": [{"type": "tool_result", "tool_use_id": "t1"}]},
+        ]
+
+        marked = with_message_breakpoint(conversation)
+
+        assert marked[0] is conversation[0]
+        assert marked[2]["content"][-1]["cache_control"] == EPHEMERAL
+        # The original conversation keeps no breakpoints
+        assert "cache_control" not in conversation[2]["content"][-1]
+
+    def test_string_content_converted_to_block(self):
+        marked = with_message_breakpoint([{"role": "user", "content": "Query 1"}])
+
+        assert marked[0]["content"] == [
+            {"type": "text", "text": "Query 1", "cache_control": EPHEMERAL}
+        ]
+
+    def test_no_user_message(self):
+        conversation = [{"role": "assistant", "content": "Hallo"}]
+
+        assert with_message_breakpoint(conversation) is conversation
+
+
+class TestCacheReport:
+    """Test cache statistics over recorded turns."""
+
+    def test_read_ratio_and_savings(self):
+        report = cache_report([_turn(100, written=1000), _turn(200, read=1000)])
+
+        assert report["turns"] == 2
+        assert report["input_tokens"] == 2300
+        assert report["read_ratio"] == 1000 / 2300
+        # 1000 reads at 10% minus 1000 writes at +25%
+        assert report["saved_tokens"] == 900 - 250
+
+    def test_empty(self):
+        assert cache_report([])["read_ratio"] == 0.0
+
+
+class TestSearchPhaseCaching:
+    """Test the requests sent by run_search_phase."""
+
+    def test_instructions_in_system_not_in_messages(self, monkeypatch):
+        from src.guest_search.agent import GuestFinderAgent
+        from src.guest_search.config import Config
+
+        monkeypatch.setattr(Config, "ENABLE_PROMPT_CACHING", True)
+        with patch("src.guest_search.agent.get_anthropic_client"):
+            agent = GuestFinderAgent()
+        agent.candidates = []
+
+        done = MagicMock(
+            stop_reason="end_turn",
+            content=[SimpleNamespace(type="text", text="Klaar")],
+            usage=SimpleNamespace(input_tokens=50, output_tokens=5, cache_read_input_tokens=3000),
+        )
+        agent.client = MagicMock()
+        agent.client.messages.create.return_value = done
+
+        strategy = {"search_queries": [{"query": "AI zorg"}, {"query": "Data onderwijs"}]}
+        agent.run_search_phase(strategy)
+
+        calls = agent.client.messages.create.call_args_list
+        assert len(calls) == 2
+        for call in calls:
+            assert call.kwargs["system"][0]["text"] == SEARCH_EXECUTION_PROMPT_CACHEABLE
+            assert call.kwargs["system"][0]["cache_control"] == EPHEMERAL
+            assert SEARCH_EXECUTION_PROMPT_CACHEABLE not in str(call.kwargs["messages"])
+
+        # Second query only appends its dynamic prompt, marked as breakpoint
+        last_message = calls[1].kwargs["messages"][-1]
+        assert "Data onderwijs" in last_message["content"][-1]["text"]
+        assert last_message["content"][-1]["cache_control"] == EPHEMERAL
+
+        assert len(agent.search_turns) == 2
+        assert cache_report(agent.search_turns)["cache_read_input_tokens"] == 6000
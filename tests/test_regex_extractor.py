@@ -0,0 +1,47 @@
+"""Tests for the compiled regex person extractor (spaCy fallback)."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from src.guest_search.extraction import ROLE_STOPWORDS, extract_persons_regex
+
+CORPUS_PATH = Path(__file__).parent / "fixtures" / "regex_person_corpus.json"
+
+
+def _load_corpus():
+    with open(CORPUS_PATH, encoding="utf-8") as f:
+        corpus = json.load(f)
+    return list(zip(corpus["texts"], corpus["expected"], strict=True))
+
+
+@pytest.mark.parametrize("text,expected", _load_corpus())
+def test_output_matches_original_extractor(text, expected):
+    """Output is identical to the original per-pattern implementation."""
+    assert extract_persons_regex(text) == expected
+
+
+def test_empty_text():
+    assert extract_persons_regex("") == []
+
+
+def test_role_stopwords_are_frozen():
+    assert isinstance(ROLE_STOPWORDS, frozenset)
+    assert "ceo" in ROLE_STOPWORDS
+
+
+def test_title_and_role_matches():
+    text = "Prof. Anna Visser is blij. Maria Jansen, CEO van Acme. Dat klopt, volgens Piet Bakker."
+
+    persons = extract_persons_regex(text)
+
+    assert [p["name"] for p in persons] == ["Anna Visser", "Maria Jansen", "Piet Bakker"]
+    assert persons[0]["title_match"] == "Prof. Anna Visser"
+    assert persons[1]["position"] == text.index("Maria Jansen")
+
+
+def test_name_before_role_across_comma():
+    persons = extract_persons_regex("Onderzoek: Anna Smit, hoogleraar aan de UvA.")
+
+    assert [p["name"] for p in persons] == ["Anna Smit"]
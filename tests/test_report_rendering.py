@@ -0,0 +1,82 @@
+"""Tests for local rendering of the guest report."""
+
+from src.guest_search.report_rendering import default_intro, intro_summary, render_report
+
+CANDIDATE = {
+    "name": "Anna Visser",
+    "role": "hoogleraar",
+    "organization": "TU Delft",
+    "topics": ["Uitlegbare AI in de zorg", "AI Act in ziekenhuizen"],
+    "relevance_description": "Anna onderzoekt uitlegbare AI.",
+    "sources": ["https://a.nl/1", "https://a.nl/2", "https://a.nl/3", "https://a.nl/4"],
+    "contact_info": {"linkedin": "https://www.linkedin.com/in/annavisser"},
+}
+
+RECENT_GUEST = {
+    "name": "Mark de Jong",
+    "organization": "TNO",
+    "role": "onderzoeker",
+    "date": "2025-10-07T09:30:00",
+    "why_now": "Nieuw AI-lab.",
+    "sources": [{"url": "https://tno.nl/lab", "title": "AI-lab", "date": ""}],
+}
+
+
+class TestRenderReport:
+    """Test the report structure."""
+
+    def test_candidate_section(self):
+        report = render_report([CANDIDATE], [], 42, intro="Intro.")
+
+        assert report.startswith("# Potentiële gasten voor AIToday Live - Week 42\n\nIntro.")
+        assert "## Nieuwe kandidaten" in report
+        assert "### Anna Visser - hoogleraar bij TU Delft" in report
+        assert "- Uitlegbare AI in de zorg" in report
+        assert "**Waarom interessant:** Anna onderzoekt uitlegbare AI." in report
+        # Max 3 sources
+        assert "https://a.nl/3" in report
+        assert "https://a.nl/4" not in report
+        assert "**Contact:** [LinkedIn](https://www.linkedin.com/in/annavisser)" in report
+        assert "Recent aanbevolen" not in report
+
+    def test_recent_guest_section(self):
+        report = render_report([], [RECENT_GUEST], 42)
+
+        assert "## Recent aanbevolen (herhaling)" in report
+        assert "**Waarom toen aanbevolen:** Nieuw AI-lab." in report
+        assert "- [AI-lab](https://tno.nl/lab)" in report
+        assert "**Aanbevolen op:** 7 oktober 2025" in report
+        assert "## Nieuwe kandidaten" not in report
+
+    def test_missing_fields(self):
+        report = render_report([{"name": "Eva Smit"}], [{"name": "Jan Bakker", "date": "?"}], 1)
+
+        assert "### Eva Smit\n" in report
+        assert "**Contact:**" not in report
+        assert "**Aanbevolen op:** ?" in report
+
+
+class TestIntro:
+    """Test the intro helpers."""
+
+    def test_default_intro(self):
+        candidates = [
+            CANDIDATE,
+            {**CANDIDATE, "name": "Eva"},
+            {"name": "Jan", "organization": "TNO"},
+        ]
+
+        assert default_intro(candidates) == (
+            "Deze week 3 nieuwe kandidaten, onder andere van TU Delft en TNO."
+        )
+        assert default_intro([]) == "Deze week zijn er geen nieuwe kandidaten gevonden."
+
+    def test_intro_summary_is_compact(self):
+        assert intro_summary([CANDIDATE]) == [
+            {
+                "name": "Anna Visser",
+                "role": "hoogleraar",
+                "organization": "TU Delft",
+                "topics": ["Uitlegbare AI in de zorg", "AI Act in ziekenhuizen"],
+            }
+        ]
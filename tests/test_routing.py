@@ -0,0 +1,185 @@
+"""Tests for per-phase models and escalation of search turns."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.guest_search.agent import GuestFinderAgent
+from src.guest_search.async_runtime import AsyncGuestRuntime
+from src.guest_search.config import Config
+from src.guest_search.routing import ToolResultMemo, defer_escalation_tools, needs_escalation
+
+FAST = "fast-model"
+LARGE = "large-model"
+
+
+def _tool_use(name, tool_input, block_id):
+    return SimpleNamespace(type="tool_use", name=name, input=tool_input, id=block_id)
+
+
+def _response(*blocks, stop_reason="tool_use"):
+    return SimpleNamespace(stop_reason=stop_reason, content=list(blocks), usage=None)
+
+
+def _done():
+    return _response(SimpleNamespace(type="text", text="Klaar"), stop_reason="end_turn")
+
+
+def _save(name, block_id):
+    return _response(_tool_use("save_candidate", {"name": name, "organization": ""}, block_id))
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    monkeypatch.setattr(Config, "PARALLEL_QUERY_WORKERS", 0)
+    monkeypatch.setattr(Config, "SEARCH_ESCALATION", True)
+    monkeypatch.setattr(Config, "SEARCH_FAST_MODEL", FAST)
+    monkeypatch.setattr(Config, "SEARCH_MODEL", LARGE)
+    with patch("src.guest_search.agent.get_anthropic_client"):
+        agent = GuestFinderAgent()
+    agent.candidates = []
+    agent.previous_guests = []
+    agent.client = MagicMock()
+    return agent
+
+
+class TestEscalationHelpers:
+    """Test the escalation helpers."""
+
+    def test_needs_escalation_only_for_decision_tools(self):
+        assert needs_escalation(_save("Anna Visser", "t1"))
+        assert not needs_escalation(_response(_tool_use("web_search", {}, "t1")))
+        assert not needs_escalation(_done())
+
+    def test_decision_tools_are_not_executed(self):
+        handler = MagicMock(return_value={"status": "success"})
+        deferred = defer_escalation_tools(handler)
+
+        assert deferred("save_candidate", {"name": "Anna Visser"}) == {"status": "escalated"}
+        assert deferred("web_search", {"query": "AI"}) == {"status": "success"}
+        handler.assert_called_once_with("web_search", {"query": "AI"})
+
+    def test_memo_reuses_io_results_once(self):
+        handler = MagicMock(side_effect=lambda name, tool_input: {"tool": name})
+        memo = ToolResultMemo()
+
+        memo.record(handler)("fetch_page_content", {"url": "https://a.nl"})
+        memo.record(handler)("check_previous_guests", {"name": "Anna Visser"})
+        reuse = memo.reuse(handler)
+
+        assert reuse("fetch_page_content", {"url": "https://a.nl"}) == {
+            "tool": "fetch_page_content"
+        }
+        assert handler.call_count == 2
+        # Only I/O tools are stored, and each result is used once
+        reuse("check_previous_guests", {"name": "Anna Visser"})
+        reuse("fetch_page_content", {"url": "https://a.nl"})
+        assert handler.call_count == 4
+
+
+class TestSyncEscalation:
+    """Test escalation in the sync search loop."""
+
+    def test_save_candidate_decided_by_search_model(self, agent):
+        agent.client.messages.create.side_effect = [
+            _save("Anna V.", "fast-1"),
+            _save("Anna Visser", "large-1"),
+            _done(),
+        ]
+
+        agent.run_search_phase({"search_queries": [{"query": "AI zorg"}]})
+
+        models = [c.kwargs["model"] for c in agent.client.messages.create.call_args_list]
+        assert models == [FAST, LARGE, FAST]
+        # Only the search model's decision is executed and kept in the conversation
+        assert [c["name"] for c in agent.candidates] == ["Anna Visser"]
+        messages = agent.client.messages.create.call_args.kwargs["messages"]
+        assert [b.id for b in messages[1]["content"]] == ["large-1"]
+        assert set(agent.metrics.model_totals()) == {FAST, LARGE}
+
+    def test_escalated_turn_reuses_fast_turn_io(self, agent):
+        fetch = {"url": "https://a.nl"}
+        agent.client.messages.create.side_effect = [
+            _response(
+                _tool_use("fetch_page_content", fetch, "fast-1"),
+                _tool_use("save_candidate", {"name": "Anna V.", "organization": ""}, "fast-2"),
+            ),
+            _response(
+                _tool_use("fetch_page_content", fetch, "large-1"),
+                _tool_use("save_candidate", {"name": "Anna Visser", "organization": ""}, "large-2"),
+            ),
+            _done(),
+        ]
+        calls = []
+        handle = agent._handle_tool_call
+
+        def handle_tool_call(tool_name, tool_input, silent=False):
+            calls.append(tool_name)
+            if tool_name == "fetch_page_content":
+                return {"url": tool_input["url"], "status": "success", "content": "..."}
+            return handle(tool_name, tool_input, silent=silent)
+
+        agent._handle_tool_call = handle_tool_call
+
+        agent.run_search_phase({"search_queries": [{"query": "AI zorg"}]})
+
+        assert calls == ["fetch_page_content", "save_candidate"]
+        assert [c["name"] for c in agent.candidates] == ["Anna Visser"]
+
+    def test_disabled_uses_search_model_only(self, agent, monkeypatch):
+        monkeypatch.setattr(Config, "SEARCH_ESCALATION", False)
+        agent.client.messages.create.side_effect = [_save("Anna Visser", "t1"), _done()]
+
+        agent.run_search_phase({"search_queries": [{"query": "AI zorg"}]})
+
+        models = [c.kwargs["model"] for c in agent.client.messages.create.call_args_list]
+        assert models == [LARGE, LARGE]
+        assert [c["name"] for c in agent.candidates] == ["Anna Visser"]
+
+
+class TestAsyncEscalation:
+    """Test escalation in the async search loop."""
+
+    def test_save_candidate_decided_by_search_model(self, agent):
+        requests = []
+        responses = [_save("Anna V.", "fast-1"), _save("Anna Visser", "large-1"), _done()]
+
+        async def create(**request):
+            requests.append(request)
+            return responses.pop(0)
+
+        client = SimpleNamespace(messages=SimpleNamespace(create=create))
+        runtime = AsyncGuestRuntime(agent, client=client, http=MagicMock())
+
+        asyncio.run(runtime.run_search_phase({"search_queries": [{"query": "AI zorg"}]}))
+
+        assert [r["model"] for r in requests] == [FAST, LARGE, FAST]
+        assert [c["name"] for c in agent.candidates] == ["Anna Visser"]
+
+
+class TestReportModels:
+    """Test model routing in the report phase."""
+
+    def test_enrichment_then_report_model(self, agent, monkeypatch, tmp_path):
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "output" / "reports").mkdir(parents=True)
+        monkeypatch.setattr(Config, "ENRICHMENT_MODEL", "enrich-model")
+        monkeypatch.setattr(Config, "REPORT_MODEL", "report-model")
+        agent.candidates = [{"name": "Anna Visser", "organization": "TU Delft", "topics": []}]
+        agent.client.messages.create.side_effect = [
+            _response(
+                _tool_use(
+                    "enrich_candidate",
+                    {"name": "Anna Visser", "enriched_topics": ["AI"], "enriched_relevance": "x"},
+                    "t1",
+                )
+            ),
+            _response(SimpleNamespace(type="text", text="# Rapport"), stop_reason="end_turn"),
+        ]
+
+        assert agent.generate_report() == "# Rapport"
+
+        models = [c.kwargs["model"] for c in agent.client.messages.create.call_args_list]
+        assert models == ["enrich-model", "report-model"]
@@ -0,0 +1,108 @@
+"""Tests for per-phase token, cache and latency accounting."""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from src.guest_search.run_metrics import RunMetrics
+
+
+def _usage(input_tokens, output_tokens, read=0, written=0):
+    return SimpleNamespace(
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        cache_read_input_tokens=read,
+        cache_creation_input_tokens=written,
+    )
+
+
+class TestRunMetrics:
+    """Test aggregation per phase and per query."""
+
+    def test_totals_per_phase_and_label(self):
+        metrics = RunMetrics()
+        metrics.record_llm_call("planning", _usage(1000, 500), 4.0)
+        metrics.record_llm_call("search", _usage(100, 20, read=900), 1.0, "query-a")
+        metrics.record_llm_call("search", _usage(200, 30, written=50), 2.0, "query-b")
+        metrics.record_tool_call("search", "web_search", 0.5, "query-a")
+        metrics.record_tool_call("search", "fetch_page_content", 1.5, "query-a")
+
+        search = metrics.totals(phase="search")
+        assert search["llm_calls"] == 2
+        assert search["input_tokens"] == 300
+        assert search["cache_read_input_tokens"] == 900
+        assert search["cache_creation_input_tokens"] == 50
+        assert search["llm_seconds"] == 3.0
+
+        query_a = metrics.totals(phase="search", label="query-a")
+        assert query_a["output_tokens"] == 20
+        assert query_a["tool_calls"] == 2
+        assert query_a["tool_seconds"] == 2.0
+
+        assert metrics.totals()["input_tokens"] == 1300
+
+    def test_mocked_usage_counts_as_zero(self):
+        metrics = RunMetrics()
+        metrics.record_llm_call("report", MagicMock(), 0.1)
+
+        assert metrics.totals(phase="report")["llm_calls"] == 1
+        assert metrics.totals(phase="report")["input_tokens"] == 0
+
+    def test_phase_wall_time_accumulates(self):
+        metrics = RunMetrics()
+        metrics.add_phase_seconds("search", 1.25)
+        with metrics.phase("search"):
+            pass
+
+        assert metrics.summary()["phases"]["search"]["wall_seconds"] >= 1.25
+
+    def test_summary_is_json_serializable(self):
+        metrics = RunMetrics()
+        metrics.record_llm_call("search", _usage(100, 10, read=300), 1.0, "query-a")
+
+        summary = json.loads(json.dumps(metrics.summary()))
+
+        assert set(summary["phases"]) == {"planning", "search", "linkedin", "report"}
+        assert summary["queries"]["query-a"]["cache_read_input_tokens"] == 300
+        assert summary["prompt_cache"]["read_ratio"] == 0.75
+
+
+class TestSearchPhaseMetrics:
+    """Test metrics recorded by the guest agent."""
+
+    def test_query_record_and_phase_totals(self):
+        from src.guest_search.agent import GuestFinderAgent
+
+        with patch("src.guest_search.agent.get_anthropic_client"):
+            agent = GuestFinderAgent()
+        agent.candidates = []
+
+        search = SimpleNamespace(
+            type="tool_use", name="web_search", input={"query": "AI"}, id="toolu_1"
+        )
+        agent.client = MagicMock()
+        agent.client.messages.create.side_effect = [
+            MagicMock(stop_reason="tool_use", content=[search], usage=_usage(100, 10, read=400)),
+            MagicMock(
+                stop_reason="end_turn",
+                content=[SimpleNamespace(type="text", text="Klaar")],
+                usage=_usage(150, 5, read=500),
+            ),
+        ]
+
+        with patch.object(agent, "_handle_tool_call", return_value={"results": []}):
+            agent.run_search_phase({"search_queries": [{"query": "AI zorg"}]})
+
+        record = agent.current_session_queries[0]
+        assert record["cache_read_input_tokens"] == 900
+        assert record["tool_calls"] == 1
+        assert record["duration_seconds"] >= record["tool_seconds"]
+
+        summary = agent.metrics.summary()
+        assert summary["phases"]["search"]["llm_calls"] == 2
+        assert summary["phases"]["search"]["wall_seconds"] > 0
+        assert summary["queries"]["AI zorg"]["output_tokens"] == 15
+
+        agent.console = MagicMock()
+        agent.print_run_metrics()
+        agent.console.print.assert_called_once()
@@ -0,0 +1,173 @@
+"""Tests for reusing planning strategies within a week."""
+
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.guest_search.config import Config
+from src.guest_search.strategy_cache import (
+    StrategyCache,
+    deprioritize_completed,
+    insights_fingerprint,
+    iso_week,
+    prompt_version,
+)
+
+STRATEGY = {
+    "week_focus": "AI in de zorg",
+    "search_queries": [
+        {"query": "AI zorg hoogleraar", "rationale": "a", "priority": "high"},
+        {"query": "AI ziekenhuis onderzoek", "rationale": "b", "priority": "medium"},
+    ],
+}
+
+# Wednesday of ISO week 2026-W42
+NOW = datetime(2026, 10, 14, 15, 0)
+
+
+def _session(date, queries=("q",), candidates=1):
+    return {
+        "date": date,
+        "total_candidates": candidates,
+        "queries": [{"query": q, "candidates_found": 1} for q in queries],
+    }
+
+
+class TestKey:
+    """Test the parts of the cache key."""
+
+    def test_iso_week(self):
+        assert iso_week(NOW) == "2026-W42"
+        # ISO week of the first days of January can belong to the previous year
+        assert iso_week(datetime(2027, 1, 1)) == "2026-W53"
+
+    def test_fingerprint_same_all_week(self):
+        sessions = [_session("2026-10-07T09:00:00")]
+
+        monday = insights_fingerprint(sessions, datetime(2026, 10, 12, 8, 0))
+        sunday = insights_fingerprint(sessions, datetime(2026, 10, 18, 23, 0))
+
+        assert monday == sunday
+
+    def test_fingerprint_ignores_sessions_of_this_week(self):
+        before = [_session("2026-10-07T09:00:00")]
+        after = before + [_session("2026-10-13T09:00:00", candidates=5)]
+
+        assert insights_fingerprint(before, NOW) == insights_fingerprint(after, NOW)
+
+    def test_fingerprint_changes_with_history(self):
+        first = [_session("2026-10-07T09:00:00", queries=("a",))]
+        second = [_session("2026-10-07T09:00:00", queries=("b",))]
+
+        assert insights_fingerprint(first, NOW) != insights_fingerprint(second, NOW)
+
+    def test_fingerprint_skips_invalid_dates(self):
+        assert insights_fingerprint([{"date": "gisteren"}, {}], NOW) == insights_fingerprint(
+            [], NOW
+        )
+
+    def test_prompt_version(self):
+        assert prompt_version("prompt", {"tool": 1}) == prompt_version("prompt", {"tool": 1})
+        assert prompt_version("prompt", "model-a") != prompt_version("prompt", "model-b")
+
+
+class TestDeprioritize:
+    """Test moving already run queries to the back."""
+
+    def test_completed_queries_go_last_at_low_priority(self):
+        strategy, repeated = deprioritize_completed(STRATEGY, {"AI zorg hoogleraar"})
+
+        assert repeated == 1
+        queries = strategy["search_queries"]
+        assert [q["query"] for q in queries] == ["AI ziekenhuis onderzoek", "AI zorg hoogleraar"]
+        assert queries[1]["priority"] == "low"
+        assert queries[1]["already_run"]
+        # The stored strategy is not changed
+        assert STRATEGY["search_queries"][0]["priority"] == "high"
+
+
+class TestStrategyCache:
+    """Test storing and loading strategies."""
+
+    def test_round_trip(self, tmp_path):
+        cache = StrategyCache(str(tmp_path))
+        key = StrategyCache.key("2026-W42", "a" * 64, "b" * 64)
+
+        cache.put(key, STRATEGY, created=NOW)
+
+        entry = cache.get(key)
+        assert entry["strategy"] == STRATEGY
+        assert entry["created"] == NOW.isoformat()
+        assert cache.get(StrategyCache.key("2026-W43", "a" * 64, "b" * 64)) is None
+
+    def test_corrupt_entry_is_a_miss(self, tmp_path):
+        cache = StrategyCache(str(tmp_path))
+        (tmp_path / "kapot.json").write_text("{niet json", encoding="utf-8")
+
+        assert cache.get("kapot") is None
+
+
+class TestAgentReuse:
+    """Test run_full_cycle reusing this week's strategy."""
+
+    @pytest.fixture
+    def new_agent(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(Config, "STRATEGY_CACHE_ENABLED", True)
+        monkeypatch.setattr(Config, "STRATEGY_CACHE_DIR", str(tmp_path))
+        monkeypatch.setattr(Config, "CHECKPOINTS_ENABLED", False)
+        monkeypatch.setattr(Config, "ASYNC_RUNTIME", False)
+        monkeypatch.setattr(Config, "PLANNING_PIPELINE", False)
+
+        def create(sessions=()):
+            from src.guest_search.agent import GuestFinderAgent
+
+            with patch("src.guest_search.agent.get_anthropic_client"):
+                agent = GuestFinderAgent()
+            agent.search_history = {"sessions": list(sessions)}
+            agent.client = MagicMock()
+            agent.run_search_phase = MagicMock()
+            agent.enrich_linkedin_profiles = MagicMock()
+            agent.generate_report = MagicMock(return_value="rapport")
+            agent.print_run_metrics = MagicMock()
+            return agent
+
+        return create
+
+    def test_second_run_reuses_strategy(self, new_agent):
+        first = new_agent()
+        first.run_planning_phase = MagicMock(return_value=STRATEGY)
+        first.run_full_cycle()
+
+        session = _session(datetime.now().isoformat(), queries=["AI zorg hoogleraar"])
+        second = new_agent(sessions=[session])
+        second.run_planning_phase = MagicMock()
+
+        assert second.run_full_cycle() == "rapport"
+
+        second.run_planning_phase.assert_not_called()
+        strategy = second.run_search_phase.call_args.args[0]
+        assert [q["query"] for q in strategy["search_queries"]] == [
+            "AI ziekenhuis onderzoek",
+            "AI zorg hoogleraar",
+        ]
+        assert "reused_from" in second.current_session_strategy
+
+    def test_replan_ignores_cached_strategy(self, new_agent):
+        first = new_agent()
+        first.run_planning_phase = MagicMock(return_value=STRATEGY)
+        first.run_full_cycle()
+
+        second = new_agent()
+        second.run_planning_phase = MagicMock(return_value=STRATEGY)
+        second.run_full_cycle(replan=True)
+
+        second.run_planning_phase.assert_called_once()
+
+    def test_disabled_cache_always_plans(self, new_agent, monkeypatch):
+        monkeypatch.setattr(Config, "STRATEGY_CACHE_ENABLED", False)
+        for _ in range(2):
+            agent = new_agent()
+            agent.run_planning_phase = MagicMock(return_value=STRATEGY)
+            agent.run_full_cycle()
+            agent.run_planning_phase.assert_called_once()
@@ -0,0 +1,182 @@
+"""Tests for streaming model turns with early tool execution."""
+
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from src.guest_search.streaming import run_model_turn, supports_streaming
+
+
+def _tool_use(name, tool_input, block_id):
+    return SimpleNamespace(type="tool_use", name=name, input=tool_input, id=block_id)
+
+
+class FakeStream:
+    """Yields a content_block_stop per block; waits on ``gate`` after the first tool block."""
+
+    def __init__(self, blocks, gate):
+        self.blocks = blocks
+        self.gate = gate
+        self.finished = False
+        self.tool_started_early = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __iter__(self):
+        for i, block in enumerate(self.blocks):
+            yield SimpleNamespace(type="content_block_start", index=i)
+            yield SimpleNamespace(type="content_block_stop", index=i, content_block=block)
+            if i == 0:
+                # Rest of the response is "still generating" until the tool has started
+                self.tool_started_early = self.gate.wait(timeout=2)
+        self.finished = True
+
+    def get_final_message(self):
+        return SimpleNamespace(stop_reason="tool_use", content=self.blocks, usage=None)
+
+
+class FakeMessages:
+    def __init__(self, blocks):
+        self.gate = threading.Event()
+        self.blocks = blocks
+        self.streams = []
+
+    def stream(self, **request):
+        stream = FakeStream(self.blocks, self.gate)
+        self.streams.append(stream)
+        return stream
+
+    def create(self, **request):
+        raise AssertionError("create should not be used when streaming")
+
+
+class StreamingClient:
+    def __init__(self, blocks):
+        self.messages = FakeMessages(blocks)
+
+
+class TestRunModelTurn:
+    """Test tool execution during and after the stream."""
+
+    def test_tool_starts_before_stream_ends(self):
+        blocks = [
+            _tool_use("fetch_page_content", {"url": "https://a.nl"}, "t1"),
+            _tool_use("fetch_page_content", {"url": "https://b.nl"}, "t2"),
+        ]
+        client = StreamingClient(blocks)
+        stream_done_at_start = []
+
+        def handler(name, tool_input):
+            stream_done_at_start.append(client.messages.streams[0].finished)
+            client.messages.gate.set()
+            return {"url": tool_input["url"]}
+
+        response, results = run_model_turn(client, {"messages": []}, handler)
+
+        assert client.messages.streams[0].tool_started_early
+        assert stream_done_at_start[0] is False
+        assert results == [{"url": "https://a.nl"}, {"url": "https://b.nl"}]
+        assert response.stop_reason == "tool_use"
+
+    def test_stateful_tools_run_after_stream_in_order(self):
+        blocks = [
+            _tool_use("check_previous_guests", {"name": "Anna"}, "t1"),
+            _tool_use("save_candidate", {"name": "Anna"}, "t2"),
+        ]
+        client = StreamingClient(blocks)
+        client.messages.gate.set()
+        calls = []
+
+        def handler(name, tool_input):
+            calls.append((name, client.messages.streams[0].finished, threading.get_ident()))
+            return {"tool": name}
+
+        _, results = run_model_turn(client, {"messages": []}, handler)
+
+        assert [name for name, _, _ in calls] == ["check_previous_guests", "save_candidate"]
+        assert all(finished for _, finished, _ in calls)
+        assert all(thread == threading.get_ident() for _, _, thread in calls)
+        assert results == [{"tool": "check_previous_guests"}, {"tool": "save_candidate"}]
+
+    def test_sequential_workers_wait_for_stream(self):
+        blocks = [_tool_use("web_search", {"query": "AI"}, "t1")]
+        client = StreamingClient(blocks)
+        client.messages.gate.set()
+        finished = []
+
+        def handler(name, tool_input):
+            finished.append(client.messages.streams[0].finished)
+            return {}
+
+        run_model_turn(client, {"messages": []}, handler, max_workers=1)
+
+        assert finished == [True]
+
+    def test_should_dispatch_false_skips_stateful_tools(self):
+        blocks = [_tool_use("save_candidate", {"name": "Anna"}, "t1")]
+        client = StreamingClient(blocks)
+        client.messages.gate.set()
+        handler = MagicMock(return_value={})
+
+        response, results = run_model_turn(
+            client, {}, handler, should_dispatch=lambda response: False
+        )
+
+        handler.assert_not_called()
+        assert results == []
+        assert response.content == blocks
+
+    def test_should_dispatch_without_stream(self):
+        client = MagicMock()
+        client.messages.create.return_value = SimpleNamespace(
+            stop_reason="end_turn", content=[_tool_use("save_topic", {}, "t1")]
+        )
+        handler = MagicMock(return_value={})
+
+        _, results = run_model_turn(
+            client, {}, handler, should_dispatch=lambda r: r.stop_reason != "end_turn"
+        )
+
+        handler.assert_not_called()
+        assert results == []
+
+    def test_falls_back_to_create_without_stream(self):
+        client = MagicMock()
+        client.messages.create.return_value = SimpleNamespace(
+            content=[_tool_use("web_search", {"query": "AI"}, "t1")]
+        )
+
+        _, results = run_model_turn(client, {"model": "m"}, lambda name, _: {"tool": name})
+
+        client.messages.create.assert_called_once_with(model="m")
+        assert results == [{"tool": "web_search"}]
+
+    def test_stream_disabled(self):
+        client = StreamingClient([])
+        client.messages.create = MagicMock(return_value=SimpleNamespace(content=[]))
+
+        run_model_turn(client, {}, lambda name, _: {}, stream=False)
+
+        assert client.messages.streams == []
+        client.messages.create.assert_called_once()
+
+
+class TestSupportsStreaming:
+    """Test client detection."""
+
+    def test_mock_client_does_not_stream(self):
+        assert not supports_streaming(MagicMock())
+
+    def test_portkey_adapter_does_not_stream(self):
+        from src.utils.portkey_client import AnthropicPortkeyAdapter
+
+        assert not supports_streaming(AnthropicPortkeyAdapter(MagicMock(), "@slug", "model"))
+
+    def test_anthropic_client_streams(self):
+        from anthropic import Anthropic
+
+        assert supports_streaming(Anthropic(api_key="test"))
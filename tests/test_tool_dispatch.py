@@ -0,0 +1,130 @@
+"""Tests for concurrent execution of tool_use blocks from one response."""
+
+import json
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.guest_search.agent import GuestFinderAgent
+from src.guest_search.tool_dispatch import dispatch_tool_calls
+
+
+def _tool_use(name, tool_input, block_id):
+    return SimpleNamespace(type="tool_use", name=name, input=tool_input, id=block_id)
+
+
+class TestDispatchToolCalls:
+    """Test the dispatcher itself."""
+
+    def test_results_keep_block_order(self):
+        blocks = [_tool_use("fetch_page_content", {"url": f"u{i}"}, f"id{i}") for i in range(5)]
+
+        results = dispatch_tool_calls(blocks, lambda name, tool_input: {"url": tool_input["url"]})
+
+        assert [r["url"] for r in results] == ["u0", "u1", "u2", "u3", "u4"]
+
+    def test_io_tools_run_concurrently(self):
+        # All three calls must be in flight at the same time to pass the barrier
+        barrier = threading.Barrier(3, timeout=5)
+        blocks = [_tool_use("fetch_page_content", {"url": f"u{i}"}, f"id{i}") for i in range(3)]
+
+        def handler(name, tool_input):
+            barrier.wait()
+            return {"status": "success"}
+
+        results = dispatch_tool_calls(blocks, handler, max_workers=3)
+
+        assert len(results) == 3
+
+    def test_stateful_tools_run_in_order_on_calling_thread(self):
+        calls = []
+        blocks = [
+            _tool_use("check_previous_guests", {"name": "A"}, "1"),
+            _tool_use("web_search", {"query": "q1"}, "2"),
+            _tool_use("save_candidate", {"name": "A"}, "3"),
+            _tool_use("web_search", {"query": "q2"}, "4"),
+        ]
+
+        def handler(name, tool_input):
+            if name != "web_search":
+                calls.append((name, threading.current_thread() is threading.main_thread()))
+            return {"tool": name}
+
+        results = dispatch_tool_calls(blocks, handler)
+
+        assert calls == [("check_previous_guests", True), ("save_candidate", True)]
+        assert [r["tool"] for r in results] == [b.name for b in blocks]
+
+    def test_sequential_with_one_worker(self):
+        threads = set()
+        blocks = [_tool_use("web_search", {"query": f"q{i}"}, str(i)) for i in range(3)]
+
+        def handler(name, tool_input):
+            threads.add(threading.current_thread())
+            return {}
+
+        dispatch_tool_calls(blocks, handler, max_workers=1)
+
+        assert threads == {threading.current_thread()}
+
+    def test_tool_errors_propagate(self):
+        blocks = [_tool_use("web_search", {"query": f"q{i}"}, str(i)) for i in range(2)]
+
+        def handler(name, tool_input):
+            raise RuntimeError("provider down")
+
+        with pytest.raises(RuntimeError):
+            dispatch_tool_calls(blocks, handler)
+
+
+class TestSearchPhaseToolMessages:
+    """Test the conversation built by run_search_phase."""
+
+    def test_one_assistant_and_one_user_message_per_turn(self):
+        with patch("src.guest_search.agent.get_anthropic_client"):
+            agent = GuestFinderAgent()
+        agent.candidates = []
+
+        first = MagicMock(
+            stop_reason="tool_use",
+            content=[
+                SimpleNamespace(type="text", text="Ik haal drie pagina's op."),
+                _tool_use("fetch_page_content", {"url": "https://a.nl"}, "toolu_1"),
+                _tool_use("fetch_page_content", {"url": "https://b.nl"}, "toolu_2"),
+                _tool_use("fetch_page_content", {"url": "https://c.nl"}, "toolu_3"),
+            ],
+        )
+        second = MagicMock(
+            stop_reason="end_turn", content=[SimpleNamespace(type="text", text="Klaar")]
+        )
+        agent.client = MagicMock()
+        agent.client.messages.create.side_effect = [first, second]
+
+        def fetch(name, tool_input, silent=False):
+            return {"url": tool_input["url"], "status": "success"}
+
+        strategy = {"search_queries": [{"query": "AI zorg", "rationale": "test"}]}
+        with patch.object(agent, "_handle_tool_call", side_effect=fetch):
+            agent.run_search_phase(strategy)
+
+        # [query prompt, assistant with tool calls, tool results] as sent on the second turn
+        messages = agent.client.messages.create.call_args_list[1].kwargs["messages"]
+        assert len(messages) == 3
+        assistant, tool_message = messages[1], messages[2]
+
+        assert assistant["role"] == "assistant"
+        assert [b.type for b in assistant["content"]] == ["text"] + ["tool_use"] * 3
+        assert tool_message["role"] == "user"
+        assert [r["tool_use_id"] for r in tool_message["content"]] == [
+            "toolu_1",
+            "toolu_2",
+            "toolu_3",
+        ]
+        assert json.loads(tool_message["content"][1]["content"])["url"] == "https://b.nl"
+        assert agent.current_session_queries[0]["successful_sources"] == [
+            "https://a.nl",
+            "https://b.nl",
+            "https://c.nl",
+        ]
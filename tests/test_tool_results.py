@@ -0,0 +1,117 @@
+"""Tests for compact tool result serialization."""
+
+import json
+from unittest.mock import patch
+
+from src.guest_search.compaction import summarize_tool_result
+from src.guest_search.config import Config
+from src.guest_search.extraction import extract_persons_regex
+from src.guest_search.run_metrics import RunMetrics
+from src.guest_search.tool_results import encode_tool_result, result_sizes
+
+PAGE_TEXT = (
+    "Het AI-congres in Utrecht trok dit jaar ruim vijfhonderd bezoekers.\n"
+    "Prof. dr. Jan de Vries is hoogleraar AI aan de Universiteit van Amsterdam en "
+    "sprak over betrouwbare taalmodellen in de zorg.\n"
+    "Volgens directeur Maria de Wit van TNO is de Nederlandse AI-sector klaar voor "
+    "de volgende stap, mits er geïnvesteerd wordt in rekenkracht.\n"
+    "Dr. Anna Smit van de TU Delft presenteerde onderzoek naar energiezuinige training."
+)
+
+
+def _search_result():
+    long_snippet = "AI in de zorg " * 60
+    return {
+        "results": [
+            {"title": "AI in de zorg", "snippet": long_snippet, "url": "https://a.nl/zorg"},
+            {"title": "AI in de zorg (kopie)", "snippet": "", "url": "https://a.nl/zorg/"},
+            {"title": "Onderzoek", "snippet": "Kort", "url": "https://b.nl/"},
+        ],
+        "provider": "SerperProvider",
+    }
+
+
+class TestSearchResults:
+    """Test web_search result encoding."""
+
+    def test_provider_duplicates_and_long_snippets_removed(self):
+        encoded = json.loads(encode_tool_result("web_search", _search_result(), 100))
+
+        assert "provider" not in encoded
+        assert [r["url"] for r in encoded["results"]] == ["https://a.nl/zorg", "https://b.nl/"]
+        assert len(encoded["results"][0]["snippet"]) == 101
+
+    def test_no_results_error_kept(self):
+        encoded = json.loads(encode_tool_result("web_search", {"results": [], "error": "x"}))
+
+        assert encoded == {"results": [], "error": "x"}
+
+
+class TestPageResults:
+    """Test fetch_page_content result encoding."""
+
+    def _page_result(self, text):
+        from src.guest_search.agent import GuestFinderAgent
+
+        with patch("src.guest_search.agent.get_anthropic_client"):
+            agent = GuestFinderAgent()
+        agent.current_query = "AI hoogleraar"
+        return agent._build_page_result("https://a.nl/", text, extract_persons_regex(text))
+
+    def test_context_in_page_text_dropped(self):
+        result = self._page_result(PAGE_TEXT)
+
+        encoded = json.loads(encode_tool_result("fetch_page_content", result))
+
+        persons = encoded["potential_persons"]
+        assert {"name", "title_match"} >= set(persons[0])
+        assert all("context" not in p and "sentence" not in p for p in persons)
+        assert encoded["content"] == result["content"]
+
+    def test_context_outside_sent_text_kept(self):
+        result = {
+            "url": "https://a.nl/",
+            "content": "Korte passage zonder namen.",
+            "potential_persons": [
+                {"name": "Jan de Vries", "context": "Jan de Vries is hoogleraar", "sentence": "s"}
+            ],
+            "persons_found": 1,
+            "status": "success",
+        }
+
+        encoded = json.loads(encode_tool_result("fetch_page_content", result))
+
+        assert encoded["potential_persons"] == [
+            {"name": "Jan de Vries", "context": "Jan de Vries is hoogleraar"}
+        ]
+
+    def test_compacted_later_by_conversation_compactor(self):
+        encoded = json.loads(encode_tool_result("fetch_page_content", self._page_result(PAGE_TEXT)))
+
+        summary = summarize_tool_result(encoded)
+
+        assert summary["url"] == "https://a.nl/"
+        assert "Jan de Vries" in " ".join(summary["persons"])
+
+
+class TestSizeMeasurement:
+    """Test before/after measurement on a recorded session."""
+
+    def test_session_report(self):
+        metrics = RunMetrics()
+        page = TestPageResults()._page_result(PAGE_TEXT)
+        for tool_name, result in [
+            ("web_search", _search_result()),
+            ("fetch_page_content", page),
+            ("save_candidate", {"status": "saved", "name": "Jan de Vries"}),
+        ]:
+            encoded = encode_tool_result(tool_name, result, Config.SEARCH_SNIPPET_MAX_CHARS)
+            metrics.record_tool_result(result_sizes(tool_name, result, encoded))
+
+        report = metrics.summary()["tool_results"]
+
+        assert report["results"] == 3
+        assert report["compact_tokens"] < report["default_tokens"]
+        assert report["saved_ratio"] > 0.25
+        for tool in report["per_tool"].values():
+            assert tool["compact_tokens"] <= tool["default_tokens"]
@@ -281,6 +281,27 @@ class TestTopicSearchFlow:
 
         assert report == "Geen interessante topics deze week."
 
+    @patch("src.utils.smart_search_tool.SmartSearchTool")
+    @patch("src.utils.portkey_client.get_anthropic_client")
+    def test_end_turn_does_not_run_tool_calls(
+        self, mock_get_client, mock_search_tool, mock_env_vars
+    ):
+        """Test that tool calls in an end_turn response are not executed."""
+        from src.topic_search.agent import TopicFinderAgent
+
+        save_topic = MagicMock(type="tool_use", input={"title": "AI"}, id="t1")
+        save_topic.name = "save_topic"
+        mock_response = MagicMock(stop_reason="end_turn", content=[save_topic], usage=None)
+
+        agent = TopicFinderAgent()
+        agent.client = MagicMock()
+        agent.client.messages.create.return_value = mock_response
+
+        agent.run_topic_search()
+
+        assert agent.topics == []
+        agent.client.messages.create.assert_called_once()
+
 
 class TestErrorHandling:
     """Test error handling in topic agent."""